@@ -1,3 +1,10 @@
-from . import health, modules, market, backtest, symbols
+import importlib
 
-__all__ = ['health', 'modules', 'market', 'backtest', 'symbols']
+__all__ = ['health', 'modules', 'market', 'backtest', 'symbols', 'sweep', 'portfolio', 'live', 'metrics']
+
+
+def __getattr__(name):
+    # Router-Module erst bei Bedarf importieren (schneller Kaltstart, siehe backend/core/startup.py)
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
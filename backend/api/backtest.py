@@ -1,22 +1,26 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+import json
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
-from datetime import datetime
 import pandas as pd
 import numpy as np
 
-from alpaca.data.historical import StockHistoricalDataClient, CryptoHistoricalDataClient
-from alpaca.data.requests import StockBarsRequest, CryptoBarsRequest
-from alpaca.data.enums import Adjustment, DataFeed
-
-from ..core.clients import _default_stock_client, _default_crypto_client, SYMBOL_MAP, CRYPTO_SYMBOLS, TIMEFRAME_MAP  # ← geändert
-from ..core.utils import to_list, load_modules  # ← geändert
+from ..core.utils import to_list
+from ..core.bars import iter_bars, load_bars
+from ..core.engine import strategies, apply_indicators
+from ..core.backtest import indicator_cols, result_frame, summarize, with_equity
+from ..core.chunked import chunk_days, run_chunked
+from ..core.binary import MEDIA_TYPE, wants_binary, encode_frame
+from ..core.downsample import CHART_POINT_BUDGET, lttb_indices, ohlc_buckets, result_cache, window
+from ..core.jobs import JOB_PARALLEL_BARS, TERMINAL, Job, QueueFull, queue as job_queue
+from ..core.metrics import span
+from ..core.montecarlo import DRAWDOWNS, MC_MAX_PATHS, MC_PATHS, PERCENTILES
 
 
 router = APIRouter()
 
-indicators = load_modules("indicators")
-strategies = load_modules("strategies")
-
 class BacktestRequest(BaseModel):
     symbol:            str       = "SPY"
     interval:          str       = "1d"
@@ -24,164 +28,292 @@ class BacktestRequest(BaseModel):
     end:               str       = "2025-01-01"
     capital:           float     = 10000
     sma_period:        int       = 20
+    slow_period:       int       = 50
     strategy:          str       = ""
     active_indicators: list[str] = []
     alpaca_key:        str       = ""
     alpaca_secret:     str       = ""
+    max_points:        int       = CHART_POINT_BUDGET   # 0 = alle Bars
+    mc_paths:          int       = MC_PATHS             # Monte-Carlo-Projektion
+    mc_block:          int       = 1                    # >1: Block-Bootstrap
+    mc_percentiles:    list[float] = list(PERCENTILES)
+    mc_drawdowns:      list[float] = list(DRAWDOWNS)    # Prozent
+    mc_seed:           int       = 0                    # gleiche Anfrage -> gleiche Projektion
+    chunk_days:        int       = 0                    # >0: fensterweise (Out-of-Core), 0 = automatisch
+
+
+def _series(df: pd.DataFrame, indicator_cols: list, binary: bool, max_points: int):
+    """
+    Chart- und Equity-Serien, bei mehr als `max_points` Bars reduziert:
+    Kerzen/Indikatoren über OHLC-Buckets, Equity-Linien über LTTB.
+    JSON: Listen mit None; Binär: gepackte float32-Spalten.
+    """
+    candles, line_rows, eq_rows = df, None, None
+    if max_points and len(df) > max_points:
+        candles, line_rows = ohlc_buckets(df, max_points)
+        eq_rows = lttb_indices(df["equity"].to_numpy(), max_points)
+
+    def col(frame, name, rows=None):
+        values = frame[name].to_numpy(dtype="float32" if binary else "float64")
+        values = values if rows is None else values[rows]
+        return values if binary else to_list(values)
+
+    def dates(index):
+        return index if binary else index.strftime("%Y-%m-%d %H:%M").tolist()
+
+    eq_index = df.index if eq_rows is None else df.index[eq_rows]
+    chart = {
+        "dates":      dates(candles.index),
+        "open":       col(candles, "open"),
+        "high":       col(candles, "high"),
+        "low":        col(candles, "low"),
+        "close":      col(candles, "close"),
+        "indicators": {c: col(df, c, line_rows) for c in indicator_cols},
+        "rsi":        col(df, "rsi", line_rows) if "rsi" in df.columns else []
+    }
+    equity = {
+        "dates":       dates(eq_index),
+        "equity":      col(df, "equity", eq_rows),
+        "bh_equity":   col(df, "bh_equity", eq_rows),
+        "equity_high": col(df, "equity_high", eq_rows),
+        "equity_low":  col(df, "equity_low", eq_rows),
+    }
+    return chart, equity
+
+
+def _trades(df: pd.DataFrame, ledger: dict, binary: bool) -> dict:
+    """Trade-Tabelle für die Antwort (Spalten-Arrays, Zeiten als Einstiegs-/Ausstiegs-Bar)."""
+    entry = df.index[np.maximum(ledger["entry"] - 1, 0)]
+    exit_ = df.index[ledger["exit"]]
+    cols  = {k: ledger[k] for k in ("entry_price", "exit_price", "pnl", "pnl_abs")}
+    cols["pnl"] = cols["pnl"] * 100
+    if binary:
+        return {"entry": entry, "exit": exit_, **cols,
+                "bars": ledger["bars"].astype("int64"), "open": ledger["open"].astype("int64")}
+    return {"entry": entry.strftime("%Y-%m-%d %H:%M").tolist(),
+            "exit":  exit_.strftime("%Y-%m-%d %H:%M").tolist(),
+            **{k: to_list(v) for k, v in cols.items()},
+            "bars": ledger["bars"].tolist(), "open": ledger["open"].tolist()}
+
+
+def _validate(req: BacktestRequest) -> str:
+    """Anfrage prüfen (400 bei ungültigen Werten) und den Strategienamen auflösen."""
+    if not 1 <= req.mc_paths <= MC_MAX_PATHS or req.mc_block < 1:
+        raise HTTPException(status_code=400, detail=f"mc_paths muss zwischen 1 und {MC_MAX_PATHS} liegen, mc_block >= 1.")
+    if not req.mc_percentiles or not all(0 <= p <= 100 for p in req.mc_percentiles):
+        raise HTTPException(status_code=400, detail="mc_percentiles müssen zwischen 0 und 100 liegen.")
+    strategy_name = req.strategy or (list(strategies.keys())[0] if strategies else None)
+    if not strategy_name or strategy_name not in strategies:
+        raise HTTPException(status_code=400, detail=f"Strategie '{strategy_name}' nicht gefunden.")
+    return strategy_name
+
+
+def _summary_args(req: BacktestRequest) -> tuple:
+    return (req.capital, req.max_points, req.mc_paths, req.mc_block,
+            req.mc_percentiles, req.mc_drawdowns, req.mc_seed)
+
+
+def _params(req: BacktestRequest) -> dict:
+    return {"fast": req.sma_period, "slow": req.slow_period}
+
+
+def _run_chunked(req: BacktestRequest, strategy_name: str, days: int, progress=None):
+    """Out-of-Core-Pfad: Bars in Fenstern zu `days` Tagen laden und verarbeiten (backend.core.chunked)."""
+    chunks = iter_bars(req.symbol, req.interval, req.start, req.end, days, req.alpaca_key, req.alpaca_secret)
+    return run_chunked(chunks, strategy_name, _params(req), req.active_indicators, req.capital,
+                       _summary_args(req)[1:], progress)
+
+
+def _result(frame: pd.DataFrame, summary: dict, result_id: str, binary: bool, max_points: int):
+    """Antwort aus Ergebnis-Frame und Zusammenfassung bauen (JSON-Dict oder Binär-Response)."""
+    chart, equity = _series(frame, indicator_cols(frame), binary, max_points)
+    projection = dict(summary["projection"])
+    if binary:
+        projection["bands"] = dict(projection["bands"])
+    else:
+        projection["dates"] = projection["dates"].strftime("%Y-%m-%d").tolist()
+        for k in ("upper", "lower", "mid"):
+            projection[k] = projection[k].tolist()
+        projection["bands"] = {k: v.tolist() for k, v in projection["bands"].items()}
+    equity["projection"] = projection
+
+    result = {
+        "result_id":   result_id,
+        "total_bars":  len(frame),
+        "downsampled": len(chart["dates"]) < len(frame),
+        "chart":       chart,
+        "equity":      equity,
+        "trades":      _trades(frame, summary["ledger"], binary),
+        "performance": summary["performance"],
+    }
+    if binary:
+        return Response(encode_frame(result), media_type=MEDIA_TYPE)
+    return result
+
 
 @router.post("/backtest")
-def run_backtest(req: BacktestRequest):
+def run_backtest(req: BacktestRequest, request: Request):
     try:
-        if req.alpaca_key and req.alpaca_secret:
-            stock_client  = StockHistoricalDataClient(req.alpaca_key, req.alpaca_secret)
-            crypto_client = CryptoHistoricalDataClient()
-        elif _default_stock_client:
-            stock_client  = _default_stock_client
-            crypto_client = _default_crypto_client
-        else:
-            raise HTTPException(
-                status_code=401,
-                detail="Keine Alpaca API-Keys konfiguriert. Bitte in 'Data & Synchro' eintragen."
-            )
-
-        mapped   = SYMBOL_MAP.get(req.symbol, req.symbol)
-        tf       = TIMEFRAME_MAP.get(req.interval)
-        start_dt = datetime.strptime(req.start, "%Y-%m-%d")
-        end_dt   = datetime.strptime(req.end,   "%Y-%m-%d")
-
-        if mapped in CRYPTO_SYMBOLS:
-            bars_req = CryptoBarsRequest(
-                symbol_or_symbols=mapped, timeframe=tf,
-                start=start_dt, end=end_dt
-            )
-            bars = crypto_client.get_crypto_bars(bars_req)
-        else:
-            bars_req = StockBarsRequest(
-                symbol_or_symbols=mapped, timeframe=tf,
-                start=start_dt, end=end_dt,
-                feed=DataFeed.SIP,
-                adjustment=Adjustment.ALL
-            )
-            bars = stock_client.get_stock_bars(bars_req)
-
-        df = bars.df
-        if isinstance(df.index, pd.MultiIndex):
-            df = df.reset_index(level=0, drop=True)
-        df.columns = [c.lower() for c in df.columns]
-
-        if df.empty:
-            raise HTTPException(status_code=400, detail="Keine Daten. Symbol oder Zeitraum prüfen.")
-
-        for name in req.active_indicators:
-            if name in indicators:
-                df = indicators[name](df)
-
-        strategy_name = req.strategy or (list(strategies.keys())[0] if strategies else None)
-        if not strategy_name or strategy_name not in strategies:
-            raise HTTPException(status_code=400, detail=f"Strategie '{strategy_name}' nicht gefunden.")
-
-        df = strategies[strategy_name](df, fast=req.sma_period, slow=50)
-
-        if "signal" not in df.columns:
-            raise HTTPException(status_code=400, detail="Strategie hat keine 'signal'-Spalte.")
-
-        df["position"]  = df["signal"].shift(1).fillna(0)
-        df["returns"]   = df["close"].pct_change()
-        df["strat_ret"] = df["position"].clip(lower=0) * df["returns"]
-        df["equity"]    = req.capital * (1 + df["strat_ret"]).cumprod()
-        df["bh_equity"] = req.capital * (1 + df["returns"]).cumprod()
-
-        equity_high_list, equity_low_list = [], []
-        equity_vals   = df["equity"].values
-        position_vals = df["position"].values
-        high_vals     = df["high"].values
-        low_vals      = df["low"].values
-        close_vals    = df["close"].values
-
-        for i in range(len(df)):
-            eq = float(equity_vals[i])
-            if position_vals[i] == 1 and close_vals[i] > 0:
-                equity_high_list.append(eq * float(high_vals[i]) / float(close_vals[i]))
-                equity_low_list.append( eq * float(low_vals[i])  / float(close_vals[i]))
-            else:
-                equity_high_list.append(eq)
-                equity_low_list.append(eq)
-
-        df["equity_high"] = equity_high_list
-        df["equity_low"]  = equity_low_list
-
-        peak          = df["equity"].cummax()
-        max_dd        = ((df["equity"] - peak) / peak).min() * 100
-        sharpe        = (df["strat_ret"].mean() / df["strat_ret"].std()) * np.sqrt(252) if df["strat_ret"].std() > 0 else 0
-        wins          = (df["strat_ret"] > 0).sum()
-        losses        = (df["strat_ret"] < 0).sum()
-        wr            = wins / (wins + losses) * 100 if (wins + losses) > 0 else 0
-        tot_r         = (df["equity"].iloc[-1] / req.capital - 1) * 100
-        bh_r          = (df["bh_equity"].iloc[-1] / req.capital - 1) * 100
-        total_trades  = int(wins + losses)
-        gross_profit  = float(df.loc[df["strat_ret"] > 0, "strat_ret"].sum())
-        gross_loss    = abs(float(df.loc[df["strat_ret"] < 0, "strat_ret"].sum()))
-        profit_factor = round(gross_profit / gross_loss, 2) if gross_loss > 0 else 999
-        calmar        = round(float(tot_r / abs(float(max_dd))), 2) if max_dd != 0 else 0
-
-        proj_days  = max(5, len(df) // 4)
-        daily_mean = float(df["strat_ret"].mean())
-        daily_std  = float(df["strat_ret"].std())
-        last_eq    = float(df["equity"].iloc[-1])
-        last_date  = df.index[-1]
-
-        future_dates = []
-        cur = last_date
-        while len(future_dates) < proj_days:
-            cur = cur + pd.Timedelta(days=1)
-            if cur.weekday() < 5:
-                future_dates.append(cur)
-
-        proj_upper = [last_eq * ((1 + daily_mean + daily_std) ** i) for i in range(1, proj_days + 1)]
-        proj_lower = [last_eq * ((1 + daily_mean - daily_std) ** i) for i in range(1, proj_days + 1)]
-        proj_mid   = [last_eq * ((1 + daily_mean) ** i)             for i in range(1, proj_days + 1)]
-        proj_dates = [d.strftime("%Y-%m-%d") for d in future_dates]
-
-        indicator_cols = [c for c in df.columns if c.startswith("sma_") or c.startswith("ema_")]
-
-        return {
-            "chart": {
-                "dates":      df.index.strftime("%Y-%m-%d %H:%M").tolist(),
-                "open":       to_list(df["open"]),
-                "high":       to_list(df["high"]),
-                "low":        to_list(df["low"]),
-                "close":      to_list(df["close"]),
-                "indicators": {col: to_list(df[col]) for col in indicator_cols},
-                "rsi":        to_list(df["rsi"]) if "rsi" in df.columns else []
-            },
-            "equity": {
-                "dates":       df.index.strftime("%Y-%m-%d %H:%M").tolist(),
-                "equity":      to_list(df["equity"]),
-                "bh_equity":   to_list(df["bh_equity"]),
-                "equity_high": to_list(df["equity_high"]),
-                "equity_low":  to_list(df["equity_low"]),
-                "projection": {
-                    "dates": proj_dates,
-                    "upper": [round(v, 2) for v in proj_upper],
-                    "lower": [round(v, 2) for v in proj_lower],
-                    "mid":   [round(v, 2) for v in proj_mid]
-                }
-            },
-            "performance": {
-                "end_capital":   round(float(df["equity"].iloc[-1]), 2),
-                "total_return":  round(float(tot_r), 2),
-                "bh_return":     round(float(bh_r), 2),
-                "bh_capital":    round(float(df["bh_equity"].iloc[-1]), 2),
-                "sharpe":        round(float(sharpe), 2),
-                "max_drawdown":  round(float(max_dd), 2),
-                "win_rate":      round(float(wr), 2),
-                "total_trades":  total_trades,
-                "profit_factor": profit_factor,
-                "calmar":        calmar,
-                "capital":       req.capital
-            }
-        }
+        binary = wants_binary(request.headers.get("accept", ""))
+        strategy_name = _validate(req)
+
+        days = chunk_days(req.interval, req.start, req.end, req.chunk_days)
+        if days:
+            try:
+                with span("chunked"):
+                    frame, summary = _run_chunked(req, strategy_name, days)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            with span("serialize"):
+                return _result(frame, summary, result_cache.put(frame), binary, req.max_points)
+
+        with span("fetch"):
+            df = load_bars(req.symbol, req.interval, req.start, req.end,
+                           req.alpaca_key, req.alpaca_secret)
+        try:
+            with span("indicators"):
+                df = apply_indicators(df, req.active_indicators)
+            with span("strategy"):
+                df = with_equity(df, strategy_name, _params(req), req.capital)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        with span("metrics"):
+            summary = summarize(df, *_summary_args(req))
+        frame = result_frame(df)
+        with span("serialize"):
+            return _result(frame, summary, result_cache.put(frame), binary, req.max_points)
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+# ─── Jobs ────────────────────────────────────────────────────────────────────
+def _chunked_job(job: Job, req: BacktestRequest, strategy_name: str, days: int) -> dict:
+    """Out-of-Core-Backtest im Runner-Thread; Fortschritt und Abbruch nach jedem Fenster."""
+    start, end = pd.Timestamp(req.start, tz="UTC"), pd.Timestamp(req.end, tz="UTC")
+
+    def progress(run, bars):
+        done = min(1.0, (bars.index[-1] - start) / (end - start))
+        job.emit("chunked", 5 + int(done * 65), f"{run.bars} Bars verarbeitet", bars=run.bars)
+        job.check()
+
+    try:
+        frame, summary = job.stage_run("chunked", 5, f"Lade und verarbeite {req.symbol} in {days}-Tage-Fenstern...",
+                                       _run_chunked, req, strategy_name, days, progress)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"frame": frame, "summary": summary, "result_id": result_cache.put(frame),
+            "max_points": req.max_points}
+
+
+def _backtest_job(job: Job, req: BacktestRequest, strategy_name: str) -> dict:
+    """Backtest in Stufen: Bars (Thread) -> Indikatoren -> Strategie -> Kennzahlen (ggf. Prozesspool)."""
+    days = chunk_days(req.interval, req.start, req.end, req.chunk_days)
+    if days:
+        return _chunked_job(job, req, strategy_name, days)
+    df = job.stage_run("fetch", 5, f"Lade Bars für {req.symbol}...", load_bars,
+                       req.symbol, req.interval, req.start, req.end, req.alpaca_key, req.alpaca_secret)
+    parallel = len(df) >= JOB_PARALLEL_BARS
+    job.emit("fetch", 25, f"{len(df)} Bars geladen", bars=len(df))
+
+    try:
+        df = job.stage_run("indicators", 30, "Berechne Indikatoren...", apply_indicators,
+                           df, req.active_indicators, parallel=parallel)
+        df = job.stage_run("strategy", 50, f"Führe Strategie {strategy_name} aus...", with_equity,
+                           df, strategy_name, _params(req), req.capital, parallel=parallel)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    summary = job.stage_run("metrics", 70, "Berechne Kennzahlen und Projektion...", summarize,
+                            df, *_summary_args(req), parallel=parallel)
+
+    frame = result_frame(df)
+    return {"frame": frame, "summary": summary, "result_id": result_cache.put(frame),
+            "max_points": req.max_points}
+
+
+def _job(job_id: str) -> Job:
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job unbekannt oder abgelaufen.")
+    return job
+
+
+@router.post("/backtest/jobs", status_code=202)
+def submit_backtest_job(req: BacktestRequest):
+    """Backtest einreihen; Fortschritt über /backtest/jobs/{id}/stream, Ergebnis über /result."""
+    strategy_name = _validate(req)
+    try:
+        job = job_queue.submit("backtest", _backtest_job, req, strategy_name)
+    except QueueFull as e:
+        raise HTTPException(status_code=429, detail=f"Job-Queue voll: {e}")
+    return job.snapshot()
+
+
+@router.get("/backtest/jobs/{job_id}")
+def get_backtest_job(job_id: str):
+    return _job(job_id).snapshot()
+
+
+@router.get("/backtest/jobs/{job_id}/stream")
+async def stream_backtest_job(job_id: str):
+    """SSE: alle Fortschritts-Events des Jobs (auch bereits vergangene), bis er endet."""
+    job = _job(job_id)
+
+    async def event_generator():
+        cursor = 0
+        while True:
+            events = await asyncio.to_thread(job.events_since, cursor)
+            for event in events:
+                yield "data: " + json.dumps(event) + "\n\n"
+            cursor += len(events)
+            if job.state in TERMINAL and cursor >= len(job.events):
+                return
+
+    return StreamingResponse(event_generator(), media_type="text/event-stream")
+
+
+@router.get("/backtest/jobs/{job_id}/result")
+def get_backtest_job_result(job_id: str, request: Request):
+    job = _job(job_id)
+    if job.state == "error":
+        raise HTTPException(status_code=job.error[0], detail=job.error[1])
+    if job.state != "done":
+        raise HTTPException(status_code=409, detail=f"Job ist {job.state}.")
+    out = job.result
+    with span("serialize"):
+        return _result(out["frame"], out["summary"], out["result_id"],
+                       wants_binary(request.headers.get("accept", "")), out["max_points"])
+
+
+@router.delete("/backtest/jobs/{job_id}")
+def cancel_backtest_job(job_id: str):
+    job = job_queue.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job unbekannt oder abgelaufen.")
+    return job.snapshot()
+
+
+@router.get("/backtest/window")
+def get_backtest_window(request: Request, result_id: str, start: str = "", end: str = "",
+                        max_points: int = CHART_POINT_BUDGET):
+    """Volle Auflösung (bis `max_points`) für einen Zoom-Ausschnitt eines Backtests."""
+    df = result_cache.get(result_id)
+    if df is None:
+        raise HTTPException(status_code=404, detail="Ergebnis nicht mehr im Cache. Backtest neu starten.")
+    try:
+        part = window(df, start or None, end or None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Ungültiges Zeitfenster: {e}")
+
+    binary = wants_binary(request.headers.get("accept", ""))
+    if part.empty:
+        result = {"result_id": result_id, "total_bars": 0, "downsampled": False, "chart": None, "equity": None}
+    else:
+        chart, equity = _series(part, indicator_cols(part), binary, max_points)
+        result = {"result_id": result_id, "total_bars": len(part),
+                  "downsampled": len(chart["dates"]) < len(part), "chart": chart, "equity": equity}
+    if binary:
+        return Response(encode_frame(result), media_type=MEDIA_TYPE)
+    return result
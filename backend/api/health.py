@@ -1,7 +1,19 @@
-from fastapi import APIRouter
+import asyncio
+
+from fastapi import APIRouter, Request
+
+# Nur leichte Importe: /api/health muss direkt nach dem Start antworten
+# (electron/main.js wartet darauf). Die Kern-Module werden in den
+# Endpoints importiert und sind dann meist schon vorgeladen.
 
 router = APIRouter()
 
+@router.get("/health")
+def liveness():
+    """Backend läuft (ohne Alpaca-Prüfung, ohne schwere Importe)."""
+    return {"status": "ok"}
+
+
 @router.post("/health")
 async def health_check(request: dict):
     try:
@@ -11,14 +23,88 @@ async def health_check(request: dict):
         if not alpaca_key or not alpaca_secret:
             return {"status": "ok", "alpaca_valid": False}
         
-        try:
-            from alpaca.trading.client import TradingClient
-            client  = TradingClient(alpaca_key, alpaca_secret, paper=True)
-            account = client.get_account()
+        from ..core.clients import make_trading_client, registry as client_registry
+
+        def check():
+            account = make_trading_client(alpaca_key, alpaca_secret).get_account()
             return {"status": "ok", "alpaca_valid": True, "account_status": account.status}
+
+        try:
+            # Erfolgreiche Validierung wird HEALTH_TTL Sekunden gecacht, Fehler nicht
+            return await asyncio.to_thread(client_registry.validated, alpaca_key, alpaca_secret, check)
         except Exception as e:
             print(f"Alpaca validation error: {e}")
             return {"status": "ok", "alpaca_valid": False}
             
     except Exception as e:
         return {"status": "error", "message": str(e)}
+
+
+@router.get("/health/gateway")
+def gateway_stats():
+    """Durchsatz- und Rate-Limit-Metriken des Alpaca-Data-Gateways."""
+    from ..core.gateway import gateway
+    return gateway.stats()
+
+
+@router.get("/health/indicators")
+def indicator_cache_stats():
+    """Treffer/Größe des Indikator-Caches."""
+    from ..core.indicator_engine import engine as indicator_engine
+    return indicator_engine.stats()
+
+
+@router.get("/health/clients")
+def client_pool_stats():
+    """Wiederverwendete Alpaca-Clients, Keep-Alive-Verbindungen, Health-Cache."""
+    from ..core.clients import registry as client_registry
+    return client_registry.stats()
+
+
+@router.get("/health/assets")
+def asset_catalog_stats():
+    """Alter und Änderungen des Asset-Katalog-Snapshots."""
+    from ..core.assets import catalog as asset_catalog
+    return asset_catalog.stats()
+
+
+@router.get("/health/jobs")
+def job_queue_stats():
+    """Backtest-Jobs: Zähler und aktuelle Zustände."""
+    from ..core.jobs import queue as job_queue
+    return job_queue.stats()
+
+
+@router.get("/health/flights")
+def single_flight_stats():
+    """Zusammengelegte Ladevorgänge (Heatmap-Streams, Bar-Loads)."""
+    from ..core.bars import bar_flights
+    from .market import heatmap_flights
+    return {"heatmap": heatmap_flights.stats(), "bars": bar_flights.stats()}
+
+
+@router.get("/health/plugins")
+def plugin_registry_stats():
+    """Gefundene/geladene Plugins und Hot-Reloads."""
+    from ..core.engine import indicators, strategies
+    return {"indicators": indicators.stats(), "strategies": strategies.stats()}
+
+
+@router.get("/health/startup")
+def startup_stats(request: Request):
+    """Kaltstart: Router geladen?, Warm-up-Zeiten, Uptime."""
+    return request.app.state.startup()
+
+
+@router.get("/health/resample")
+def resample_cache_stats():
+    """Lokal abgeleitete Timeframes (Treffer, Bytes, Verdrängungen)."""
+    from ..core.resample import resample_cache
+    return resample_cache.stats()
+
+
+@router.get("/health/universe")
+def universe_cache_stats():
+    """Universums-Panel der Heatmap: Symbole, Tage, Bytes, Budget."""
+    from .market import universe_stats
+    return universe_stats()
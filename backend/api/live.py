@@ -0,0 +1,61 @@
+import asyncio
+import json
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from ..core.bars import load_bars
+from ..core.engine import strategies
+from ..core.live import LiveSession, bar_dicts, replay
+from ..core.metrics import span
+
+router = APIRouter()
+
+
+@router.get("/live/replay")
+async def live_replay(
+    symbol:        str   = "SPY",
+    interval:      str   = "1d",
+    start:         str   = "2024-01-01",
+    end:           str   = "2025-01-01",
+    strategy:      str   = "",
+    fast:          int   = 20,
+    slow:          int   = 50,
+    indicators:    str   = Query(default="", description="Kommagetrennt, z.B. sma,rsi"),
+    capital:       float = 10000,
+    warmup:        int   = Query(default=0, ge=0, description="Bars zum Aufwärmen ohne Events"),
+    speed:         float = Query(default=0, ge=0, description="Bars pro Sekunde, 0 = max"),
+    alpaca_key:    str   = Query(default=""),
+    alpaca_secret: str   = Query(default="")
+):
+    """
+    Live-Modus über einen Replay-Feed aus dem Bar-Store: jeder Bar
+    aktualisiert Indikatoren und Signal inkrementell und wird als SSE-Event
+    gesendet.
+    """
+    strategy_name = strategy or (list(strategies.keys())[0] if strategies else "")
+    active = [s.strip() for s in indicators.split(",") if s.strip()]
+    try:
+        session = LiveSession(strategy_name, {"fast": fast, "slow": slow}, active, capital)
+    except (KeyError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e).strip("'\""))
+
+    with span("fetch"):
+        df = await asyncio.to_thread(load_bars, symbol, interval, start, end, alpaca_key, alpaca_secret)
+
+    async def event_generator():
+        try:
+            seeded = session.seed(bar_dicts(df.iloc[:warmup]))
+            yield "data: " + json.dumps({
+                "stage": "init", "total": len(df), "warmup": min(warmup, len(df)),
+                "unsupported": session.unsupported, "last": seeded,
+            }) + "\n\n"
+
+            async for bar in replay(df.iloc[warmup:], speed):
+                yield "data: " + json.dumps({"stage": "bar", **session.push(bar)}) + "\n\n"
+
+            yield "data: " + json.dumps({"stage": "done", "bars": session.bars}) + "\n\n"
+        except Exception as e:
+            yield "data: " + json.dumps({"error": str(e)}) + "\n\n"
+
+    return StreamingResponse(event_generator(), media_type="text/event-stream")
@@ -2,10 +2,11 @@ from fastapi import APIRouter, HTTPException, Query
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Dict, List, Optional
 import pandas as pd
 import json
 import asyncio
+import os
 import time
 
 from alpaca.data.historical import StockHistoricalDataClient
@@ -13,18 +14,32 @@ from alpaca.data.requests import StockBarsRequest
 from alpaca.data.timeframe import TimeFrame
 from alpaca.data.enums import Adjustment, DataFeed
 
+from ..core.barstore import bar_store, split_by_symbol
+from ..core.panel import BarPanel
+from ..core.assets import catalog as asset_catalog
+from ..core.clients import make_stock_client
+from ..core.gateway import gateway
+from ..core.metrics import cache_result, span
+from ..core.singleflight import StreamFlights
+
 router = APIRouter()
 
 # ─── In-Memory Cache ─────────────────────────────────────────────────────────
-_symbol_cache: Dict[str, object] = {"symbols": [], "ts": 0.0}
 _bars_cache: Dict[str, object] = {
-    "bars": {},
+    "panel": None,          # BarPanel (Symbole × Tage)
     "ts": 0.0,
     "key": "",
     "last_duration": None,  # Sekunden für letzten kompletten Load
+    "changes": None,        # letzte berechnete Veränderungen (für Refresh)
+    "cutoff_key": None,     # Spaltenpositionen der Cutoffs dazu
+    "over_budget": 0,       # Panels, die wegen des Budgets nicht gecacht wurden
 }
-SYMBOL_CACHE_TTL = 3600  # 1 Stunde
 BARS_CACHE_TTL = 300     # 5 Minuten
+# Speicherbudget für das Universums-Panel; größere Panels werden nicht
+# gehalten (der nächste Load kommt dann aus dem Bar-Store auf der Platte)
+UNIVERSE_CACHE_BYTES = int(os.environ.get("QUANTOS_UNIVERSE_CACHE_MB", "64")) * 2 ** 20
+
+heatmap_flights = StreamFlights()   # ein Ladevorgang pro Fenster, beliebig viele Streams
 # ─────────────────────────────────────────────────────────────────────────────
 
 
@@ -35,269 +50,290 @@ class HeatmapRequest(BaseModel):
 
 # ─── Sync-Helfer ─────────────────────────────────────────────────────────────
 def _sync_fetch_symbols(key: str, secret: str) -> List[str]:
-    """Holt alle handelbaren US-Aktien Symbole von Alpaca."""
-    from alpaca.trading.client import TradingClient
-    from alpaca.trading.requests import GetAssetsRequest
-    from alpaca.trading.enums import AssetClass, AssetStatus
-
-    tc = TradingClient(key, secret, paper=True)
-
-    assets = tc.get_all_assets(GetAssetsRequest(
-        asset_class=AssetClass.US_EQUITY,
-        status=AssetStatus.ACTIVE
-    ))
-    symbols: List[str] = []
-    for a in assets:
-        if (
-            getattr(a, "tradable", False)
-            and "/" not in a.symbol
-            and "." not in a.symbol
-            and len(a.symbol) <= 5
-        ):
-            symbols.append(a.symbol)
-    return symbols
+    """Alle handelbaren US-Aktien Symbole (Asset-Katalog, Snapshot + Hintergrund-Refresh)."""
+    return asset_catalog.equity_symbols(key, secret)
 
 
 def _sync_fetch_batch(
     client: StockHistoricalDataClient,
     batch: List[str],
     start_dt: datetime,
-    end_dt: datetime
+    end_dt: datetime,
+    min_bars: int = 2
 ) -> Dict[str, pd.DataFrame]:
-    """Holt Bar-Daten für ein Batch von Symbolen."""
-    req = StockBarsRequest(
-        symbol_or_symbols=batch,
-        timeframe=TimeFrame.Day,
-        start=start_dt,
-        end=end_dt,
-        feed=DataFeed.SIP,
-        adjustment=Adjustment.ALL
-    )
+    """Holt Bar-Daten für ein Batch von Symbolen (Read-Through über den Bar-Store)."""
+    def fetch_many(symbols: List[str], gap_start: datetime, gap_end: datetime) -> Dict[str, pd.DataFrame]:
+        req = StockBarsRequest(
+            symbol_or_symbols=symbols,
+            timeframe=TimeFrame.Day,
+            start=gap_start,
+            end=gap_end,
+            feed=DataFeed.SIP,
+            adjustment=Adjustment.ALL
+        )
+        return split_by_symbol(client.get_stock_bars(req).df, symbols)
+
     try:
-        df = client.get_stock_bars(req).df
+        frames = bar_store.get_many(batch, "1d", "sip", "all", start_dt, end_dt, fetch_many)
     except Exception as e:
         print(f"[Heatmap] get_stock_bars error: {e}")
         return {}
 
-    result: Dict[str, pd.DataFrame] = {}
-    if not df.empty and isinstance(df.index, pd.MultiIndex):
-        for sym in batch:
-            try:
-                sym_df = df.xs(sym, level="symbol")
-                if len(sym_df) >= 2:
-                    result[sym] = sym_df
-            except KeyError:
-                continue
-    return result
+    return {sym: df for sym, df in frames.items() if len(df) >= min_bars}
+
+
+def _cutoffs() -> Dict[str, datetime]:
+    now = datetime.now()
+    return {
+        "1D": now - timedelta(days=2),
+        "1W": now - timedelta(days=7),
+        "1M": now - timedelta(days=30),
+        "1Y": now - timedelta(days=365),
+    }
+
+
+def _compute_changes(panel: BarPanel) -> Dict[str, Dict[str, Optional[float]]]:
+    """1D/1W/1M/1Y-Veränderungen für alle Symbole in einem Durchlauf."""
+    return panel.changes(_cutoffs())
+
+
+def _refresh_changes(panel: BarPanel, rows) -> Dict[str, Dict[str, Optional[float]]]:
+    """
+    Veränderungen nach einem inkrementellen Refresh: liegen die Cutoffs noch
+    auf denselben Spalten, werden nur die betroffenen Zeilen neu berechnet.
+    """
+    cutoffs = _cutoffs()
+    key     = panel.cutoff_columns(cutoffs)
+    cached  = _bars_cache.get("changes")
+    if cached is None or rows is None or _bars_cache.get("cutoff_key") != key:
+        results = panel.changes(cutoffs)
+    else:
+        results = dict(cached)  # type: ignore
+        results.update(panel.changes(cutoffs, rows))
+    _bars_cache["changes"] = results
+    _bars_cache["cutoff_key"] = key
+    return results
+
+
+def _store_panel(panel: BarPanel, now: float, cache_key: str):
+    """Panel cachen, wenn es ins Budget passt – sonst den Cache leeren."""
+    if panel.nbytes > UNIVERSE_CACHE_BYTES:
+        print(f"[Heatmap] Panel {panel.nbytes / 2 ** 20:.1f} MB > Budget "
+              f"{UNIVERSE_CACHE_BYTES / 2 ** 20:.0f} MB – nicht gecacht")
+        _bars_cache.update(panel=None, key="", changes=None, cutoff_key=None)
+        _bars_cache["over_budget"] += 1  # type: ignore
+        return
+    _bars_cache.update(panel=panel, ts=now, key=cache_key)
+
+
+def universe_stats() -> Dict[str, object]:
+    """Footprint des Universums-Caches (Panel) und Budget."""
+    panel = _bars_cache["panel"]
+    stats = panel.stats() if panel is not None else {"symbols": 0, "days": 0, "bytes": 0}  # type: ignore
+    return {**stats, "budget_bytes": UNIVERSE_CACHE_BYTES, "over_budget": _bars_cache["over_budget"],
+            "age": round(time.time() - float(_bars_cache["ts"]), 1) if panel is not None else None}
+
+
+def _group_by_start(last: Dict[str, Optional[int]], symbols: List[str],
+                    full_start: datetime, batch_size: int) -> List[tuple]:
+    """(start, batch)-Jobs: Symbole mit gleichem letzten Bar teilen sich einen Request."""
+    by_start: Dict[Optional[int], List[str]] = {}
+    for sym in symbols:
+        by_start.setdefault(last.get(sym), []).append(sym)
+    jobs = []
+    for start_ns, group in by_start.items():
+        start = full_start if start_ns is None else pd.Timestamp(start_ns, tz="UTC").to_pydatetime()
+        for i in range(0, len(group), batch_size):
+            jobs.append((start, group[i:i + batch_size]))
+    return jobs
 # ─────────────────────────────────────────────────────────────────────────────
 
 
-@router.get("/heatmap/stream")
-async def get_heatmap_stream(
-    alpaca_key: str = Query(default=""),
-    alpaca_secret: str = Query(default="")
-):
-    """Streaming endpoint mit Progress-Updates, ETA und Caching."""
+async def _heatmap_events(alpaca_key: str, alpaca_secret: str):
+    """Ladevorgang der Heatmap als SSE-Events (Symbole -> Bars -> Veränderungen)."""
+    try:
+        if not alpaca_key or not alpaca_secret:
+            yield "data: " + json.dumps(
+                {"error": "Keine API-Keys konfiguriert"}
+            ) + "\n\n"
+            return
 
-    async def event_generator():
-        try:
-            if not alpaca_key or not alpaca_secret:
-                yield "data: " + json.dumps(
-                    {"error": "Keine API-Keys konfiguriert"}
-                ) + "\n\n"
-                return
+        stock_client = make_stock_client(alpaca_key, alpaca_secret)
+        now = time.time()
+
+        # ── Stage 1: Symbole (Cache) ─────────────────────────────────────
+        yield "data: " + json.dumps(
+            {"stage": "symbols", "message": "Lade Symbolliste..."}
+        ) + "\n\n"
 
-            stock_client = StockHistoricalDataClient(
-                alpaca_key,
-                alpaca_secret
+        with span("symbols"):
+            symbols = await asyncio.to_thread(
+                _sync_fetch_symbols, alpaca_key, alpaca_secret
             )
-            now = time.time()
 
-            # ── Stage 1: Symbole (Cache) ─────────────────────────────────────
-            yield "data: " + json.dumps(
-                {"stage": "symbols", "message": "Lade Symbolliste..."}
-            ) + "\n\n"
+        total_symbols = len(symbols)
+        yield "data: " + json.dumps(
+            {
+                "stage": "symbols",
+                "total": total_symbols,
+                "message": f"{total_symbols} Symbole gefunden",
+            }
+        ) + "\n\n"
 
-            if (
-                now - float(_symbol_cache["ts"]) > SYMBOL_CACHE_TTL
-                or not _symbol_cache["symbols"]
-            ):
-                symbols = await asyncio.to_thread(
-                    _sync_fetch_symbols, alpaca_key, alpaca_secret
-                )
-                _symbol_cache["symbols"] = symbols
-                _symbol_cache["ts"] = now
-            else:
-                symbols = _symbol_cache["symbols"]  # type: ignore
+        # ── Stage 2: Bars laden (Cache, inkrementell oder komplett) ───────
+        cache_key = alpaca_key[:8]
+        cached_panel = _bars_cache["panel"] if _bars_cache["key"] == cache_key else None
+        refreshed_rows = None
+
+        cache_hit = now - float(_bars_cache["ts"]) < BARS_CACHE_TTL and cached_panel is not None
+        cache_result("heatmap", cache_hit)
 
-            total_symbols = len(symbols)
+        if cache_hit:
+            panel: BarPanel = cached_panel  # type: ignore
+            refreshed_rows = []
             yield "data: " + json.dumps(
                 {
-                    "stage": "symbols",
+                    "stage": "loading-cache",
+                    "loaded": len(panel),
                     "total": total_symbols,
-                    "message": f"{total_symbols} Symbole gefunden",
+                    "progress": 100,
+                    "message": f"Cache: {len(panel)} Symbole",
                 }
             ) + "\n\n"
+        else:
+            # 370 Tage Window für 1Y
+            start_dt = datetime.now() - timedelta(days=370)
+            end_dt = datetime.now() - timedelta(minutes=80)
+            all_bars: Dict[str, pd.DataFrame] = {}
+
+            # Inkrementell: nur Bars ab dem letzten vorhandenen Bar je Symbol
+            incremental = cached_panel is not None
+            last = cached_panel.last_timestamps() if incremental else {}  # type: ignore
+            batches = _group_by_start(last, symbols, start_dt, batch_size=500)
+            total_batches = len(batches)
+
+            load_start_time = time.time()
+
+            # Erste ETA-Schätzung aus vorherigem Lauf (falls vorhanden)
+            initial_eta = None
+            if not incremental and _bars_cache.get("last_duration"):
+                try:
+                    initial_eta = int(_bars_cache["last_duration"])  # type: ignore
+                except Exception:
+                    initial_eta = None
 
-            # ── Stage 2: Bars laden (Cache + sequentiell mit ETA) ────────────
-            cache_key = alpaca_key[:8]
-
-            if (
-                now - float(_bars_cache["ts"]) < BARS_CACHE_TTL
-                and _bars_cache["key"] == cache_key
-                and _bars_cache["bars"]
-            ):
-                all_bars = _bars_cache["bars"]  # type: ignore
-                yield "data: " + json.dumps(
-                    {
-                        "stage": "loading-cache",
-                        "loaded": len(all_bars),
-                        "total": total_symbols,
-                        "progress": 100,
-                        "message": f"Cache: {len(all_bars)} Symbole",
-                    }
-                ) + "\n\n"
-            else:
-                # 370 Tage Window für 1Y
-                start_dt = datetime.now() - timedelta(days=370)
-                end_dt = datetime.now() - timedelta(minutes=80)
-                all_bars: Dict[str, pd.DataFrame] = {}
-
-                batch_size = 500
-                batches: List[List[str]] = []
-                for i in range(0, len(symbols), batch_size):
-                    batches.append(symbols[i:i + batch_size])
-                total_batches = len(batches)
-
-                load_start_time = time.time()
-
-                # Erste ETA-Schätzung aus vorherigem Lauf (falls vorhanden)
-                initial_eta = None
-                if _bars_cache.get("last_duration"):
-                    try:
-                        initial_eta = int(_bars_cache["last_duration"])  # type: ignore
-                    except Exception:
-                        initial_eta = None
-
-                yield "data: " + json.dumps(
-                    {
-                        "stage": "loading-init",
-                        "total_batches": total_batches,
-                        "message": "Starte Datenladen...",
-                        "eta_seconds": initial_eta,
-                    }
-                ) + "\n\n"
+            yield "data: " + json.dumps(
+                {
+                    "stage": "loading-init",
+                    "total_batches": total_batches,
+                    "incremental": incremental,
+                    "message": "Aktualisiere Daten..." if incremental else "Starte Datenladen...",
+                    "eta_seconds": initial_eta,
+                }
+            ) + "\n\n"
 
-                for idx, batch in enumerate(batches, start=1):
+            def fetch(job: tuple) -> Dict[str, pd.DataFrame]:
+                job_start, batch = job
+                with span("fetch_batch"):
+                    return _sync_fetch_batch(stock_client, batch, job_start, end_dt,
+                                             min_bars=1 if incremental else 2)
+
+            # Batches laufen parallel (begrenzt + rate-limitiert über das Gateway)
+            idx = 0
+            async for event, batch_no, job, batch_result in gateway.map_async(fetch, batches):
+                batch = job[1]
+                if event == "start":
                     # Event: Batch startet
                     yield "data: " + json.dumps(
                         {
                             "stage": "batch_start",
-                            "batch": idx,
+                            "batch": batch_no + 1,
                             "total_batches": total_batches,
                             "symbols_in_batch": len(batch),
-                            "message": f"Starte Batch {idx}/{total_batches}",
+                            "message": f"Starte Batch {batch_no + 1}/{total_batches}",
                         }
                     ) + "\n\n"
+                    continue
 
-                    try:
-                        batch_result = await asyncio.to_thread(
-                            _sync_fetch_batch,
-                            stock_client,
-                            batch,
-                            start_dt,
-                            end_dt,
-                        )
-                    except Exception as e:
-                        print(f"[Heatmap] Batch {idx} error: {e}")
-                        batch_result = {}
-
-                    all_bars.update(batch_result)
-
-                    if total_batches > 0:
-                        progress = int(float(idx) / float(total_batches) * 100.0)
-                    else:
-                        progress = 100
-
-                    elapsed = time.time() - load_start_time
-                    if idx > 0:
-                        avg_batch_time = elapsed / float(idx)
-                        remaining = avg_batch_time * float(total_batches - idx)
-                        eta_seconds = int(remaining)
-                    else:
-                        eta_seconds = None
-
-                    msg = f"{idx}/{total_batches} Batches: {len(all_bars)} Symbole"
-                    yield "data: " + json.dumps(
-                        {
-                            "stage": "batch_done",
-                            "batch": idx,
-                            "total_batches": total_batches,
-                            "loaded": len(all_bars),
-                            "total": total_symbols,
-                            "progress": progress,
-                            "eta_seconds": eta_seconds,
-                            "message": msg,
-                        }
-                    ) + "\n\n"
+                idx += 1
+                if isinstance(batch_result, Exception):
+                    print(f"[Heatmap] Batch {batch_no + 1} error: {batch_result}")
+                    batch_result = {}
 
-                _bars_cache["bars"] = all_bars
-                _bars_cache["ts"] = now
-                _bars_cache["key"] = cache_key
-                _bars_cache["last_duration"] = time.time() - load_start_time
+                all_bars.update(batch_result)
 
-            # ── Stage 3: Berechnung ───────────────────────────────────────────
-            yield "data: " + json.dumps(
-                {
-                    "stage": "calculating",
-                    "message": f"Berechne für {len(all_bars)} Symbole...",
-                }
-            ) + "\n\n"
+                if total_batches > 0:
+                    progress = int(float(idx) / float(total_batches) * 100.0)
+                else:
+                    progress = 100
+
+                elapsed = time.time() - load_start_time
+                avg_batch_time = elapsed / float(idx)
+                eta_seconds = int(avg_batch_time * float(total_batches - idx))
+
+                msg = f"{idx}/{total_batches} Batches: {len(all_bars)} Symbole"
+                yield "data: " + json.dumps(
+                    {
+                        "stage": "batch_done",
+                        "batch": idx,
+                        "total_batches": total_batches,
+                        "loaded": len(all_bars),
+                        "total": total_symbols,
+                        "progress": progress,
+                        "eta_seconds": eta_seconds,
+                        "symbols_per_sec": round(len(all_bars) / max(elapsed, 1e-6), 1),
+                        "message": msg,
+                    }
+                ) + "\n\n"
+
+            if incremental:
+                panel = cached_panel  # type: ignore
+                refreshed_rows = panel.update(all_bars, keep_from=start_dt)
+                print(f"[Heatmap] Refresh: {len(refreshed_rows)} Symbole aktualisiert")
+            else:
+                panel = BarPanel.from_frames(all_bars)
+                _bars_cache["changes"] = None
+                _bars_cache["last_duration"] = time.time() - load_start_time
+            _store_panel(panel, now, cache_key)
 
-            cutoffs = {
-                "1D": datetime.now() - timedelta(days=2),
-                "1W": datetime.now() - timedelta(days=7),
-                "1M": datetime.now() - timedelta(days=30),
-                "1Y": datetime.now() - timedelta(days=365),
+        # ── Stage 3: Berechnung ───────────────────────────────────────────
+        yield "data: " + json.dumps(
+            {
+                "stage": "calculating",
+                "message": f"Berechne für {len(panel)} Symbole...",
             }
+        ) + "\n\n"
 
-            results: Dict[str, Dict[str, float]] = {}
-            for sym, df in all_bars.items():
-                try:
-                    last_close = float(df["close"].iloc[-1])
-                except Exception:
-                    continue
+        with span("calculate"):
+            results = _refresh_changes(panel, refreshed_rows)
 
-                changes: Dict[str, float] = {}
-                for tf, cutoff in cutoffs.items():
-                    try:
-                        ts = pd.Timestamp(cutoff).tz_localize("UTC")
-                        valid = df[df.index >= ts]
-                        if not valid.empty:
-                            open_price = float(valid["open"].iloc[0])
-                            if open_price > 0.0:
-                                pct = (last_close - open_price) / open_price * 100.0
-                                changes[tf] = round(pct, 2)
-                            else:
-                                changes[tf] = None  # type: ignore
-                        else:
-                            changes[tf] = None  # type: ignore
-                    except Exception:
-                        changes[tf] = None  # type: ignore
-
-                res_entry: Dict[str, float] = {"price": round(last_close, 2)}
-                for k, v in changes.items():
-                    res_entry[k] = v  # type: ignore
-                results[sym] = res_entry
+        yield "data: " + json.dumps(
+            {"stage": "done", "symbols": results, "count": len(results)}
+        ) + "\n\n"
 
-            yield "data: " + json.dumps(
-                {"stage": "done", "symbols": results, "count": len(results)}
-            ) + "\n\n"
+    except Exception as e:
+        yield "data: " + json.dumps({"error": str(e)}) + "\n\n"
+
+
+@router.get("/heatmap/stream")
+async def get_heatmap_stream(
+    alpaca_key: str = Query(default=""),
+    alpaca_secret: str = Query(default="")
+):
+    """
+    Streaming endpoint mit Progress-Updates, ETA und Caching.
 
-        except Exception as e:
-            yield "data: " + json.dumps({"error": str(e)}) + "\n\n"
+    Gleichzeitige Streams für dasselbe Fenster teilen sich einen Ladevorgang
+    (Single-Flight) und bekommen alle dessen Events; schließt der letzte
+    Client, wird der Ladevorgang abgebrochen.
+    """
+    if not alpaca_key or not alpaca_secret:
+        return StreamingResponse(_heatmap_events(alpaca_key, alpaca_secret), media_type="text/event-stream")
 
-    return StreamingResponse(event_generator(), media_type="text/event-stream")
+    window = (datetime.now() - timedelta(days=370)).date().isoformat()
+    events = heatmap_flights.subscribe(("heatmap", "1d", window),
+                                       lambda: _heatmap_events(alpaca_key, alpaca_secret))
+    return StreamingResponse(events, media_type="text/event-stream")
 
 
 @router.post("/heatmap")
@@ -307,94 +343,27 @@ def get_heatmap(req: HeatmapRequest):
         if not req.alpaca_key or not req.alpaca_secret:
             raise HTTPException(status_code=401, detail="Keine API-Keys konfiguriert.")
 
-        stock_client = StockHistoricalDataClient(req.alpaca_key, req.alpaca_secret)
-
-        from alpaca.trading.client import TradingClient
-        from alpaca.trading.requests import GetAssetsRequest
-        from alpaca.trading.enums import AssetClass, AssetStatus
+        stock_client = make_stock_client(req.alpaca_key, req.alpaca_secret)
 
-        trading_client = TradingClient(req.alpaca_key, req.alpaca_secret, paper=True)
-        assets = trading_client.get_all_assets(GetAssetsRequest(
-            asset_class=AssetClass.US_EQUITY,
-            status=AssetStatus.ACTIVE
-        ))
-
-        symbols: List[str] = []
-        for a in assets:
-            if (
-                getattr(a, "tradable", False)
-                and "/" not in a.symbol
-                and "." not in a.symbol
-                and len(a.symbol) <= 5
-            ):
-                symbols.append(a.symbol)
+        with span("symbols"):
+            symbols = _sync_fetch_symbols(req.alpaca_key, req.alpaca_secret)
 
         start_dt = datetime.now() - timedelta(days=370)
         end_dt = datetime.now() - timedelta(minutes=80)
         all_bars: Dict[str, pd.DataFrame] = {}
 
-        for i in range(0, len(symbols), 500):
-            batch = symbols[i:i + 500]
-            try:
-                bars_req = StockBarsRequest(
-                    symbol_or_symbols=batch,
-                    timeframe=TimeFrame.Day,
-                    start=start_dt,
-                    end=end_dt,
-                    feed=DataFeed.SIP,
-                    adjustment=Adjustment.ALL
-                )
-                bars_df = stock_client.get_stock_bars(bars_req).df
-                if bars_df.empty:
-                    continue
-                if isinstance(bars_df.index, pd.MultiIndex):
-                    for sym in batch:
-                        try:
-                            sym_df = bars_df.xs(sym, level="symbol")
-                            if len(sym_df) >= 2:
-                                all_bars[sym] = sym_df
-                        except KeyError:
-                            continue
-                print(f"[Heatmap] Batch {i // 500 + 1}: {len(all_bars)} Symbole geladen")
-            except Exception as e:
-                print(f"[Heatmap] Batch {i} error: {e}")
-                continue
-
-        cutoffs = {
-            "1D": datetime.now() - timedelta(days=2),
-            "1W": datetime.now() - timedelta(days=7),
-            "1M": datetime.now() - timedelta(days=30),
-            "1Y": datetime.now() - timedelta(days=365),
-        }
-
-        results: Dict[str, Dict[str, float]] = {}
-        for sym, df in all_bars.items():
-            try:
-                last_close = float(df["close"].iloc[-1])
-            except Exception:
-                continue
-
-            changes: Dict[str, float] = {}
-            for tf, cutoff in cutoffs.items():
-                try:
-                    ts = pd.Timestamp(cutoff).tz_localize("UTC")
-                    valid = df[df.index >= ts]
-                    if not valid.empty:
-                        open_price = float(valid["open"].iloc[0])
-                        if open_price > 0.0:
-                            pct = (last_close - open_price) / open_price * 100.0
-                            changes[tf] = round(pct, 2)
-                        else:
-                            changes[tf] = None  # type: ignore
-                    else:
-                        changes[tf] = None  # type: ignore
-                except Exception:
-                    changes[tf] = None  # type: ignore
+        batches = [symbols[i:i + 500] for i in range(0, len(symbols), 500)]
+        with span("fetch"):
+            results_per_batch = gateway.map(
+                lambda batch: _sync_fetch_batch(stock_client, batch, start_dt, end_dt),
+                batches,
+            )
+            for batch_result in results_per_batch:
+                all_bars.update(batch_result)
+        print(f"[Heatmap] {len(batches)} Batches: {len(all_bars)} Symbole geladen")
 
-            res_entry: Dict[str, float] = {"price": round(last_close, 2)}
-            for k, v in changes.items():
-                res_entry[k] = v  # type: ignore
-            results[sym] = res_entry
+        with span("calculate"):
+            results = _compute_changes(BarPanel.from_frames(all_bars))
 
         return {"symbols": results, "count": len(results)}
 
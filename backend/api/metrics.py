@@ -0,0 +1,80 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from ..core.bars import bar_flights
+from ..core.clients import registry as client_registry
+from ..core.gateway import gateway
+from ..core.indicator_engine import engine as indicator_engine
+from ..core.jobs import queue as job_queue
+from ..core.metrics import CACHE_REQUESTS, profiles, registry
+from .market import heatmap_flights, universe_stats
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _ratio(hits: float, misses: float) -> float:
+    total = hits + misses
+    return round(hits / total, 4) if total else 0.0
+
+
+@registry.collector
+def _cache_metrics():
+    """Trefferquoten: Indikator-Cache und Client-Registry zählen selbst, Bar-/Heatmap-Cache über CACHE_REQUESTS."""
+    ind, cli = indicator_engine.stats(), client_registry.stats()
+    ratios = [
+        ({"cache": "indicators"}, _ratio(ind["hits"], ind["misses"])),
+        ({"cache": "clients"},    _ratio(cli["hits"], cli["misses"])),
+        ({"cache": "health"},     _ratio(cli["health_hits"], cli["health_checks"])),
+    ]
+    for cache in ("bars", "heatmap"):
+        ratios.append(({"cache": cache}, _ratio(CACHE_REQUESTS.value(cache=cache, result="hit"),
+                                                CACHE_REQUESTS.value(cache=cache, result="miss"))))
+    return [
+        ("quantos_cache_hit_ratio", "gauge", "Treffer / (Treffer + Fehlschläge) seit Start", ratios),
+        ("quantos_indicator_cache_bytes", "gauge", "Belegter Speicher des Indikator-Caches",
+         [({}, ind["bytes"])]),
+        ("quantos_universe_cache_bytes", "gauge", "Belegter Speicher des Universums-Panels (Heatmap)",
+         [({}, universe_stats()["bytes"])]),
+    ]
+
+
+@registry.collector
+def _flight_metrics():
+    samples_shared, samples_running = [], []
+    for name, stats in (("heatmap", heatmap_flights.stats()), ("bars", bar_flights.stats())):
+        samples_shared.append(({"flight": name}, stats["shared"]))
+        samples_running.append(({"flight": name}, stats["in_flight"]))
+    return [
+        ("quantos_flight_shared_total", "counter", "Aufrufe, die einen laufenden Ladevorgang mitgenutzt haben",
+         samples_shared),
+        ("quantos_flight_in_flight", "gauge", "Gerade laufende Ladevorgänge", samples_running),
+    ]
+
+
+@registry.collector
+def _queue_metrics():
+    jobs = job_queue.stats()
+    gw   = gateway.stats()
+    return [
+        ("quantos_jobs", "gauge", "Backtest-Jobs nach Zustand",
+         [({"state": k}, v) for k, v in sorted(jobs.get("states", {}).items())]),
+        ("quantos_gateway_requests_total", "counter", "Über das Gateway ausgeführte Alpaca-Requests",
+         [({}, gw.get("requests", 0))]),
+    ]
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Alle Metriken im Prometheus-Textformat."""
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
+
+
+@router.get("/metrics/profiles/{profile_id}")
+def get_profile(profile_id: str):
+    """Sampling-Profil eines Requests (angefordert per Header `X-QuantOS-Profile: 1`)."""
+    profile = profiles.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Profil unbekannt oder bereits verdrängt.")
+    return profile
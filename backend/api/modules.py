@@ -1,22 +1,17 @@
-<<<<<<< HEAD
 from fastapi import APIRouter
-from backend.core.utils import load_modules
-=======
-from fastapi import APIRouter, HTTPException
-from backend.core.utils import load_modules
-from backend.data.symbols import get_all_symbols
-
->>>>>>> fa1e9cdf2b4f300783f443f017b80fcb337aaa49
+from backend.core.engine import indicators, strategies
 
 router = APIRouter()
 
-indicators = load_modules("indicators")
-strategies = load_modules("strategies")
-
 @router.get("/modules")
 def get_modules():
+    # Namen und Parameter kommen aus den Plugin-Dateien, ohne sie zu importieren
     return {
         "indicators": list(indicators.keys()),
-        "strategies": list(strategies.keys())
+        "strategies": list(strategies.keys()),
+        "params": {
+            "indicators": {name: meta["params"] for name, meta in indicators.describe().items()},
+            "strategies": {name: meta["params"] for name, meta in strategies.describe().items()},
+        },
     }
 # ↑ GET /symbols komplett raus — der POST /symbols in api/symbols.py macht das schon
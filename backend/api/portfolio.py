@@ -0,0 +1,120 @@
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+import numpy as np
+
+from ..core.utils import to_list
+from ..core.bars import load_bars_many
+from ..core.engine import strategies
+from ..core.portfolio import evaluate_symbols, aggregate
+from ..core.metrics import span
+from ..core.sweep import grid_metrics
+
+router = APIRouter()
+
+
+class PortfolioRequest(BaseModel):
+    symbols:           list[str]   = ["SPY", "QQQ", "DIA"]
+    weights:           list[float] = []      # leer = gleichgewichtet
+    interval:          str         = "1d"
+    start:             str         = "2024-01-01"
+    end:               str         = "2025-01-01"
+    capital:           float       = 10000
+    sma_period:        int         = 20
+    slow_period:       int         = 50
+    strategy:          str         = ""
+    active_indicators: list[str]   = []
+    alpaca_key:        str         = ""
+    alpaca_secret:     str         = ""
+
+
+@router.post("/backtest/portfolio")
+def run_portfolio_backtest(req: PortfolioRequest):
+    """Backtest über eine Symbol-Liste mit gewichteten Sleeves und Attribution."""
+    try:
+        symbols = list(dict.fromkeys(req.symbols))
+        if not symbols:
+            raise HTTPException(status_code=400, detail="Keine Symbole angegeben.")
+        if len(symbols) != len(req.symbols):
+            raise HTTPException(status_code=400, detail="Symbole dürfen nur einmal vorkommen.")
+        if req.weights and len(req.weights) != len(req.symbols):
+            raise HTTPException(status_code=400, detail="Anzahl Gewichte passt nicht zu den Symbolen.")
+
+        raw_weights = dict(zip(symbols, req.weights)) if req.weights else {s: 1.0 for s in symbols}
+        if any(w < 0 for w in raw_weights.values()) or sum(raw_weights.values()) <= 0:
+            raise HTTPException(status_code=400, detail="Gewichte müssen nicht-negativ sein (Summe > 0).")
+
+        strategy_name = req.strategy or (list(strategies.keys())[0] if strategies else None)
+        if not strategy_name or strategy_name not in strategies:
+            raise HTTPException(status_code=400, detail=f"Strategie '{strategy_name}' nicht gefunden.")
+
+        with span("fetch"):
+            frames = load_bars_many(symbols, req.interval, req.start, req.end,
+                                    req.alpaca_key, req.alpaca_secret)
+        frames = {s: df for s, df in frames.items() if len(df) >= 2}
+        if not frames:
+            raise HTTPException(status_code=400, detail="Keine Daten. Symbole oder Zeitraum prüfen.")
+
+        params  = {"fast": req.sma_period, "slow": req.slow_period}
+        with span("strategy"):
+            results = evaluate_symbols(frames, strategy_name, req.active_indicators, params)
+        if not results:
+            raise HTTPException(status_code=400, detail="Strategie lieferte für kein Symbol ein Ergebnis.")
+
+        # Gewichte auf die tatsächlich geladenen Symbole normieren
+        loaded  = {s: raw_weights[s] for s in symbols if s in results}
+        total_w = sum(loaded.values())
+        if total_w <= 0:
+            raise HTTPException(status_code=400, detail="Alle geladenen Symbole haben Gewicht 0.")
+        weights = {s: w / total_w for s, w in loaded.items()}
+
+        with span("aggregate"):
+            agg = aggregate(results, weights, req.capital)
+        equity = agg["equity"]
+
+        port_ret = np.diff(np.concatenate(([req.capital], equity))) / np.concatenate(([req.capital], equity[:-1]))
+        metrics  = grid_metrics(port_ret)
+        per_sym  = grid_metrics(agg["strat_ret"].T)
+
+        attribution = []
+        for i, sym in enumerate(agg["symbols"]):
+            allocated = float(agg["allocated"][i])
+            end_value = float(agg["sleeves"][-1, i])
+            attribution.append({
+                "symbol":       sym,
+                "weight":       round(weights[sym], 4),
+                "allocated":    round(allocated, 2),
+                "end_value":    round(end_value, 2),
+                "return":       round(float(per_sym["total_return"][i]), 2),
+                "contribution": round((end_value - allocated) / req.capital * 100, 2),
+                "sharpe":       round(float(per_sym["sharpe"][i]), 2),
+                "max_drawdown": round(float(per_sym["max_drawdown"][i]), 2),
+            })
+
+        bh_r  = (float(agg["bh_equity"][-1]) / req.capital - 1) * 100
+        max_dd = float(metrics["max_drawdown"])
+        tot_r  = float(metrics["total_return"])
+
+        return {
+            "equity": {
+                "dates":     agg["index"].strftime("%Y-%m-%d %H:%M").tolist(),
+                "equity":    to_list(equity),
+                "bh_equity": to_list(agg["bh_equity"]),
+            },
+            "attribution": attribution,
+            "missing":     [s for s in symbols if s not in results],
+            "performance": {
+                "end_capital":  round(float(equity[-1]), 2),
+                "total_return": round(tot_r, 2),
+                "bh_return":    round(bh_r, 2),
+                "bh_capital":   round(float(agg["bh_equity"][-1]), 2),
+                "sharpe":       round(float(metrics["sharpe"]), 2),
+                "max_drawdown": round(max_dd, 2),
+                "calmar":       round(tot_r / abs(max_dd), 2) if max_dd != 0 else 0,
+                "symbols":      len(agg["symbols"]),
+                "capital":      req.capital
+            }
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,178 @@
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+import numpy as np
+
+from ..core.bars import load_bars
+from ..core.engine import indicators, strategies
+from ..core.sweep import run_sweep, is_vectorized, validate_grid
+from ..core.walkforward import OBJECTIVES, run_walkforward
+from ..core.downsample import CHART_POINT_BUDGET, lttb_indices
+from ..core.metrics import span
+
+router = APIRouter()
+
+MAX_CELLS        = 250_000   # vektorisierte Strategien
+MAX_PLUGIN_CELLS = 2_000     # Fallback: ein Plugin-Aufruf pro Kombination
+
+
+class ParamRange(BaseModel):
+    start: float
+    stop:  float          # inklusive
+    step:  float = 1
+
+    def count(self) -> int:
+        if self.step <= 0 or self.stop < self.start:
+            raise ValueError("step muss > 0 und stop >= start sein")
+        return int(np.floor((self.stop - self.start) / self.step + 1e-9)) + 1
+
+    def values(self) -> list:
+        vals = self.start + np.arange(self.count()) * self.step
+        if all(float(v).is_integer() for v in (self.start, self.stop, self.step)):
+            return [int(v) for v in vals]
+        return [round(float(v), 10) for v in vals]
+
+
+class SweepRequest(BaseModel):
+    symbol:            str                   = "SPY"
+    interval:          str                   = "1d"
+    start:             str                   = "2024-01-01"
+    end:               str                   = "2025-01-01"
+    strategy:          str                   = "sma_cross"
+    params:            dict[str, ParamRange] = {
+        "fast": ParamRange(start=5,  stop=50,  step=5),
+        "slow": ParamRange(start=20, stop=200, step=20),
+    }
+    active_indicators: list[str]             = []
+    alpaca_key:        str                   = ""
+    alpaca_secret:     str                   = ""
+
+
+class WalkForwardRequest(SweepRequest):
+    folds:       int   = 5
+    train_ratio: float = 3.0      # Trainingslänge als Vielfaches des Testfensters
+    anchored:    bool  = False    # True: Training immer ab Start
+    objective:   str   = "sharpe"
+    capital:     float = 10000
+
+
+def _clean(arr):
+    """NaN/Inf -> None, Rest gerundet (JSON-tauglich); Skalare bleiben Skalare."""
+    rounded = np.round(np.asarray(arr, dtype="float64"), 4)
+    if rounded.ndim == 0:
+        return float(rounded) if np.isfinite(rounded) else None
+    out = rounded.astype(object)
+    out[~np.isfinite(rounded)] = None
+    return out.tolist()
+
+
+def _grid(strategy: str, params: dict[str, ParamRange], scale: int = 1) -> tuple[dict, int]:
+    """Parameterbereiche prüfen -> (Gitter, Zellen); `scale` = Gitterläufe pro Request."""
+    if strategy not in strategies:
+        raise HTTPException(status_code=400, detail=f"Strategie '{strategy}' nicht gefunden.")
+    if not params:
+        raise HTTPException(status_code=400, detail="Leerer Parameterbereich.")
+    try:
+        counts = {name: rng.count() for name, rng in params.items()}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Ungültiger Parameterbereich: {e}.")
+    cells = int(np.prod([float(c) for c in counts.values()]))
+    limit = MAX_CELLS if is_vectorized(strategy, list(counts)) else MAX_PLUGIN_CELLS
+    if cells * scale > limit:
+        raise HTTPException(status_code=400, detail=f"Gitter zu groß ({cells * scale} > {limit} Zellen).")
+    grid = {name: rng.values() for name, rng in params.items()}
+    try:
+        validate_grid(strategy, grid)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return grid, cells
+
+
+@router.post("/backtest/sweep")
+def run_parameter_sweep(req: SweepRequest):
+    """Wertet ein komplettes Parametergitter gegen einen einzigen Datenabruf aus."""
+    try:
+        grid, cells = _grid(req.strategy, req.params)
+
+        with span("fetch"):
+            df = load_bars(req.symbol, req.interval, req.start, req.end,
+                           req.alpaca_key, req.alpaca_secret)
+        if len(df) < 2:
+            raise HTTPException(status_code=400, detail="Zu wenige Bars für einen Sweep.")
+
+        with span("indicators"):
+            for name in req.active_indicators:
+                if name in indicators:
+                    df = indicators[name](df)
+
+        with span("sweep"):
+            surface = run_sweep(df, req.strategy, grid)
+
+        sharpe = np.nan_to_num(surface["sharpe"], nan=-np.inf)
+        best_idx = np.unravel_index(int(np.argmax(sharpe)), sharpe.shape)
+        best = {
+            "params":  {name: grid[name][i] for name, i in zip(grid.keys(), best_idx)},
+            "metrics": {k: _clean(np.asarray(v[best_idx])) for k, v in surface.items()},
+        }
+
+        return {
+            "strategy": req.strategy,
+            "bars":     len(df),
+            "cells":    cells,
+            "params":   grid,
+            "metrics":  {k: _clean(v) for k, v in surface.items()},
+            "best":     best,
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/backtest/walkforward")
+def run_walk_forward(req: WalkForwardRequest):
+    """
+    Walk-Forward: Gitter pro Trainingsfenster optimieren, auf dem folgenden
+    Testfenster auswerten, Out-of-Sample-Equity zusammensetzen.
+    """
+    try:
+        if req.objective not in OBJECTIVES:
+            raise HTTPException(status_code=400, detail=f"Unbekanntes Ziel '{req.objective}'.")
+        if not 1 <= req.folds <= 50:
+            raise HTTPException(status_code=400, detail="folds muss zwischen 1 und 50 liegen.")
+        grid, cells = _grid(req.strategy, req.params, scale=req.folds)
+
+        with span("fetch"):
+            df = load_bars(req.symbol, req.interval, req.start, req.end,
+                           req.alpaca_key, req.alpaca_secret)
+        try:
+            with span("walkforward"):
+                wf = run_walkforward(df, req.strategy, grid, req.folds, req.train_ratio,
+                                     req.anchored, req.objective)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        equity = wf["equity"] * req.capital
+        rows   = lttb_indices(equity, CHART_POINT_BUDGET)
+        folds  = [{
+            "train":      f["train"],
+            "test":       f["test"],
+            "params":     f["params"],
+            "in_sample":  {k: _clean(v) for k, v in f["in_sample"].items()},
+            "out_sample": {k: _clean(v) for k, v in f["out_sample"].items()},
+        } for f in wf["folds"]]
+
+        return {
+            "strategy": req.strategy,
+            "bars":     len(df),
+            "cells":    cells,
+            "folds":    folds,
+            "equity": {
+                "dates":  wf["index"][rows].strftime("%Y-%m-%d %H:%M").tolist(),
+                "equity": _clean(equity[rows]),
+            },
+            "metrics": {k: _clean(v) for k, v in wf["metrics"].items()},
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
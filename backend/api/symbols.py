@@ -1,6 +1,12 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
+from ..core.assets import catalog as asset_catalog
+from ..core.search import MAX_LIMIT, index_for
+
 router = APIRouter()
 
 class SymbolsRequest(BaseModel):
@@ -14,27 +20,8 @@ def get_symbols(req: SymbolsRequest):
         if not req.alpaca_key or not req.alpaca_secret:
             raise HTTPException(status_code=401, detail="Keine API-Keys konfiguriert.")
 
-        from alpaca.trading.client import TradingClient
-        from alpaca.trading.requests import GetAssetsRequest
-        from alpaca.trading.enums import AssetClass, AssetStatus
-
-        trading_client = TradingClient(req.alpaca_key, req.alpaca_secret, paper=True)
-        assets = trading_client.get_all_assets(GetAssetsRequest(
-            asset_class=AssetClass.US_EQUITY,
-            status=AssetStatus.ACTIVE
-        ))
-
-        symbols = []
-        for a in assets:
-            if not a.tradable or '/' in a.symbol or '.' in a.symbol or len(a.symbol) > 5:
-                continue
-            
-            symbols.append({
-                'symbol': a.symbol,
-                'name': a.name,
-                'exchange': a.exchange.value if hasattr(a.exchange, 'value') else str(a.exchange),
-                'type': 'Stock',  # Vereinfacht, könnte erweitert werden
-            })
+        # Klassifiziert und aus dem Snapshot: kein Alpaca-Call beim Öffnen des Browsers
+        symbols = asset_catalog.equities(req.alpaca_key, req.alpaca_secret)
 
         print(f"[Symbols] {len(symbols)} Symbole zurückgegeben")
         return symbols
@@ -43,3 +30,27 @@ def get_symbols(req: SymbolsRequest):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/symbols/search")
+async def search_symbols(
+    q:             str           = "",
+    type:          Optional[str] = None,
+    sector:        Optional[str] = None,
+    market_cap:    Optional[str] = None,
+    asset_class:   Optional[str] = None,
+    popular:       bool          = False,
+    facets:        bool          = Query(default=False, description="Trefferzahlen je Facettenwert"),
+    offset:        int           = Query(default=0, ge=0),
+    limit:         int           = Query(default=50, ge=0, le=MAX_LIMIT),
+    alpaca_key:    str           = Query(default=""),
+    alpaca_secret: str           = Query(default="")
+):
+    """Gerankte, paginierte Symbolsuche (Ticker-Präfix, Namens-Tokens, Facetten) über den Asset-Katalog."""
+    # Index-Aufbau (einmal pro Snapshot) bzw. Kaltstart nicht im Event-Loop
+    index = await asyncio.to_thread(lambda: index_for(asset_catalog.assets(alpaca_key, alpaca_secret)))
+    if not index.items:
+        raise HTTPException(status_code=401, detail="Kein Asset-Snapshot vorhanden. Bitte API-Keys eintragen.")
+    return index.search(q, {"type": type, "sector": sector, "market_cap": market_cap,
+                            "asset_class": asset_class},
+                        popular=popular, offset=offset, limit=limit, facets=facets)
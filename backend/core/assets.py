@@ -0,0 +1,183 @@
+"""
+Asset-Katalog: eine Quelle für das handelbare Universum.
+
+Die Rohdaten (US-Equities + Crypto) liegen als Snapshot auf Platte und
+werden beim Start sofort geladen; ist der Snapshot älter als
+ASSET_REFRESH_TTL, läuft der Abgleich mit Alpaca im Hintergrund
+(Diff gegen den letzten Snapshot, Klassifikation nur bei Änderungen neu).
+Nur ohne jeden Snapshot wird synchron geladen.
+"""
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from data.symbols import build_symbols, symbol_metadata
+
+from .clients import make_trading_client
+
+# ─── Konfiguration ───────────────────────────────────────────────────────────
+ASSET_SNAPSHOT = Path(os.environ.get(
+    "QUANTOS_ASSET_SNAPSHOT",
+    Path(__file__).resolve().parents[2] / "data" / "cache" / "assets.json",
+))
+ASSET_REFRESH_TTL = float(os.environ.get("QUANTOS_ASSET_REFRESH_TTL", "3600"))   # Sekunden
+ASSET_RETRY_AFTER = 60.0                                                           # nach Fehler
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Felder, deren Änderung einen neuen Snapshot auslöst
+_DIFF_FIELDS = ("name", "exchange", "tradable", "asset_class")
+
+
+def _raw(asset, asset_class: str) -> Dict[str, Any]:
+    exchange = getattr(asset, "exchange", None)
+    return {
+        "symbol":      asset.symbol,
+        "name":        asset.name or asset.symbol,
+        "exchange":    exchange.value if hasattr(exchange, "value") else str(exchange or ""),
+        "tradable":    bool(getattr(asset, "tradable", False)),
+        "asset_class": asset_class,
+    }
+
+
+def heatmap_eligible(item: Dict[str, Any]) -> bool:
+    """Filter der Heatmap/Symbol-Liste: handelbare US-Equities ohne Sonderklassen."""
+    symbol = item["symbol"]
+    return (item["asset_class"] == "us_equity" and item["is_tradable"]
+            and "/" not in symbol and "." not in symbol and len(symbol) <= 5)
+
+
+class AssetCatalog:
+    def __init__(self, path: Path = ASSET_SNAPSHOT, ttl: float = ASSET_REFRESH_TTL):
+        self.path = Path(path)
+        self.ttl  = ttl
+        self.ts   = 0.0                                   # Zeitpunkt des letzten Abgleichs (Epoch)
+        self._raw: Optional[Dict[str, Dict[str, Any]]] = None
+        self._items: List[Dict[str, Any]] = []
+        self._equities: List[Dict[str, Any]] = []
+        self._lock         = threading.Lock()             # Zustand
+        self._refresh_lock = threading.Lock()             # höchstens ein Abgleich gleichzeitig
+        self._pending      = False                        # Hintergrund-Abgleich gestartet
+        self._retry_at     = 0.0
+        self._stats = {"refreshes": 0, "background_refreshes": 0, "added": 0, "removed": 0,
+                       "changed": 0, "snapshot_loads": 0}
+
+    # ── Snapshot ─────────────────────────────────────────────────────────────
+    def _set(self, raw: Dict[str, Dict[str, Any]], ts: float):
+        items = build_symbols(list(raw.values()))
+        with self._lock:
+            self._raw, self._items, self.ts = raw, items, ts
+            self._equities = [s for s in items if heatmap_eligible(s)]
+
+    def _load(self):
+        if self._raw is not None or not self.path.exists():
+            return
+        try:
+            snap = json.loads(self.path.read_text())
+            self._set({a["symbol"]: a for a in snap["assets"]}, float(snap["ts"]))
+            self._stats["snapshot_loads"] += 1
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[Assets] Snapshot unlesbar ({e}) – wird neu geladen")
+
+    def _write(self, raw: Dict[str, Dict[str, Any]], ts: float):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"ts": ts, "assets": list(raw.values())}, separators=(",", ":")))
+        os.replace(tmp, self.path)
+
+    # ── Abgleich ─────────────────────────────────────────────────────────────
+    @staticmethod
+    def _fetch(api_key: str, secret_key: str) -> Dict[str, Dict[str, Any]]:
+        from alpaca.trading.requests import GetAssetsRequest
+        from alpaca.trading.enums import AssetClass, AssetStatus
+
+        client = make_trading_client(api_key, secret_key)
+        raw: Dict[str, Dict[str, Any]] = {}
+        for asset_class, label in ((AssetClass.US_EQUITY, "us_equity"), (AssetClass.CRYPTO, "crypto")):
+            assets = client.get_all_assets(GetAssetsRequest(asset_class=asset_class, status=AssetStatus.ACTIVE))
+            raw.update({a.symbol: _raw(a, label) for a in assets})
+        return raw
+
+    def refresh(self, api_key: str, secret_key: str) -> Dict[str, int]:
+        """Alpaca-Assets laden und gegen den Snapshot diffen; klassifiziert nur bei Änderungen neu."""
+        with self._refresh_lock:
+            return self._refresh(api_key, secret_key)
+
+    def _refresh(self, api_key: str, secret_key: str) -> Dict[str, int]:
+        fresh = self._fetch(api_key, secret_key)
+        old   = self._raw or {}
+        diff  = {
+            "added":   sum(1 for s in fresh if s not in old),
+            "removed": sum(1 for s in old if s not in fresh),
+            "changed": sum(1 for s, a in fresh.items() if s in old
+                           and any(old[s].get(f) != a.get(f) for f in _DIFF_FIELDS)),
+        }
+        now = time.time()
+        if any(diff.values()) or self._raw is None:
+            self._set(fresh, now)
+        else:
+            with self._lock:
+                self.ts = now
+        self._write(fresh, now)
+        with self._lock:
+            self._stats["refreshes"] += 1
+            for k, v in diff.items():
+                self._stats[k] += v
+        print(f"[Assets] {len(fresh)} Assets (+{diff['added']} / -{diff['removed']} / ~{diff['changed']})")
+        return diff
+
+    def _refresh_background(self, api_key: str, secret_key: str):
+        try:
+            self.refresh(api_key, secret_key)
+        except Exception as e:
+            print(f"[Assets] Hintergrund-Refresh fehlgeschlagen: {e}")
+            self._retry_at = time.time() + ASSET_RETRY_AFTER
+        finally:
+            self._pending = False
+
+    def _ensure(self, api_key: str, secret_key: str):
+        if self._raw is None:
+            # Kaltstart: Snapshot von Platte, nur ohne Snapshot synchron von Alpaca
+            with self._refresh_lock:
+                self._load()
+                if self._raw is None and api_key and secret_key:
+                    self._refresh(api_key, secret_key)
+        now = time.time()
+        with self._lock:
+            start = (bool(api_key and secret_key) and now - self.ts > self.ttl
+                     and now >= self._retry_at and not self._pending)
+            if start:
+                self._pending = True
+                self._stats["background_refreshes"] += 1
+        if start:
+            threading.Thread(target=self._refresh_background, args=(api_key, secret_key),
+                             daemon=True).start()
+
+    # ── Abfragen ─────────────────────────────────────────────────────────────
+    def assets(self, api_key: str = "", secret_key: str = "") -> List[Dict[str, Any]]:
+        """Alle klassifizierten Einträge (Equities, Crypto, Pairs), alphabetisch."""
+        self._ensure(api_key, secret_key)
+        return self._items
+
+    def equities(self, api_key: str = "", secret_key: str = "") -> List[Dict[str, Any]]:
+        """Handelbare US-Equities (Heatmap-/Symbol-Browser-Filter)."""
+        self._ensure(api_key, secret_key)
+        return self._equities
+
+    def equity_symbols(self, api_key: str = "", secret_key: str = "") -> List[str]:
+        return [s["symbol"] for s in self.equities(api_key, secret_key)]
+
+    def metadata(self) -> Dict[str, Any]:
+        return symbol_metadata(self._items)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "assets": len(self._raw or {}), "entries": len(self._items),
+                    "equities": len(self._equities),
+                    "age_seconds": round(time.time() - self.ts, 1) if self.ts else None,
+                    "refreshing": self._refresh_lock.locked() or self._pending}
+
+
+catalog = AssetCatalog()
@@ -0,0 +1,125 @@
+"""
+Backtest-Pipeline ohne HTTP: Strategie -> Equity -> Kennzahlen/Projektion.
+
+Die Stufen sind modulweite Funktionen auf DataFrames, damit sie sowohl im
+synchronen Endpoint als auch stufenweise im Job-Prozesspool laufen können.
+"""
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from .engine import apply_strategy
+from .ledger import trade_ledger, trade_metrics
+from .montecarlo import monte_carlo
+
+RESULT_COLS = ["open", "high", "low", "close", "equity", "bh_equity", "equity_high", "equity_low"]
+# Projektionshorizont: ein Viertel der Bars, höchstens 10 Börsenjahre
+# (mehrjährige Minutenbars ergäben sonst Jahrtausende)
+PROJECTION_MAX_DAYS = 252 * 10
+
+
+def compound(returns: pd.Series, start: float = 1.0) -> pd.Series:
+    """
+    Kumulierter Wachstumsfaktor ab `start` (NaN-Renditen werden übersprungen
+    wie bei cumprod). Mit `start` = Faktor am Ende des Vorgänger-Chunks
+    ergibt sich bitgenau dieselbe Kurve wie in einem Durchlauf.
+    """
+    factor = pd.concat([pd.Series([start]), (1 + returns).reset_index(drop=True)]).cumprod()
+    return pd.Series(factor.to_numpy()[1:], index=returns.index)
+
+
+def add_equity(df: pd.DataFrame, capital: float, growth: float = 1.0, bh_growth: float = 1.0) -> pd.DataFrame:
+    """Equity-Kurven und Intrabar-Spanne; growth/bh_growth = bisherige Faktoren (Fortsetzung)."""
+    df["equity"]    = capital * compound(df["strat_ret"], growth)
+    df["bh_equity"] = capital * compound(df["returns"], bh_growth)
+
+    # Intrabar-Spanne der Equity, solange eine Position offen ist
+    in_pos = (df["position"] == 1) & (df["close"] > 0)
+    df["equity_high"] = np.where(in_pos, df["equity"] * df["high"] / df["close"], df["equity"])
+    df["equity_low"]  = np.where(in_pos, df["equity"] * df["low"]  / df["close"], df["equity"])
+    return df
+
+
+def with_equity(df: pd.DataFrame, strategy: str, params: Dict[str, float], capital: float) -> pd.DataFrame:
+    """Strategie anwenden, Equity-Kurven und Intrabar-Spanne ergänzen."""
+    return add_equity(apply_strategy(df, strategy, params), capital)
+
+
+def indicator_cols(df: pd.DataFrame) -> List[str]:
+    return [c for c in df.columns if c.startswith("sma_") or c.startswith("ema_")]
+
+
+def result_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Spalten, die für Charts und Zoom-Anfragen gebraucht werden."""
+    return df[RESULT_COLS + indicator_cols(df) + (["rsi"] if "rsi" in df.columns else [])]
+
+
+def summarize(df: pd.DataFrame, capital: float, max_points: int, mc_paths: int, mc_block: int,
+              mc_percentiles: Sequence[float], mc_drawdowns: Sequence[float],
+              mc_seed: int) -> Dict[str, Any]:
+    """Kennzahlen, Trade-Ledger und Monte-Carlo-Projektion (Arrays, noch nicht serialisiert)."""
+    peak   = df["equity"].cummax()
+    max_dd = ((df["equity"] - peak) / peak).min() * 100
+    sharpe = (df["strat_ret"].mean() / df["strat_ret"].std()) * np.sqrt(252) if df["strat_ret"].std() > 0 else 0
+    totals = {"bars": len(df), "last_date": df.index[-1], "equity": float(df["equity"].iloc[-1]),
+              "bh_equity": float(df["bh_equity"].iloc[-1]), "max_dd": max_dd, "sharpe": sharpe}
+    # Trades = zusammenhängende Long-Läufe (statt Bars mit Rendite != 0)
+    return report(totals, trade_ledger(df), df["strat_ret"].to_numpy(), capital, max_points,
+                  mc_paths, mc_block, mc_percentiles, mc_drawdowns, mc_seed)
+
+
+def report(totals: Dict[str, Any], ledger: Dict[str, np.ndarray], strat_ret: np.ndarray,
+           capital: float, max_points: int, mc_paths: int, mc_block: int,
+           mc_percentiles: Sequence[float], mc_drawdowns: Sequence[float],
+           mc_seed: int) -> Dict[str, Any]:
+    """
+    Zusammenfassung aus laufenden Kennzahlen (`totals`: bars, last_date,
+    equity, bh_equity, max_dd, sharpe), Ledger und Strategierenditen –
+    gemeinsam für den In-Memory- und den Chunk-Pfad (backend.core.chunked).
+    """
+    max_dd = totals["max_dd"]
+    tot_r  = (totals["equity"] / capital - 1) * 100
+    bh_r   = (totals["bh_equity"] / capital - 1) * 100
+    calmar = round(float(tot_r / abs(float(max_dd))), 2) if max_dd != 0 else 0
+    trades = trade_metrics(ledger)
+
+    # Monte-Carlo-Projektion; lange Horizonte in Schritten zu `stride` Bars
+    proj_days = min(max(5, totals["bars"] // 4), PROJECTION_MAX_DAYS)
+    stride    = -(-proj_days // max_points) if max_points else 1
+    last_eq   = totals["equity"]
+    last_date = totals["last_date"]
+
+    future_dates = pd.bdate_range(last_date.normalize() + pd.Timedelta(days=1),
+                                  periods=proj_days)[stride - 1::stride]
+    percentiles  = sorted(set(mc_percentiles))
+    mc = monte_carlo(strat_ret, len(future_dates), mc_paths, mc_block,
+                     percentiles, mc_drawdowns, stride=stride, seed=mc_seed)
+    bands = {p: np.round(last_eq * mc["bands"][p], 2) for p in percentiles}
+
+    return {
+        "ledger": ledger,
+        "projection": {
+            "dates":         future_dates,
+            "upper":         bands[percentiles[-1]],
+            "lower":         bands[percentiles[0]],
+            "mid":           bands[50] if 50 in bands else bands[percentiles[len(percentiles) // 2]],
+            "bands":         {f"p{p:g}": v for p, v in bands.items()},
+            "drawdown_prob": {f"{dd:g}": round(prob, 4) for dd, prob in mc["drawdown_prob"].items()},
+        },
+        "performance": {
+            "end_capital":   round(last_eq, 2),
+            "total_return":  round(float(tot_r), 2),
+            "bh_return":     round(float(bh_r), 2),
+            "bh_capital":    round(totals["bh_equity"], 2),
+            "sharpe":        round(float(totals["sharpe"]), 2),
+            "max_drawdown":  round(float(max_dd), 2),
+            "win_rate":      round(trades["win_rate"], 2),
+            "total_trades":  trades["total_trades"],
+            "profit_factor": trades["profit_factor"],
+            "avg_trade":     round(trades["avg_trade"], 2),
+            "avg_bars":      round(trades["avg_bars"], 1),
+            "calmar":        calmar,
+            "capital":       capital
+        },
+    }
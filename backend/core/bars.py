@@ -0,0 +1,193 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+import pandas as pd
+from fastapi import HTTPException
+
+from alpaca.data.requests import StockBarsRequest, CryptoBarsRequest
+from alpaca.data.enums import Adjustment, DataFeed
+
+from .clients import make_stock_client, make_crypto_client, _default_stock_client, SYMBOL_MAP, CRYPTO_SYMBOLS, TIMEFRAME_MAP
+from .barstore import SETTLED_AFTER, bar_store, split_by_symbol
+from .metrics import cache_result, span
+from .resample import MINUTE_BASE_SPAN, bases, resample, resample_cache
+from .singleflight import SingleFlight
+
+bar_flights = SingleFlight()
+
+
+def resolve_clients(alpaca_key: str, alpaca_secret: str):
+    """Stock/Crypto-Client für die übergebenen Keys (oder Default-Clients)."""
+    if alpaca_key and alpaca_secret:
+        return make_stock_client(alpaca_key, alpaca_secret), make_crypto_client()
+    if _default_stock_client:
+        return _default_stock_client, make_crypto_client()
+    raise HTTPException(
+        status_code=401,
+        detail="Keine Alpaca API-Keys konfiguriert. Bitte in 'Data & Synchro' eintragen."
+    )
+
+
+def _symbol_fetch(mapped: str, interval: str, stock_client, crypto_client):
+    """(feed, adjustment, fetch) für ein Symbol in einem Alpaca-Timeframe."""
+    tf = TIMEFRAME_MAP.get(interval)
+    if mapped in CRYPTO_SYMBOLS:
+        def fetch(gap_start, gap_end):
+            bars_req = CryptoBarsRequest(
+                symbol_or_symbols=mapped, timeframe=tf,
+                start=gap_start, end=gap_end
+            )
+            return crypto_client.get_crypto_bars(bars_req).df
+        return "crypto", "raw", fetch
+
+    def fetch(gap_start, gap_end):
+        bars_req = StockBarsRequest(
+            symbol_or_symbols=mapped, timeframe=tf,
+            start=gap_start, end=gap_end,
+            feed=DataFeed.SIP,
+            adjustment=Adjustment.ALL
+        )
+        return stock_client.get_stock_bars(bars_req).df
+    return "sip", "all", fetch
+
+
+def _stored(mapped: str, interval: str, start: str, end: str, clients: tuple) -> pd.DataFrame:
+    """Bars in Alpaca-Granularität über den Bar-Store."""
+    feed, adjustment, fetch = _symbol_fetch(mapped, interval, *clients)
+    start_dt = datetime.strptime(start, "%Y-%m-%d")
+    end_dt   = datetime.strptime(end,   "%Y-%m-%d")
+    # Read-Through: nur fehlende Zeitbereiche gehen an Alpaca; identische
+    # gleichzeitige Loads (z.B. mehrere Jobs) teilen sich einen Durchlauf
+    return bar_flights.do(
+        (mapped, interval, start, end),
+        lambda: bar_store.get(mapped, interval, feed, adjustment, start_dt, end_dt, fetch),
+        clone=pd.DataFrame.copy,
+    )
+
+
+def _base_interval(mapped: str, interval: str, start: pd.Timestamp, end: pd.Timestamp) -> str:
+    """
+    Granularität, in der für `interval` geladen wird: die feinste bereits
+    im Bar-Store vollständige Basis, sonst 1m bei kurzen Zeiträumen (alle
+    Intraday-Wechsel danach lokal), sonst das Intervall selbst. 1h kommt
+    mindestens aus 30m, damit die Stunden immer am Session-Start liegen.
+    """
+    candidates = bases(interval)
+    if not candidates:
+        return interval
+    feed, adjustment = ("crypto", "raw") if mapped in CRYPTO_SYMBOLS else ("sip", "all")
+    settled_end = min(end, pd.Timestamp.now(tz="UTC") - SETTLED_AFTER)
+    if settled_end > start:
+        for base in candidates:
+            if not bar_store.missing(mapped, base, feed, adjustment, start, settled_end):
+                return base
+    if end - start <= MINUTE_BASE_SPAN:
+        return candidates[0]
+    return "30m" if interval == "1h" else interval
+
+
+def _load(mapped: str, interval: str, start: str, end: str, clients: tuple,
+          base: Optional[str] = None) -> pd.DataFrame:
+    """Bars eines (gemappten) Symbols, ggf. leer; `base` legt die Basis-Granularität fest."""
+    start_ts = pd.Timestamp(start, tz="UTC")
+    end_ts   = pd.Timestamp(end, tz="UTC")
+
+    key    = (mapped, interval, start, end)
+    settled = end_ts <= pd.Timestamp.now(tz="UTC") - SETTLED_AFTER
+    df = resample_cache.get(key) if settled else None
+    if df is not None:
+        cache_result("resample", True)
+        return df
+
+    base = base or _base_interval(mapped, interval, start_ts, end_ts)
+    if base == interval:
+        return _stored(mapped, interval, start, end, clients)
+    cache_result("resample", False)
+    base_df = _stored(mapped, base, start, end, clients)
+    with span("resample"):
+        df = resample(base_df, interval, session=mapped not in CRYPTO_SYMBOLS)
+    if settled and not df.empty:
+        resample_cache.put(key, df)
+    return df
+
+
+def load_bars(symbol: str, interval: str, start: str, end: str,
+              alpaca_key: str = "", alpaca_secret: str = "") -> pd.DataFrame:
+    """
+    OHLCV-Bars eines Symbols, Read-Through über den Bar-Store. Intraday-
+    Intervalle werden, wo möglich, lokal aus feineren Bars aggregiert
+    (backend.core.resample).
+    """
+    clients = resolve_clients(alpaca_key, alpaca_secret)
+    df = _load(SYMBOL_MAP.get(symbol, symbol), interval, start, end, clients)
+    if df.empty:
+        raise HTTPException(status_code=400, detail="Keine Daten. Symbol oder Zeitraum prüfen.")
+    return df
+
+
+def iter_bars(symbol: str, interval: str, start: str, end: str, chunk_days: int,
+              alpaca_key: str = "", alpaca_secret: str = "") -> Iterator[pd.DataFrame]:
+    """
+    Bars wie `load_bars`, aber in Zeitfenstern zu `chunk_days` Tagen, damit
+    lange Intraday-Zeiträume nie komplett im Speicher liegen. Die Fenster
+    sind halboffen [lo, hi) (das letzte schließt `end` ein), leere Fenster
+    (Wochenenden, Feiertage) werden übersprungen. Die Basis-Granularität
+    wird einmal für den ganzen Zeitraum gewählt.
+    """
+    clients = resolve_clients(alpaca_key, alpaca_secret)
+    mapped  = SYMBOL_MAP.get(symbol, symbol)
+    base    = _base_interval(mapped, interval, pd.Timestamp(start, tz="UTC"), pd.Timestamp(end, tz="UTC"))
+    lo, stop = datetime.strptime(start, "%Y-%m-%d"), datetime.strptime(end, "%Y-%m-%d")
+    found = False
+    while lo < stop:
+        hi = min(lo + timedelta(days=chunk_days), stop)
+        df = _load(mapped, interval, lo.strftime("%Y-%m-%d"), hi.strftime("%Y-%m-%d"), clients, base)
+        if hi < stop:
+            # Bar bzw. Bucket ab Mitternacht gehört ins nächste Fenster
+            df = df[df.index < pd.Timestamp(hi, tz="UTC")]
+        if len(df):
+            found = True
+            yield df
+        lo = hi
+    if not found:
+        raise HTTPException(status_code=400, detail="Keine Daten. Symbol oder Zeitraum prüfen.")
+
+
+def load_bars_many(symbols: List[str], interval: str, start: str, end: str,
+                   alpaca_key: str = "", alpaca_secret: str = "") -> Dict[str, pd.DataFrame]:
+    """
+    OHLCV-Bars für viele Symbole mit je einem Multi-Symbol-Request für
+    Aktien und Crypto. Schlüssel sind die angefragten (ungemappten) Symbole.
+    """
+    stock_client, crypto_client = resolve_clients(alpaca_key, alpaca_secret)
+
+    tf       = TIMEFRAME_MAP.get(interval)
+    start_dt = datetime.strptime(start, "%Y-%m-%d")
+    end_dt   = datetime.strptime(end,   "%Y-%m-%d")
+
+    mapped = {sym: SYMBOL_MAP.get(sym, sym) for sym in symbols}
+    crypto = sorted({m for m in mapped.values() if m in CRYPTO_SYMBOLS})
+    stocks = sorted({m for m in mapped.values() if m not in CRYPTO_SYMBOLS})
+
+    def fetch_crypto(batch, gap_start, gap_end):
+        bars_req = CryptoBarsRequest(
+            symbol_or_symbols=batch, timeframe=tf,
+            start=gap_start, end=gap_end
+        )
+        return split_by_symbol(crypto_client.get_crypto_bars(bars_req).df, batch)
+
+    def fetch_stocks(batch, gap_start, gap_end):
+        bars_req = StockBarsRequest(
+            symbol_or_symbols=batch, timeframe=tf,
+            start=gap_start, end=gap_end,
+            feed=DataFeed.SIP,
+            adjustment=Adjustment.ALL
+        )
+        return split_by_symbol(stock_client.get_stock_bars(bars_req).df, batch)
+
+    frames: Dict[str, pd.DataFrame] = {}
+    if crypto:
+        frames.update(bar_store.get_many(crypto, interval, "crypto", "raw", start_dt, end_dt, fetch_crypto))
+    if stocks:
+        frames.update(bar_store.get_many(stocks, interval, "sip", "all", start_dt, end_dt, fetch_stocks))
+
+    return {sym: frames[m] for sym, m in mapped.items() if m in frames}
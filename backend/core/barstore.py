@@ -0,0 +1,305 @@
+import json
+import os
+import shutil
+import threading
+from contextlib import ExitStack
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .metrics import BARS_FETCHED, cache_result
+
+# ─── Konfiguration ───────────────────────────────────────────────────────────
+BAR_STORE_DIR = Path(os.environ.get(
+    "QUANTOS_BAR_STORE",
+    Path(__file__).resolve().parents[2] / "data" / "cache" / "bars",
+))
+# Bars, die jünger sind, gelten als "nicht abgeschlossen" und werden
+# beim nächsten Zugriff erneut geladen (z.B. laufender Tagesbar).
+SETTLED_AFTER = timedelta(days=1)
+# ─────────────────────────────────────────────────────────────────────────────
+
+Range = Tuple[int, int]   # [start_ns, end_ns], beide inklusive
+FetchFn = Callable[[datetime, datetime], pd.DataFrame]
+FetchManyFn = Callable[[List[str], datetime, datetime], Dict[str, pd.DataFrame]]
+
+
+def _to_ns(dt) -> int:
+    """Naive Zeitpunkte werden wie bei Alpaca als UTC interpretiert."""
+    ts = pd.Timestamp(dt)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize("UTC")
+    return int(ts.value)
+
+
+def _from_ns(ns: int) -> datetime:
+    return pd.Timestamp(ns, tz="UTC").to_pydatetime()
+
+
+def _merge_ranges(ranges: List[Range]) -> List[Range]:
+    merged: List[Range] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _gaps(start: int, end: int, covered: List[Range]) -> List[Range]:
+    """Teilbereiche von [start, end], die noch nicht im Store liegen."""
+    gaps: List[Range] = []
+    cursor = start
+    for c_start, c_end in covered:
+        if c_end < cursor:
+            continue
+        if c_start > end:
+            break
+        if c_start > cursor:
+            gaps.append((cursor, c_start))
+        cursor = max(cursor, c_end)
+        if cursor >= end:
+            break
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def normalize_bars(df: pd.DataFrame, symbol: Optional[str] = None) -> pd.DataFrame:
+    """Bringt ein Alpaca `bars.df` auf Einzel-Symbol-Form mit UTC-Index."""
+    if df is None or df.empty:
+        return pd.DataFrame()
+    if isinstance(df.index, pd.MultiIndex):
+        if symbol is not None and "symbol" in df.index.names:
+            df = df.xs(symbol, level="symbol")
+        else:
+            df = df.reset_index(level=0, drop=True)
+    df = df.copy()
+    df.columns = [c.lower() for c in df.columns]
+    if df.index.tz is None:
+        df.index = df.index.tz_localize("UTC")
+    df.index.name = "timestamp"
+    return df
+
+
+def split_by_symbol(df: pd.DataFrame, symbols: List[str]) -> Dict[str, pd.DataFrame]:
+    """Zerlegt ein Multi-Symbol `bars.df` in einzelne, normalisierte Frames."""
+    result: Dict[str, pd.DataFrame] = {}
+    if df is None or df.empty or not isinstance(df.index, pd.MultiIndex):
+        return result
+    present = set(df.index.get_level_values("symbol"))
+    for sym in symbols:
+        if sym in present:
+            result[sym] = normalize_bars(df, sym)
+    return result
+
+
+class BarStore:
+    """
+    Persistenter Bar-Cache auf Platte.
+
+    Pro (symbol, timeframe, feed, adjustment) liegt ein Ordner mit einer
+    `meta.json` (abgedeckte Zeitbereiche, aktuelle Version) und einem
+    Versions-Unterordner `v<n>/` mit einer `.npy`-Datei pro Spalte
+    (Zeitstempel als int64-ns, Werte als float64). Ein Schreibvorgang legt
+    eine neue Version an und schaltet erst danach `meta.json` um, Leser
+    sehen also immer einen konsistenten Stand.
+
+    Gelesen wird per Memory-Map, nachgeladen werden nur fehlende Bereiche.
+    Noch nicht abgeschlossene Bars (jünger als SETTLED_AFTER) werden nicht
+    persistiert, sondern bei jedem Zugriff frisch geholt.
+    """
+
+    def __init__(self, root: Path = BAR_STORE_DIR):
+        self.root = Path(root)
+        self._locks: Dict[Path, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    # ── Pfade & Locks ────────────────────────────────────────────────────────
+    def _path(self, symbol: str, timeframe: str, feed: str, adjustment: str) -> Path:
+        safe = symbol.replace("/", "_").replace("\\", "_")
+        return self.root / f"{timeframe}_{feed}_{adjustment}".lower() / safe
+
+    def _lock(self, path: Path) -> threading.Lock:
+        with self._locks_guard:
+            if path not in self._locks:
+                self._locks[path] = threading.Lock()
+            return self._locks[path]
+
+    # ── Lesen ────────────────────────────────────────────────────────────────
+    def _meta(self, path: Path) -> Dict[str, list]:
+        try:
+            with open(path / "meta.json", "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            meta["ranges"] = [tuple(r) for r in meta.get("ranges", [])]
+            return meta
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {"columns": [], "ranges": [], "version": 0}
+
+    @staticmethod
+    def _data_dir(path: Path, meta: Dict[str, list]) -> Path:
+        version = meta.get("version")
+        return path / f"v{version}" if version else path
+
+    def _read(self, path: Path, meta: Dict[str, list],
+              start: Optional[int] = None, end: Optional[int] = None) -> pd.DataFrame:
+        path = self._data_dir(path, meta)
+        if not meta["columns"] or not (path / "timestamp.npy").exists():
+            return pd.DataFrame()
+
+        ts = np.load(path / "timestamp.npy", mmap_mode="r")
+        lo = 0 if start is None else int(np.searchsorted(ts, start, side="left"))
+        hi = len(ts) if end is None else int(np.searchsorted(ts, end, side="right"))
+        index = pd.DatetimeIndex(np.array(ts[lo:hi]).astype("datetime64[ns]"),
+                                 name="timestamp").tz_localize("UTC")
+        del ts
+
+        data: Dict[str, np.ndarray] = {}
+        for col in meta["columns"]:
+            arr = np.load(path / f"{col}.npy", mmap_mode="r")
+            data[col] = np.array(arr[lo:hi])
+            del arr
+        return pd.DataFrame(data, index=index)
+
+    def missing(self, symbol: str, timeframe: str, feed: str, adjustment: str,
+                start: datetime, end: datetime) -> List[Range]:
+        meta = self._meta(self._path(symbol, timeframe, feed, adjustment))
+        return _gaps(_to_ns(start), _to_ns(end), meta["ranges"])
+
+    # ── Schreiben ────────────────────────────────────────────────────────────
+    def _write(self, path: Path, new_df: pd.DataFrame, covered: Optional[Range]):
+        """Schreibt neue Bars als neue Version; `meta.json` wird zuletzt ersetzt."""
+        meta = self._meta(path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        if not new_df.empty:
+            numeric = new_df.select_dtypes(include="number").astype("float64")
+            existing = self._read(path, meta)
+            combined = pd.concat([existing, numeric]) if not existing.empty else numeric
+            combined = combined[~combined.index.duplicated(keep="last")].sort_index()
+
+            old_dir = self._data_dir(path, meta)
+            meta["version"] = int(meta.get("version") or 0) + 1
+            new_dir = self._data_dir(path, meta)
+            if new_dir.exists():
+                shutil.rmtree(new_dir, ignore_errors=True)
+            new_dir.mkdir()
+
+            columns = list(combined.columns)
+            np.save(new_dir / "timestamp.npy", combined.index.as_unit("ns").asi8)
+            for c in columns:
+                np.save(new_dir / f"{c}.npy", combined[c].to_numpy(dtype="float64"))
+            meta["columns"] = columns
+        else:
+            old_dir = None
+
+        if covered is not None:
+            meta["ranges"] = _merge_ranges(list(meta["ranges"]) + [covered])
+
+        tmp = path / "meta.tmp.json"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"columns": meta["columns"], "version": meta.get("version", 0),
+                       "ranges": [list(r) for r in meta["ranges"]]}, f)
+        os.replace(tmp, path / "meta.json")
+
+        # Alte Version aufräumen (unter Windows evtl. noch gemappt -> später)
+        if old_dir is not None and old_dir != path:
+            shutil.rmtree(old_dir, ignore_errors=True)
+
+    @staticmethod
+    def _settle_cutoff() -> int:
+        return _to_ns(datetime.now(timezone.utc) - SETTLED_AFTER)
+
+    @staticmethod
+    def _settled_range(start: int, end: int, cutoff: int) -> Optional[Range]:
+        """Nur abgeschlossene Zeiträume werden als vollständig markiert."""
+        end = min(end, cutoff)
+        return (start, end) if end > start else None
+
+    def _store(self, path: Path, fetched: pd.DataFrame, gap: Range, cutoff: int) -> pd.DataFrame:
+        """
+        Persistiert den abgeschlossenen Teil einer geladenen Lücke und gibt
+        den noch offenen Rest (jünger als `cutoff`) zurück.
+        """
+        if fetched.empty:
+            settled, fresh = fetched, fetched
+        else:
+            stamps  = fetched.index.as_unit("ns").asi8
+            settled = fetched[stamps <= cutoff]
+            fresh   = fetched[stamps > cutoff]
+        covered = self._settled_range(gap[0], gap[1], cutoff)
+        if covered is not None or not settled.empty:
+            self._write(path, settled, covered)
+        return fresh
+
+    def _read_with(self, path: Path, start: int, end: int, fresh: List[pd.DataFrame]) -> pd.DataFrame:
+        df = self._read(path, self._meta(path), start, end)
+        fresh = [f.select_dtypes(include="number").astype("float64") for f in fresh if not f.empty]
+        if not fresh:
+            return df
+        combined = pd.concat([df, *fresh]) if not df.empty else pd.concat(fresh)
+        combined = combined[~combined.index.duplicated(keep="last")].sort_index()
+        stamps = combined.index.as_unit("ns").asi8
+        return combined[(stamps >= start) & (stamps <= end)]
+
+    # ── Read-Through ─────────────────────────────────────────────────────────
+    def get(self, symbol: str, timeframe: str, feed: str, adjustment: str,
+            start: datetime, end: datetime, fetch: FetchFn) -> pd.DataFrame:
+        """Liefert Bars für [start, end]; fehlende Bereiche werden via `fetch` geholt."""
+        path = self._path(symbol, timeframe, feed, adjustment)
+        start_ns, end_ns = _to_ns(start), _to_ns(end)
+        cutoff = self._settle_cutoff()
+
+        with self._lock(path):
+            fresh: List[pd.DataFrame] = []
+            gaps = _gaps(start_ns, end_ns, self._meta(path)["ranges"])
+            cache_result("bars", not gaps)
+            for gap in gaps:
+                fetched = normalize_bars(fetch(_from_ns(gap[0]), _from_ns(gap[1])), symbol)
+                BARS_FETCHED.inc(len(fetched), timeframe=timeframe)
+                fresh.append(self._store(path, fetched, gap, cutoff))
+            return self._read_with(path, start_ns, end_ns, fresh)
+
+    def get_many(self, symbols: List[str], timeframe: str, feed: str, adjustment: str,
+                 start: datetime, end: datetime, fetch_many: FetchManyFn) -> Dict[str, pd.DataFrame]:
+        """
+        Wie `get`, aber für viele Symbole: Symbole mit identischen Lücken
+        werden in einem gemeinsamen Multi-Symbol-Request nachgeladen.
+        Planung, Nachladen und Lesen laufen unter den Locks aller Symbole
+        (in fester Reihenfolge), parallele Aufrufe laden also nichts doppelt.
+        """
+        start_ns, end_ns = _to_ns(start), _to_ns(end)
+        cutoff = self._settle_cutoff()
+        paths  = {sym: self._path(sym, timeframe, feed, adjustment) for sym in dict.fromkeys(symbols)}
+
+        with ExitStack() as stack:
+            for path in sorted(set(paths.values())):
+                stack.enter_context(self._lock(path))
+
+            by_gap: Dict[Range, List[str]] = {}
+            for sym, path in paths.items():
+                gaps = _gaps(start_ns, end_ns, self._meta(path)["ranges"])
+                cache_result("bars", not gaps)
+                for gap in gaps:
+                    by_gap.setdefault(gap, []).append(sym)
+
+            fresh: Dict[str, List[pd.DataFrame]] = {}
+            for gap, gap_symbols in by_gap.items():
+                fetched = fetch_many(gap_symbols, _from_ns(gap[0]), _from_ns(gap[1]))
+                BARS_FETCHED.inc(sum(len(df) for df in fetched.values()), timeframe=timeframe)
+                for sym in gap_symbols:
+                    rest = self._store(paths[sym], fetched.get(sym, pd.DataFrame()), gap, cutoff)
+                    fresh.setdefault(sym, []).append(rest)
+
+            result: Dict[str, pd.DataFrame] = {}
+            for sym, path in paths.items():
+                df = self._read_with(path, start_ns, end_ns, fresh.get(sym, []))
+                if not df.empty:
+                    result[sym] = df
+            return result
+
+
+bar_store = BarStore()
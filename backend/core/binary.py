@@ -0,0 +1,104 @@
+"""
+Kompaktes Binärformat für große Serien (opt-in über den Accept-Header).
+
+Layout (Little Endian):
+    b"QOSF" | uint32 Header-Länge | Header-JSON (UTF-8) | Padding auf 8 Byte | Spalten
+
+Der Header enthält die komplette Antwort; jedes Array ist darin durch
+{"$col": i} ersetzt. `columns[i]` beschreibt dtype ("f4", "f8", "i8"),
+Byte-Offset (relativ zum Datenbereich, 8-Byte-aligned) und Länge.
+Zeitachsen werden als int64 Epoch-Millisekunden mit "time": true
+übertragen, NaN bleibt NaN. Decoder: `decodeFrame` in frontend/core/api.js.
+"""
+import json
+import struct
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+MEDIA_TYPE = "application/vnd.quantos.frame"
+MAGIC      = b"QOSF"
+_DTYPES    = {np.dtype("float32"): "f4", np.dtype("float64"): "f8", np.dtype("int64"): "i8"}
+
+
+def wants_binary(accept: str) -> bool:
+    return MEDIA_TYPE in (accept or "")
+
+
+def _pad(n: int) -> int:
+    return (-n) % 8
+
+
+class _Encoder:
+    def __init__(self):
+        self.columns: List[Dict[str, Any]] = []
+        self.blobs: List[bytes] = []
+        self.offset = 0
+        self._seen: Dict[int, Dict[str, int]] = {}   # id(obj) -> Referenz (z.B. gemeinsame Zeitachse)
+
+    def column(self, arr: np.ndarray, time: bool = False) -> Dict[str, int]:
+        arr = np.ascontiguousarray(arr)
+        if arr.dtype not in _DTYPES:
+            arr = arr.astype("float64")
+        data = arr.astype(arr.dtype.newbyteorder("<"), copy=False).tobytes()
+        self.columns.append({"dtype": _DTYPES[arr.dtype], "offset": self.offset,
+                             "length": int(arr.size), "time": time})
+        self.blobs.append(data + b"\0" * _pad(len(data)))
+        self.offset += len(data) + _pad(len(data))
+        return {"$col": len(self.columns) - 1}
+
+    def array(self, value) -> Dict[str, int]:
+        if id(value) not in self._seen:
+            if isinstance(value, pd.DatetimeIndex):
+                self._seen[id(value)] = self.column(value.as_unit("ms").asi8, time=True)
+            else:
+                self._seen[id(value)] = self.column(np.asarray(value))
+        return self._seen[id(value)]
+
+    def walk(self, value: Any) -> Any:
+        if isinstance(value, (pd.DatetimeIndex, pd.Series)) or (isinstance(value, np.ndarray) and value.ndim == 1):
+            return self.array(value)
+        if isinstance(value, dict):
+            return {k: self.walk(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [self.walk(v) for v in value]
+        if isinstance(value, np.generic):
+            return value.item()
+        return value
+
+
+def encode_frame(payload: Dict[str, Any]) -> bytes:
+    """Serialisiert eine Antwort; Arrays/Series/DatetimeIndex werden zu gepackten Spalten."""
+    enc    = _Encoder()
+    tree   = enc.walk(payload)
+    header = json.dumps({"v": 1, "columns": enc.columns, "data": tree},
+                        allow_nan=False, separators=(",", ":")).encode()
+    head   = MAGIC + struct.pack("<I", len(header)) + header
+    return b"".join([head, b"\0" * _pad(len(head)), *enc.blobs])
+
+
+def decode_frame(buf: bytes) -> Dict[str, Any]:
+    """Gegenstück zu `encode_frame` (für Tests/Python-Clients)."""
+    if buf[:4] != MAGIC:
+        raise ValueError("Kein QuantOS-Frame")
+    (size,) = struct.unpack("<I", buf[4:8])
+    header  = json.loads(buf[8:8 + size])
+    base    = 8 + size + _pad(8 + size)
+
+    def column(i: int):
+        col = header["columns"][i]
+        arr = np.frombuffer(buf, dtype="<" + col["dtype"], count=col["length"],
+                            offset=base + col["offset"])
+        return pd.to_datetime(arr, unit="ms", utc=True) if col["time"] else arr
+
+    def walk(value: Any) -> Any:
+        if isinstance(value, dict):
+            if set(value) == {"$col"}:
+                return column(value["$col"])
+            return {k: walk(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [walk(v) for v in value]
+        return value
+
+    return walk(header["data"])
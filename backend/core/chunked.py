@@ -0,0 +1,246 @@
+"""
+Out-of-Core-Backtest: Bars fensterweise laden und verarbeiten.
+
+Für mehrjährige Intraday-Läufe (z.B. 5 Jahre 1m) liegt nie der ganze
+Bar-Frame samt Zwischenspalten (signal, position, returns, ...) im
+Speicher, sondern nur ein Fenster (bars.iter_bars). Über Fenstergrenzen
+getragen werden:
+
+    Indikatoren/Strategie – die letzten `lookback` Roh-Bars des Vorgängers
+                            werden vorangestellt und nach der Berechnung
+                            wieder verworfen (rollende Fenster, shift,
+                            pct_change sehen dieselbe Historie)
+    Equity                – kumulierter Wachstumsfaktor (backtest.compound)
+    Kennzahlen            – laufender Peak/Max-Drawdown, Welford-Mittelwert/
+                            -Varianz der Strategierenditen (Sharpe), offener
+                            Trade des Ledgers
+
+Equity, Trades und Kennzahlen entsprechen bitgenau dem In-Memory-Pfad
+(rollende Mittel können in der letzten Stelle abweichen, weil pandas je
+Fenster neu summiert). Über das Fenster hinaus bleiben nur die Chart-
+Spalten (result_frame, ~100 Byte/Bar, für Zoom in voller Auflösung) und
+die Strategierenditen für die Monte-Carlo-Projektion.
+"""
+import inspect
+import os
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .backtest import add_equity, compound, report, result_frame
+from .engine import apply_indicators, apply_strategy, indicators, strategies
+from .resample import MINUTES
+
+# ─── Konfiguration ───────────────────────────────────────────────────────────
+CHUNK_DAYS      = int(os.environ.get("QUANTOS_CHUNK_DAYS", "30"))        # Fenstergröße
+# Ab so vielen Bars (Obergrenze: Kalenderminuten / Intervall) automatisch fensterweise, 0 = nie
+CHUNK_AUTO_BARS = int(os.environ.get("QUANTOS_CHUNK_AUTO_BARS", "1000000"))
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def lookback(strategy: str, params: Dict[str, Any], active_indicators: List[str]) -> int:
+    """
+    Vorlauf in Bars je Fenster: doppelter größter Integer-Parameter (Perioden
+    der Strategie und der aktiven Indikatoren) + 1 für shift/pct_change.
+    Reicht für rollende Fenster, auch verkettete; Indikatoren mit unendlichem
+    Gedächtnis (EMA) nähern sich dem In-Memory-Ergebnis nur an.
+    """
+    def periods(fn: Callable, given: Dict[str, Any]) -> List[int]:
+        values = {name: p.default for name, p in inspect.signature(fn).parameters.items()}
+        values.update(given)
+        return [v for v in values.values() if isinstance(v, int) and not isinstance(v, bool)]
+
+    found = periods(strategies[strategy], params)
+    for name in active_indicators:
+        if name in indicators:
+            found += periods(indicators[name], {})
+    return 2 * max(found, default=0) + 1
+
+
+class RunningStats:
+    """Mittelwert/Varianz (ddof=1) über Blöcke, Welford bzw. Chan-Merge; NaN werden ignoriert."""
+
+    def __init__(self):
+        self.n    = 0
+        self.mean = 0.0
+        self.m2   = 0.0
+
+    def update(self, values: np.ndarray):
+        values = values[~np.isnan(values)]
+        n = len(values)
+        if n == 0:
+            return
+        mean  = float(values.mean())
+        m2    = float(((values - mean) ** 2).sum())
+        delta = mean - self.mean
+        total = self.n + n
+        self.mean += delta * n / total
+        self.m2   += m2 + delta * delta * self.n * n / total
+        self.n     = total
+
+    @property
+    def std(self) -> float:
+        return float(np.sqrt(self.m2 / (self.n - 1))) if self.n > 1 else float("nan")
+
+
+class TradeTracker:
+    """
+    Trade-Ledger wie ledger.trade_ledger, fensterweise: ein Long-Lauf, der
+    über das Fensterende hinausgeht, bleibt offen und wird im nächsten
+    Fenster (oder in `ledger`) geschlossen.
+    """
+
+    def __init__(self):
+        self.offset = 0                        # globaler Index des nächsten Bars
+        self.prev   = (False, np.nan, np.nan)  # (long, close, equity) des letzten Bars
+        self.open: Optional[Tuple[int, float]] = None   # (Einstieg, Einstiegskurs)
+        self.parts: List[Dict[str, np.ndarray]] = []
+
+    def update(self, position: np.ndarray, close: np.ndarray, equity: np.ndarray):
+        long = position > 0
+        n    = len(long)
+        prev_long, prev_close, prev_equity = self.prev
+        edges  = np.diff(np.concatenate(([prev_long], long)).astype("int8"))
+        starts = np.flatnonzero(edges == 1)
+        ends   = np.flatnonzero(edges == -1) - 1        # -1 = letzter Bar des Vorgängers
+
+        # Einstieg = Close des Vorbars (am allerersten Bar: dessen eigener Close)
+        before = np.concatenate(([prev_close if self.offset else close[0]], close))
+        entry  = starts + self.offset
+        price  = before[starts]
+        if self.open is not None:
+            entry = np.concatenate(([self.open[0]], entry))
+            price = np.concatenate(([self.open[1]], price))
+        closed = len(ends)
+        self.open = (int(entry[-1]), float(price[-1])) if len(entry) > closed else None
+
+        if closed:
+            closes   = np.concatenate(([prev_close], close))
+            equities = np.concatenate(([prev_equity], equity))
+            self.parts.append(_rows(entry[:closed], price[:closed], ends + self.offset,
+                                    closes[ends + 1], equities[ends + 1], False))
+        self.offset += n
+        self.prev = (bool(long[-1]), float(close[-1]), float(equity[-1]))
+
+    def ledger(self) -> Dict[str, np.ndarray]:
+        """Ledger aller Fenster; ein noch offener Trade endet am letzten Bar."""
+        parts = list(self.parts)
+        if self.open is not None:
+            _, close, equity = self.prev
+            parts.append(_rows([self.open[0]], [self.open[1]], [self.offset - 1], [close], [equity], True))
+        if not parts:
+            parts.append(_rows([], [], [], [], [], False))
+        return {k: np.concatenate([p[k] for p in parts]) for k in parts[0]}
+
+
+def _rows(entry, entry_price, exit_, exit_price, exit_equity, is_open: bool) -> Dict[str, np.ndarray]:
+    """Ledger-Zeilen (Spalten wie ledger.trade_ledger)."""
+    entry, exit_ = np.asarray(entry, dtype="int64"), np.asarray(exit_, dtype="int64")
+    entry_price  = np.asarray(entry_price, dtype="float64")
+    exit_price   = np.asarray(exit_price, dtype="float64")
+    pnl = exit_price / entry_price - 1.0
+    return {
+        "entry": entry, "exit": exit_, "entry_price": entry_price, "exit_price": exit_price,
+        "pnl": pnl, "bars": exit_ - entry + 1, "open": np.full(len(pnl), is_open),
+        "pnl_abs": np.asarray(exit_equity, dtype="float64") * pnl / (1.0 + pnl),
+    }
+
+
+class ChunkedBacktest:
+    """Backtest-Zustand über Bar-Fenster; `push` je Fenster, `finish` am Ende."""
+
+    def __init__(self, strategy: str, params: Dict[str, Any], active_indicators: List[str],
+                 capital: float):
+        self.strategy  = strategy
+        self.params    = params
+        self.active    = active_indicators
+        self.capital   = capital
+        self.lookback  = lookback(strategy, params, active_indicators)
+        self.tail: Optional[pd.DataFrame] = None        # Roh-Bars als Vorlauf
+        self.growth    = 1.0
+        self.bh_growth = 1.0
+        self.peak      = np.nan
+        self.max_dd    = np.nan
+        self.returns   = RunningStats()
+        self.trades    = TradeTracker()
+        self.frames: List[pd.DataFrame] = []
+        self.strat_ret: List[np.ndarray] = []
+
+    @property
+    def bars(self) -> int:
+        return self.trades.offset
+
+    def push(self, bars: pd.DataFrame):
+        work = bars if self.tail is None else pd.concat([self.tail, bars])
+        work.attrs = {}                                   # Memo des Indikator-Caches gilt nur pro Frame
+        warm = len(work) - len(bars)
+        self.tail = work.iloc[-self.lookback:].copy()      # ohne Verweis auf das ganze Fenster
+
+        df = apply_strategy(apply_indicators(work.copy(), self.active), self.strategy, self.params)
+        df = df.iloc[warm:].copy()
+        growth    = compound(df["strat_ret"], self.growth).to_numpy()
+        bh_growth = compound(df["returns"], self.bh_growth).to_numpy()
+        df = add_equity(df, self.capital, self.growth, self.bh_growth)
+        self.growth    = _last_finite(growth, self.growth)
+        self.bh_growth = _last_finite(bh_growth, self.bh_growth)
+
+        equity = df["equity"].to_numpy()
+        peak = np.fmax(self.peak, np.fmax.accumulate(equity))
+        with np.errstate(invalid="ignore"):
+            self.max_dd = np.fmin(self.max_dd, np.nanmin((equity - peak) / peak, initial=np.inf))
+        self.peak = _last_finite(peak, self.peak)
+
+        strat_ret = df["strat_ret"].to_numpy(dtype="float64", copy=True)   # keine Sicht auf das Fenster
+        self.returns.update(strat_ret)
+        self.strat_ret.append(strat_ret)
+        self.trades.update(df["position"].to_numpy(dtype="float64"),
+                           df["close"].to_numpy(dtype="float64"), equity)
+        self.frames.append(result_frame(df).copy())       # eigene Blöcke statt Sicht auf das Fenster
+
+    def finish(self, max_points: int, mc_paths: int, mc_block: int, mc_percentiles, mc_drawdowns,
+               mc_seed: int) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        frame = pd.concat(self.frames)
+        self.frames = []
+        std    = self.returns.std
+        sharpe = self.returns.mean / std * np.sqrt(252) if std > 0 else 0
+        max_dd = self.max_dd * 100 if np.isfinite(self.max_dd) else np.nan
+        totals = {"bars": len(frame), "last_date": frame.index[-1],
+                  "equity": float(frame["equity"].iloc[-1]), "bh_equity": float(frame["bh_equity"].iloc[-1]),
+                  "max_dd": max_dd, "sharpe": sharpe}
+        summary = report(totals, self.trades.ledger(), np.concatenate(self.strat_ret), self.capital,
+                         max_points, mc_paths, mc_block, mc_percentiles, mc_drawdowns, mc_seed)
+        return frame, summary
+
+
+def _last_finite(values: np.ndarray, default: float) -> float:
+    finite = np.flatnonzero(np.isfinite(values))
+    return float(values[finite[-1]]) if len(finite) else default
+
+
+def chunk_days(interval: str, start: str, end: str, requested: int = 0) -> int:
+    """Fenstergröße in Tagen für einen Backtest, 0 = in einem Stück (In-Memory-Pfad)."""
+    if requested > 0:
+        return requested
+    if not CHUNK_AUTO_BARS or interval not in MINUTES:
+        return 0
+    minutes = (pd.Timestamp(end) - pd.Timestamp(start)).total_seconds() / 60
+    if minutes / MINUTES[interval] > CHUNK_AUTO_BARS:
+        return CHUNK_DAYS
+    return 0
+
+
+def run_chunked(chunks: Iterable[pd.DataFrame], strategy: str, params: Dict[str, Any],
+                active_indicators: List[str], capital: float, summary_args: tuple,
+                progress: Optional[Callable[["ChunkedBacktest", pd.DataFrame], None]] = None
+                ) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Backtest über Bar-Fenster; `summary_args` = (max_points, mc_paths, mc_block,
+    mc_percentiles, mc_drawdowns, mc_seed). `progress(run, bars)` nach jedem Fenster.
+    """
+    run = ChunkedBacktest(strategy, params, active_indicators, capital)
+    for bars in chunks:
+        run.push(bars)
+        if progress is not None:
+            progress(run, bars)
+    return run.finish(*summary_args)
@@ -1,8 +1,180 @@
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
 from alpaca.data.historical import StockHistoricalDataClient, CryptoHistoricalDataClient
 from alpaca.data.timeframe import TimeFrame, TimeFrameUnit
 
+from .gateway import gateway
+
+# Optionale Umleitung (z.B. auf backend.core.fake_alpaca für Offline-Tests)
+ALPACA_DATA_URL    = os.environ.get("QUANTOS_ALPACA_DATA_URL") or None
+ALPACA_TRADING_URL = os.environ.get("QUANTOS_ALPACA_TRADING_URL") or None
+
+
+# ─── Konfiguration ───────────────────────────────────────────────────────────
+CLIENT_IDLE_TTL = float(os.environ.get("QUANTOS_CLIENT_IDLE_TTL", "900"))   # Sekunden ohne Nutzung
+CLIENT_MAX      = int(os.environ.get("QUANTOS_CLIENT_MAX", "64"))
+HEALTH_TTL      = float(os.environ.get("QUANTOS_HEALTH_TTL", "60"))         # Key-Validierung
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def credential_id(api_key: str, secret_key: str) -> str:
+    """Hash eines Key-Paars (Keys selbst werden nicht als Cache-Schlüssel gehalten)."""
+    return hashlib.blake2b(f"{api_key}:{secret_key}".encode(), digest_size=16).hexdigest()
+
+
+class ClientRegistry:
+    """
+    Alpaca-Clients pro (Art, Credential-Hash, URL) wiederverwenden: jeder
+    Client behält seine requests-Session mit Keep-Alive-Pool (Gateway-Adapter),
+    wiederholte Requests sparen so TCP/TLS-Handshakes. Nach CLIENT_IDLE_TTL
+    ohne Nutzung bzw. über CLIENT_MAX hinaus wird der älteste geschlossen.
+    """
+
+    def __init__(self, idle_ttl: float = CLIENT_IDLE_TTL, max_clients: int = CLIENT_MAX,
+                 health_ttl: float = HEALTH_TTL):
+        self.idle_ttl    = idle_ttl
+        self.max_clients = max_clients
+        self.health_ttl  = health_ttl
+        self._clients: "OrderedDict[tuple, list]" = OrderedDict()   # key -> [client, last_used]
+        self._health: Dict[tuple, Tuple[float, Any]] = {}
+        self._lock  = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "health_hits": 0, "health_checks": 0}
+
+    def get(self, kind: str, api_key: str, secret_key: str, url: Optional[str],
+            factory: Callable[[], Any]) -> Any:
+        key = (kind, credential_id(api_key, secret_key), url)
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+            entry = self._clients.get(key)
+            if entry is not None:
+                entry[1] = now
+                self._clients.move_to_end(key)
+                self._stats["hits"] += 1
+                return entry[0]
+            self._stats["misses"] += 1
+
+        client = factory()
+        with self._lock:
+            entry = self._clients.setdefault(key, [client, now])   # paralleler Erstaufruf: einer gewinnt
+            self._evict(now)
+        if entry[0] is not client:
+            _close(client)
+        return entry[0]
+
+    def _evict(self, now: float):
+        """Idle-Clients und Überhang schließen (Lock wird gehalten)."""
+        while self._clients:
+            key, (client, last_used) = next(iter(self._clients.items()))
+            if now - last_used < self.idle_ttl and len(self._clients) <= self.max_clients:
+                break
+            del self._clients[key]
+            self._stats["evictions"] += 1
+            _close(client)
+
+    def validated(self, api_key: str, secret_key: str, check: Callable[[], Any]) -> Any:
+        """Ergebnis einer Key-Validierung (z.B. get_account) für HEALTH_TTL Sekunden cachen."""
+        key = (credential_id(api_key, secret_key), ALPACA_TRADING_URL)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._health.get(key)
+            if cached is not None and now - cached[0] < self.health_ttl:
+                self._stats["health_hits"] += 1
+                return cached[1]
+            self._stats["health_checks"] += 1
+        result = check()
+        with self._lock:
+            self._health = {k: v for k, v in self._health.items() if now - v[0] < self.health_ttl}
+            self._health[key] = (now, result)
+        return result
+
+    def invalidate(self, api_key: str, secret_key: str):
+        """Gecachte Validierung verwerfen (z.B. nach Fehler)."""
+        with self._lock:
+            self._health.pop((credential_id(api_key, secret_key), ALPACA_TRADING_URL), None)
+
+    def clear(self):
+        with self._lock:
+            clients = [entry[0] for entry in self._clients.values()]
+            self._clients.clear()
+            self._health.clear()
+        for client in clients:
+            _close(client)
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            by_kind: Dict[str, int] = {}
+            for kind, _, _ in self._clients:
+                by_kind[kind] = by_kind.get(kind, 0) + 1
+            return {**self._stats, "clients": len(self._clients), "by_kind": by_kind,
+                    "max_clients": self.max_clients,
+                    "oldest_idle_seconds": round(max((now - e[1] for e in self._clients.values()), default=0.0), 1),
+                    "pool_connections": self._pooled_connections()}
+
+    def _pooled_connections(self) -> int:
+        """Offene Keep-Alive-Verbindungen über alle Sessions (Interna von urllib3)."""
+        total = 0
+        for client, _ in self._clients.values():
+            session  = getattr(client, "_session", None)
+            adapters = {id(a): a for a in getattr(session, "adapters", {}).values()}
+            for adapter in adapters.values():
+                pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+                for key in (pools.keys() if pools is not None else []):
+                    pool = pools.get(key)
+                    idle = getattr(getattr(pool, "pool", None), "queue", ())   # Slots ohne Verbindung sind None
+                    total += sum(conn is not None for conn in list(idle))
+        return total
+
+
+def _close(client):
+    session = getattr(client, "_session", None)
+    if session is not None:
+        session.close()
+
+
+registry = ClientRegistry()
+
+
+# ─── Injizierbarer Daten-Client (Benchmarks / Offline) ──────────────────────
+_data_client: Optional[Any] = None
+
+
+def set_data_client(client: Optional[Any]):
+    """
+    Ersetzt Stock- und Crypto-Client prozessweit (z.B. durch
+    fake_alpaca.FakeDataClient); None stellt die Alpaca-Clients wieder her.
+    """
+    global _data_client
+    _data_client = client
+
+
+def make_stock_client(api_key: str, secret_key: str) -> StockHistoricalDataClient:
+    if _data_client is not None:
+        return _data_client
+    return registry.get("stock", api_key, secret_key, ALPACA_DATA_URL, lambda: gateway.attach(
+        StockHistoricalDataClient(api_key, secret_key, url_override=ALPACA_DATA_URL)))
+
+
+def make_crypto_client() -> CryptoHistoricalDataClient:
+    if _data_client is not None:
+        return _data_client
+    return registry.get("crypto", "", "", ALPACA_DATA_URL, lambda: gateway.attach(
+        CryptoHistoricalDataClient(url_override=ALPACA_DATA_URL)))
+
+
+def make_trading_client(api_key: str, secret_key: str):
+    from alpaca.trading.client import TradingClient
+    return registry.get("trading", api_key, secret_key, ALPACA_TRADING_URL, lambda: gateway.attach(
+        TradingClient(api_key, secret_key, paper=True, url_override=ALPACA_TRADING_URL)))
+
+
 _default_stock_client  = None
-_default_crypto_client = CryptoHistoricalDataClient()
 
 SYMBOL_MAP = {
     "^GSPC": "SPY",  "^SPX": "SPY",  "^DJI":  "DIA",
@@ -0,0 +1,110 @@
+import os
+import uuid
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# ─── Konfiguration ───────────────────────────────────────────────────────────
+CHART_POINT_BUDGET = int(os.environ.get("QUANTOS_CHART_POINTS", "2000"))   # Punkte pro Serie
+RESULT_CACHE_SIZE  = int(os.environ.get("QUANTOS_RESULT_CACHE", "8"))      # Backtest-Ergebnisse
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+# ─── Downsampling ────────────────────────────────────────────────────────────
+def lttb_indices(y: np.ndarray, n_out: int, x: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: Indizes der `n_out` Punkte, die den
+    Linienverlauf visuell am besten erhalten (erster/letzter Punkt bleiben).
+    NaN-Werte werden für die Flächenberechnung wie 0 behandelt.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.arange(n, dtype="float64") if x is None else np.asarray(x, dtype="float64")
+    y = np.nan_to_num(np.asarray(y, dtype="float64"))
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)    # n_out - 2 Buckets
+    out = np.empty(n_out, dtype=int)
+    out[0], out[-1] = 0, n - 1
+
+    prev = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        # Schwerpunkt des nächsten Buckets (bzw. letzter Punkt)
+        nlo, nhi = hi, edges[b + 2] if b + 2 < len(edges) else n
+        avg_x = x[nlo:nhi].mean() if nhi > nlo else x[-1]
+        avg_y = y[nlo:nhi].mean() if nhi > nlo else y[-1]
+
+        area = np.abs((x[prev] - avg_x) * (y[lo:hi] - y[prev])
+                      - (x[prev] - x[lo:hi]) * (avg_y - y[prev]))
+        prev = lo + int(np.argmax(area))
+        out[b + 1] = prev
+    return out
+
+
+def bucket_edges(n: int, n_out: int) -> np.ndarray:
+    """Startindizes von `n_out` gleich großen Buckets über `n` Bars."""
+    if n_out >= n:
+        return np.arange(n)
+    return np.unique(np.linspace(0, n, n_out, endpoint=False).astype(int))
+
+
+def ohlc_buckets(df: pd.DataFrame, n_out: int) -> Tuple[pd.DataFrame, np.ndarray]:
+    """
+    Fasst Kerzen zu `n_out` Buckets zusammen (Open erster, High max, Low min,
+    Close letzter Bar; Zeitstempel = erster Bar). Liefert auch die Indizes
+    des letzten Bars je Bucket (für Linien auf dem Kerzenchart).
+    """
+    starts = bucket_edges(len(df), n_out)
+    ends   = np.append(starts[1:], len(df)) - 1
+    out = pd.DataFrame({
+        "open":  df["open"].to_numpy(dtype="float64")[starts],
+        "high":  np.fmax.reduceat(df["high"].to_numpy(dtype="float64"), starts),
+        "low":   np.fmin.reduceat(df["low"].to_numpy(dtype="float64"), starts),
+        "close": df["close"].to_numpy(dtype="float64")[ends],
+    }, index=df.index[starts])
+    return out, ends
+
+
+# ─── Ergebnis-Cache für Zoom-Anfragen ────────────────────────────────────────
+class ResultCache:
+    """LRU-Cache voller Backtest-Ergebnisse (DataFrames) für Viewport-Abfragen."""
+
+    def __init__(self, size: int = RESULT_CACHE_SIZE):
+        self.size   = size
+        self._items: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+        self._lock  = Lock()
+
+    def put(self, df: pd.DataFrame) -> str:
+        key = uuid.uuid4().hex
+        with self._lock:
+            self._items[key] = df
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+        return key
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        with self._lock:
+            df = self._items.get(key)
+            if df is not None:
+                self._items.move_to_end(key)
+            return df
+
+
+result_cache = ResultCache()
+
+
+def _utc(value: str) -> pd.Timestamp:
+    ts = pd.Timestamp(value)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts
+
+
+def window(df: pd.DataFrame, start: Optional[str], end: Optional[str]) -> pd.DataFrame:
+    """Zeitfenster [start, end] eines Ergebnisses (ISO-Strings, naive = UTC)."""
+    lo = df.index.searchsorted(_utc(start), side="left") if start else 0
+    hi = df.index.searchsorted(_utc(end), side="right") if end else len(df)
+    return df.iloc[lo:hi]
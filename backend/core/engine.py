@@ -0,0 +1,53 @@
+from typing import Dict, List
+
+import pandas as pd
+
+import indicators as indicator_package
+
+from .indicator_engine import engine as indicator_engine
+from .plugins import PluginRegistry
+
+# Eine Registry pro Plugin-Ordner: lazy importiert, Hot-Reload bei Dateiänderung
+indicators = PluginRegistry("indicators")
+strategies = PluginRegistry("strategies")
+
+# Indikator-Aufrufe aus Strategien (`from indicators import sma`) laufen memoisiert
+indicator_package._compute = indicator_engine.compute
+
+
+@indicators.on_reload
+def _indicator_reloaded(name: str):
+    # Gecachte Ergebnisse stammen vom alten Code
+    indicator_engine.clear()
+
+
+def apply_indicators(df: pd.DataFrame, active_indicators: List[str]) -> pd.DataFrame:
+    """Aktive Indikatoren (memoisiert) an den Bar-Frame hängen."""
+    for name in active_indicators:
+        if name in indicators:
+            df = indicator_engine.compute(name, indicators[name], df)
+    return df
+
+
+def apply_strategy(df: pd.DataFrame, strategy: str, params: Dict[str, float]) -> pd.DataFrame:
+    """Strategie anwenden und position / returns / strat_ret ergänzen (nur Long)."""
+    if strategy not in strategies:
+        raise KeyError(f"Strategie '{strategy}' nicht gefunden.")
+    df = strategies.call(strategy, df, **params)
+
+    if "signal" not in df.columns:
+        raise ValueError("Strategie hat keine 'signal'-Spalte.")
+
+    df["position"]  = df["signal"].shift(1).fillna(0)
+    df["returns"]   = df["close"].pct_change()
+    df["strat_ret"] = df["position"].clip(lower=0) * df["returns"]
+    return df
+
+
+def run_strategy(df: pd.DataFrame, strategy: str, active_indicators: List[str],
+                 params: Dict[str, float]) -> pd.DataFrame:
+    """
+    Indikatoren + Strategie auf einen Bar-Frame anwenden und die Spalten
+    position / returns / strat_ret ergänzen (nur Long, wie run_backtest).
+    """
+    return apply_strategy(apply_indicators(df, active_indicators), strategy, params)
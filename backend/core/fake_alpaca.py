@@ -0,0 +1,309 @@
+"""
+Lokaler Fake-Alpaca-Server für Offline-Tests des Data-Gateways.
+
+Implementiert die von QuantOS genutzten Endpunkte mit deterministischen
+synthetischen Daten:
+    GET /v2/stocks/bars            (Paging via next_page_token)
+    GET /v1beta3/crypto/us/bars
+    GET /v2/assets
+    GET /v2/account
+
+FakeDataClient liefert dieselben Bars ohne HTTP (Benchmarks, In-Process-Tests).
+
+Start:  python -m backend.core.fake_alpaca --port 8765 --symbols 12000
+Danach QUANTOS_ALPACA_DATA_URL / QUANTOS_ALPACA_TRADING_URL auf
+http://127.0.0.1:8765 setzen.
+"""
+import argparse
+import json
+import threading
+import time
+import uuid
+import zlib
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+PAGE_SIZE = 10_000
+_UNIT_SECONDS = {"Min": 60, "Hour": 3600, "Day": 86400, "Week": 7 * 86400}
+
+
+def _parse_time(value: str) -> datetime:
+    value = value.replace("Z", "+00:00")
+    dt = datetime.fromisoformat(value) if "T" in value else datetime.fromisoformat(value + "T00:00:00+00:00")
+    return dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+
+def _step_seconds(timeframe: str) -> int:
+    for unit, seconds in _UNIT_SECONDS.items():
+        if timeframe.endswith(unit):
+            return int(timeframe[: -len(unit)] or 1) * seconds
+    raise ValueError(f"Unbekannter Timeframe: {timeframe}")
+
+
+def fake_symbols(n: int) -> List[str]:
+    """Deterministische Ticker AAA, AAB, ... (max. 5 Zeichen)."""
+    out: List[str] = []
+    i = 0
+    while len(out) < n:
+        k, name = i, ""
+        for _ in range(3 + (i // 17576) % 3):
+            name = chr(65 + k % 26) + name
+            k //= 26
+        out.append(name)
+        i += 1
+    return out
+
+
+def _noise(seed: int, t: np.ndarray, salt: float) -> np.ndarray:
+    """Deterministisches Pseudo-Rauschen in [-0.5, 0.5) pro (Symbol, Timestamp)."""
+    x = np.sin((t % 10_000_019) * 12.9898 + seed * 78.233 + salt) * 43758.5453
+    return x - np.floor(x) - 0.5
+
+
+def _arrays(symbol: str, timeframe: str, start: datetime, end: datetime,
+            crypto: bool = False) -> Dict[str, np.ndarray]:
+    """Random-Walk-artige Bars als Spalten (t in Epoch-Sekunden), reproduzierbar pro (Symbol, Timestamp)."""
+    step = _step_seconds(timeframe)
+    seed = zlib.crc32(symbol.encode()) % 100_000
+    base = 20.0 + seed % 480
+
+    first = -(-int(start.timestamp()) // step) * step
+    t = np.arange(first, int(end.timestamp()) + 1, step, dtype="int64")
+    if not crypto:
+        dt = t.astype("datetime64[s]")
+        weekday = (dt.astype("datetime64[D]").astype("int64") + 3) % 7
+        minute = (t % 86400) // 60
+        keep = weekday < 5
+        if step < 86400:
+            keep &= (minute >= 13 * 60 + 30) & (minute < 20 * 60)
+        t = t[keep]
+
+    trend = 1.0 + 0.4 * ((t // step) % 997 / 997.0 - 0.5)
+    close = base * trend * (1.0 + 0.02 * _noise(seed, t, 1.0))
+    open_ = close * (1.0 + 0.01 * _noise(seed, t, 2.0))
+    high  = np.maximum(open_, close) * (1.0 + 0.004 * np.abs(_noise(seed, t, 3.0)))
+    low   = np.minimum(open_, close) * (1.0 - 0.004 * np.abs(_noise(seed, t, 4.0)))
+    vol   = np.floor(1_000 + 999_000 * (_noise(seed, t, 5.0) + 0.5))
+    return {"t": t, "open": np.round(open_, 4), "high": np.round(high, 4), "low": np.round(low, 4),
+            "close": np.round(close, 4), "volume": vol}
+
+
+def generate_bars(symbol: str, timeframe: str, start: datetime, end: datetime,
+                  crypto: bool = False) -> List[Dict[str, object]]:
+    """Bars im JSON-Format der Alpaca-API."""
+    a = _arrays(symbol, timeframe, start, end, crypto)
+    if len(a["t"]) == 0:
+        return []
+    stamps = np.datetime_as_string(a["t"].astype("datetime64[s]"), unit="s")
+    return [
+        {"t": ts + "Z", "o": o, "h": h, "l": lo, "c": c,
+         "v": v, "n": int(v // 200), "vw": round((h + lo + c) / 3, 4)}
+        for ts, o, h, lo, c, v in zip(stamps.tolist(), a["open"].tolist(), a["high"].tolist(),
+                                      a["low"].tolist(), a["close"].tolist(), a["volume"].tolist())
+    ]
+
+
+def bars_frame(symbol: str, timeframe: str, start: datetime, end: datetime,
+               crypto: bool = False) -> pd.DataFrame:
+    """Dieselben Bars direkt als DataFrame (UTC-Index `timestamp`, Spalten wie normalize_bars)."""
+    a = _arrays(symbol, timeframe, start, end, crypto)
+    index = pd.DatetimeIndex(a["t"].astype("datetime64[s]").astype("datetime64[ns]"),
+                             name="timestamp").tz_localize("UTC")
+    return pd.DataFrame({
+        "open": a["open"], "high": a["high"], "low": a["low"], "close": a["close"],
+        "volume": a["volume"], "trade_count": np.floor(a["volume"] / 200),
+        "vwap": np.round((a["high"] + a["low"] + a["close"]) / 3, 4),
+    }, index=index)
+
+
+class _BarSet:
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+
+
+class FakeDataClient:
+    """
+    In-Process-Ersatz für Stock-/CryptoHistoricalDataClient (ohne HTTP):
+    liefert dieselben synthetischen Bars wie der Server als `bars.df` mit
+    (symbol, timestamp)-MultiIndex. Einsetzbar über clients.set_data_client.
+    """
+
+    def __init__(self, symbols: Optional[List[str]] = None):
+        self.symbols  = set(symbols) if symbols is not None else None   # None = jedes Symbol
+        self.requests = 0
+        self._lock    = threading.Lock()
+
+    def _bars(self, req, crypto: bool) -> _BarSet:
+        with self._lock:
+            self.requests += 1
+        symbols = req.symbol_or_symbols
+        symbols = [symbols] if isinstance(symbols, str) else list(symbols)
+        start   = req.start or datetime(2024, 1, 1, tzinfo=timezone.utc)
+        end     = req.end or datetime.now(timezone.utc)
+        start   = start if start.tzinfo else start.replace(tzinfo=timezone.utc)
+        end     = end if end.tzinfo else end.replace(tzinfo=timezone.utc)
+
+        frames = {sym: bars_frame(sym, req.timeframe.value, start, end, crypto) for sym in symbols
+                  if self.symbols is None or sym in self.symbols}
+        frames = {sym: df for sym, df in frames.items() if len(df)}
+        if not frames:
+            return _BarSet(pd.DataFrame())
+        return _BarSet(pd.concat(frames, names=["symbol", "timestamp"]))
+
+    def get_stock_bars(self, req) -> _BarSet:
+        return self._bars(req, crypto=False)
+
+    def get_crypto_bars(self, req) -> _BarSet:
+        return self._bars(req, crypto=True)
+
+
+class FakeAlpaca:
+    """
+    Fake-Server im Hintergrund-Thread.
+
+    `rate_limit_every=n` beantwortet jeden n-ten Request mit 429,
+    `latency` simuliert Netzwerklatenz in Sekunden.
+    """
+
+    def __init__(self, port: int = 0, n_symbols: int = 500,
+                 rate_limit_every: int = 0, latency: float = 0.0):
+        self.symbols          = fake_symbols(n_symbols)
+        self.rate_limit_every = rate_limit_every
+        self.latency          = latency
+        self.requests         = 0
+        self.connections      = 0                 # TCP-Verbindungen (Keep-Alive-Nachweis)
+        self._pages: Dict[tuple, list] = {}   # Query -> flache Bar-Liste (für Paging)
+        self._lock            = threading.Lock()
+        self.server           = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeAlpaca":
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ── Antworten ────────────────────────────────────────────────────────────
+    def _bars(self, params: Dict[str, str], crypto: bool) -> Dict[str, object]:
+        symbols = params["symbols"].split(",")
+        start   = _parse_time(params.get("start", "2024-01-01"))
+        end     = _parse_time(params["end"]) if params.get("end") else datetime.now(timezone.utc)
+        limit   = int(params.get("limit") or PAGE_SIZE)
+        offset  = int(params.get("page_token") or 0)
+
+        key = (params["symbols"], params["timeframe"], start, end, crypto)
+        with self._lock:
+            flat = self._pages.get(key)
+        if flat is None:
+            flat = [(sym, bar) for sym in symbols
+                    for bar in generate_bars(sym, params["timeframe"], start, end, crypto)]
+            with self._lock:
+                if len(self._pages) > 64:
+                    self._pages.clear()
+                self._pages[key] = flat
+        page = flat[offset:offset + limit]
+        out: Dict[str, List[Dict[str, object]]] = {}
+        for sym, bar in page:
+            out.setdefault(sym, []).append(bar)
+        next_token = str(offset + limit) if offset + limit < len(flat) else None
+        return {"bars": out, "next_page_token": next_token}
+
+    def _assets(self, params: Dict[str, str]) -> List[Dict[str, object]]:
+        if params.get("asset_class") == "crypto":
+            return [{
+                "id": str(uuid.UUID(int=zlib.crc32(s.encode()))), "class": "crypto",
+                "exchange": "CRYPTO", "symbol": s, "name": s, "status": "active", "tradable": True,
+                "marginable": False, "shortable": False, "easy_to_borrow": False, "fractionable": True,
+            } for s in ("BTC/USD", "ETH/USD", "SOL/USD")]
+        return [{
+            "id": str(uuid.UUID(int=zlib.crc32(s.encode()))), "class": "us_equity",
+            "exchange": "NASDAQ" if i % 3 else "NYSE", "symbol": s, "name": f"{s} Fake Corp",
+            "status": "active", "tradable": True, "marginable": True, "shortable": True,
+            "easy_to_borrow": True, "fractionable": i % 2 == 0,
+        } for i, s in enumerate(self.symbols)]
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"          # Keep-Alive wie beim echten API-Server
+
+            def setup(self):
+                super().setup()
+                with fake._lock:
+                    fake.connections += 1
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: object):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                with fake._lock:
+                    fake.requests += 1
+                    n = fake.requests
+                if fake.latency:
+                    time.sleep(fake.latency)
+                if fake.rate_limit_every and n % fake.rate_limit_every == 0:
+                    return self._send(429, {"code": 42910000, "message": "rate limit exceeded"})
+
+                url    = urlparse(self.path)
+                params = {k: v[-1] for k, v in parse_qs(url.query).items()}
+                try:
+                    if url.path == "/v2/stocks/bars":
+                        return self._send(200, fake._bars(params, crypto=False))
+                    if url.path.startswith("/v1beta3/crypto/") and url.path.endswith("/bars"):
+                        return self._send(200, fake._bars(params, crypto=True))
+                    if url.path == "/v2/assets":
+                        return self._send(200, fake._assets(params))
+                    if url.path == "/v2/account":
+                        return self._send(200, {"id": str(uuid.uuid4()), "account_number": "FAKE0001",
+                                                "status": "ACTIVE", "currency": "USD"})
+                except (KeyError, ValueError) as e:
+                    return self._send(422, {"code": 42210000, "message": str(e)})
+                return self._send(404, {"code": 40410000, "message": "not found"})
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake-Alpaca-Server für Offline-Tests")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--rate-limit-every", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+
+    fake = FakeAlpaca(args.port, args.symbols, args.rate_limit_every, args.latency)
+    print(f"[FakeAlpaca] {fake.url}  ({len(fake.symbols)} Symbole)")
+    print(f"  QUANTOS_ALPACA_DATA_URL={fake.url}")
+    print(f"  QUANTOS_ALPACA_TRADING_URL={fake.url}")
+    try:
+        fake.server.serve_forever()
+    except KeyboardInterrupt:
+        fake.stop()
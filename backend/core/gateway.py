@@ -0,0 +1,199 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, List, Sequence, Tuple
+
+from requests.adapters import HTTPAdapter
+
+# ─── Konfiguration ───────────────────────────────────────────────────────────
+ALPACA_RPM      = int(os.environ.get("QUANTOS_ALPACA_RPM", "200"))       # Requests/Minute (Free-Plan)
+MAX_CONCURRENCY = int(os.environ.get("QUANTOS_ALPACA_CONCURRENCY", "4"))
+MAX_RETRIES     = 5
+BACKOFF_BASE    = 0.5     # Sekunden, verdoppelt sich pro Versuch
+BACKOFF_MAX     = 30.0
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+class TokenBucket:
+    """Thread-sicherer Token-Bucket; `acquire` blockiert bis ein Token frei ist."""
+
+    def __init__(self, rate_per_minute: int, capacity: int = 0):
+        self.rate     = rate_per_minute / 60.0
+        self.capacity = float(capacity or max(1, rate_per_minute // 10))
+        self.tokens   = self.capacity
+        self.updated  = time.monotonic()
+        self._lock    = threading.Lock()
+
+    def _refill(self, now: float):
+        self.tokens  = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self) -> float:
+        """Gibt die Wartezeit in Sekunden zurück."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return waited
+                delay = (1.0 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def available(self) -> float:
+        with self._lock:
+            self._refill(time.monotonic())
+            return self.tokens
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponentielles Backoff mit Jitter (±50 %)."""
+    return min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)) * random.uniform(0.5, 1.5)
+
+
+class _GatewayAdapter(HTTPAdapter):
+    """HTTP-Adapter: jeder einzelne Request (auch Folgeseiten) läuft durch den Bucket."""
+
+    def __init__(self, gateway: "DataGateway", **kwargs):
+        self.gateway = gateway
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        gw = self.gateway
+        for attempt in range(MAX_RETRIES + 1):
+            waited  = gw.bucket.acquire()
+            started = time.perf_counter()
+            response = super().send(request, **kwargs)
+            gw._record(time.perf_counter() - started, waited, response)
+            if response.status_code != 429 or attempt == MAX_RETRIES:
+                return response
+            delay = backoff_delay(attempt)
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, float(retry_after))
+            gw._count("retries")
+            response.close()
+            time.sleep(delay)
+        return response
+
+
+class DataGateway:
+    """
+    Gemeinsames Gateway für alle Alpaca-Datenabrufe.
+
+    - Token-Bucket passend zum Alpaca-Request-Budget (pro HTTP-Request)
+    - 429 -> Retry mit exponentiellem, gejittertem Backoff
+    - Batches mit begrenzter Parallelität (`map` / `map_async`)
+    - Durchsatz-Metriken über `stats()`
+    """
+
+    def __init__(self, rpm: int = ALPACA_RPM, concurrency: int = MAX_CONCURRENCY):
+        self.bucket      = TokenBucket(rpm)
+        self.concurrency = max(1, concurrency)
+        self._executor   = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="alpaca")
+        self._lock       = threading.Lock()
+        self._stats: Dict[str, float] = {
+            "requests": 0, "rate_limited": 0, "retries": 0, "errors": 0,
+            "bytes": 0, "latency_total": 0.0, "throttled_seconds": 0.0,
+        }
+        self._started = time.time()
+
+    # ── Client-Anbindung ─────────────────────────────────────────────────────
+    def attach(self, client):
+        """
+        Hängt den Gateway-Adapter an die HTTP-Session eines alpaca-py Clients.
+
+        Nutzt Interna von alpaca-py (`_session`, `_retry_codes`, getestet mit
+        0.4x). Fehlen sie, bleibt der Client unverändert (ohne Rate-Limit).
+        """
+        session = getattr(client, "_session", None)
+        if session is None or not hasattr(session, "mount"):
+            print(f"[Gateway] {type(client).__name__} ohne HTTP-Session – nicht angebunden")
+            return client
+        adapter = _GatewayAdapter(self, pool_maxsize=self.concurrency)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        # 429 übernimmt der Adapter (Backoff statt fix 3 s), 504 etc. bleibt beim SDK
+        codes = getattr(client, "_retry_codes", None)
+        if isinstance(codes, list):
+            client._retry_codes = [c for c in codes if c != 429]
+        return client
+
+    # ── Metriken ─────────────────────────────────────────────────────────────
+    def _count(self, key: str, value: float = 1):
+        with self._lock:
+            self._stats[key] += value
+
+    def _record(self, latency: float, waited: float, response):
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["latency_total"] += latency
+            self._stats["throttled_seconds"] += waited
+            self._stats["bytes"] += len(response.content or b"")
+            if response.status_code == 429:
+                self._stats["rate_limited"] += 1
+            elif response.status_code >= 400:
+                self._stats["errors"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            s = dict(self._stats)
+        uptime = max(time.time() - self._started, 1e-9)
+        return {
+            "requests":          int(s["requests"]),
+            "rate_limited":      int(s["rate_limited"]),
+            "retries":           int(s["retries"]),
+            "errors":            int(s["errors"]),
+            "bytes":             int(s["bytes"]),
+            "avg_latency_ms":    round(s["latency_total"] / s["requests"] * 1000, 1) if s["requests"] else None,
+            "throttled_seconds": round(s["throttled_seconds"], 2),
+            "requests_per_min":  round(s["requests"] / uptime * 60, 1),
+            "budget_per_min":    int(self.bucket.rate * 60),
+            "tokens_available":  round(self.bucket.available(), 1),
+            "concurrency":       self.concurrency,
+        }
+
+    # ── Parallele Batches ────────────────────────────────────────────────────
+    def map(self, fn: Callable[[Any], Any], items: Sequence[Any]) -> List[Any]:
+        """Führt `fn` für alle Items mit begrenzter Parallelität aus (Reihenfolge bleibt)."""
+        return list(self._executor.map(fn, items))
+
+    async def map_async(self, fn: Callable[[Any], Any],
+                        items: Sequence[Any]) -> AsyncIterator[Tuple[str, int, Any, Any]]:
+        """
+        Async-Variante für Streams. Liefert ("start", index, item, None) sobald
+        ein Worker ein Item übernimmt und ("done", index, item, result) in
+        Fertigstellungsreihenfolge. Exceptions kommen als Ergebnis zurück.
+        Wird der Stream vorzeitig geschlossen, werden noch nicht gestartete
+        Items abgebrochen.
+        """
+        loop  = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def run(i: int, item: Any):
+            loop.call_soon_threadsafe(queue.put_nowait, ("start", i, item, None))
+            try:
+                result = fn(item)
+            except Exception as e:
+                result = e
+            loop.call_soon_threadsafe(queue.put_nowait, ("done", i, item, result))
+
+        futures = [self._executor.submit(run, i, item) for i, item in enumerate(items)]
+        try:
+            remaining = len(futures)
+            while remaining:
+                event = await queue.get()
+                if event[0] == "done":
+                    remaining -= 1
+                yield event
+        finally:
+            for f in futures:
+                f.cancel()
+
+
+gateway = DataGateway()
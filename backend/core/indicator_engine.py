@@ -0,0 +1,156 @@
+"""
+Memoisierte Indikator-Berechnung.
+
+Indikator-Plugins können ihre Ein- und Ausgabespalten als Format-Strings
+über die Parameter deklarieren, z.B. in indicators/sma.py:
+
+    INPUTS  = ["{col}"]
+    OUTPUTS = ["sma_{period}"]
+
+Jeder Aufruf wird zu einem Knoten (Indikator, Parameter, Eingabespalten).
+Innerhalb eines Laufs wird ein bereits berechneter Knoten übersprungen,
+über Requests hinweg liegen die Ergebnisse in einem LRU-Cache, der über
+einen Fingerprint der Eingabedaten adressiert und nach Bytes begrenzt ist.
+"""
+import hashlib
+import inspect
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# ─── Konfiguration ───────────────────────────────────────────────────────────
+CACHE_BYTES = int(os.environ.get("QUANTOS_INDICATOR_CACHE_MB", "256")) * 2 ** 20
+# Ohne Deklaration gelten diese Spalten als Eingaben
+DEFAULT_INPUTS = ["open", "high", "low", "close", "volume"]
+# ─────────────────────────────────────────────────────────────────────────────
+
+NodeKey = Tuple[str, Tuple[Tuple[str, Any], ...]]
+
+
+class _Spec:
+    """Signatur + Spalten-Deklaration eines Plugins (einmal pro Funktion ermittelt)."""
+
+    def __init__(self, name: str, fn: Callable):
+        module = inspect.getmodule(fn)
+        params = list(inspect.signature(fn).parameters.values())[1:]   # erstes Argument = df
+        self.name     = name
+        self.fn       = fn
+        self.names    = [p.name for p in params]
+        self.defaults = {p.name: p.default for p in params if p.default is not inspect.Parameter.empty}
+        self.inputs   = getattr(module, "INPUTS", None)
+        self.outputs  = getattr(module, "OUTPUTS", None)
+
+    def bind(self, args: tuple, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        bound = dict(self.defaults)
+        bound.update(zip(self.names, args))
+        bound.update({k: v for k, v in kwargs.items() if k in self.names})
+        return bound
+
+
+class IndicatorEngine:
+    def __init__(self, max_bytes: int = CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._specs: Dict[Callable, _Spec] = {}
+        self._cache: "OrderedDict[tuple, Dict[str, np.ndarray]]" = OrderedDict()
+        self._bytes = 0
+        self._lock  = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "deduped": 0, "evictions": 0}
+
+    # ── Knoten ───────────────────────────────────────────────────────────────
+    def _spec(self, name: str, fn: Callable) -> _Spec:
+        spec = self._specs.get(fn)
+        if spec is None:
+            spec = self._specs[fn] = _Spec(name, fn)
+        return spec
+
+    @staticmethod
+    def _fingerprint(df: pd.DataFrame, columns: List[str]) -> str:
+        """Hash über Zeitachse + Eingabespalten; pro DataFrame gemerkt (df.attrs)."""
+        memo = df.attrs.setdefault("_fingerprints", {})
+        key = (len(df), tuple(columns))
+        if key not in memo:
+            h = hashlib.blake2b(digest_size=16)
+            h.update(np.ascontiguousarray(df.index.as_unit("ns").asi8).tobytes()
+                     if isinstance(df.index, pd.DatetimeIndex) else pd.util.hash_pandas_object(df.index).values.tobytes())
+            for col in columns:
+                h.update(col.encode())
+                h.update(np.ascontiguousarray(df[col].to_numpy(dtype="float64")).tobytes())
+            memo[key] = h.hexdigest()
+        return memo[key]
+
+    # ── Cache ────────────────────────────────────────────────────────────────
+    def _get(self, key: tuple) -> Optional[Dict[str, np.ndarray]]:
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None:
+                self._cache.move_to_end(key)
+                self._stats["hits"] += 1
+            else:
+                self._stats["misses"] += 1
+            return hit
+
+    def _put(self, key: tuple, arrays: Dict[str, np.ndarray]):
+        size = sum(a.nbytes for a in arrays.values())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._cache:
+                return
+            self._cache[key] = arrays
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._cache:
+                _, old = self._cache.popitem(last=False)
+                self._bytes -= sum(a.nbytes for a in old.values())
+                self._stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._cache), "bytes": self._bytes,
+                    "max_bytes": self.max_bytes}
+
+    # ── Berechnung ───────────────────────────────────────────────────────────
+    def compute(self, name: str, fn: Callable, df: pd.DataFrame, *args, **kwargs) -> pd.DataFrame:
+        """Führt ein Indikator-Plugin memoisiert aus und gibt `df` mit den Ausgabespalten zurück."""
+        spec  = self._spec(name, fn)
+        bound = spec.bind(args, kwargs)
+        node: NodeKey = (name, tuple(sorted(bound.items(), key=lambda kv: kv[0])))
+
+        outputs = [o.format(**bound) for o in spec.outputs] if spec.outputs else None
+        inputs  = [i.format(**bound) for i in spec.inputs] if spec.inputs else \
+                  [c for c in DEFAULT_INPUTS if c in df.columns]
+
+        # Gleicher Knoten im selben Lauf: Spalten liegen schon im Frame
+        nodes = df.attrs.setdefault("_indicator_nodes", set())
+        if node in nodes and outputs and all(o in df.columns for o in outputs):
+            with self._lock:
+                self._stats["deduped"] += 1
+            return df
+
+        try:
+            key = (self._fingerprint(df, inputs), node)
+        except (KeyError, TypeError, ValueError):
+            return fn(df, **bound)            # Eingaben nicht hashbar -> ohne Cache
+
+        hit = self._get(key)
+        if hit is not None:
+            for col, arr in hit.items():
+                df[col] = arr.copy()
+        else:
+            before = set(df.columns)
+            df = fn(df, **bound)
+            cols = outputs or [c for c in df.columns if c not in before]
+            self._put(key, {c: df[c].to_numpy(copy=True) for c in cols if c in df.columns})
+        df.attrs.setdefault("_indicator_nodes", set()).add(node)
+        return df
+
+
+engine = IndicatorEngine()
@@ -0,0 +1,198 @@
+"""
+Job-Queue für lange Backtests.
+
+Ein Job läuft in einem von JOB_WORKERS Runner-Threads (I/O wie Bar-Downloads
+bleibt im Hauptprozess mit Gateway und Client-Registry); CPU-Stufen gehen ab
+JOB_PARALLEL_BARS in den geteilten Prozesspool. Fortschritt wird als Event-
+Liste am Job gesammelt, die der SSE-Endpoint abspielt. Abbrechen greift
+zwischen den Stufen; Ergebnisse bleiben JOB_RESULT_TTL Sekunden abrufbar.
+"""
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .metrics import span
+from .utils import get_pool
+
+# ─── Konfiguration ───────────────────────────────────────────────────────────
+JOB_WORKERS       = int(os.environ.get("QUANTOS_JOB_WORKERS", "2"))        # gleichzeitige Jobs
+JOB_MAX_PENDING   = int(os.environ.get("QUANTOS_JOB_MAX_PENDING", "100"))  # wartend + laufend
+JOB_RESULT_TTL    = float(os.environ.get("QUANTOS_JOB_TTL", "900"))        # Sekunden nach Ende
+JOB_PARALLEL_BARS = 20_000                                                 # ab hier Prozesspool
+# ─────────────────────────────────────────────────────────────────────────────
+
+TERMINAL = ("done", "error", "cancelled")
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class QueueFull(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, kind: str):
+        self.id       = uuid.uuid4().hex
+        self.kind     = kind
+        self.state    = "queued"
+        self.stage    = "queued"
+        self.progress = 0
+        self.created  = time.time()
+        self.finished: Optional[float] = None
+        self.result: Any = None
+        self.error: Optional[Tuple[int, str]] = None     # (HTTP-Status, Meldung)
+        self.events: List[Dict[str, Any]] = []
+        self._cancel = threading.Event()
+        self._cond   = threading.Condition()
+        self._future = None
+        self.emit("queued", 0, "In der Warteschlange")
+
+    # ── Fortschritt ──────────────────────────────────────────────────────────
+    def emit(self, stage: str, progress: int, message: str, **extra):
+        with self._cond:
+            self.stage, self.progress = stage, progress
+            self.events.append({"job_id": self.id, "state": self.state, "stage": stage,
+                                "progress": progress, "message": message, **extra})
+            self._cond.notify_all()
+
+    def events_since(self, cursor: int, timeout: float = 1.0) -> List[Dict[str, Any]]:
+        """Neue Events ab `cursor`; wartet höchstens `timeout` Sekunden auf das nächste."""
+        with self._cond:
+            if cursor >= len(self.events) and self.state not in TERMINAL:
+                self._cond.wait(timeout)
+            return self.events[cursor:]
+
+    def _finish(self, state: str, message: str, **extra):
+        with self._cond:
+            self.state    = state
+            self.finished = time.time()
+        self.emit(state, 100 if state == "done" else self.progress, message, **extra)
+
+    # ── Abbruch ──────────────────────────────────────────────────────────────
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def check(self):
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def stage_run(self, stage: str, progress: int, message: str, fn: Callable, *args,
+                  parallel: bool = False):
+        """
+        Eine Stufe ausführen (optional im Prozesspool). Vor und nach der Stufe
+        wird auf Abbruch geprüft; eine Pool-Stufe wird beim Abbruch nicht
+        abgewartet, ihr Ergebnis verworfen.
+        """
+        self.check()
+        self.emit(stage, progress, message)
+        with span(stage):
+            if not parallel:
+                out = fn(*args)
+            else:
+                future = get_pool().submit(fn, *args)
+                while True:
+                    try:
+                        out = future.result(timeout=0.1)
+                        break
+                    except TimeoutError:
+                        if self._cancel.is_set():
+                            future.cancel()
+                            raise JobCancelled()
+                    except CancelledError:
+                        raise JobCancelled()
+        self.check()
+        return out
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "job_id":   self.id,
+            "kind":     self.kind,
+            "state":    self.state,
+            "stage":    self.stage,
+            "progress": self.progress,
+            "created":  self.created,
+            "finished": self.finished,
+            "error":    self.error[1] if self.error else None,
+        }
+
+
+class JobQueue:
+    def __init__(self, workers: int = JOB_WORKERS, ttl: float = JOB_RESULT_TTL,
+                 max_pending: int = JOB_MAX_PENDING):
+        self.ttl         = ttl
+        self.max_pending = max_pending
+        self._executor   = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="quantos-job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._stats = {"submitted": 0, "done": 0, "error": 0, "cancelled": 0, "expired": 0}
+
+    def _sweep(self):
+        now = time.time()
+        with self._lock:
+            expired = [k for k, j in self._jobs.items() if j.finished and now - j.finished > self.ttl]
+            for k in expired:
+                del self._jobs[k]
+            self._stats["expired"] += len(expired)
+
+    def submit(self, kind: str, fn: Callable[..., Any], *args) -> Job:
+        """`fn(job, *args)` im Runner-Thread ausführen; Rückgabewert wird das Ergebnis."""
+        self._sweep()
+        job = Job(kind)
+        with self._lock:
+            pending = sum(1 for j in self._jobs.values() if j.state not in TERMINAL)
+            if pending >= self.max_pending:
+                raise QueueFull(f"{pending} Jobs offen, Limit {self.max_pending}")
+            self._jobs[job.id] = job
+            self._stats["submitted"] += 1
+        job._future = self._executor.submit(self._run, job, fn, args)
+        return job
+
+    def _run(self, job: Job, fn: Callable[..., Any], args: tuple):
+        if job.cancelled:
+            return self._done(job, "cancelled", "Abgebrochen")
+        job.state = "running"
+        try:
+            job.result = fn(job, *args)
+            self._done(job, "done", "Fertig")
+        except JobCancelled:
+            self._done(job, "cancelled", "Abgebrochen")
+        except Exception as e:
+            job.error = (getattr(e, "status_code", 500), str(getattr(e, "detail", None) or e))
+            self._done(job, "error", job.error[1], error=job.error[1])
+
+    def _done(self, job: Job, state: str, message: str, **extra):
+        job._finish(state, message, **extra)
+        with self._lock:
+            self._stats[state] += 1
+
+    def get(self, job_id: str) -> Optional[Job]:
+        self._sweep()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        """Abbruch anfordern; wartende Jobs enden sofort, laufende an der nächsten Stufengrenze."""
+        job = self.get(job_id)
+        if job is None or job.state in TERMINAL:
+            return job
+        job._cancel.set()
+        if job._future is not None and job._future.cancel():
+            self._done(job, "cancelled", "Abgebrochen")
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        self._sweep()
+        with self._lock:
+            states: Dict[str, int] = {}
+            for j in self._jobs.values():
+                states[j.state] = states.get(j.state, 0) + 1
+            return {**self._stats, "jobs": len(self._jobs), "states": states}
+
+
+queue = JobQueue()
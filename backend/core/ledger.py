@@ -0,0 +1,54 @@
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+
+def trade_ledger(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Trade-Tabelle aus der Positionsspalte (nur Long, wie run_strategy), ohne Zeilenschleife.
+
+    Ein Trade ist ein zusammenhängender Lauf mit position > 0. Die Position
+    von Bar i wirkt auf die Rendite close[i-1] -> close[i]; Einstieg ist
+    also der Close des Vorbars, Ausstieg der Close des letzten Bars im Lauf.
+    Spalten: entry/exit (Bar-Index), entry_price, exit_price, pnl (Faktor - 1),
+    pnl_abs (auf `equity`, falls vorhanden), bars, open (Trade läuft noch).
+    """
+    long  = (df["position"].to_numpy(dtype="float64") > 0).astype("int8")
+    edges = np.diff(np.concatenate(([0], long, [0])))
+    entry = np.flatnonzero(edges == 1)
+    exit_ = np.flatnonzero(edges == -1) - 1
+
+    close = df["close"].to_numpy(dtype="float64")
+    entry_price = close[np.maximum(entry - 1, 0)]
+    exit_price  = close[exit_]
+
+    ledger = {
+        "entry":       entry,
+        "exit":        exit_,
+        "entry_price": entry_price,
+        "exit_price":  exit_price,
+        "pnl":         exit_price / entry_price - 1.0,
+        "bars":        exit_ - entry + 1,
+        "open":        exit_ == len(df) - 1,
+    }
+    if "equity" in df.columns:
+        # equity[exit] = equity[Einstieg] * (1 + pnl), unabhängig vom NaN am ersten Bar
+        end = df["equity"].to_numpy(dtype="float64")[exit_]
+        ledger["pnl_abs"] = end * ledger["pnl"] / (1.0 + ledger["pnl"])
+    return ledger
+
+
+def trade_metrics(ledger: Dict[str, np.ndarray]) -> Dict[str, float]:
+    """Trade-Kennzahlen (statt Bar-Statistik): Anzahl, Trefferquote, Profit-Faktor, Ø Trade."""
+    pnl = ledger.get("pnl_abs", ledger["pnl"])
+    n   = len(pnl)
+    gross_profit = float(pnl[pnl > 0].sum())
+    gross_loss   = abs(float(pnl[pnl < 0].sum()))
+    return {
+        "total_trades":  n,
+        "win_rate":      float((pnl > 0).sum() / n * 100) if n else 0.0,
+        "profit_factor": round(gross_profit / gross_loss, 2) if gross_loss > 0 else 999,
+        "avg_trade":     float(ledger["pnl"].mean() * 100) if n else 0.0,
+        "avg_bars":      float(ledger["bars"].mean()) if n else 0.0,
+    }
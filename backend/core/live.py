@@ -0,0 +1,112 @@
+"""
+Live-Modus: Indikatoren und Signale inkrementell, O(1) pro neuem Bar.
+
+Plugins können neben der Batch-Funktion eine Streaming-Variante als
+`STREAM` deklarieren, z.B. in indicators/sma.py:
+
+    class SmaStream:
+        def __init__(self, period=20, col="close"): ...
+        def update(self, bar) -> dict: ...   # {"sma_20": Wert oder None}
+
+    STREAM = SmaStream
+
+Strategien liefern zusätzlich den Schlüssel "signal". Ein Bar ist ein
+dict mit t (Epoch-ms), open, high, low, close, volume.
+"""
+import asyncio
+import inspect
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .engine import indicators, strategies
+
+
+def stream_class(fn: Callable) -> Optional[type]:
+    """Streaming-Gegenstück (`STREAM`) zum Modul eines Plugins."""
+    return getattr(inspect.getmodule(fn), "STREAM", None)
+
+
+def _build(cls: type, params: Dict[str, Any]):
+    names = set(inspect.signature(cls).parameters)
+    return cls(**{k: v for k, v in params.items() if k in names})
+
+
+class LiveSession:
+    """Inkrementeller Zustand einer Strategie inkl. Position und Equity (nur Long, wie run_strategy)."""
+
+    def __init__(self, strategy: str, params: Dict[str, Any], active_indicators: List[str],
+                 capital: float = 10000):
+        if strategy not in strategies:
+            raise KeyError(f"Strategie '{strategy}' nicht gefunden.")
+        cls = stream_class(strategies[strategy])
+        if cls is None:
+            raise ValueError(f"Strategie '{strategy}' hat keinen Live-Modus (STREAM fehlt).")
+        self.strategy = _build(cls, params)
+
+        self.indicators = {}
+        self.unsupported = []
+        for name in active_indicators:
+            cls = stream_class(indicators[name]) if name in indicators else None
+            if cls is None:
+                self.unsupported.append(name)
+            else:
+                self.indicators[name] = _build(cls, {})
+
+        self.capital    = capital
+        self.equity     = capital
+        self.bh_equity  = capital
+        self.signal     = 0
+        self.prev_close: Optional[float] = None
+        self.bars       = 0
+
+    def push(self, bar: Dict[str, Any]) -> Dict[str, Any]:
+        """Einen neuen Bar verarbeiten; liefert Indikatorwerte, Signal, Position und Equity."""
+        values: Dict[str, Any] = {}
+        for state in self.indicators.values():
+            values.update(state.update(bar))
+        values.update(self.strategy.update(bar))
+        signal = values.pop("signal", 0)
+
+        # Position = Signal des Vorbars, Rendite auf Close-Basis
+        position = self.signal
+        close = bar["close"]
+        ret = close / self.prev_close - 1 if self.prev_close else 0.0
+        self.equity    *= 1 + max(position, 0) * ret
+        self.bh_equity *= 1 + ret
+        self.prev_close, self.signal = close, signal
+        self.bars += 1
+
+        return {
+            "bar":        bar,
+            "indicators": values,
+            "signal":     signal,
+            "position":   position,
+            "equity":     round(self.equity, 2),
+            "bh_equity":  round(self.bh_equity, 2),
+        }
+
+    def seed(self, bars: Iterator[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Zustand mit historischen Bars aufwärmen; liefert das letzte Update."""
+        last = None
+        for bar in bars:
+            last = self.push(bar)
+        return last
+
+
+# ─── Replay-Feed ─────────────────────────────────────────────────────────────
+def bar_dicts(df: pd.DataFrame) -> Iterator[Dict[str, Any]]:
+    """Bars eines Frames als dicts (Stand-in für Alpacas Live-Stream)."""
+    times = df.index.as_unit("ms").asi8
+    cols  = [c for c in ("open", "high", "low", "close", "volume") if c in df.columns]
+    data  = np.column_stack([df[c].to_numpy(dtype="float64") for c in cols])
+    for t, row in zip(times, data.tolist()):
+        yield {"t": int(t), **dict(zip(cols, row))}
+
+
+async def replay(df: pd.DataFrame, speed: float = 0) -> AsyncIterator[Dict[str, Any]]:
+    """Gespeicherte Bars als Live-Feed abspielen, `speed` Bars/Sekunde (0 = so schnell wie möglich)."""
+    for bar in bar_dicts(df):
+        yield bar
+        await asyncio.sleep(1 / speed if speed > 0 else 0)
@@ -0,0 +1,336 @@
+"""
+Laufzeit-Metriken: benannte Timing-Spans, Zähler, Histogramme.
+
+`with span("fetch"): ...` misst eine Stufe: die Dauer landet im Histogramm
+quantos_stage_seconds und – innerhalb eines HTTP-Requests – in dessen
+Server-Timing-Header (TimingMiddleware). `registry.render()` liefert alles im
+Prometheus-Textformat; Collector-Funktionen steuern Werte bei, die andere
+Komponenten ohnehin zählen (Cache-Statistiken).
+
+Optional läuft für einen einzelnen Request ein Sampling-Profiler
+(Header `X-QuantOS-Profile: 1`); das Ergebnis ist über die zurückgegebene
+Profil-ID abrufbar.
+"""
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# ─── Konfiguration ───────────────────────────────────────────────────────────
+BUCKETS          = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+PROFILER_ENABLED = os.environ.get("QUANTOS_PROFILER", "1") != "0"
+PROFILE_INTERVAL = 0.002          # Sekunden zwischen zwei Stack-Samples
+PROFILES_KEPT    = 16
+# ─────────────────────────────────────────────────────────────────────────────
+
+Labels = Tuple[Tuple[str, str], ...]
+_ROOT  = str(Path(__file__).resolve().parents[2])
+
+
+def _labels(labelnames: Sequence[str], values: Dict[str, Any]) -> Labels:
+    return tuple((name, str(values.get(name, ""))) for name in labelnames)
+
+
+def _fmt_labels(labels: Labels, extra: Labels = ()) -> str:
+    items = labels + extra
+    if not items:
+        return ""
+    escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in items)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(items, escaped)) + "}"
+
+
+def _fmt_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, value: float = 1, **labels):
+        key = _labels(self.labelnames, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def value(self, **labels) -> float:
+        return self._values.get(_labels(self.labelnames, labels), 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_fmt_labels(k)} {_fmt_value(v)}" for k, v in items]
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = BUCKETS):
+        self.name, self.help, self.labelnames = name, help, tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[Labels, list] = {}          # Labels -> [Bucket-Zähler..., Summe, Anzahl]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = _labels(self.labelnames, labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry[i] += 1
+            entry[-2] += value
+            entry[-1] += 1
+
+    def count(self, **labels) -> int:
+        entry = self._values.get(_labels(self.labelnames, labels))
+        return entry[-1] if entry else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((k, list(v)) for k, v in self._values.items())
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, entry in items:
+            for bound, n in zip(self.buckets, entry):
+                lines.append(f"{self.name}_bucket{_fmt_labels(key, (('le', _fmt_value(bound)),))} {n}")
+            lines.append(f"{self.name}_bucket{_fmt_labels(key, (('le', '+Inf'),))} {entry[-1]}")
+            lines.append(f"{self.name}_sum{_fmt_labels(key)} {_fmt_value(entry[-2])}")
+            lines.append(f"{self.name}_count{_fmt_labels(key)} {entry[-1]}")
+        return lines
+
+
+# Collector: () -> [(Name, Typ, Hilfe, [(Labels-Dict, Wert), ...]), ...]
+Collector = Callable[[], List[Tuple[str, str, str, List[Tuple[Dict[str, Any], float]]]]]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: "OrderedDict[str, Any]" = OrderedDict()
+        self._collectors: List[Collector] = []
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._metrics.setdefault(name, Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = BUCKETS) -> Histogram:
+        return self._metrics.setdefault(name, Histogram(name, help, labelnames, buckets))
+
+    def collector(self, fn: Collector) -> Collector:
+        self._collectors.append(fn)
+        return fn
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines += metric.render()
+        for fn in self._collectors:
+            try:
+                families = fn()
+            except Exception as e:
+                print(f"[Metrics] Collector {getattr(fn, '__name__', fn)} fehlgeschlagen: {e}")
+                continue
+            for name, kind, help, samples in families:
+                lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+                lines += [f"{name}{_fmt_labels(tuple((k, str(v)) for k, v in labels.items()))} {_fmt_value(value)}"
+                          for labels, value in samples]
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+REQUEST_SECONDS = registry.histogram("quantos_request_seconds", "HTTP-Latenz bis zum Ende der Antwort",
+                                     ("method", "route", "status"))
+STAGE_SECONDS   = registry.histogram("quantos_stage_seconds", "Dauer benannter Verarbeitungsstufen", ("stage",))
+RESPONSE_BYTES  = registry.counter("quantos_response_bytes_total", "Serialisierte Antwort-Bytes", ("format",))
+BARS_FETCHED    = registry.counter("quantos_bars_fetched_total", "Von Alpaca geholte Bars", ("timeframe",))
+CACHE_REQUESTS  = registry.counter("quantos_cache_requests_total", "Cache-Zugriffe nach Ergebnis",
+                                   ("cache", "result"))
+
+
+# ─── Spans ───────────────────────────────────────────────────────────────────
+_timings: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("quantos_timings", default=None)
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Stufe messen (Histogramm + Server-Timing des laufenden Requests)."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - t0
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        timings = _timings.get()
+        if timings is not None:
+            timings.append((stage, elapsed))
+
+
+def cache_result(cache: str, hit: bool):
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def server_timing(timings: List[Tuple[str, float]], total: float) -> str:
+    """Header-Wert `stage;dur=ms, ...` (gleichnamige Stufen summiert) plus `app` für die Gesamtzeit."""
+    merged: "OrderedDict[str, float]" = OrderedDict()
+    for stage, seconds in timings:
+        merged[stage] = merged.get(stage, 0.0) + seconds
+    parts = [f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in merged.items()]
+    parts.append(f"app;dur={total * 1000:.1f}")
+    return ", ".join(parts)
+
+
+# ─── Sampling-Profiler ───────────────────────────────────────────────────────
+class Sampler:
+    """
+    Stack-Sampler für die Dauer eines Requests: zieht alle PROFILE_INTERVAL
+    Sekunden die Stacks aller Threads und zählt die, die durch Projekt-Code
+    laufen (Endpoint-Threads, Pool-Runner). Ergebnis als Collapsed-Stacks
+    (Flamegraph-Format) und Self-Time pro Funktion.
+    """
+
+    def __init__(self, interval: float = PROFILE_INTERVAL):
+        self.interval = interval
+        self.stacks: Dict[str, int] = {}
+        self.samples = 0
+        self._stop   = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="quantos-sampler")
+        self._t0     = 0.0
+        self.duration = 0.0
+
+    def start(self) -> "Sampler":
+        self._t0 = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                ours  = False
+                while frame is not None:
+                    code = frame.f_code
+                    ours = ours or code.co_filename.startswith(_ROOT)
+                    stack.append(f"{Path(code.co_filename).name}:{code.co_name}:{frame.f_lineno}")
+                    frame = frame.f_back
+                if ours:
+                    key = ";".join(reversed(stack))
+                    self.stacks[key] = self.stacks.get(key, 0) + 1
+            self.samples += 1
+
+    def stop(self) -> Dict[str, Any]:
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self._t0
+        own_time: Dict[str, int] = {}
+        for key, n in self.stacks.items():
+            leaf = key.rsplit(";", 1)[-1].rsplit(":", 1)[0]
+            own_time[leaf] = own_time.get(leaf, 0) + n
+        return {
+            "interval_ms": self.interval * 1000,
+            "duration_ms": round(self.duration * 1000, 1),
+            "samples":     self.samples,
+            "top":         sorted(own_time.items(), key=lambda kv: -kv[1])[:25],
+            "stacks":      dict(sorted(self.stacks.items(), key=lambda kv: -kv[1])),
+        }
+
+
+class ProfileStore:
+    def __init__(self, size: int = PROFILES_KEPT):
+        self.size   = size
+        self._items: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock  = threading.Lock()
+
+    def put(self, profile_id: str, profile: Dict[str, Any]):
+        with self._lock:
+            self._items[profile_id] = profile
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._items.get(profile_id)
+
+
+profiles = ProfileStore()
+
+
+# ─── ASGI-Middleware ─────────────────────────────────────────────────────────
+def _format(content_type: str) -> str:
+    if content_type.startswith("application/json"):
+        return "json"
+    if content_type.startswith("text/event-stream"):
+        return "sse"
+    if content_type.startswith("application/vnd.quantos"):
+        return "binary"
+    return "other"
+
+
+def _route_label(scope) -> str:
+    """Pfad-Vorlage des Requests (`/api/backtest/jobs/{job_id}`), damit Labels nicht pro ID wachsen."""
+    if "route" not in scope:
+        return "unmatched"
+    by_value = {str(v): k for k, v in (scope.get("path_params") or {}).items()}
+    return "/".join("{" + by_value[seg] + "}" if seg in by_value else seg
+                    for seg in scope.get("path", "").split("/"))
+
+
+class TimingMiddleware:
+    """
+    Pro HTTP-Request: Span-Sammlung (ContextVar), Server-Timing-Header beim
+    Antwortstart, Latenz-Histogramm und Antwort-Bytes nach Format am Ende.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        timings: List[Tuple[str, float]] = []
+        token   = _timings.set(timings)
+        t0      = time.perf_counter()
+        state   = {"status": 500, "format": "other", "bytes": 0}
+
+        profile_id, sampler = None, None
+        headers = dict(scope.get("headers") or [])
+        if PROFILER_ENABLED and headers.get(b"x-quantos-profile", b"") not in (b"", b"0"):
+            profile_id, sampler = uuid.uuid4().hex[:12], Sampler().start()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+                out = list(message.get("headers") or [])
+                content_type = next((v.decode("latin-1") for k, v in out if k.lower() == b"content-type"), "")
+                state["format"] = _format(content_type)
+                out.append((b"server-timing", server_timing(timings, time.perf_counter() - t0).encode("latin-1")))
+                if profile_id:
+                    out.append((b"x-quantos-profile-id", profile_id.encode("latin-1")))
+                message = {**message, "headers": out}
+            elif message["type"] == "http.response.body":
+                state["bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _timings.reset(token)
+            REQUEST_SECONDS.observe(time.perf_counter() - t0, method=scope.get("method", ""),
+                                    route=_route_label(scope), status=state["status"])
+            RESPONSE_BYTES.inc(state["bytes"], format=state["format"])
+            if sampler is not None:
+                profiles.put(profile_id, {"path": scope.get("path"), **sampler.stop()})
@@ -0,0 +1,180 @@
+import sys
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .barstore import _to_ns
+
+# ─── Konfiguration ───────────────────────────────────────────────────────────
+# Kurse als float32 (7 signifikante Stellen, Prozente werden in float64 gerechnet)
+PANEL_DTYPE = np.float32
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def _index_dtype(d: int) -> type:
+    """Kleinster Integer-Typ für Spaltenindizes 0..d."""
+    return np.int16 if d < 2 ** 15 else np.int32
+
+
+class BarPanel:
+    """
+    Ausgerichtetes 2-D-Panel (Symbole × Datumsachse) für Open/Close.
+
+    Fehlende Bars sind NaN. `next_bar` enthält pro Zelle den Spaltenindex
+    des nächsten vorhandenen Bars (oder D), damit "erster Bar ab
+    Zeitpunkt X" ein reiner Array-Lookup ist. Kurse liegen als float32,
+    Spaltenindizes als int16 (bis 32767 Tage) – ~10 Byte pro Zelle.
+    """
+
+    def __init__(self, symbols: List[str], dates: np.ndarray,
+                 open_: np.ndarray, close: np.ndarray):
+        self.symbols = symbols
+        self.row     = {sym: i for i, sym in enumerate(symbols)}
+        self.dates   = dates            # int64 ns, aufsteigend
+        self.open    = open_            # (N, D) PANEL_DTYPE
+        self.close   = close            # (N, D) PANEL_DTYPE
+        self._index()
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def last_timestamps(self) -> Dict[str, Optional[int]]:
+        """Zeitstempel (ns) des letzten Bars je Symbol."""
+        return {sym: int(self.dates[c]) if c >= 0 else None
+                for sym, c in zip(self.symbols, self.last_col.tolist())}
+
+    def _index(self):
+        n, d = self.close.shape
+        cols = np.arange(d)
+
+        has_close = ~np.isnan(self.close)
+        last = d - 1 - np.argmax(has_close[:, ::-1], axis=1) if d else np.zeros(n, dtype=int)
+        self.last_col   = np.where(has_close.any(axis=1), last, -1)
+        self.last_close = np.where(self.last_col >= 0,
+                                   self.close[np.arange(n), np.maximum(self.last_col, 0)] if d else np.nan,
+                                   np.nan).astype("float64")
+
+        # Nächster vorhandener Bar je Spalte: umgekehrtes laufendes Minimum
+        has_bar = ~np.isnan(self.open) | has_close
+        idx = np.where(has_bar, cols, d).astype(_index_dtype(d))
+        self.next_bar = np.minimum.accumulate(idx[:, ::-1], axis=1)[:, ::-1] if d else idx
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame]) -> "BarPanel":
+        symbols = [s for s, df in frames.items() if not df.empty]
+        if not symbols:
+            empty = np.empty((0, 0), dtype=PANEL_DTYPE)
+            return cls([], np.empty(0, dtype="int64"), empty, empty)
+
+        stamps = [frames[s].index.as_unit("ns").asi8 for s in symbols]
+        dates  = np.unique(np.concatenate(stamps))
+        n, d   = len(symbols), len(dates)
+
+        open_ = np.full((n, d), np.nan, dtype=PANEL_DTYPE)
+        close = np.full((n, d), np.nan, dtype=PANEL_DTYPE)
+        for i, (sym, ts) in enumerate(zip(symbols, stamps)):
+            cols = np.searchsorted(dates, ts)
+            open_[i, cols] = frames[sym]["open"].to_numpy(dtype="float64")
+            close[i, cols] = frames[sym]["close"].to_numpy(dtype="float64")
+        return cls(symbols, dates, open_, close)
+
+    @property
+    def nbytes(self) -> int:
+        """Speicher der Arrays plus Symbol-Index (Schätzung für die Python-Objekte)."""
+        arrays = (self.dates, self.open, self.close, self.next_bar, self.last_col, self.last_close)
+        return sum(a.nbytes for a in arrays) + sum(sys.getsizeof(s) + 8 for s in self.symbols) \
+            + sys.getsizeof(self.row)
+
+    def stats(self) -> Dict[str, object]:
+        return {"symbols": len(self.symbols), "days": len(self.dates), "bytes": self.nbytes,
+                "dtype": np.dtype(PANEL_DTYPE).name}
+
+    def cutoff_columns(self, cutoffs: Dict[str, datetime]) -> Tuple[int, ...]:
+        """Spaltenpositionen der Cutoffs – ändern sie sich nicht, bleiben alte Fenster gültig."""
+        return (len(self.dates), int(self.dates[0]) if len(self.dates) else 0,
+                *(int(np.searchsorted(self.dates, _to_ns(c), side="left")) for c in cutoffs.values()))
+
+    def update(self, frames: Dict[str, pd.DataFrame], keep_from: Optional[datetime] = None) -> np.ndarray:
+        """
+        Merged neue Bars in das bestehende Panel (überschreibt vorhandene
+        Zellen, hängt neue Tage/Symbole an) und gibt die Indizes der
+        betroffenen Zeilen zurück. Mit `keep_from` fallen ältere Spalten weg.
+        """
+        frames = {s: df for s, df in frames.items() if not df.empty}
+        new_syms = [s for s in frames if s not in self.row]
+        stamps   = {s: df.index.as_unit("ns").asi8 for s, df in frames.items()}
+
+        dates = self.dates
+        if stamps:
+            dates = np.union1d(dates, np.concatenate(list(stamps.values())))
+        if keep_from is not None:
+            dates = dates[dates >= _to_ns(keep_from)]
+
+        if len(dates) != len(self.dates) or new_syms or not np.array_equal(dates, self.dates):
+            # Achsen haben sich geändert: Matrizen einmal umkopieren
+            n_old, n = len(self.symbols), len(self.symbols) + len(new_syms)
+            open_ = np.full((n, len(dates)), np.nan, dtype=PANEL_DTYPE)
+            close = np.full((n, len(dates)), np.nan, dtype=PANEL_DTYPE)
+            keep  = np.isin(self.dates, dates)
+            cols  = np.searchsorted(dates, self.dates[keep])
+            open_[:n_old, cols] = self.open[:, keep]
+            close[:n_old, cols] = self.close[:, keep]
+            self.symbols = self.symbols + new_syms
+            self.row     = {sym: i for i, sym in enumerate(self.symbols)}
+            self.dates, self.open, self.close = dates, open_, close
+
+        rows = []
+        for sym, ts in stamps.items():
+            inside = ts >= self.dates[0] if len(self.dates) else np.zeros(len(ts), dtype=bool)
+            if not inside.any():
+                continue
+            i    = self.row[sym]
+            cols = np.searchsorted(self.dates, ts[inside])
+            self.open[i, cols]  = frames[sym]["open"].to_numpy(dtype="float64")[inside]
+            self.close[i, cols] = frames[sym]["close"].to_numpy(dtype="float64")[inside]
+            rows.append(i)
+
+        self._index()
+        return np.asarray(sorted(rows), dtype=int)
+
+    def changes(self, cutoffs: Dict[str, datetime],
+                rows: Optional[np.ndarray] = None) -> Dict[str, Dict[str, Optional[float]]]:
+        """
+        Prozentänderung letzter Close vs. Open des ersten Bars ab jedem Cutoff.
+        Ein Durchlauf: searchsorted auf der Datumsachse + Array-Arithmetik.
+        Mit `rows` nur für diese Zeilen.
+        """
+        d     = self.close.shape[1]
+        rows  = np.arange(len(self.symbols)) if rows is None else np.asarray(rows, dtype=int)
+        n     = len(rows)
+        valid = self.last_col[rows] >= 0
+
+        columns: Dict[str, List[Optional[float]]] = {}
+        for label, cutoff in cutoffs.items():
+            pos = int(np.searchsorted(self.dates, _to_ns(cutoff), side="left"))
+            if pos >= d:
+                columns[label] = [None] * n
+                continue
+            col  = self.next_bar[rows, pos]
+            hit  = col < d
+            base = np.where(hit, self.open[rows, np.minimum(col, d - 1)].astype("float64"), np.nan)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                pct = np.round((self.last_close[rows] - base) / base * 100.0, 2)
+            ok  = hit & (base > 0.0)
+            out = pct.astype(object)
+            out[~ok] = None
+            columns[label] = out.tolist()
+
+        prices = np.round(self.last_close[rows], 2).tolist()
+        result: Dict[str, Dict[str, Optional[float]]] = {}
+        for i, r in enumerate(rows.tolist()):
+            if not valid[i]:
+                continue
+            sym = self.symbols[r]
+            entry: Dict[str, Optional[float]] = {"price": prices[i]}
+            for label, vals in columns.items():
+                entry[label] = vals[i]
+            result[sym] = entry
+        return result
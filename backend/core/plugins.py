@@ -0,0 +1,202 @@
+"""
+Plugin-Registry für indicators/ und strategies/.
+
+Ein Plugin ist eine Datei `<name>.py` mit einer gleichnamigen Funktion
+(`def sma(df, period=20, ...)`). Die Registry findet Plugins über die
+Dateien selbst (Name, mtime, Funktionskopf per `ast`), ohne sie zu
+importieren; importiert wird erst beim ersten Zugriff. Signatur und
+kwargs-Filter werden pro Funktion einmal ermittelt.
+
+Geänderte Dateien werden bei der nächsten Nutzung neu geladen
+(mtime-Vergleich, höchstens alle PLUGIN_RELOAD_INTERVAL Sekunden) – ohne
+Neustart von uvicorn. Ein fehlerhafter Reload behält die alte Version.
+"""
+import ast
+import importlib
+import inspect
+import os
+import threading
+import time
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# ─── Konfiguration ───────────────────────────────────────────────────────────
+# Sekunden zwischen zwei mtime-Prüfungen, 0 = kein Hot-Reload
+PLUGIN_RELOAD_INTERVAL = float(os.environ.get("QUANTOS_PLUGIN_RELOAD", "2"))
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def _literal(node: Optional[ast.expr]) -> Any:
+    try:
+        return ast.literal_eval(node) if node is not None else None
+    except ValueError:
+        return ast.unparse(node)
+
+
+def read_meta(path: Path, name: str) -> Optional[Dict[str, Any]]:
+    """Funktionskopf `name` aus dem Quelltext: Parameter (ohne df) mit Defaults, Docstring."""
+    try:
+        tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    except (OSError, SyntaxError, UnicodeDecodeError) as e:
+        print(f"[Plugins] {path.name} nicht lesbar: {e}")
+        return None
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name == name:
+            args     = node.args.posonlyargs + node.args.args
+            defaults = [None] * (len(args) - len(node.args.defaults)) + list(node.args.defaults)
+            params   = {a.arg: _literal(d) for a, d in zip(args, defaults)}
+            params.update({a.arg: _literal(d) for a, d in zip(node.args.kwonlyargs, node.args.kw_defaults)})
+            params.pop(args[0].arg if args else "", None)          # erstes Argument = df
+            return {"params": params, "doc": ast.get_docstring(node) or ""}
+    return None
+
+
+class Plugin:
+    """Eine Plugin-Datei: Metadaten sofort, Modul/Funktion/Signatur erst beim Laden."""
+
+    def __init__(self, name: str, path: Path, mtime: float, meta: Dict[str, Any]):
+        self.name   = name
+        self.path   = path
+        self.mtime  = mtime
+        self.meta   = meta
+        self.stale  = False
+        self.module = None
+        self.fn: Optional[Callable] = None
+        self.valid: frozenset = frozenset()
+        self.var_kw = False
+
+    def bind(self, module):
+        self.module = module
+        self.fn     = getattr(module, self.name)
+        params      = inspect.signature(self.fn).parameters.values()
+        self.valid  = frozenset(p.name for p in params)
+        self.var_kw = any(p.kind == inspect.Parameter.VAR_KEYWORD for p in params)
+        self.stale  = False
+
+    def filter(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        if self.var_kw:
+            return kwargs
+        return {k: v for k, v in kwargs.items() if k in self.valid}
+
+
+class PluginRegistry(Mapping):
+    """
+    Name -> Plugin-Funktion (wie früher `load_modules`), aber lazy und mit
+    Hot-Reload. `call` ruft mit gefilterten kwargs auf, `describe` liefert
+    Parameter aller Plugins ohne Import. Listener (`on_reload`) erfahren
+    von neu geladenen Plugins, z.B. um Ergebnis-Caches zu leeren.
+    """
+
+    def __init__(self, package: str, reload_interval: float = PLUGIN_RELOAD_INTERVAL):
+        self.package  = package
+        self.folder   = Path(importlib.import_module(package).__file__).parent
+        self.reload_interval = reload_interval
+        self._plugins: Dict[str, Plugin] = {}
+        self._ignored: Dict[Path, float] = {}       # Dateien ohne Plugin-Funktion -> mtime
+        self._listeners: List[Callable[[str], None]] = []
+        self._lock      = threading.RLock()
+        self._last_scan = 0.0
+        self._stats     = {"scans": 0, "imports": 0, "reloads": 0, "reload_errors": 0}
+        self._scan()
+
+    # ── Dateien ──────────────────────────────────────────────────────────────
+    def _scan(self):
+        """Plugin-Dateien abgleichen: neue aufnehmen, geänderte als veraltet markieren, gelöschte entfernen."""
+        with self._lock:
+            seen = set()
+            for path in sorted(self.folder.glob("*.py")):
+                name = path.stem
+                if name.startswith("_"):
+                    continue
+                try:
+                    mtime = path.stat().st_mtime
+                except OSError:
+                    continue
+                plugin = self._plugins.get(name)
+                if plugin is not None and plugin.mtime == mtime:
+                    seen.add(name)
+                    continue
+                if plugin is None and self._ignored.get(path) == mtime:
+                    continue
+                meta = read_meta(path, name)
+                if plugin is None:
+                    if meta is None:
+                        self._ignored[path] = mtime
+                        continue
+                    self._plugins[name] = Plugin(name, path, mtime, meta)
+                else:
+                    # Unlesbare Änderung: Plugin bleibt, der Reload scheitert und behält die alte Version
+                    plugin.mtime, plugin.meta = mtime, meta or plugin.meta
+                    plugin.stale = plugin.module is not None
+                seen.add(name)
+            for name in set(self._plugins) - seen:
+                del self._plugins[name]
+            self._last_scan = time.monotonic()
+            self._stats["scans"] += 1
+
+    def _maybe_scan(self):
+        if self.reload_interval > 0 and time.monotonic() - self._last_scan >= self.reload_interval:
+            self._scan()
+
+    # ── Laden ────────────────────────────────────────────────────────────────
+    def plugin(self, name: str) -> Plugin:
+        """Geladenes Plugin (Import beim ersten Zugriff, Reload wenn die Datei geändert wurde)."""
+        self._maybe_scan()
+        plugin = self._plugins.get(name)
+        if plugin is None:
+            raise KeyError(name)
+        if plugin.fn is not None and not plugin.stale:
+            return plugin
+        with self._lock:
+            if plugin.fn is None:
+                plugin.bind(importlib.import_module(f"{self.package}.{name}"))
+                self._stats["imports"] += 1
+            elif plugin.stale:
+                try:
+                    plugin.bind(importlib.reload(plugin.module))
+                except Exception as e:
+                    plugin.stale = False            # alte Version behalten, bis die Datei erneut geändert wird
+                    self._stats["reload_errors"] += 1
+                    print(f"[Plugins] Reload {self.package}.{name} fehlgeschlagen: {e}")
+                    return plugin
+                self._stats["reloads"] += 1
+                print(f"[Plugins] {self.package}.{name} neu geladen")
+                for listener in self._listeners:
+                    listener(name)
+        return plugin
+
+    def call(self, name: str, df, *args, **kwargs):
+        """Plugin aufrufen; unbekannte kwargs werden anhand der gecachten Signatur verworfen."""
+        plugin = self.plugin(name)
+        return plugin.fn(df, *args, **plugin.filter(kwargs))
+
+    def on_reload(self, fn: Callable[[str], None]) -> Callable[[str], None]:
+        self._listeners.append(fn)
+        return fn
+
+    # ── Mapping ──────────────────────────────────────────────────────────────
+    def __getitem__(self, name: str) -> Callable:
+        return self.plugin(name).fn
+
+    def __contains__(self, name: object) -> bool:
+        self._maybe_scan()
+        return name in self._plugins
+
+    def __iter__(self) -> Iterator[str]:
+        self._maybe_scan()
+        return iter(sorted(self._plugins))
+
+    def __len__(self) -> int:
+        self._maybe_scan()
+        return len(self._plugins)
+
+    def describe(self) -> Dict[str, Dict[str, Any]]:
+        """Parameter/Docstring aller Plugins aus dem Quelltext (ohne Import)."""
+        self._maybe_scan()
+        return {name: dict(p.meta, loaded=p.fn is not None) for name, p in sorted(self._plugins.items())}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "plugins": len(self._plugins),
+                    "loaded": sum(p.fn is not None for p in self._plugins.values())}
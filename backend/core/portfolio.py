@@ -0,0 +1,78 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .engine import run_strategy
+from .utils import get_pool, MAX_WORKERS
+
+# ─── Konfiguration ───────────────────────────────────────────────────────────
+PARALLEL_MIN_SYMBOLS = 16   # darunter lohnt sich der Prozesspool nicht
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+def _evaluate_chunk(frames: Dict[str, pd.DataFrame], strategy: str,
+                    active_indicators: List[str], params: Dict[str, float]
+                    ) -> Dict[str, Tuple[pd.Series, pd.Series]]:
+    """Worker: (strat_ret, returns) pro Symbol auf dem nativen Bar-Raster."""
+    out: Dict[str, Tuple[pd.Series, pd.Series]] = {}
+    for sym, df in frames.items():
+        try:
+            res = run_strategy(df, strategy, active_indicators, params)
+        except Exception as e:
+            print(f"[Portfolio] {sym}: {e}")
+            continue
+        out[sym] = (res["strat_ret"].fillna(0.0), res["returns"].fillna(0.0))
+    return out
+
+
+def evaluate_symbols(frames: Dict[str, pd.DataFrame], strategy: str,
+                     active_indicators: List[str], params: Dict[str, float]
+                     ) -> Dict[str, Tuple[pd.Series, pd.Series]]:
+    """Strategie pro Symbol ausführen – ab PARALLEL_MIN_SYMBOLS im Prozesspool."""
+    if len(frames) < PARALLEL_MIN_SYMBOLS:
+        return _evaluate_chunk(frames, strategy, active_indicators, params)
+
+    symbols  = list(frames.keys())
+    n_chunks = min(MAX_WORKERS * 2, len(symbols))
+    chunks   = [symbols[i::n_chunks] for i in range(n_chunks)]
+    pool     = get_pool()
+    futures  = [
+        pool.submit(_evaluate_chunk, {s: frames[s] for s in chunk}, strategy, active_indicators, params)
+        for chunk in chunks
+    ]
+    results: Dict[str, Tuple[pd.Series, pd.Series]] = {}
+    for f in futures:
+        results.update(f.result())
+    return results
+
+
+def aggregate(results: Dict[str, Tuple[pd.Series, pd.Series]],
+              weights: Dict[str, float], capital: float) -> Dict[str, object]:
+    """
+    Richtet alle Symbole auf einen gemeinsamen Zeitindex aus und bildet
+    je Symbol einen Sleeve (capital * weight), der unabhängig compoundet.
+    Portfolio-Equity = Summe der Sleeves.
+    """
+    symbols = [s for s in weights if s in results]
+    index   = results[symbols[0]][0].index
+    for sym in symbols[1:]:
+        index = index.union(results[sym][0].index)
+
+    # Fehlende Bars -> 0 % Rendite (Position hält den letzten Wert)
+    strat = np.column_stack([results[s][0].reindex(index, fill_value=0.0).to_numpy() for s in symbols])
+    bh    = np.column_stack([results[s][1].reindex(index, fill_value=0.0).to_numpy() for s in symbols])
+    w     = np.array([weights[s] for s in symbols]) * capital
+
+    sleeves    = np.cumprod(1.0 + strat, axis=0) * w
+    bh_sleeves = np.cumprod(1.0 + bh,    axis=0) * w
+
+    return {
+        "index":      index,
+        "symbols":    symbols,
+        "strat_ret":  strat,
+        "sleeves":    sleeves,
+        "equity":     sleeves.sum(axis=1),
+        "bh_equity":  bh_sleeves.sum(axis=1),
+        "allocated":  w,
+    }
@@ -0,0 +1,155 @@
+"""
+Lokales Resampling: gröbere Intraday-Bars aus feineren ableiten.
+
+Statt für 5m, 15m, 30m und 1h jeweils eigene Alpaca-Requests zu stellen,
+lädt `bars.load_bars` die feinste passende Granularität (Basis) einmal in
+den Bar-Store und aggregiert daraus vektorisiert (OHLCV). Ein Wechsel
+zwischen Timeframes desselben Zeitraums ist dann eine lokale Operation.
+
+Buckets:
+    Aktien – sessionbezogen in America/New_York: Pre-Market ab 04:00,
+             regulär ab 09:30, Post-Market ab 16:00. Ein Bucket beginnt am
+             Session-Start und überschreitet nie eine Session-Grenze
+             (1h regulär = 09:30, 10:30, ..., 15:30–16:00).
+    Crypto – 24/7, am UTC-Raster ausgerichtet.
+
+Tagesbars bleiben native Alpaca-Bars (offizielle Session-OHLC, 390-mal
+weniger Daten als Minutenbars).
+"""
+import os
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# ─── Konfiguration ───────────────────────────────────────────────────────────
+# Ableitbare Intervalle in Minuten (Schlüssel wie TIMEFRAME_MAP)
+MINUTES = {"1m": 1, "5m": 5, "15m": 15, "30m": 30, "1h": 60}
+# Bis zu dieser Spanne werden Intraday-Anfragen direkt aus 1m-Bars bedient
+# (ein Download, danach sind alle Intervalle lokal)
+MINUTE_BASE_SPAN = timedelta(days=int(os.environ.get("QUANTOS_RESAMPLE_MINUTE_DAYS", "31")))
+RESAMPLE_CACHE_BYTES = int(os.environ.get("QUANTOS_RESAMPLE_CACHE_MB", "128")) * 2 ** 20
+EXCHANGE_TZ = "America/New_York"
+# Session-Starts in Minuten nach Mitternacht (Ortszeit der Börse)
+SESSIONS = np.array([4 * 60, 9 * 60 + 30, 16 * 60], dtype="int64")
+# ─────────────────────────────────────────────────────────────────────────────
+
+_MINUTE_NS = 60 * 10 ** 9
+_DAY_NS    = 24 * 60 * _MINUTE_NS
+
+
+def bases(interval: str) -> List[str]:
+    """Feinere Intervalle, aus denen `interval` exakt ableitbar ist (feinstes zuerst)."""
+    if interval not in MINUTES:
+        return []
+    return [b for b, m in sorted(MINUTES.items(), key=lambda kv: kv[1])
+            if m < MINUTES[interval] and MINUTES[interval] % m == 0]
+
+
+def _bucket_labels(index: pd.DatetimeIndex, minutes: int, session: bool) -> np.ndarray:
+    """Bucket-Start je Bar als UTC-ns (monoton steigend für sortierte Bars)."""
+    utc   = index.as_unit("ns").asi8
+    width = minutes * _MINUTE_NS
+    if not session:
+        return utc - utc % width
+    local = index.tz_convert(EXCHANGE_TZ).tz_localize(None).as_unit("ns").asi8
+    day   = local - local % _DAY_NS
+    minute_of_day = (local - day) // _MINUTE_NS
+    # Session-Start des Bars (vor 04:00 zählt zur ersten Session)
+    start = SESSIONS[np.maximum(np.searchsorted(SESSIONS, minute_of_day, side="right") - 1, 0)]
+    anchor = day + start * _MINUTE_NS
+    label_local = anchor + (local - anchor) // width * width
+    # Zurück nach UTC über den Abstand zum Bar selbst (kein Umweg über tz_localize/DST)
+    return utc - (local - label_local)
+
+
+def resample(df: pd.DataFrame, interval: str, session: bool = True) -> pd.DataFrame:
+    """
+    OHLCV-Bars auf `interval` aggregieren: open = erster, high = Max,
+    low = Min, close = letzter Wert, volume/trade_count = Summe,
+    vwap volumengewichtet. Index = Bucket-Start (UTC).
+    """
+    if df.empty:
+        return df.copy()
+    labels = _bucket_labels(df.index, MINUTES[interval], session)
+    starts = np.flatnonzero(np.r_[True, labels[1:] != labels[:-1]])
+    ends   = np.r_[starts[1:], len(labels)] - 1
+
+    out: Dict[str, np.ndarray] = {}
+    for col in df.columns:
+        values = df[col].to_numpy(dtype="float64")
+        if col == "open":
+            out[col] = values[starts]
+        elif col == "high":
+            out[col] = np.maximum.reduceat(values, starts)
+        elif col == "low":
+            out[col] = np.minimum.reduceat(values, starts)
+        elif col in ("volume", "trade_count"):
+            out[col] = np.add.reduceat(values, starts)
+        elif col == "vwap" and "volume" in df.columns:
+            volume = df["volume"].to_numpy(dtype="float64")
+            vol    = np.add.reduceat(volume, starts)
+            turn   = np.add.reduceat(np.nan_to_num(values * volume), starts)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                out[col] = np.where(vol > 0, turn / vol, values[ends])
+        else:                                           # close und unbekannte Spalten: letzter Wert
+            out[col] = values[ends]
+
+    index = pd.DatetimeIndex(labels[starts].astype("datetime64[ns]"), name=df.index.name)
+    index = index.tz_localize("UTC").as_unit(df.index.unit)
+    return pd.DataFrame(out, index=index)
+
+
+class ResampleCache:
+    """
+    LRU-Cache abgeleiteter Frames, nach Bytes begrenzt. Nur abgeschlossene
+    Zeiträume werden gecacht (die Basis jüngerer Bars kann sich noch ändern).
+    """
+
+    def __init__(self, max_bytes: int = RESAMPLE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._items: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+        self._bytes = 0
+        self._lock  = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def get(self, key: tuple) -> Optional[pd.DataFrame]:
+        with self._lock:
+            df = self._items.get(key)
+            if df is None:
+                self._stats["misses"] += 1
+                return None
+            self._items.move_to_end(key)
+            self._stats["hits"] += 1
+        return df.copy()
+
+    def put(self, key: tuple, df: pd.DataFrame):
+        size = int(df.memory_usage(index=True).sum())
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= int(old.memory_usage(index=True).sum())
+            self._items[key] = df.copy()
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._items:
+                _, evicted = self._items.popitem(last=False)
+                self._bytes -= int(evicted.memory_usage(index=True).sum())
+                self._stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "entries": len(self._items), "bytes": self._bytes,
+                    "max_bytes": self.max_bytes}
+
+
+resample_cache = ResampleCache()
@@ -0,0 +1,149 @@
+"""
+In-Memory-Suchindex über den Asset-Katalog.
+
+Ticker-Präfixe per Binärsuche über die sortierten Symbole, Namens-Tokens
+per Binärsuche über die sortierte Token-Liste (Präfix je Token), Facetten
+als Bool-Masken. Der Index wird einmal pro Katalog-Snapshot gebaut.
+"""
+import bisect
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+FACETS = ("type", "sector", "market_cap", "asset_class")
+MAX_LIMIT = 100
+_TOKEN = re.compile(r"[A-Z0-9]+")
+
+# Ranking: exakter Ticker > Ticker-Präfix > Namens-Treffer; Bonus für populär / kurz
+_EXACT, _PREFIX, _NAME, _POPULAR = 1000.0, 500.0, 100.0, 50.0
+
+
+def _tokens(text: str) -> List[str]:
+    return _TOKEN.findall(text.upper())
+
+
+class SymbolIndex:
+    def __init__(self, items: List[Dict[str, Any]]):
+        self.items = items
+        n = len(items)
+        symbols = [s["symbol"].upper() for s in items]
+
+        # Ticker: sortierte Symbole (+ Varianten ohne Trennzeichen, z.B. BTCUSD für BTC/USD)
+        keys = sorted({(sym, i) for i, sym in enumerate(symbols)} |
+                      {(re.sub(r"[^A-Z0-9]", "", sym), i) for i, sym in enumerate(symbols)})
+        self._tickers    = [k for k, _ in keys]
+        self._ticker_ids = np.array([i for _, i in keys], dtype=np.int32)
+
+        # Namens-Tokens: Token -> Positionen, sortierte Token-Liste für Präfixe
+        postings: Dict[str, List[int]] = {}
+        for i, s in enumerate(items):
+            for tok in set(_tokens(s.get("name") or "")):
+                postings.setdefault(tok, []).append(i)
+        # flach hintereinander: ein Präfix-Bereich von Tokens ist ein zusammenhängender Slice
+        self._tokens   = sorted(postings)
+        sizes          = np.array([len(postings[t]) for t in self._tokens], dtype=np.int64)
+        self._starts   = np.concatenate(([0], np.cumsum(sizes)))
+        self._postings = np.array([i for t in self._tokens for i in postings[t]], dtype=np.int32)
+
+        # Facetten: Feld -> Wert -> Bool-Maske
+        self._facets: Dict[str, Dict[str, np.ndarray]] = {}
+        for field in FACETS:
+            values = np.array([str(s.get(field, "")) for s in items], dtype=object)
+            self._facets[field] = {v: values == v for v in np.unique(values)} if n else {}
+        self._popular = np.array([bool(s.get("is_popular")) for s in items], dtype=bool)
+        self._symbols = np.array(symbols, dtype=object)
+        self._length  = np.array([len(sym) for sym in symbols], dtype=np.float64)
+        self._alpha   = np.empty(n, dtype=np.int64)                      # alphabetischer Rang
+        self._alpha[sorted(range(n), key=symbols.__getitem__)] = np.arange(n)
+
+    # ── Bausteine ────────────────────────────────────────────────────────────
+    @staticmethod
+    def _prefix_range(keys: List[str], prefix: str) -> Tuple[int, int]:
+        lo = bisect.bisect_left(keys, prefix)
+        hi = bisect.bisect_left(keys, prefix + "\uffff")
+        return lo, hi
+
+    def _name_mask(self, token: str) -> np.ndarray:
+        mask = np.zeros(len(self.items), dtype=bool)
+        lo, hi = self._prefix_range(self._tokens, token)
+        mask[self._postings[self._starts[lo]:self._starts[hi]]] = True
+        return mask
+
+    def _filter_mask(self, filters: Dict[str, Optional[str]], popular: bool) -> np.ndarray:
+        mask = np.ones(len(self.items), dtype=bool)
+        for field, value in filters.items():
+            if value:
+                mask &= self._facets[field].get(value, np.zeros(len(self.items), dtype=bool))
+        if popular:
+            mask &= self._popular
+        return mask
+
+    # ── Suche ────────────────────────────────────────────────────────────────
+    def search(self, query: str = "", filters: Optional[Dict[str, Optional[str]]] = None,
+               popular: bool = False, offset: int = 0, limit: int = 50,
+               facets: bool = False) -> Dict[str, Any]:
+        """
+        Gerankte, paginierte Treffer. Ohne Query alphabetisch; mit Query
+        zählen Ticker-Präfix oder alle Tokens als Namens-Präfix.
+        """
+        n      = len(self.items)
+        limit  = max(0, min(int(limit), MAX_LIMIT))
+        offset = max(0, int(offset))
+        mask   = self._filter_mask(filters or {}, popular)
+        query  = query.strip().upper()
+
+        if query:
+            score = np.zeros(n)
+            lo, hi = self._prefix_range(self._tickers, query)
+            ids = self._ticker_ids[lo:hi]
+            score[ids] = _PREFIX
+            score[ids[self._symbols[ids] == query]] = _EXACT
+
+            tokens = _tokens(query)
+            if tokens:
+                name_hit = np.ones(n, dtype=bool)
+                for tok in tokens:
+                    name_hit &= self._name_mask(tok)
+                score[name_hit] = np.maximum(score[name_hit], _NAME)
+
+            mask &= score > 0
+            score += np.where(self._popular, _POPULAR, 0.0) - self._length
+            hits  = np.flatnonzero(mask)
+            order = hits[np.lexsort((self._alpha[hits], -score[hits]))]
+        else:
+            hits  = np.flatnonzero(mask)
+            order = hits[np.argsort(self._alpha[hits], kind="stable")]
+
+        result = {
+            "query":   query,
+            "total":   int(len(order)),
+            "offset":  offset,
+            "limit":   limit,
+            "results": [self._compact(self.items[i]) for i in order[offset:offset + limit]],
+        }
+        if facets:
+            result["facets"] = {
+                field: {v: int((m & mask).sum()) for v, m in self._facets[field].items() if (m & mask).any()}
+                for field in FACETS
+            }
+        return result
+
+    @staticmethod
+    def _compact(item: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: item.get(k) for k in ("symbol", "name", "exchange", "type", "sector", "market_cap")}
+
+
+# ─── Index pro Katalog-Snapshot ─────────────────────────────────────────────
+_index: Optional[SymbolIndex] = None
+_lock = threading.Lock()
+
+
+def index_for(items: List[Dict[str, Any]]) -> SymbolIndex:
+    """Index zum aktuellen Katalog-Stand; neu gebaut, sobald der Katalog eine neue Liste liefert."""
+    global _index
+    with _lock:
+        if _index is None or _index.items is not items:
+            _index = SymbolIndex(items)
+        return _index
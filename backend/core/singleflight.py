@@ -0,0 +1,153 @@
+"""
+Single-Flight: gleiche Ladevorgänge laufen nur einmal.
+
+SingleFlight (Threads): gleichzeitige Aufrufe mit demselben Schlüssel warten
+auf das Ergebnis des ersten Aufrufs (z.B. Bar-Loads identischer Backtests).
+
+StreamFlights (asyncio): ein Event-Producer (SSE) pro Schlüssel; weitere
+Abonnenten hängen sich an, bekommen die bisherigen Events nachgespielt und
+danach jedes neue. Geht der letzte Abonnent, wird der Producer abgebrochen.
+"""
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+_END = object()
+
+
+# ─── Threads ─────────────────────────────────────────────────────────────────
+class _Call:
+    def __init__(self):
+        self.done   = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None  # type: ignore
+
+
+class SingleFlight:
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock  = threading.Lock()
+        self._stats = {"calls": 0, "shared": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any],
+           clone: Optional[Callable[[Any], Any]] = None) -> Any:
+        """
+        `fn()` ausführen, außer für `key` läuft schon ein Aufruf – dann dessen
+        Ergebnis teilen (mit `clone`, falls Aufrufer es verändern dürfen).
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats["calls"] += 1
+            else:
+                self._stats["shared"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return clone(call.result) if clone else call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "in_flight": len(self._calls)}
+
+
+# ─── Streams ─────────────────────────────────────────────────────────────────
+class _Flight:
+    def __init__(self):
+        self.history: List[Any] = []
+        self.subscribers: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = set()
+        self.finished = False
+        self.task: asyncio.Task = None  # type: ignore
+        self.loop: asyncio.AbstractEventLoop = None  # type: ignore
+
+
+class StreamFlights:
+    def __init__(self):
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock  = threading.Lock()
+        self._stats = {"flights": 0, "subscribers": 0, "shared": 0, "cancelled": 0}
+
+    def _publish(self, flight: _Flight, event: Any):
+        with self._lock:
+            if event is _END:
+                flight.finished = True
+            else:
+                flight.history.append(event)
+            targets = list(flight.subscribers)
+        for loop, queue in targets:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+
+    async def _run(self, key: Hashable, flight: _Flight, events: AsyncIterator[Any]):
+        try:
+            async for event in events:
+                self._publish(flight, event)
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            self._publish(flight, _END)
+
+    async def subscribe(self, key: Hashable, factory: Callable[[], AsyncIterator[Any]]) -> AsyncIterator[Any]:
+        """
+        Events des laufenden Producers für `key` (bisherige zuerst); startet
+        `factory()` als Producer, falls keiner läuft.
+        """
+        loop  = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        entry = (loop, queue)
+        with self._lock:
+            flight = self._flights.get(key)
+            start  = flight is None
+            if start:
+                flight = self._flights[key] = _Flight()
+                flight.loop = loop
+                self._stats["flights"] += 1
+            else:
+                self._stats["shared"] += 1
+            self._stats["subscribers"] += 1
+            replay   = list(flight.history)
+            finished = flight.finished
+            flight.subscribers.add(entry)
+        if start:
+            flight.task = loop.create_task(self._run(key, flight, factory()))
+
+        try:
+            for event in replay:
+                yield event
+            if finished:
+                return
+            while True:
+                event = await queue.get()
+                if event is _END:
+                    return
+                yield event
+        finally:
+            with self._lock:
+                flight.subscribers.discard(entry)
+                orphaned = not flight.subscribers and not flight.finished
+                if orphaned:
+                    # letzter Abonnent weg: Producer abbrechen, neue Anfragen starten frisch
+                    if self._flights.get(key) is flight:
+                        del self._flights[key]
+                    self._stats["cancelled"] += 1
+            if orphaned and flight.task is not None:
+                flight.loop.call_soon_threadsafe(flight.task.cancel)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self._stats, "in_flight": len(self._flights)}
@@ -0,0 +1,126 @@
+"""
+Schneller Kaltstart: Router und schwere Importe (pandas, alpaca, Plugins)
+erst bei Bedarf.
+
+`main.py` bindet nur den Health-Router direkt ein; alle anderen Router
+lädt `LazyRouters` beim ersten Request, der nicht an /api/health geht.
+Nach dem ersten Request (der Port ist dann gebunden, z.B. das Polling von
+electron/main.js) oder spätestens nach WARMUP_DELAY Sekunden lädt ein
+Hintergrund-Thread Router und registrierte Warm-up-Hooks vor, damit auch
+der erste echte Request nicht auf Importe wartet.
+
+QUANTOS_LAZY_ROUTERS=0 lädt alles beim Import (altes Verhalten),
+QUANTOS_WARMUP=0 schaltet das Vorladen ab.
+"""
+import asyncio
+import importlib
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+# ─── Konfiguration ───────────────────────────────────────────────────────────
+LAZY_ROUTERS  = os.environ.get("QUANTOS_LAZY_ROUTERS", "1") != "0"
+WARMUP        = os.environ.get("QUANTOS_WARMUP", "1") != "0"
+WARMUP_DELAY  = float(os.environ.get("QUANTOS_WARMUP_DELAY", "1.0"))   # Sekunden nach dem Start
+EAGER_PATHS   = ("/api/health",)   # exakte Pfade, die ohne Router-Import beantwortet werden
+# ─────────────────────────────────────────────────────────────────────────────
+
+STARTED = time.perf_counter()
+
+# (Modul in backend.api, Prefix, Tag)
+RouterSpec = Tuple[str, str, str]
+
+
+class RouterLoader:
+    """Router-Module einmalig importieren und in die App einhängen (threadsicher)."""
+
+    def __init__(self, app, specs: List[RouterSpec]):
+        self.app    = app
+        self.specs  = specs
+        self.loaded = False
+        self.seconds: float = 0.0
+        self._lock  = threading.Lock()
+
+    def load(self):
+        if self.loaded:
+            return
+        with self._lock:
+            if self.loaded:
+                return
+            t0 = time.perf_counter()
+            for module, prefix, tag in self.specs:
+                router = importlib.import_module(f"backend.api.{module}").router
+                self.app.include_router(router, prefix=prefix, tags=[tag])
+            self.app.openapi_schema = None
+            self.seconds = time.perf_counter() - t0
+            self.loaded  = True
+            print(f"[Startup] {len(self.specs)} Router geladen ({self.seconds * 1000:.0f} ms)")
+
+
+class Warmup:
+    """Hooks, die nach dem Start im Hintergrund laufen (einmal, Fehler werden nur geloggt)."""
+
+    def __init__(self, delay: float = WARMUP_DELAY):
+        self.delay  = delay
+        self.hooks: List[Tuple[str, Callable[[], Any]]] = []
+        self.timings: Dict[str, float] = {}
+        self.state  = "idle"             # idle -> scheduled -> running -> done
+        self._go    = threading.Event()
+        self._lock  = threading.Lock()
+
+    def hook(self, fn: Callable[[], Any]) -> Callable[[], Any]:
+        self.hooks.append((fn.__name__, fn))
+        return fn
+
+    def start(self):
+        """Thread starten; er wartet auf `trigger()` oder `delay` Sekunden."""
+        with self._lock:
+            if self.state != "idle":
+                return
+            self.state = "scheduled"
+        threading.Thread(target=self._run, daemon=True, name="quantos-warmup").start()
+
+    def trigger(self):
+        self._go.set()
+
+    def _run(self):
+        self._go.wait(self.delay)
+        self.state = "running"
+        for name, fn in self.hooks:
+            t0 = time.perf_counter()
+            try:
+                fn()
+            except Exception as e:
+                print(f"[Startup] Warm-up {name} fehlgeschlagen: {e}")
+            self.timings[name] = round((time.perf_counter() - t0) * 1000, 1)
+        self.state = "done"
+        print(f"[Startup] Warm-up fertig: {self.timings}")
+
+
+class LazyRouters:
+    """ASGI-Middleware: lädt die Router vor dem ersten Request, der sie braucht."""
+
+    def __init__(self, app, loader: RouterLoader, warmup: Warmup):
+        self.app    = app
+        self.loader = loader
+        self.warmup = warmup
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] in ("http", "websocket"):
+            self.warmup.trigger()
+            if not self.loader.loaded and scope.get("path") not in EAGER_PATHS:
+                # Import im Thread: die Event-Loop bleibt für Health-Checks frei
+                await asyncio.to_thread(self.loader.load)
+        return await self.app(scope, receive, send)
+
+
+def stats(loader: RouterLoader, warmup: Warmup) -> Dict[str, Any]:
+    return {
+        "lazy_routers":   LAZY_ROUTERS,
+        "routers_loaded": loader.loaded,
+        "routers_ms":     round(loader.seconds * 1000, 1),
+        "warmup":         warmup.state,
+        "warmup_ms":      dict(warmup.timings),
+        "uptime_seconds": round(time.perf_counter() - STARTED, 1),
+    }
@@ -0,0 +1,141 @@
+import itertools
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from .engine import run_strategy
+from .utils import get_pool
+
+# ─── Konfiguration ───────────────────────────────────────────────────────────
+CHUNK_ELEMENTS     = 4_000_000    # max. Elemente (Zellen × Bars) pro Arbeitspaket
+PARALLEL_THRESHOLD = 20_000_000   # ab hier wird der Prozesspool genutzt
+# ─────────────────────────────────────────────────────────────────────────────
+
+
+# ─── Metriken (vektorisiert über beliebige führende Achsen) ─────────────────
+def grid_metrics(strat_ret: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Kennzahlen für eine Matrix von Strategie-Renditen (..., T).
+    Entspricht den Formeln aus `run_backtest` (Sharpe mit sqrt(252), ddof=1).
+    """
+    equity = np.cumprod(1.0 + strat_ret, axis=-1)
+    peak   = np.maximum.accumulate(equity, axis=-1)
+
+    mean = strat_ret.mean(axis=-1)
+    std  = strat_ret.std(axis=-1, ddof=1) if strat_ret.shape[-1] > 1 else np.zeros_like(mean)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std > 0, mean / std * np.sqrt(252), 0.0)
+
+    return {
+        "total_return": (equity[..., -1] - 1.0) * 100,
+        "sharpe":       sharpe,
+        "max_drawdown": ((equity - peak) / peak).min(axis=-1) * 100,
+    }
+
+
+# ─── Vektorisierte Strategien ───────────────────────────────────────────────
+def _sma_matrix(close: np.ndarray, windows: np.ndarray) -> np.ndarray:
+    """Alle SMAs auf einmal über eine kumulierte Summe: (len(windows), T)."""
+    csum = np.concatenate(([0.0], np.cumsum(close)))
+    out  = np.full((len(windows), len(close)), np.nan)
+    for i, w in enumerate(windows.astype("int64")):
+        if 0 < w <= len(close):
+            out[i, w - 1:] = (csum[w:] - csum[:-w]) / w
+    return out
+
+
+def _sma_cross_chunk(close: np.ndarray, fast: np.ndarray, slow: np.ndarray) -> Dict[str, np.ndarray]:
+    returns   = close[1:] / close[:-1] - 1.0
+    sma_fast  = _sma_matrix(close, fast)[:, None, :-1]
+    sma_slow  = _sma_matrix(close, slow)[None, :, :-1]
+    # Signal von Bar t-1 wirkt auf Rendite von Bar t (nur Long, wie run_backtest)
+    long      = sma_fast > sma_slow
+    strat_ret = np.where(long, returns, 0.0)
+    return grid_metrics(strat_ret)
+
+
+# Strategien mit eigener Grid-Implementierung: (close, *param_arrays) -> Metriken
+VECTORIZED: Dict[str, Callable[..., Dict[str, np.ndarray]]] = {
+    "sma_cross": _sma_cross_chunk,
+}
+VECTORIZED_PARAMS: Dict[str, List[str]] = {
+    "sma_cross": ["fast", "slow"],
+}
+# Parameter, die als Fensterlänge ganzzahlig sein müssen
+INTEGER_PARAMS: Dict[str, List[str]] = {
+    "sma_cross": ["fast", "slow"],
+}
+
+
+def is_vectorized(strategy: str, names: List[str]) -> bool:
+    return strategy in VECTORIZED and set(names) == set(VECTORIZED_PARAMS[strategy])
+
+
+def validate_grid(strategy: str, grid: Dict[str, List[float]]):
+    """ValueError bei nicht ganzzahligen Fensterlängen (statt stillem Abschneiden)."""
+    for name in INTEGER_PARAMS.get(strategy, []):
+        bad = [v for v in grid.get(name, []) if not float(v).is_integer()]
+        if bad:
+            raise ValueError(f"Parameter '{name}' muss ganzzahlig sein (z.B. {bad[0]}).")
+
+
+# ─── Fallback: Plugin-Funktion pro Kombination ──────────────────────────────
+def _plugin_chunk(strategy: str, df: pd.DataFrame, names: List[str], combos: List[tuple]) -> Dict[str, np.ndarray]:
+    rows = []
+    for combo in combos:
+        out = run_strategy(df.copy(), strategy, [], dict(zip(names, combo)))
+        rows.append(out["strat_ret"].to_numpy()[1:])
+    return grid_metrics(np.nan_to_num(np.vstack(rows)))
+
+
+# ─── Sweep ──────────────────────────────────────────────────────────────────
+def run_sweep(df: pd.DataFrame, strategy: str, grid: Dict[str, List[float]],
+              parallel: bool = True) -> Dict[str, np.ndarray]:
+    """
+    Wertet das komplette Parametergitter gegen einen einzigen DataFrame aus.
+    Ergebnis: Metrik-Name -> Array mit Form (len(p1), len(p2), ...).
+    `parallel=False` innerhalb von Pool-Workern (keine verschachtelten Pools).
+    """
+    names  = list(grid.keys())
+    n_bars = len(df)
+    validate_grid(strategy, grid)
+    use_vectorized = is_vectorized(strategy, names)
+    if use_vectorized:
+        # Interne Achsenreihenfolge der Implementierung, am Ende zurücktransponiert
+        order = VECTORIZED_PARAMS[strategy]
+        axes  = [order.index(n) for n in names]
+        names = order
+    shape  = tuple(len(grid[n]) for n in names)
+
+    jobs = []
+    if use_vectorized:
+        # Aufteilen entlang der ersten Achse, Rest bleibt vektorisiert
+        close     = df["close"].to_numpy(dtype="float64")
+        first     = np.asarray(grid[names[0]], dtype="float64")
+        rest      = [np.asarray(grid[n], dtype="float64") for n in names[1:]]
+        per_row   = int(np.prod([len(r) for r in rest])) * n_bars
+        step      = max(1, CHUNK_ELEMENTS // max(1, per_row))
+        for i in range(0, len(first), step):
+            jobs.append((VECTORIZED[strategy], (close, first[i:i + step], *rest)))
+    else:
+        combos = list(itertools.product(*(grid[n] for n in names)))
+        step   = max(1, CHUNK_ELEMENTS // max(1, n_bars))
+        for i in range(0, len(combos), step):
+            jobs.append((_plugin_chunk, (strategy, df, names, combos[i:i + step])))
+
+    total = int(np.prod(shape)) * n_bars
+    if parallel and total >= PARALLEL_THRESHOLD and len(jobs) > 1:
+        pool    = get_pool()
+        futures = [pool.submit(fn, *args) for fn, args in jobs]
+        parts   = [f.result() for f in futures]
+    else:
+        parts = [fn(*args) for fn, args in jobs]
+
+    surface = {
+        key: np.concatenate([p[key].reshape(-1) for p in parts]).reshape(shape)
+        for key in parts[0]
+    }
+    if use_vectorized:
+        surface = {key: arr.transpose(axes) for key, arr in surface.items()}
+    return surface
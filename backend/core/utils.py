@@ -1,16 +1,21 @@
-import pandas as pd
-import importlib
-from pathlib import Path
+import numpy as np
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+MAX_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+_pool: Optional[ProcessPoolExecutor] = None
 
 def to_list(series):
-    return [None if pd.isna(x) else round(float(x), 5) for x in series]
+    """Serie -> JSON-Liste (NaN -> None, 5 Nachkommastellen), vektorisiert."""
+    arr = np.asarray(series, dtype="float64")
+    out = np.round(arr, 5).astype(object)
+    out[np.isnan(arr)] = None
+    return out.tolist()
 
-def load_modules(folder):
-    modules = {}
-    for file in Path(folder).glob("*.py"):
-        if file.stem == "__init__":
-            continue
-        mod = importlib.import_module(f"{folder}.{file.stem}")
-        if hasattr(mod, file.stem):
-            modules[file.stem] = getattr(mod, file.stem)
-    return modules
+def get_pool() -> ProcessPoolExecutor:
+    """Geteilter Prozesspool für CPU-lastige Arbeit, startet beim ersten Bedarf."""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=MAX_WORKERS)
+    return _pool
@@ -0,0 +1,98 @@
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .engine import run_strategy
+from .sweep import PARALLEL_THRESHOLD, grid_metrics, run_sweep
+from .utils import get_pool
+
+Fold = Tuple[int, int, int, int]   # train_lo, train_hi, test_lo, test_hi (Bar-Indizes, hi exklusiv)
+
+OBJECTIVES = ("sharpe", "total_return")
+
+
+def make_folds(n_bars: int, folds: int, train_ratio: float, anchored: bool = False) -> List[Fold]:
+    """
+    Teilt `n_bars` in `folds` aufeinanderfolgende Testfenster; davor liegt je
+    ein Trainingsfenster der Länge `train_ratio` × Test (rollierend) bzw. ab
+    Bar 0 (anchored). Das letzte Testfenster reicht bis zum Ende.
+    """
+    if folds < 1 or train_ratio <= 0:
+        raise ValueError("folds muss >= 1 und train_ratio > 0 sein")
+    test_len  = int(n_bars / (folds + train_ratio))
+    train_len = n_bars - folds * test_len
+    if test_len < 2 or train_len < 2:
+        raise ValueError(f"Zu wenige Bars ({n_bars}) für {folds} Folds")
+
+    out = []
+    for k in range(folds):
+        test_lo = train_len + k * test_len
+        test_hi = n_bars if k == folds - 1 else test_lo + test_len
+        out.append((0 if anchored else test_lo - train_len, test_lo, test_lo, test_hi))
+    return out
+
+
+def _best(surface: Dict[str, np.ndarray], objective: str) -> Tuple[int, ...]:
+    score = np.nan_to_num(surface[objective], nan=-np.inf)
+    return np.unravel_index(int(np.argmax(score)), score.shape)
+
+
+def _run_fold(df: pd.DataFrame, strategy: str, grid: Dict[str, List[float]],
+              objective: str, test_len: int) -> Dict[str, Any]:
+    """
+    Ein Fold (läuft im Pool-Worker): Gitter auf dem Trainingsteil optimieren,
+    beste Parameter auf den letzten `test_len` Bars auswerten. Der
+    Trainingsteil dient dabei als Warm-up der Indikatoren.
+    """
+    train    = df.iloc[:len(df) - test_len]
+    surface  = run_sweep(train, strategy, grid, parallel=False)
+    idx      = _best(surface, objective)
+    params   = {name: grid[name][i] for name, i in zip(grid.keys(), idx)}
+
+    out       = run_strategy(df.copy(), strategy, [], params)
+    strat_ret = np.nan_to_num(out["strat_ret"].to_numpy(dtype="float64")[-test_len:])
+    return {
+        "params":     params,
+        "in_sample":  {k: float(v[idx]) for k, v in surface.items()},
+        "out_sample": {k: float(v) for k, v in grid_metrics(strat_ret).items()},
+        "strat_ret":  strat_ret,
+    }
+
+
+def run_walkforward(df: pd.DataFrame, strategy: str, grid: Dict[str, List[float]],
+                    folds: int = 5, train_ratio: float = 3.0, anchored: bool = False,
+                    objective: str = "sharpe") -> Dict[str, Any]:
+    """
+    Walk-Forward-Optimierung gegen einen einzigen Datenabruf. Folds laufen
+    ab PARALLEL_THRESHOLD im Prozesspool; die Out-of-Sample-Renditen werden
+    zu einer durchgehenden Equity (Faktor, Start 1.0) zusammengesetzt.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unbekanntes Ziel '{objective}' (erlaubt: {', '.join(OBJECTIVES)})")
+    splits = make_folds(len(df), folds, train_ratio, anchored)
+    cells  = int(np.prod([len(v) for v in grid.values()]))
+
+    jobs  = [(df.iloc[lo:test_hi], strategy, grid, objective, test_hi - test_lo)
+             for lo, _, test_lo, test_hi in splits]
+    total = sum(cells * len(job[0]) for job in jobs)
+    if total >= PARALLEL_THRESHOLD and len(jobs) > 1:
+        pool    = get_pool()
+        futures = [pool.submit(_run_fold, *job) for job in jobs]
+        results = [f.result() for f in futures]
+    else:
+        results = [_run_fold(*job) for job in jobs]
+
+    strat_ret = np.concatenate([r.pop("strat_ret") for r in results])
+    index     = df.index[splits[0][2]:]
+    for (lo, train_hi, test_lo, test_hi), r in zip(splits, results):
+        r.update({"train": [str(df.index[lo]), str(df.index[train_hi - 1])],
+                  "test":  [str(df.index[test_lo]), str(df.index[test_hi - 1])]})
+
+    return {
+        "folds":     results,
+        "index":     index,
+        "equity":    np.cumprod(1.0 + strat_ret),
+        "strat_ret": strat_ret,
+        "metrics":   {k: float(v) for k, v in grid_metrics(strat_ret).items()},
+    }
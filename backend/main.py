@@ -1,20 +1,71 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from backend.api import health, modules, market, backtest, symbols
+from backend.api import health
+from backend.core import startup
+from backend.core.metrics import TimingMiddleware
+
+# Router (Modul in backend.api, Prefix, Tag) – Health wird immer direkt eingebunden
+ROUTERS = [
+    ("modules",   "/api",        "modules"),
+    ("market",    "/api/market", "market"),
+    ("backtest",  "/api",        "backtest"),
+    ("symbols",   "/api",        "symbols"),
+    ("sweep",     "/api",        "backtest"),
+    ("portfolio", "/api",        "backtest"),
+    ("live",      "/api",        "live"),
+    ("metrics",   "/api",        "metrics"),
+]
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if startup.WARMUP:
+        warmup.start()
+    yield
+
+
+app = FastAPI(lifespan=lifespan)
+
+loader = startup.RouterLoader(app, ROUTERS)
+warmup = startup.Warmup()
+app.state.startup = lambda: startup.stats(loader, warmup)
+
+
+@warmup.hook
+def routers():
+    loader.load()
+
+
+@warmup.hook
+def plugins():
+    from backend.core.engine import indicators, strategies
+    for registry in (indicators, strategies):
+        for name in registry:
+            registry.plugin(name)
+
+
+@warmup.hook
+def asset_catalog():
+    # Snapshot von der Platte lesen (kein Netzwerk)
+    from backend.core.assets import catalog
+    catalog.equities()
 
-app = FastAPI()
 
+app.add_middleware(startup.LazyRouters, loader=loader, warmup=warmup)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "X-QuantOS-Profile-Id"],
 )
+# Außerhalb von CORS: misst den kompletten Request
+app.add_middleware(TimingMiddleware)
 
 # Router registrieren
 app.include_router(health.router, prefix="/api", tags=["health"])
-app.include_router(modules.router, prefix="/api", tags=["modules"])
-app.include_router(market.router, prefix="/api/market", tags=["market"])
-app.include_router(backtest.router, prefix="/api", tags=["backtest"])
-app.include_router(symbols.router, prefix="/api", tags=["symbols"])
+if not startup.LAZY_ROUTERS:
+    loader.load()
@@ -0,0 +1,7 @@
+"""
+Offline-Benchmarks für QuantOS (ohne Alpaca-Credentials).
+
+Synthetische OHLCV-Daten (benchmarks.synthetic), FakeDataClient statt
+Alpaca-Clients, Mini-Harness mit Baselines (benchmarks.harness).
+Start: python -m benchmarks --help
+"""
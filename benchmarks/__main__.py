@@ -0,0 +1,74 @@
+"""
+Benchmarks ausführen und gegen die gespeicherte Baseline vergleichen.
+
+    python -m benchmarks                       # Profil "full", Vergleich mit Baseline
+    python -m benchmarks --profile quick -k backtest
+    python -m benchmarks --save                # Ergebnisse als neue Baseline speichern
+    python -m benchmarks --check               # Exit-Code 1 bei Regression
+
+Ratio = Median / Baseline-Median (derselben Maschine sinnvoll); ab
+REGRESSION_THRESHOLD wird der Eintrag als Regression markiert.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from . import harness
+from .synthetic import PROFILES
+
+
+def _fmt(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:8.3f} s "
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:8.3f} ms"
+    return f"{seconds * 1e6:8.1f} µs"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="QuantOS Offline-Benchmarks")
+    parser.add_argument("-k", dest="pattern", default="", help="nur Benchmarks, deren Name das enthält")
+    parser.add_argument("--profile", default="full", choices=sorted(PROFILES))
+    parser.add_argument("--max-time", type=float, default=1.0, help="Messzeit pro Benchmark (s)")
+    parser.add_argument("--baseline", type=Path, default=harness.BASELINE_FILE)
+    parser.add_argument("--save", action="store_true", help="Ergebnisse als Baseline speichern")
+    parser.add_argument("--check", action="store_true", help="Exit-Code 1 bei Regression")
+    parser.add_argument("--json", type=Path, help="Rohdaten zusätzlich als JSON schreiben")
+    args = parser.parse_args(argv)
+
+    baseline = harness.load_baseline(args.baseline).get(args.profile, {})
+    base     = baseline.get("results", {})
+    print(f"Profil {args.profile}, Baseline: {baseline.get('created', '–')}")
+    print(f"{'Benchmark':<44} {'Median':>11} {'Min':>11} {'Runden':>6}  Ratio")
+
+    def report(name, res):
+        if "error" in res:
+            print(f"{name:<44} FEHLER {res['error']}")
+            return
+        ratio = ""
+        if name in base and base[name]["median"]:
+            r = res["median"] / base[name]["median"]
+            ratio = f"{r:5.2f}x" + ("  ▲ REGRESSION" if r > harness.REGRESSION_THRESHOLD else "")
+        print(f"{name:<44} {_fmt(res['median'])} {_fmt(res['min'])} {res['rounds']:>6}  {ratio}", flush=True)
+
+    results = harness.run(args.pattern, PROFILES[args.profile], args.max_time, report)
+    ratios  = harness.compare(results, baseline)
+    regressions = sorted(k for k, v in ratios.items() if v["regression"])
+    errors      = sorted(k for k, v in results.items() if "error" in v)
+
+    if args.json:
+        args.json.write_text(json.dumps({"profile": args.profile, "machine": harness.machine(),
+                                         "results": results, "ratios": ratios}, indent=2))
+    if args.save:
+        harness.save_baseline(results, args.profile, args.baseline)
+        print(f"Baseline gespeichert: {args.baseline}")
+    if regressions:
+        print(f"{len(regressions)} Regression(en): {', '.join(regressions)}")
+    if errors:
+        print(f"{len(errors)} Fehler: {', '.join(errors)}")
+    return 1 if args.check and (regressions or errors) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
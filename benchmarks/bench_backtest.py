@@ -0,0 +1,89 @@
+"""Backtest: einzelne Stufen der Pipeline und der Endpoint end-to-end."""
+import shutil
+
+from fastapi.testclient import TestClient
+
+from backend.api.backtest import _result
+from backend.core.backtest import result_frame, summarize, with_equity
+from backend.core.engine import apply_indicators
+from backend.core.indicator_engine import engine as indicator_engine
+
+from .harness import cases
+from .synthetic import END, offline, ohlcv, window
+
+STAGES = ("1d", "1h", "1m")
+PARAMS = {"fast": 20, "slow": 50}
+
+
+def _simulated(profile, interval):
+    indicator_engine.clear()
+    df = apply_indicators(ohlcv("SPY", interval, profile["bars"][interval]), ["rsi"])
+    return with_equity(df, "sma_cross", PARAMS, 10_000)
+
+
+def _summary_args(profile, max_points=2000):
+    return (10_000, max_points, profile["mc_paths"], 1, [5, 25, 50, 75, 95], [10, 20, 30], 0)
+
+
+@cases(*STAGES)
+def bench_with_equity(benchmark, profile, interval):
+    df = apply_indicators(ohlcv("SPY", interval, profile["bars"][interval]), ["rsi"])
+
+    def setup():
+        indicator_engine.clear()
+        return (df.copy(), "sma_cross", PARAMS, 10_000), {}
+
+    benchmark.pedantic(with_equity, setup=setup)
+
+
+@cases(*STAGES)
+def bench_summarize(benchmark, profile, interval):
+    """Kennzahlen, Trade-Ledger und Monte-Carlo-Projektion."""
+    df = _simulated(profile, interval)
+    benchmark(summarize, df, *_summary_args(profile))
+
+
+@cases(*(f"{fmt}@{iv}" for fmt in ("json", "binary") for iv in STAGES))
+def bench_render(benchmark, profile, case):
+    """Antwort bauen (Downsampling + Serialisierung) aus fertigem Ergebnis."""
+    fmt, interval = case.split("@")
+    df      = _simulated(profile, interval)
+    summary = summarize(df, *_summary_args(profile))
+    frame   = result_frame(df)
+    benchmark(_result, frame, summary, "bench", fmt == "binary", 2000)
+
+
+def _request(profile, interval):
+    start, _ = window(interval, profile["bars"][interval])
+    return {"symbol": "SPY", "interval": interval, "start": start.strftime("%Y-%m-%d"),
+            "end": END.strftime("%Y-%m-%d"), "strategy": "sma_cross", "active_indicators": ["rsi"],
+            "mc_paths": profile["mc_paths"], "alpaca_key": "bench", "alpaca_secret": "bench"}
+
+
+@cases(*STAGES)
+def bench_endpoint_warm(benchmark, profile, interval):
+    """POST /api/backtest, Bars bereits im Bar-Store (FakeDataClient)."""
+    from backend.main import app
+
+    body = _request(profile, interval)
+    with offline(), TestClient(app) as client:
+        client.post("/api/backtest", json=body).raise_for_status()
+        benchmark.pedantic(lambda: client.post("/api/backtest", json=body).raise_for_status(),
+                           setup=indicator_engine.clear)
+
+
+@cases(*STAGES)
+def bench_endpoint_cold(benchmark, profile, interval):
+    """POST /api/backtest mit leerem Bar-Store: Fetch (in-process) + Speichern + Backtest."""
+    from backend.main import app
+
+    body = _request(profile, interval)
+    with offline() as env, TestClient(app) as client:
+        def setup():
+            indicator_engine.clear()
+            shutil.rmtree(env["root"], ignore_errors=True)
+            env["root"].mkdir()
+
+        benchmark.pedantic(lambda: client.post("/api/backtest", json=body).raise_for_status(),
+                           setup=setup, warmup=0)
+        benchmark.extra["fetches"] = env["client"].requests
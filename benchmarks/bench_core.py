@@ -0,0 +1,56 @@
+"""Microbenchmarks: Serialisierung, Indikator- und Strategie-Plugins."""
+from backend.core.engine import apply_strategy, indicators, run_strategy, strategies
+from backend.core.indicator_engine import engine as indicator_engine
+from backend.core.utils import to_list
+
+from .harness import cases
+from .synthetic import ohlcv
+
+INTERVALS = ("1d", "1h", "1m")
+
+
+@cases(*INTERVALS)
+def bench_to_list(benchmark, profile, interval):
+    close = ohlcv("SPY", interval, profile["bars"][interval])["close"]
+    benchmark(to_list, close)
+
+
+@cases(*(f"{name}@{iv}" for name in sorted(indicators) for iv in INTERVALS))
+def bench_indicator(benchmark, profile, case):
+    """Plugin direkt (ohne Memoisierung), pro Runde auf frischem Frame."""
+    name, interval = case.split("@")
+    df = ohlcv("SPY", interval, profile["bars"][interval])
+    benchmark.pedantic(indicators[name], setup=lambda: ((df.copy(),), {}))
+
+
+@cases(*INTERVALS)
+def bench_indicator_memo_hit(benchmark, profile, interval):
+    """Wiederholter Aufruf über die Indicator-Engine (Cache-Treffer)."""
+    df = ohlcv("SPY", interval, profile["bars"][interval])
+    indicator_engine.compute("sma", indicators["sma"], df.copy())
+    benchmark.pedantic(indicator_engine.compute, setup=lambda: (("sma", indicators["sma"], df.copy()), {}))
+
+
+@cases(*(f"{name}@{iv}" for name in sorted(strategies) for iv in INTERVALS))
+def bench_strategy(benchmark, profile, case):
+    """Strategie + Positions-/Renditespalten, Indikator-Cache pro Runde geleert."""
+    name, interval = case.split("@")
+    df = ohlcv("SPY", interval, profile["bars"][interval])
+
+    def setup():
+        indicator_engine.clear()
+        return (df.copy(), name, {}), {}
+
+    benchmark.pedantic(apply_strategy, setup=setup)
+
+
+@cases(*INTERVALS)
+def bench_run_strategy(benchmark, profile, interval):
+    """Indikatoren (rsi) + sma_cross mit kaltem Indikator-Cache."""
+    df = ohlcv("SPY", interval, profile["bars"][interval])
+
+    def setup():
+        indicator_engine.clear()
+        return (df.copy(), "sma_cross", ["rsi"], {"fast": 20, "slow": 50}), {}
+
+    benchmark.pedantic(run_strategy, setup=setup)
@@ -0,0 +1,53 @@
+"""Heatmap: Panel-Aufbau, Veränderungs-Berechnung und Endpoint über das Universum."""
+import json
+
+from backend.api import market
+from backend.core.assets import AssetCatalog
+from backend.core.fake_alpaca import fake_symbols
+from backend.core.panel import BarPanel
+
+from .harness import cases
+from .synthetic import asset_snapshot, offline, universe
+
+BARS = 260     # ~1 Jahr Tagesbars wie das 370-Tage-Fenster der Heatmap
+
+
+SIZES = ("medium", "large")
+
+
+def _symbols(profile, size):
+    """Universumsgröße aus dem Profil: medium/large = zweite/dritte Stufe."""
+    return profile["symbols"][1 + SIZES.index(size)]
+
+
+@cases(*SIZES)
+def bench_panel_build(benchmark, profile, size):
+    n = _symbols(profile, size)
+    frames = universe(n, "1d", BARS)
+    benchmark.extra["symbols"] = n
+    benchmark(BarPanel.from_frames, frames)
+
+
+@cases(*SIZES)
+def bench_changes(benchmark, profile, size):
+    n = _symbols(profile, size)
+    panel = BarPanel.from_frames(universe(n, "1d", BARS))
+    benchmark.extra["symbols"] = n
+    benchmark(market._compute_changes, panel)
+
+
+@cases(*SIZES)
+def bench_endpoint(benchmark, profile, size):
+    """POST /api/heatmap (Batches über Gateway + Bar-Store, FakeDataClient), Store warm."""
+    n = _symbols(profile, size)
+    benchmark.extra["symbols"] = n
+    with offline() as env:
+        path = env["root"] / "assets.json"
+        path.write_text(json.dumps(asset_snapshot(fake_symbols(n))))
+        old_catalog, market.asset_catalog = market.asset_catalog, AssetCatalog(path)
+        try:
+            req = market.HeatmapRequest(alpaca_key="bench", alpaca_secret="bench")
+            assert market.get_heatmap(req)["count"] == n
+            benchmark(market.get_heatmap, req)
+        finally:
+            market.asset_catalog = old_catalog
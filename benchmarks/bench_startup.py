@@ -0,0 +1,57 @@
+"""
+Kaltstart: frischer Python-Prozess bis zur ersten Antwort auf GET /api/health.
+
+Gemessen wird die Wanduhrzeit des Kindprozesses (benchmarks.startup_probe),
+also Interpreter-Start + Import von backend.main + erster Request.
+Zusätzlich einmal `python -X importtime`: die teuersten Importe landen in
+den Extras, um Regressionen einem Modul zuordnen zu können.
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from .harness import cases
+
+ROOT  = Path(__file__).resolve().parents[1]
+MODES = {"lazy": "1", "eager": "0"}      # QUANTOS_LAZY_ROUTERS
+
+
+def _env(mode: str) -> Dict[str, str]:
+    return {**os.environ, "QUANTOS_LAZY_ROUTERS": MODES[mode], "QUANTOS_WARMUP": "0",
+            "PYTHONDONTWRITEBYTECODE": "0"}
+
+
+def probe(mode: str, *flags: str) -> subprocess.CompletedProcess:
+    out = subprocess.run([sys.executable, *flags, "-m", "benchmarks.startup_probe"], cwd=ROOT,
+                         env=_env(mode), capture_output=True, text=True, timeout=60)
+    if out.returncode != 0:
+        raise RuntimeError(out.stderr.strip().splitlines()[-1] if out.stderr.strip() else "probe fehlgeschlagen")
+    return out
+
+
+def importtime(stderr: str, top: int = 8) -> Tuple[float, List[Tuple[str, float]]]:
+    """(kumulierte ms für backend.main, teuerste Module nach Eigenzeit) aus `-X importtime`."""
+    total, rows = 0.0, []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        rows.append((name, int(self_us) / 1000))
+        if name == "backend.main":
+            total = int(cumulative_us) / 1000
+    return total, [(n, round(ms, 1)) for n, ms in sorted(rows, key=lambda r: -r[1])[:top]]
+
+
+@cases(*MODES)
+def bench_health(benchmark, profile, mode):
+    """Prozessstart bis zur ersten /api/health-Antwort (lazy = Standard, eager = alle Router beim Import)."""
+    out = benchmark.pedantic(probe, (mode,), warmup=1)
+    result = json.loads(out.stdout.strip().splitlines()[-1])
+    benchmark.extra.update({k: result[k] for k in ("import_ms", "health_ms", "modules", "heavy_loaded")})
+
+    total, top = importtime(probe(mode, "-X", "importtime").stderr)
+    benchmark.extra["importtime_ms"] = round(total, 1)
+    benchmark.extra["top_imports"]   = top
@@ -0,0 +1,159 @@
+"""
+Mini-Harness im Stil von pytest-benchmark (ohne Abhängigkeit).
+
+Benchmarks sind Funktionen `bench_*(benchmark, profile, [case])` in
+benchmarks/bench_*.py. `benchmark(fn, *args)` misst `fn` über mehrere
+Runden und gibt das letzte Ergebnis zurück; `benchmark.pedantic(...)`
+erlaubt ein Setup pro Runde (z.B. kalter Cache). `@cases(...)`
+parametrisiert eine Funktion, der Name wird dann `bench_x[case]`.
+"""
+import gc
+import importlib
+import json
+import os
+import platform
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+BASELINE_FILE        = Path(__file__).with_name("baselines.json")
+REGRESSION_THRESHOLD = 1.25     # Median / Baseline-Median, ab dem ein Lauf als Regression gilt
+
+
+def cases(*values: Any):
+    """Parametrisierung: die Funktion läuft einmal pro Wert (drittes Argument)."""
+    def wrap(fn):
+        fn.cases = list(values)
+        return fn
+    return wrap
+
+
+class Benchmark:
+    def __init__(self, min_rounds: int = 5, max_time: float = 1.0, warmup: int = 1):
+        self.min_rounds = min_rounds
+        self.max_time   = max_time
+        self.warmup     = warmup
+        self.times: List[float] = []
+        self.extra: Dict[str, Any] = {}
+
+    def __call__(self, fn: Callable, *args, **kwargs):
+        return self.pedantic(fn, args, kwargs)
+
+    def pedantic(self, fn: Callable, args: Sequence = (), kwargs: Optional[dict] = None,
+                 setup: Optional[Callable[[], Any]] = None, rounds: Optional[int] = None,
+                 warmup: Optional[int] = None):
+        """
+        `fn` messen: nach `warmup` Aufwärmläufen mindestens `min_rounds` Runden,
+        weitere solange das Zeitbudget `max_time` reicht (oder genau `rounds`).
+        `setup()` läuft vor jeder Runde außerhalb der Messung; gibt es
+        `(args, kwargs)` zurück, ersetzen diese die festen Argumente.
+        """
+        kwargs = kwargs or {}
+
+        def prepare():
+            prepared = setup() if setup else None
+            return prepared if prepared is not None else (args, kwargs)
+
+        for _ in range(self.warmup if warmup is None else warmup):
+            a, kw = prepare()
+            fn(*a, **kw)
+
+        result, started = None, time.perf_counter()
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            while True:
+                a, kw = prepare()
+                t0 = time.perf_counter()
+                result = fn(*a, **kw)
+                self.times.append(time.perf_counter() - t0)
+                n = len(self.times)
+                if rounds is not None:
+                    if n >= rounds:
+                        break
+                elif n >= self.min_rounds and time.perf_counter() - started >= self.max_time:
+                    break
+                elif n >= 1000:
+                    break
+        finally:
+            if gc_enabled:
+                gc.enable()
+        return result
+
+    def stats(self) -> Dict[str, float]:
+        t = self.times
+        return {
+            "min":    min(t),
+            "median": statistics.median(t),
+            "mean":   statistics.fmean(t),
+            "stdev":  statistics.stdev(t) if len(t) > 1 else 0.0,
+            "rounds": len(t),
+        }
+
+
+# ─── Sammeln & Ausführen ─────────────────────────────────────────────────────
+def collect(pattern: str = "") -> List[tuple]:
+    """(Name, Funktion, Case)-Tripel aller Benchmarks, optional gefiltert (Teilstring)."""
+    found = []
+    for path in sorted(Path(__file__).parent.glob("bench_*.py")):
+        module = importlib.import_module(f"benchmarks.{path.stem}")
+        for name in sorted(n for n in dir(module) if n.startswith("bench_")):
+            fn = getattr(module, name)
+            for case in getattr(fn, "cases", [None]):
+                full = f"{path.stem[6:]}.{name[6:]}" + (f"[{case}]" if case is not None else "")
+                if pattern in full:
+                    found.append((full, fn, case))
+    return found
+
+
+def run(pattern: str = "", profile: Any = None, max_time: float = 1.0,
+        report: Callable[[str, Dict[str, Any]], None] = lambda name, result: None) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, fn, case in collect(pattern):
+        bench = Benchmark(max_time=max_time)
+        try:
+            fn(bench, profile) if case is None else fn(bench, profile, case)
+            results[name] = {**bench.stats(), **bench.extra}
+        except Exception as e:
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+        report(name, results[name])
+    return results
+
+
+# ─── Baselines ───────────────────────────────────────────────────────────────
+def machine() -> Dict[str, Any]:
+    return {"python": platform.python_version(), "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(), "cpus": os.cpu_count()}
+
+
+def load_baseline(path: Path = BASELINE_FILE) -> Dict[str, Any]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_baseline(results: Dict[str, Dict[str, Any]], profile_name: str, path: Path = BASELINE_FILE):
+    """Mediane pro Profil speichern; andere Profile und nicht gelaufene Benchmarks bleiben erhalten."""
+    data  = load_baseline(path)
+    known = data.get(profile_name, {}).get("results", {})
+    known.update({k: {"median": v["median"], "min": v["min"]} for k, v in results.items() if "median" in v})
+    data[profile_name] = {
+        "machine": machine(),
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "results": known,
+    }
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any],
+            threshold: float = REGRESSION_THRESHOLD) -> Dict[str, Dict[str, Any]]:
+    """Verhältnis Median / Baseline-Median je Benchmark (>1 = langsamer)."""
+    base = baseline.get("results", {})
+    out: Dict[str, Dict[str, Any]] = {}
+    for name, res in results.items():
+        if "median" not in res or name not in base:
+            continue
+        ratio = res["median"] / base[name]["median"] if base[name]["median"] else float("inf")
+        out[name] = {"ratio": ratio, "regression": ratio > threshold}
+    return out
@@ -0,0 +1,53 @@
+"""
+Kindprozess für bench_startup: App importieren, den ersten GET /api/health
+direkt über ASGI beantworten (ohne Server, ohne Lifespan) und die Zeiten
+als JSON ausgeben.
+
+    python -m benchmarks.startup_probe
+    QUANTOS_LAZY_ROUTERS=0 python -m benchmarks.startup_probe
+"""
+import asyncio
+import json
+import sys
+import time
+
+T0 = time.perf_counter()
+
+from backend.main import app  # noqa: E402
+
+T1 = time.perf_counter()
+
+
+async def _get(path: str) -> int:
+    messages = []
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": b"",
+        "root_path": "", "headers": [(b"host", b"127.0.0.1:8000")],
+        "client": ("127.0.0.1", 0), "server": ("127.0.0.1", 8000),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages[0]["status"]
+
+
+def main():
+    status = asyncio.run(_get("/api/health"))
+    t2 = time.perf_counter()
+    print(json.dumps({
+        "status":       status,
+        "import_ms":    round((T1 - T0) * 1000, 1),
+        "health_ms":    round((t2 - T0) * 1000, 1),
+        "modules":      len(sys.modules),
+        "heavy_loaded": sorted(m for m in ("pandas", "numpy", "alpaca", "backend.core.engine") if m in sys.modules),
+    }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Deterministische OHLCV-Daten und Offline-Umgebung für Benchmarks.
+
+Die Bars kommen aus backend.core.fake_alpaca (gleiche Formel wie der
+Fake-Server), hier nur nach Bar-Anzahl statt Zeitraum zugeschnitten.
+Profile legen die Größen fest: "quick" für Smoke-Läufe, "full" für
+Baselines (1d bis 1m, 1 bis 10k Symbole).
+"""
+import shutil
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+import pandas as pd
+
+from backend.core.fake_alpaca import FakeDataClient, bars_frame, fake_symbols
+
+END       = datetime(2025, 1, 1, tzinfo=timezone.utc)     # fester Endpunkt -> reproduzierbar
+INTERVALS = {"1d": "1Day", "1h": "1Hour", "30m": "30Min", "15m": "15Min", "5m": "5Min", "1m": "1Min"}
+_PER_DAY  = {"1d": 1, "1h": 6, "30m": 13, "15m": 26, "5m": 78, "1m": 390}   # Bars pro Handelstag
+
+PROFILES: Dict[str, Dict[str, object]] = {
+    "quick": {
+        "bars":     {"1d": 500, "1h": 2_000, "1m": 10_000},
+        "symbols":  (1, 100, 500),
+        "mc_paths": 1_000,
+    },
+    "full": {
+        "bars":     {"1d": 2_520, "1h": 12_000, "1m": 100_000},
+        "symbols":  (1, 1_000, 10_000),
+        "mc_paths": 10_000,
+    },
+}
+
+
+def window(interval: str, bars: int) -> Tuple[datetime, datetime]:
+    """Zeitraum bis END, der mindestens `bars` Aktien-Bars enthält."""
+    days = -(-bars // _PER_DAY[interval]) * 7 // 5 + 7
+    return END - timedelta(days=days), END
+
+
+@lru_cache(maxsize=64)
+def _ohlcv(symbol: str, interval: str, bars: int) -> pd.DataFrame:
+    start, end = window(interval, bars)
+    return bars_frame(symbol, INTERVALS[interval], start, end).iloc[-bars:]
+
+
+def ohlcv(symbol: str = "SPY", interval: str = "1d", bars: int = 2_520) -> pd.DataFrame:
+    """Genau `bars` Bars (Kopie, darf verändert werden)."""
+    return _ohlcv(symbol, interval, bars).copy()
+
+
+def universe(n_symbols: int, interval: str = "1d", bars: int = 260) -> Dict[str, pd.DataFrame]:
+    """`n_symbols` Fake-Ticker (AAA, AAB, ...) mit je `bars` Bars."""
+    return {sym: ohlcv(sym, interval, bars) for sym in fake_symbols(n_symbols)}
+
+
+def asset_snapshot(symbols: List[str]) -> Dict[str, object]:
+    """Asset-Katalog-Snapshot (Format von AssetCatalog._write) für Fake-Ticker."""
+    return {"ts": datetime.now(timezone.utc).timestamp(), "assets": [
+        {"symbol": s, "name": f"{s} Inc", "exchange": "NASDAQ", "tradable": True, "asset_class": "us_equity"}
+        for s in symbols
+    ]}
+
+
+@contextmanager
+def offline() -> Iterator[Dict[str, object]]:
+    """
+    Offline-Umgebung: FakeDataClient statt Alpaca, Bar-Store in einem
+    temporären Verzeichnis. Liefert {"client", "root"}; stellt alles wieder her.
+    """
+    from backend.core import clients
+    from backend.core.barstore import bar_store
+
+    client   = FakeDataClient()
+    root     = Path(tempfile.mkdtemp(prefix="quantos-bench-"))
+    old_root = bar_store.root
+    clients.set_data_client(client)
+    bar_store.root = root
+    try:
+        yield {"client": client, "root": root}
+    finally:
+        clients.set_data_client(None)
+        bar_store.root = old_root
+        shutil.rmtree(root, ignore_errors=True)
@@ -1,263 +1,233 @@
 # data/symbols.py
 from typing import Dict, List, Any, Set, Optional
-from alpaca.trading.client import TradingClient
-from alpaca.trading.requests import GetAssetsRequest
-from alpaca.trading.enums import AssetClass, AssetStatus
 
-# ── Kein globaler Client mehr! ────────────────────────────────────
-# TradingClient wird jetzt on-demand mit Keys erstellt
-
-def get_all_symbols(alpaca_key: Optional[str] = None, alpaca_secret: Optional[str] = None) -> Dict[str, Any]:
-    """
-    Liefert ALLE relevanten Symbole für dein Terminal, inkl.:
-    - US Equities (Aktien + ETFs)
-    - Crypto Assets (Alpaca-Spot-Tokens)
-    - synthetische Crypto-Pairs (BTC/USD, BTC/EUR, ETH/USD, …)
-
-    Args:
-        alpaca_key: Optional API Key (falls None, wird nur Cached-Struktur zurückgegeben)
-        alpaca_secret: Optional API Secret
-
-    Rückgabeformat:
-    {
-      "symbols": [...],
-      "metadata": { ... }
-    }
-    """
-    
-    # Falls keine Keys übergeben wurden, leere Liste zurückgeben
-    # (Backend kann das dann cachen oder Fallback verwenden)
-    if not alpaca_key or not alpaca_secret:
-        return {
-            "symbols": [],
-            "metadata": {
-                "total": 0,
-                "asset_classes": [],
-                "types": [],
-                "sectors": [],
-                "market_caps": [],
-                "error": "No API keys provided"
-            }
-        }
-    
-    # Trading Client mit übergebenen Keys erstellen
-    _trading_client = TradingClient(alpaca_key, alpaca_secret)
-
-    # ── 1) Equities laden ─────────────────────────────────────────
-    eq_req = GetAssetsRequest(
-        status=AssetStatus.ACTIVE,
-        asset_class=AssetClass.US_EQUITY,
-    )
-    eq_assets = _trading_client.get_all_assets(eq_req)
-
-    # ── 2) Crypto-Assets laden ────────────────────────────────────
-    cr_req = GetAssetsRequest(
-        status=AssetStatus.ACTIVE,
-        asset_class=AssetClass.CRYPTO,
+# ── Klassifikation ────────────────────────────────────────────────
+# Wird vom Asset-Katalog (backend/core/assets.py) einmal pro Snapshot
+# angewendet; Rohdaten sind dicts mit symbol, name, exchange, tradable,
+# asset_class.
+
+# ── Sektor-Mapping / Popularität / Market-Cap-Proxy ───────────
+sector_map: Dict[str, str] = {
+    # Technology
+    "AAPL": "Technology", "MSFT": "Technology", "GOOGL": "Technology", "GOOG": "Technology",
+    "META": "Technology", "NVDA": "Technology", "TSLA": "Technology", "ADBE": "Technology",
+    "CRM": "Technology", "ORCL": "Technology", "CSCO": "Technology", "INTC": "Technology",
+    "AMD": "Technology", "QCOM": "Technology", "TXN": "Technology", "NOW": "Technology",
+    "AVGO": "Technology", "NFLX": "Technology", "IBM": "Technology",
+
+    # Healthcare
+    "JNJ": "Healthcare", "UNH": "Healthcare", "PFE": "Healthcare", "ABBV": "Healthcare",
+    "TMO": "Healthcare", "ABT": "Healthcare", "MRK": "Healthcare", "LLY": "Healthcare",
+    "BMY": "Healthcare", "AMGN": "Healthcare", "GILD": "Healthcare", "MDT": "Healthcare",
+    "ISRG": "Healthcare", "VRTX": "Healthcare", "ZTS": "Healthcare", "REGN": "Healthcare",
+    "CI": "Healthcare", "CVS": "Healthcare", "BSX": "Healthcare", "EW": "Healthcare",
+
+    # Finance
+    "JPM": "Finance", "BAC": "Finance", "WFC": "Finance", "GS": "Finance", "MS": "Finance",
+    "SCHW": "Finance", "BLK": "Finance", "C": "Finance", "AXP": "Finance", "SPGI": "Finance",
+    "CME": "Finance", "ICE": "Finance", "FIS": "Finance", "MCO": "Finance", "AON": "Finance",
+    "V": "Finance", "MA": "Finance", "PYPL": "Finance",
+
+    # Consumer
+    "AMZN": "Consumer", "WMT": "Consumer", "HD": "Consumer", "DIS": "Consumer",
+    "NKE": "Consumer", "COST": "Consumer", "TGT": "Consumer", "SBUX": "Consumer",
+    "LOW": "Consumer", "TJX": "Consumer", "BKNG": "Consumer", "MCD": "Consumer",
+    "MDLZ": "Consumer", "CL": "Consumer", "PG": "Consumer", "KO": "Consumer",
+    "PEP": "Consumer", "PM": "Consumer", "MO": "Consumer",
+
+    # Energy
+    "CVX": "Energy", "XOM": "Energy", "COP": "Energy", "SLB": "Energy",
+    "EOG": "Energy", "PSX": "Energy", "MPC": "Energy", "VLO": "Energy",
+
+    # Industrial
+    "BA": "Industrial", "HON": "Industrial", "UNP": "Industrial", "CAT": "Industrial",
+    "GE": "Industrial", "RTX": "Industrial", "MMM": "Industrial", "UPS": "Industrial",
+    "DE": "Industrial", "NSC": "Industrial",
+
+    # Utilities
+    "NEE": "Utilities", "DUK": "Utilities", "SO": "Utilities", "D": "Utilities",
+}
+
+top_traded: Set[str] = {
+    "AAPL", "MSFT", "NVDA", "TSLA", "AMZN", "META", "GOOGL", "GOOG", "SPY", "QQQ",
+    "AMD", "NFLX", "BABA", "INTC", "DIS", "PYPL", "MRNA", "NIO", "PLTR", "SOFI",
+}
+
+mega_cap_symbols: Set[str] = {
+    "AAPL", "MSFT", "GOOGL", "GOOG", "AMZN", "NVDA", "META", "TSLA", "BRK.B"
+}
+
+index_etfs: Set[str] = {
+    "SPY", "QQQ", "IWM", "DIA", "VOO", "VTI", "IVV", "MDY", "IJH", "IJR",
+    "RSP", "SPLG", "SPYG", "SPYV", "VUG", "VTV", "QQQM", "ONEQ"
+}
+
+sector_etfs: Set[str] = {
+    "XLF", "XLE", "XLK", "XLV", "XLI", "XLP", "XLY", "XLU", "XLB", "XLRE",
+    "VGT", "VHT", "VFH", "VDE", "VIS", "VDC", "VAW", "VNQ"
+}
+
+bond_etfs: Set[str] = {
+    "AGG", "BND", "VCIT", "VCSH", "VGIT", "VGLT", "LQD", "HYG", "JNK", "TLT",
+    "IEF", "SHY", "TIP", "VTIP", "MUB", "BNDX"
+}
+
+commodity_etfs: Set[str] = {
+    "GLD", "SLV", "USO", "UNG", "DBA", "DBC", "PDBC", "IAU", "GLTR", "COMT"
+}
+
+international_etfs: Set[str] = {
+    "VEA", "IEFA", "EFA", "VWO", "IEMG", "VXUS", "EEM", "IXUS", "ACWI", "VEU",
+    "SCHF", "SPDW", "IDEV", "EWJ", "EWZ", "FXI", "MCHI"
+}
+
+# Crypto-Assets, die du zu Pairs kombinieren willst
+core_crypto_symbols: Set[str] = {
+    "BTCUSD", "ETHUSD", "SOLUSD", "LTCUSD", "DOGEUSD"
+}
+pair_currencies: List[str] = ["USD", "EUR", "USDT"]
+
+
+def classify_equity(a: Dict[str, Any]) -> Dict[str, Any]:
+    """US-Equity (Rohdaten) -> Katalog-Eintrag mit Typ, Sektor, Market-Cap-Proxy."""
+    symbol = a["symbol"]
+    name = a.get("name") or symbol
+    exchange = a.get("exchange") or ""
+
+    name_upper = name.upper()
+
+    # ETF-Erkennung
+    is_etf = (
+        symbol in index_etfs
+        or symbol in sector_etfs
+        or symbol in bond_etfs
+        or symbol in commodity_etfs
+        or symbol in international_etfs
+        or "ETF" in name_upper
+        or "FUND" in name_upper
+        or exchange in ("ARCA", "BATS")
     )
-    cr_assets = _trading_client.get_all_assets(cr_req)
-
-    # ── Sektor-Mapping / Popularität / Market-Cap-Proxy ───────────
-    sector_map: Dict[str, str] = {
-        # Technology
-        "AAPL": "Technology", "MSFT": "Technology", "GOOGL": "Technology", "GOOG": "Technology",
-        "META": "Technology", "NVDA": "Technology", "TSLA": "Technology", "ADBE": "Technology",
-        "CRM": "Technology", "ORCL": "Technology", "CSCO": "Technology", "INTC": "Technology",
-        "AMD": "Technology", "QCOM": "Technology", "TXN": "Technology", "NOW": "Technology",
-        "AVGO": "Technology", "NFLX": "Technology", "IBM": "Technology",
-
-        # Healthcare
-        "JNJ": "Healthcare", "UNH": "Healthcare", "PFE": "Healthcare", "ABBV": "Healthcare",
-        "TMO": "Healthcare", "ABT": "Healthcare", "MRK": "Healthcare", "LLY": "Healthcare",
-        "BMY": "Healthcare", "AMGN": "Healthcare", "GILD": "Healthcare", "MDT": "Healthcare",
-        "ISRG": "Healthcare", "VRTX": "Healthcare", "ZTS": "Healthcare", "REGN": "Healthcare",
-        "CI": "Healthcare", "CVS": "Healthcare", "BSX": "Healthcare", "EW": "Healthcare",
-
-        # Finance
-        "JPM": "Finance", "BAC": "Finance", "WFC": "Finance", "GS": "Finance", "MS": "Finance",
-        "SCHW": "Finance", "BLK": "Finance", "C": "Finance", "AXP": "Finance", "SPGI": "Finance",
-        "CME": "Finance", "ICE": "Finance", "FIS": "Finance", "MCO": "Finance", "AON": "Finance",
-        "V": "Finance", "MA": "Finance", "PYPL": "Finance",
-
-        # Consumer
-        "AMZN": "Consumer", "WMT": "Consumer", "HD": "Consumer", "DIS": "Consumer",
-        "NKE": "Consumer", "COST": "Consumer", "TGT": "Consumer", "SBUX": "Consumer",
-        "LOW": "Consumer", "TJX": "Consumer", "BKNG": "Consumer", "MCD": "Consumer",
-        "MDLZ": "Consumer", "CL": "Consumer", "PG": "Consumer", "KO": "Consumer",
-        "PEP": "Consumer", "PM": "Consumer", "MO": "Consumer",
-
-        # Energy
-        "CVX": "Energy", "XOM": "Energy", "COP": "Energy", "SLB": "Energy",
-        "EOG": "Energy", "PSX": "Energy", "MPC": "Energy", "VLO": "Energy",
-
-        # Industrial
-        "BA": "Industrial", "HON": "Industrial", "UNP": "Industrial", "CAT": "Industrial",
-        "GE": "Industrial", "RTX": "Industrial", "MMM": "Industrial", "UPS": "Industrial",
-        "DE": "Industrial", "NSC": "Industrial",
-
-        # Utilities
-        "NEE": "Utilities", "DUK": "Utilities", "SO": "Utilities", "D": "Utilities",
-    }
-
-    top_traded: Set[str] = {
-        "AAPL", "MSFT", "NVDA", "TSLA", "AMZN", "META", "GOOGL", "GOOG", "SPY", "QQQ",
-        "AMD", "NFLX", "BABA", "INTC", "DIS", "PYPL", "MRNA", "NIO", "PLTR", "SOFI",
-    }
-
-    mega_cap_symbols: Set[str] = {
-        "AAPL", "MSFT", "GOOGL", "GOOG", "AMZN", "NVDA", "META", "TSLA", "BRK.B"
-    }
-
-    index_etfs: Set[str] = {
-        "SPY", "QQQ", "IWM", "DIA", "VOO", "VTI", "IVV", "MDY", "IJH", "IJR",
-        "RSP", "SPLG", "SPYG", "SPYV", "VUG", "VTV", "QQQM", "ONEQ"
-    }
 
-    sector_etfs: Set[str] = {
-        "XLF", "XLE", "XLK", "XLV", "XLI", "XLP", "XLY", "XLU", "XLB", "XLRE",
-        "VGT", "VHT", "VFH", "VDE", "VIS", "VDC", "VAW", "VNQ"
-    }
+    if symbol in index_etfs:
+        asset_type = "Index ETF"
+    elif symbol in sector_etfs:
+        asset_type = "Sector ETF"
+    elif symbol in bond_etfs:
+        asset_type = "Bond ETF"
+    elif symbol in commodity_etfs:
+        asset_type = "Commodity ETF"
+    elif symbol in international_etfs:
+        asset_type = "International ETF"
+    elif is_etf:
+        asset_type = "Other ETF"
+    else:
+        asset_type = "Stock"
+
+    # Market Cap Proxy
+    if symbol in mega_cap_symbols:
+        market_cap = "Mega Cap"
+    elif symbol in top_traded:
+        market_cap = "Large Cap"
+    elif len(symbol) <= 4:
+        market_cap = "Mid Cap"
+    else:
+        market_cap = "Small Cap"
 
-    bond_etfs: Set[str] = {
-        "AGG", "BND", "VCIT", "VCSH", "VGIT", "VGLT", "LQD", "HYG", "JNK", "TLT",
-        "IEF", "SHY", "TIP", "VTIP", "MUB", "BNDX"
-    }
-
-    commodity_etfs: Set[str] = {
-        "GLD", "SLV", "USO", "UNG", "DBA", "DBC", "PDBC", "IAU", "GLTR", "COMT"
+    return {
+        "symbol": symbol,
+        "name": name,
+        "exchange": exchange,
+        "type": asset_type,
+        "asset_class": "us_equity",
+        "sector": sector_map.get(symbol, "Other"),
+        "market_cap": market_cap,
+        "is_popular": symbol in top_traded,
+        "is_tradable": bool(a.get("tradable")),
     }
 
-    international_etfs: Set[str] = {
-        "VEA", "IEFA", "EFA", "VWO", "IEMG", "VXUS", "EEM", "IXUS", "ACWI", "VEU",
-        "SCHF", "SPDW", "IDEV", "EWJ", "EWZ", "FXI", "MCHI"
-    }
 
-    # Crypto-Assets, die du zu Pairs kombinieren willst
-    core_crypto_symbols: Set[str] = {
-        "BTCUSD", "ETHUSD", "SOLUSD", "LTCUSD", "DOGEUSD"
+def classify_crypto(a: Dict[str, Any]) -> Dict[str, Any]:
+    """Crypto-Spot-Asset (Rohdaten) -> Katalog-Eintrag."""
+    symbol = a["symbol"]  # z.B. BTCUSD
+    return {
+        "symbol": symbol,
+        "name": a.get("name") or symbol,
+        "exchange": a.get("exchange") or "CRYPTO",
+        "type": "Crypto Spot",
+        "asset_class": "crypto",
+        "sector": "Crypto",
+        "market_cap": "N/A",
+        "is_popular": symbol.replace("/", "") in core_crypto_symbols,
+        "is_tradable": bool(a.get("tradable")),
     }
-    pair_currencies: List[str] = ["USD", "EUR", "USDT"]
-
-    symbols: List[Dict[str, Any]] = []
 
-    # ── 3) Equities normalisieren ─────────────────────────────────
-    for a in eq_assets:
-        if not a.tradable:
-            continue
-
-        symbol = a.symbol
-        name = a.name or symbol
-        exchange = a.exchange.value if hasattr(a.exchange, "value") else str(a.exchange)
-
-        name_upper = name.upper()
-
-        # ETF-Erkennung
-        is_etf = (
-            symbol in index_etfs
-            or symbol in sector_etfs
-            or symbol in bond_etfs
-            or symbol in commodity_etfs
-            or symbol in international_etfs
-            or "ETF" in name_upper
-            or "FUND" in name_upper
-            or exchange in ("ARCA", "BATS")
-        )
-
-        if symbol in index_etfs:
-            asset_type = "Index ETF"
-        elif symbol in sector_etfs:
-            asset_type = "Sector ETF"
-        elif symbol in bond_etfs:
-            asset_type = "Bond ETF"
-        elif symbol in commodity_etfs:
-            asset_type = "Commodity ETF"
-        elif symbol in international_etfs:
-            asset_type = "International ETF"
-        elif is_etf:
-            asset_type = "Other ETF"
-        else:
-            asset_type = "Stock"
-
-        # Market Cap Proxy
-        if symbol in mega_cap_symbols:
-            market_cap = "Mega Cap"
-        elif symbol in top_traded:
-            market_cap = "Large Cap"
-        elif len(symbol) <= 4:
-            market_cap = "Mid Cap"
-        else:
-            market_cap = "Small Cap"
-
-        item: Dict[str, Any] = {
-            "symbol": symbol,
-            "name": name,
-            "exchange": exchange,
-            "type": asset_type,
-            "asset_class": "us_equity",
-            "sector": sector_map.get(symbol, "Other"),
-            "market_cap": market_cap,
-            "is_popular": symbol in top_traded,
-            "is_tradable": bool(a.tradable),
-        }
-        symbols.append(item)
-
-    # ── 4) Crypto-Assets normalisieren (Spot) ─────────────────────
-    for a in cr_assets:
-        if not a.tradable:
-            continue
 
-        symbol = a.symbol  # z.B. BTCUSD
-        name = a.name or symbol
-        exchange = a.exchange.value if hasattr(a.exchange, "value") else str(a.exchange)
-
-        item: Dict[str, Any] = {
-            "symbol": symbol,
-            "name": name,
-            "exchange": exchange or "CRYPTO",
-            "type": "Crypto Spot",
-            "asset_class": "crypto",
-            "sector": "Crypto",
-            "market_cap": "N/A",
-            "is_popular": symbol in core_crypto_symbols,
-            "is_tradable": bool(a.tradable),
-        }
-        symbols.append(item)
-
-    # ── 5) Synthetische Crypto-Pairs erzeugen ─────────────────────
-    for base_symbol in core_crypto_symbols:
+def crypto_pairs() -> List[Dict[str, Any]]:
+    """Synthetische Crypto-Pairs (BTC/USD, BTC/EUR, ETH/USD, …)."""
+    pairs: List[Dict[str, Any]] = []
+    for base_symbol in sorted(core_crypto_symbols):
         base = base_symbol.replace("USD", "")
         for quote in pair_currencies:
-            pair_symbol = f"{base}/{quote}"
-            pair_name = f"{base} / {quote}"
-            item: Dict[str, Any] = {
-                "symbol": pair_symbol,
-                "name": pair_name,
+            pairs.append({
+                "symbol": f"{base}/{quote}",
+                "name": f"{base} / {quote}",
                 "exchange": "CRYPTO",
                 "type": "Crypto Pair",
                 "asset_class": "crypto",
                 "sector": "Crypto",
                 "market_cap": "N/A",
-                "is_popular": base_symbol in core_crypto_symbols and quote == "USD",
+                "is_popular": quote == "USD",
                 "is_tradable": True,
-            }
-            symbols.append(item)
+            })
+    return pairs
 
-    # ── 6) Alphabetisch sortieren ─────────────────────────────────
+
+def build_symbols(raw_assets: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Alle handelbaren Assets klassifizieren, Pairs ergänzen, alphabetisch sortieren."""
+    symbols: List[Dict[str, Any]] = []
+    for a in raw_assets:
+        if not a.get("tradable"):
+            continue
+        symbols.append(classify_crypto(a) if a.get("asset_class") == "crypto" else classify_equity(a))
+
+    # Spot-Assets im Pair-Format (neuere Alpaca-Symbole) nicht doppelt aufnehmen
+    seen = {s["symbol"] for s in symbols}
+    symbols.extend(p for p in crypto_pairs() if p["symbol"] not in seen)
     symbols.sort(key=lambda x: x["symbol"])
+    return symbols
 
-    # ── 7) Metadaten für spätere Dashboards ───────────────────────
-    asset_classes = sorted(list({s["asset_class"] for s in symbols}))
-    types = sorted(list({s["type"] for s in symbols}))
-    sectors = sorted(list({s["sector"] for s in symbols}))
-    market_caps = ["Mega Cap", "Large Cap", "Mid Cap", "Small Cap", "N/A"]
 
+def symbol_metadata(symbols: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Metadaten für Dashboards/Filter."""
     return {
-        "symbols": symbols,
-        "metadata": {
-            "total": len(symbols),
-            "asset_classes": asset_classes,
-            "types": types,
-            "sectors": sectors,
-            "market_caps": market_caps,
-        },
+        "total": len(symbols),
+        "asset_classes": sorted({s["asset_class"] for s in symbols}),
+        "types": sorted({s["type"] for s in symbols}),
+        "sectors": sorted({s["sector"] for s in symbols}),
+        "market_caps": ["Mega Cap", "Large Cap", "Mid Cap", "Small Cap", "N/A"],
+    }
+
+
+def get_all_symbols(alpaca_key: Optional[str] = None, alpaca_secret: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Liefert ALLE relevanten Symbole für dein Terminal, inkl.:
+    - US Equities (Aktien + ETFs)
+    - Crypto Assets (Alpaca-Spot-Tokens)
+    - synthetische Crypto-Pairs (BTC/USD, BTC/EUR, ETH/USD, …)
+
+    Quelle ist der Asset-Katalog (Snapshot auf Platte, Refresh im
+    Hintergrund). Ohne Keys wird nur ein vorhandener Snapshot genutzt.
+
+    Rückgabeformat:
+    {
+      "symbols": [...],
+      "metadata": { ... }
     }
+    """
+    from backend.core.assets import catalog
+
+    symbols = catalog.assets(alpaca_key or "", alpaca_secret or "")
+    metadata = symbol_metadata(symbols)
+    if not symbols and (not alpaca_key or not alpaca_secret):
+        metadata["error"] = "No API keys provided"
+    return {"symbols": symbols, "metadata": metadata}
@@ -17,7 +17,9 @@ function startFastAPI() {
   fastApiProcess.stderr.on('data', (d) => console.log(`FastAPI: ${d}`))
 }
 
-function waitForBackend(retries = 40, delay = 500) {
+// Backend lädt Router erst nach dem ersten Request (backend/core/startup.py),
+// /api/health antwortet direkt nach dem Start – kurz pollen statt 500 ms warten
+function waitForBackend(retries = 200, delay = 100) {
   return new Promise((resolve) => {
     const attempt = (n) => {
       http.get('http://127.0.0.1:8000/api/health', (res) => {
@@ -14,8 +14,77 @@ async function apiModules() {
   return r.json()
 }
 
-async function apiBacktest(params) {
+// ── Binärformat (application/vnd.quantos.frame) ──────────
+// Layout: "QOSF" | uint32 Header-Länge | Header-JSON | Padding (8) | Spalten
+// Arrays stehen im Header als {"$col": i}; siehe backend/core/binary.py
+const FRAME_TYPE = 'application/vnd.quantos.frame'
+const FRAME_ARRAYS = { f4: Float32Array, f8: Float64Array, i8: BigInt64Array }
+
+function pad8(n) { return (8 - (n % 8)) % 8 }
+
+function formatFrameTime(ms) {
+  // wie pandas strftime('%Y-%m-%d %H:%M') auf dem UTC-Index
+  return new Date(ms).toISOString().slice(0, 16).replace('T', ' ')
+}
+
+// plain = true: Typed Arrays -> normale Arrays (NaN -> null, Zeit -> String),
+// damit bestehende Renderer unverändert funktionieren
+function decodeFrame(buffer, { plain = false } = {}) {
+  const view = new DataView(buffer)
+  const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4))
+  if (magic !== 'QOSF') throw new Error('Ungültiges Binärformat')
+
+  const size = view.getUint32(4, true)
+  const header = JSON.parse(new TextDecoder().decode(new Uint8Array(buffer, 8, size)))
+  const base = 8 + size + pad8(8 + size)
+
+  const column = i => {
+    const col = header.columns[i]
+    const Ctor = FRAME_ARRAYS[col.dtype]
+    let arr = new Ctor(buffer, base + col.offset, col.length)
+    if (col.time) arr = Float64Array.from(arr, Number)  // Epoch-ms
+    if (!plain) return arr
+    if (col.time) return Array.from(arr, formatFrameTime)
+    return Array.from(arr, v => (Number.isNaN(v) ? null : v))
+  }
+
+  const walk = v => {
+    if (Array.isArray(v)) return v.map(walk)
+    if (v && typeof v === 'object') {
+      if ('$col' in v && Object.keys(v).length === 1) return column(v.$col)
+      const out = {}
+      for (const [k, x] of Object.entries(v)) out[k] = walk(x)
+      return out
+    }
+    return v
+  }
+  return walk(header.data)
+}
+
+async function apiBacktest(params, { binary = false } = {}) {
   const r = await fetch(`${BASE}/api/backtest`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json',
+      ...(binary ? { Accept: `${FRAME_TYPE}, application/json` } : {})
+    },
+    body: JSON.stringify(params)
+  })
+  if (!r.ok) {
+    let detail = `Server Fehler (${r.status})`
+    try { const err = await r.json(); detail = err.detail || detail } catch {}
+    throw new Error(detail)
+  }
+  if ((r.headers.get('Content-Type') || '').startsWith(FRAME_TYPE)) {
+    return decodeFrame(await r.arrayBuffer(), { plain: true })
+  }
+  return r.json()
+}
+
+// Backtest als Job: einreihen, Fortschritt per SSE, Ergebnis abholen.
+// onProgress({ stage, progress, message }) für jede Stufe
+async function apiBacktestJob(params, { binary = false, onProgress = null } = {}) {
+  const r = await fetch(`${BASE}/api/backtest/jobs`, {
     method: 'POST',
     headers: { 'Content-Type': 'application/json' },
     body: JSON.stringify(params)
@@ -25,6 +94,42 @@ async function apiBacktest(params) {
     try { const err = await r.json(); detail = err.detail || detail } catch {}
     throw new Error(detail)
   }
+  const job = await r.json()
+
+  await new Promise((resolve) => {
+    const source = new EventSource(`${BASE}/api/backtest/jobs/${job.job_id}/stream`)
+    source.onmessage = (e) => {
+      const event = JSON.parse(e.data)
+      if (onProgress) onProgress(event)
+      if (['done', 'error', 'cancelled'].includes(event.state)) { source.close(); resolve() }
+    }
+    source.onerror = () => { source.close(); resolve() }   // Status klärt /result
+  })
+
+  const res = await fetch(`${BASE}/api/backtest/jobs/${job.job_id}/result`, {
+    headers: binary ? { Accept: `${FRAME_TYPE}, application/json` } : {}
+  })
+  if (!res.ok) {
+    let detail = `Server Fehler (${res.status})`
+    try { const err = await res.json(); detail = err.detail || detail } catch {}
+    throw new Error(detail)
+  }
+  if ((res.headers.get('Content-Type') || '').startsWith(FRAME_TYPE)) {
+    return decodeFrame(await res.arrayBuffer(), { plain: true })
+  }
+  return res.json()
+}
+
+// Zoom-Ausschnitt eines Backtests in voller Auflösung (aus dem Server-Cache)
+async function apiBacktestWindow({ result_id, start, end, max_points }) {
+  const q = new URLSearchParams({ result_id, start: start || '', end: end || '' })
+  if (max_points) q.set('max_points', max_points)
+  const r = await fetch(`${BASE}/api/backtest/window?${q}`)
+  if (!r.ok) {
+    let detail = `Server Fehler (${r.status})`
+    try { const err = await r.json(); detail = err.detail || detail } catch {}
+    throw new Error(detail)
+  }
   return r.json()
 }
 
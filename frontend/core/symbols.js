@@ -1,9 +1,9 @@
 // frontend/js/symbols.js
-let symbolData = null;
 let sortMode = 'alphabetical';
 const BATCH_SIZE = 50;
-let groupOffsets = {};
 let observers = [];
+let renderToken = 0;       // verwirft Antworten veralteter Suchen/Ansichten
+let searchTimer = null;
 
 const modal = document.getElementById('symbol-modal');
 const btnBrowse = document.getElementById('btn-browse-symbols');
@@ -18,32 +18,40 @@ window.addEventListener('click', (e) => {
   if (e.target === modal) closeModal();
 });
 
-// ── CACHE LADEN ──────────────────────────────────────────
+// ── SERVER-SUCHE ─────────────────────────────────────────
+// Suche, Sortierung und Gruppen laufen über /api/symbols/search
+// (Index im Backend); pro Tastendruck kommt nur eine Seite.
+function apiKeys() {
+  const cached = QuantCache.load()
+  return (cached && cached.api) ? cached.api : {}
+}
+
+async function searchSymbols(params) {
+  const keys = apiKeys()
+  const query = new URLSearchParams({
+    alpaca_key: keys.alpacaKey || '',
+    alpaca_secret: keys.alpacaSecret || '',
+  })
+  Object.entries(params).forEach(([k, v]) => {
+    if (v !== undefined && v !== null && v !== '' && v !== false) query.set(k, v)
+  })
+  const res = await fetch(`http://localhost:8000/api/symbols/search?${query}`)
+  if (!res.ok) throw new Error((await res.json()).detail || res.statusText)
+  return res.json()
+}
+
+// Index im Backend vorwärmen (Snapshot laden / Index bauen)
 async function preloadSymbols() {
-  if (symbolData) return;
+  const keys = apiKeys()
+  if (!keys.alpacaKey || !keys.alpacaSecret) {
+    console.warn('⚠️ Keine API-Keys für Symbole')
+    return
+  }
   try {
-    const cached = QuantCache.load()
-    const apiKeys = (cached && cached.api) ? cached.api : {}
-    
-    if (!apiKeys.alpacaKey || !apiKeys.alpacaSecret) {
-      console.warn('⚠️ Keine API-Keys für Symbole')
-      return
-    }
-
-    const res = await fetch('http://localhost:8000/api/symbols', {
-      method: 'POST',
-      headers: { 'Content-Type': 'application/json' },
-      body: JSON.stringify({
-        alpaca_key: apiKeys.alpacaKey,
-        alpaca_secret: apiKeys.alpacaSecret
-      })
-    });
-    
-    const data = await res.json();
-    symbolData = Array.isArray(data) ? data : (data.symbols || []);
-    console.log('✅ Symbols cached:', symbolData.length);
+    const res = await searchSymbols({ limit: 0 })
+    console.log('✅ Symbol-Index bereit:', res.total);
   } catch (err) {
-    console.error('❌ Symbol cache failed:', err);
+    console.error('❌ Symbol-Index nicht verfügbar:', err);
   }
 }
 
@@ -51,26 +59,34 @@ async function preloadSymbols() {
 preloadSymbols();
 
 // ── MODAL ────────────────────────────────────────────────
-async function openModal() {
+function openModal() {
   modal.style.display = 'flex';
   searchInput.value = '';
   searchInput.focus();
-
-  if (!symbolData) {
-    symbolList.innerHTML = '<p class="loading">⏳ Lade Symbole...</p>';
-    await preloadSymbols();
-  }
-
   renderView();
 }
 
 function closeModal() {
   modal.style.display = 'none';
+  disconnectObservers();
+}
+
+function disconnectObservers() {
   observers.forEach(o => o.disconnect());
   observers = [];
 }
 
 // ── VIEW ─────────────────────────────────────────────────
+const GROUP_FIELDS = {
+  'type':       { field: 'type',       order: ["Index ETF", "Sector ETF", "Bond ETF", "Commodity ETF",
+                                                 "International ETF", "Other ETF", "Stock",
+                                                 "Crypto Pair", "Crypto Spot"] },
+  'market_cap': { field: 'market_cap', order: ["Mega Cap", "Large Cap", "Mid Cap", "Small Cap", "N/A"] },
+  'sector':     { field: 'sector',     order: ["Technology", "Healthcare", "Finance", "Consumer", "Energy",
+                                                 "Industrial", "Utilities", "Real Estate", "Materials",
+                                                 "Crypto", "Other"] },
+};
+
 function renderView() {
   let sortBtn = document.getElementById('sort-toggle');
   if (!sortBtn) {
@@ -82,10 +98,11 @@ function renderView() {
   }
 
   updateSortButton(sortBtn);
-  groupOffsets = {};
-  observers.forEach(o => o.disconnect());
-  observers = [];
-  renderGrouped();
+  disconnectObservers();
+
+  if (sortMode === 'alphabetical') renderFlat({});
+  else if (sortMode === 'popularity') renderFlat({ popular: true });
+  else renderGroups(GROUP_FIELDS[sortMode]);
 }
 
 function cycleSortMode() {
@@ -108,6 +125,8 @@ function updateSortButton(btn) {
 // ── ICONS ────────────────────────────────────────────────
 const GROUP_ICONS = {
   "Crypto Pairs":        "₿",
+  "Crypto Pair":         "₿",
+  "Crypto Spot":         "🪙",
   "Index ETF":           "📊",
   "Sector ETF":          "🎯",
   "Bond ETF":            "💵",
@@ -136,165 +155,92 @@ const GROUP_ICONS = {
   "Most Popular": "🔥",
 };
 
-// ── GRUPPIERUNG ──────────────────────────────────────────
-function groupBy(symbols, key) {
-  return symbols.reduce((acc, s) => {
-    const g = s[key] || 'Other';
-    if (!acc[g]) acc[g] = [];
-    acc[g].push(s);
-    return acc;
-  }, {});
-}
-
-function groupByType(symbols) {
-  const order = [
-    "Crypto Pairs",
-    "Index ETF",
-    "Sector ETF",
-    "Bond ETF",
-    "Commodity ETF",
-    "International ETF",
-    "Crypto & Blockchain",
-    "Other ETF",
-    "Stock"
-  ];
-
-  const raw = symbols.reduce((acc, s) => {
-    const type = s.symbol.includes('/') ? 'Crypto Pairs' : (s.type || 'Stock');
-    if (!acc[type]) acc[type] = [];
-    acc[type].push(s);
-    return acc;
-  }, {});
-
-  return Object.fromEntries(order.filter(t => raw[t]).map(t => [t, raw[t]]));
-}
-
-function groupByMarketCap(symbols) {
-  const order = ["Mega Cap", "Large Cap", "Mid Cap", "Small Cap"];
-  const stocks = symbols.filter(s => !s.symbol.includes('/') && s.type === 'Stock');
-  const etfs = symbols.filter(s => s.type && s.type.includes('ETF'));
-  const crypto = symbols.filter(s => s.symbol.includes('/'));
-
-  const grouped = stocks.reduce((acc, s) => {
-    const g = s.market_cap || 'Small Cap';
-    if (!acc[g]) acc[g] = [];
-    acc[g].push(s);
-    return acc;
-  }, {});
-
-  const result = Object.fromEntries(order.filter(c => grouped[c]).map(c => [c, grouped[c]]));
-  if (etfs.length > 0) result["ETFs"] = etfs;
-  if (crypto.length > 0) result["Crypto Pairs"] = crypto;
-  return result;
-}
-
-function groupBySector(symbols) {
-  const order = [
-    "Technology", "Healthcare", "Finance", "Consumer",
-    "Energy", "Industrial", "Utilities", "Real Estate", "Materials", "Other"
-  ];
-
-  const stocks = symbols.filter(s => !s.symbol.includes('/') && s.type === 'Stock');
-  const etfs = symbols.filter(s => s.type && s.type.includes('ETF'));
-  const crypto = symbols.filter(s => s.symbol.includes('/'));
-
-  const grouped = stocks.reduce((acc, s) => {
-    const g = s.sector || 'Other';
-    if (!acc[g]) acc[g] = [];
-    acc[g].push(s);
-    return acc;
-  }, {});
-
-  const result = Object.fromEntries(order.filter(sec => grouped[sec]).map(sec => [sec, grouped[sec]]));
-  if (etfs.length > 0) result["ETFs"] = etfs;
-  if (crypto.length > 0) result["Crypto Pairs"] = crypto;
-  return result;
-}
-
 // ── RENDER ────────────────────────────────────────────────
-function renderGrouped() {
-  // 1) Alphabetisch: flache Liste A–Z
-  if (sortMode === 'alphabetical') {
-    const list = [...symbolData].sort((a, b) =>
-      a.symbol.localeCompare(b.symbol)
-    );
-    renderFlatWithInfiniteScroll(list, 'alphabetical');
+// flache Liste (A-Z, Popular, Suchtreffer) mit seitenweisem Nachladen
+async function renderFlat(params) {
+  const token = ++renderToken;
+  symbolList.innerHTML = '<p class="loading">⏳ Lade Symbole...</p>';
+  let page;
+  try {
+    page = await searchSymbols({ ...params, limit: BATCH_SIZE });
+  } catch (err) {
+    if (token === renderToken) symbolList.innerHTML = `<p class="no-results">${err.message}</p>`;
     return;
   }
+  if (token !== renderToken) return;
 
-  // 2) Popular: flache Liste, nur "is_popular", absteigend, max 1000
-  if (sortMode === 'popularity') {
-    const popular = symbolData
-      .filter(s => s.is_popular)
-      .sort((a, b) => a.symbol.localeCompare(b.symbol))
-      .slice(0, 1000);
-
-    renderFlatWithInfiniteScroll(popular, 'popular');
+  if (!page.total) {
+    symbolList.innerHTML = '<p class="no-results">Keine Symbole gefunden</p>';
     return;
   }
+  symbolList.innerHTML = `
+    <div class="group-symbols" data-group="flat">${renderRows(page.results)}</div>
+    ${page.total > BATCH_SIZE ? scrollTrigger('flat') : ''}
+  `;
+  attachRowHandlers();
+  attachScrollObserver(symbolList.querySelector('.scroll-trigger'), params, BATCH_SIZE, page.total, token);
+}
 
-  // 3) Alle anderen: gruppiert
-  let groups = {};
-  switch (sortMode) {
-    case 'type':       groups = groupByType(symbolData);      break;
-    case 'market_cap': groups = groupByMarketCap(symbolData); break;
-    case 'sector':     groups = groupBySector(symbolData);    break;
+// Gruppen = Facettenwerte mit Trefferzahl; Inhalte erst beim Aufklappen
+async function renderGroups({ field, order }) {
+  const token = ++renderToken;
+  symbolList.innerHTML = '<p class="loading">⏳ Lade Gruppen...</p>';
+  let res;
+  try {
+    res = await searchSymbols({ limit: 0, facets: true });
+  } catch (err) {
+    if (token === renderToken) symbolList.innerHTML = `<p class="no-results">${err.message}</p>`;
+    return;
   }
-
-  symbolList.innerHTML = Object.entries(groups).map(([groupName, symbols]) => {
-    if (!symbols || symbols.length === 0) return '';
-
-    groupOffsets[groupName] = BATCH_SIZE;
-    const initial = symbols.slice(0, BATCH_SIZE);
-    const hasMore = symbols.length > BATCH_SIZE;
-    const icon = GROUP_ICONS[groupName] || "📁";
-
-    return `
-      <div class="symbol-group" data-group="${groupName}">
-        <div class="group-header">
-          <span class="group-icon">${icon}</span>
-          <span class="group-title">${groupName}</span>
-          <span class="group-count">${symbols.length}</span>
-          <span class="group-toggle">▼</span>
-        </div>
-        <div class="group-content" style="display: none;">
-          <div class="group-symbols" data-group="${groupName}">
-            ${renderRows(initial)}
-          </div>
-          ${hasMore ? `
-            <div class="scroll-trigger" data-group="${groupName}">
-              <div class="loading-spinner">⏳ Lädt mehr...</div>
-            </div>
-          ` : ''}
-        </div>
+  if (token !== renderToken) return;
+
+  const counts = res.facets[field] || {};
+  const names = [...order.filter(g => counts[g]), ...Object.keys(counts).filter(g => !order.includes(g)).sort()];
+
+  symbolList.innerHTML = names.map(groupName => `
+    <div class="symbol-group" data-group="${groupName}">
+      <div class="group-header">
+        <span class="group-icon">${GROUP_ICONS[groupName] || "📁"}</span>
+        <span class="group-title">${groupName}</span>
+        <span class="group-count">${counts[groupName]}</span>
+        <span class="group-toggle">▶</span>
       </div>
-    `;
-  }).join('');
+      <div class="group-content" style="display: none;">
+        <div class="group-symbols" data-group="${groupName}"></div>
+      </div>
+    </div>
+  `).join('');
 
-  attachRowHandlers();
-  attachGroupToggle();
-  attachScrollObservers(groups);
+  symbolList.querySelectorAll('.symbol-group').forEach(group => {
+    const header = group.querySelector('.group-header');
+    const content = group.querySelector('.group-content');
+    const groupName = group.dataset.group;
+    header.addEventListener('click', async () => {
+      const open = content.style.display === 'none';
+      content.style.display = open ? 'flex' : 'none';
+      header.querySelector('.group-toggle').textContent = open ? '▼' : '▶';
+      if (!open || group.dataset.loaded) return;
+      group.dataset.loaded = 'true';
+
+      const params = { [field]: groupName };
+      const page = await searchSymbols({ ...params, limit: BATCH_SIZE });
+      if (token !== renderToken) return;
+      content.querySelector('.group-symbols').innerHTML = renderRows(page.results);
+      if (page.total > BATCH_SIZE) {
+        content.insertAdjacentHTML('beforeend', scrollTrigger(groupName));
+        attachScrollObserver(content.querySelector('.scroll-trigger'), params, BATCH_SIZE, page.total, token);
+      }
+      attachRowHandlers();
+    });
+  });
 }
 
-// flache Liste mit Auto-Infinite-Scroll (für Alphabetical & Popular)
-function renderFlatWithInfiniteScroll(list, groupName) {
-  groupOffsets[groupName] = BATCH_SIZE;
-  const initial = list.slice(0, BATCH_SIZE);
-  const hasMore = list.length > BATCH_SIZE;
-
-  symbolList.innerHTML = `
-    <div class="group-symbols" data-group="${groupName}">
-      ${renderRows(initial)}
+function scrollTrigger(groupName) {
+  return `
+    <div class="scroll-trigger" data-group="${groupName}">
+      <div class="loading-spinner">⏳ Lädt mehr...</div>
     </div>
-    ${hasMore ? `
-      <div class="scroll-trigger" data-group="${groupName}">
-        <div class="loading-spinner">⏳ Lädt mehr...</div>
-      </div>
-    ` : ''}
   `;
-
-  attachRowHandlers();
-  attachScrollObservers({ [groupName]: list });
 }
 
 function renderRows(symbols) {
@@ -310,45 +256,33 @@ function renderRows(symbols) {
 }
 
 // ── INTERSECTION OBSERVER ─────────────────────────────────
-function attachScrollObservers(groups) {
-  document.querySelectorAll('.scroll-trigger').forEach(trigger => {
-    const groupName = trigger.dataset.group;
-    const allSymbols = groups[groupName];
-    if (!allSymbols) return;
-
-    const container = trigger.previousElementSibling;
-
-    const observer = new IntersectionObserver((entries) => {
-      entries.forEach(entry => {
-        if (!entry.isIntersecting) return;
-
-        const offset = groupOffsets[groupName];
-        if (offset >= allSymbols.length) {
-          trigger.remove();
-          observer.disconnect();
-          return;
-        }
-
-        const nextBatch = allSymbols.slice(offset, offset + BATCH_SIZE);
-        groupOffsets[groupName] = offset + BATCH_SIZE;
-
-        container.insertAdjacentHTML('beforeend', renderRows(nextBatch));
-        attachRowHandlers();
-
-        if (groupOffsets[groupName] >= allSymbols.length) {
-          trigger.remove();
-          observer.disconnect();
-        }
-      });
-    }, {
-      root: symbolList,
-      rootMargin: '100px',
-      threshold: 0.1
-    });
-
-    observer.observe(trigger);
-    observers.push(observer);
+function attachScrollObserver(trigger, params, offset, total, token) {
+  if (!trigger) return;
+  const container = trigger.previousElementSibling;
+  let loading = false;
+
+  const observer = new IntersectionObserver(async (entries) => {
+    if (!entries.some(e => e.isIntersecting) || loading) return;
+    loading = true;
+    const page = await searchSymbols({ ...params, offset, limit: BATCH_SIZE });
+    loading = false;
+    if (token !== renderToken) return;
+
+    container.insertAdjacentHTML('beforeend', renderRows(page.results));
+    attachRowHandlers();
+    offset += page.results.length;
+    if (offset >= total || !page.results.length) {
+      trigger.remove();
+      observer.disconnect();
+    }
+  }, {
+    root: symbolList,
+    rootMargin: '100px',
+    threshold: 0.1
   });
+
+  observer.observe(trigger);
+  observers.push(observer);
 }
 
 // ── HANDLERS ─────────────────────────────────────────────
@@ -363,44 +297,13 @@ function attachRowHandlers() {
   });
 }
 
-function attachGroupToggle() {
-  document.querySelectorAll('.group-header').forEach(header => {
-    header.addEventListener('click', () => {
-      const content = header.nextElementSibling;
-      const toggle = header.querySelector('.group-toggle');
-      content.style.display = content.style.display === 'none' ? 'flex' : 'none';
-      toggle.textContent = content.style.display === 'none' ? '▶' : '▼';
-    });
-  });
-}
-
 // ── LIVE-SUCHE ───────────────────────────────────────────
 searchInput.addEventListener('input', (e) => {
-  const query = e.target.value.toLowerCase();
-
-  if (!query) {
-    renderView();
-    return;
-  }
-
-  const filtered = symbolData
-    .filter(s =>
-      s.symbol.toLowerCase().includes(query) ||
-      s.name.toLowerCase().includes(query)
-    )
-    .slice(0, 100);
-
-  symbolList.innerHTML = filtered.length
-    ? filtered.map(s => `
-        <div class="symbol-row" data-symbol="${s.symbol}">
-          <div class="symbol-info">
-            <span class="symbol-ticker">${s.symbol}</span>
-            <span class="symbol-name">${s.name}</span>
-          </div>
-          <span class="symbol-exchange">${s.exchange}</span>
-        </div>
-      `).join('')
-    : '<p class="no-results">Keine Symbole gefunden</p>';
-
-  attachRowHandlers();
+  const query = e.target.value.trim();
+  clearTimeout(searchTimer);
+  searchTimer = setTimeout(() => {
+    disconnectObservers();
+    if (!query) renderView();
+    else renderFlat({ q: query });
+  }, 80);
 });
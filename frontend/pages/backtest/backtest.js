@@ -17,6 +17,13 @@ let lwIndicatorSeries = []
 // ── PLOTLY STATE ──────────────────────────────────────────
 let equityRelayoutGuard = false
 
+// ── ZOOM STATE (downsampled Ergebnisse) ───────────────────
+let backtestMeta = null       // { resultId, downsampled }
+let chartOverview = null      // reduzierte Chart-Daten der Gesamtansicht
+let chartWindowKey = ''
+let chartWindowTimer = null
+let equityWindowTimer = null
+
 // ══════════════════════════════════════════════════════════
 //  CACHE HELPERS – alle try-catch, schlagen nie durch
 // ══════════════════════════════════════════════════════════
@@ -85,6 +92,27 @@ function toUnixTime(dateStr) {
   return Math.floor(new Date(dateStr).getTime() / 1000)
 }
 
+function toFrameTime(ms) {
+  return new Date(ms).toISOString().slice(0, 16).replace('T', ' ')
+}
+
+// Übersicht außerhalb des Fensters + volle Auflösung innerhalb zusammenführen
+function mergeWindow(base, win, keys) {
+  if (!win || win.dates.length === 0) return base
+  const first = win.dates[0]
+  const last = win.dates[win.dates.length - 1]
+  const before = base.dates.findIndex(d => d >= first)
+  let after = base.dates.findIndex(d => d > last)
+  const lo = before < 0 ? base.dates.length : before
+  if (after < 0) after = base.dates.length
+
+  const out = { dates: [...base.dates.slice(0, lo), ...win.dates, ...base.dates.slice(after)] }
+  keys.forEach(k => {
+    out[k] = [...base[k].slice(0, lo), ...win[k], ...base[k].slice(after)]
+  })
+  return out
+}
+
 // ── CONSTRAINTS ───────────────────────────────────────────
 function calcPerfConstraints() {
   const perfEl = document.getElementById('perf-panel')
@@ -289,6 +317,8 @@ function ensureLwcChart() {
     wickDownColor: '#ef5350',
   })
 
+  lwChart.timeScale().subscribeVisibleTimeRangeChange(onChartRangeChange)
+
   setTimeout(() => {
     const watermarks = container.querySelectorAll('a')
     watermarks.forEach(el => el.remove())
@@ -522,7 +552,12 @@ async function runBacktest() {
   }
 
   try {
-    const result = await apiBacktest(params)
+    const result = await apiBacktestJob(params, {
+      binary: true,
+      onProgress: (e) => { btn.textContent = `⏳ ${e.progress}% ${e.stage}` }
+    })
+    backtestMeta = { resultId: result.result_id, downsampled: !!result.downsampled }
+    chartWindowKey = ''
     renderChart(result.chart)
     renderEquity(result.equity)
     renderPerformance(result.performance)
@@ -551,16 +586,8 @@ async function runBacktest() {
 
 
 // ── RENDER CHART (Lightweight Charts) ────────────────────
-function renderChart(data) {
-  if (!ensureLwcChart()) {
-    console.error('lwc-chart Container nicht gefunden')
-    return
-  }
-
-  lwIndicatorSeries.forEach(s => lwChart.removeSeries(s))
-  lwIndicatorSeries = []
-
-  const candles = data.dates
+function toCandles(data) {
+  return data.dates
     .map((d, i) => ({
       time: toUnixTime(d),
       open: data.open[i],
@@ -569,8 +596,70 @@ function renderChart(data) {
       close: data.close[i],
     }))
     .filter(c => c.open !== null && c.high !== null && c.low !== null && c.close !== null)
+}
 
-  lwCandleSeries.setData(candles)
+function toLine(dates, values) {
+  return dates
+    .map((d, idx) => ({ time: toUnixTime(d), value: values[idx] }))
+    .filter(p => p.value !== null)
+}
+
+// Zoom im Kerzenchart: sichtbaren Bereich in voller Auflösung nachladen
+function onChartRangeChange(range) {
+  if (!range || !backtestMeta || !backtestMeta.downsampled || !chartOverview) return
+  clearTimeout(chartWindowTimer)
+  chartWindowTimer = setTimeout(async () => {
+    const start = toFrameTime(range.from * 1000)
+    const end = toFrameTime(range.to * 1000)
+    const key = start + '|' + end
+    if (key === chartWindowKey) return
+    chartWindowKey = key
+    try {
+      const win = await apiBacktestWindow({ result_id: backtestMeta.resultId, start, end })
+      if (!win.chart || win.downsampled) return
+      const indicatorKeys = Object.keys(chartOverview.indicators)
+      const flat = d => ({ dates: d.dates, open: d.open, high: d.high, low: d.low, close: d.close,
+                           ...Object.fromEntries(indicatorKeys.map(k => ['ind:' + k, d.indicators[k]])) })
+      const merged = mergeWindow(flat(chartOverview), flat(win.chart),
+        ['open', 'high', 'low', 'close', ...indicatorKeys.map(k => 'ind:' + k)])
+      lwCandleSeries.setData(toCandles(merged))
+      indicatorKeys.forEach((k, i) => lwIndicatorSeries[i].setData(toLine(merged.dates, merged['ind:' + k])))
+    } catch (err) {
+      console.warn('[Backtest] Zoom-Daten nicht geladen:', err.message)
+    }
+  }, 300)
+}
+
+// Zoom im Equity-Chart: Equity-Linien im Fenster in voller Auflösung
+function loadEquityWindow(plotEl, fromMs, toMs) {
+  if (!backtestMeta || !backtestMeta.downsampled || !lastEquityData) return
+  clearTimeout(equityWindowTimer)
+  equityWindowTimer = setTimeout(async () => {
+    try {
+      const win = await apiBacktestWindow({
+        result_id: backtestMeta.resultId, start: toFrameTime(fromMs), end: toFrameTime(toMs)
+      })
+      if (!win.equity || win.downsampled) return
+      const keys = ['equity_high', 'equity_low', 'bh_equity', 'equity']
+      const merged = mergeWindow(lastEquityData, win.equity, keys)
+      Plotly.restyle(plotEl, { x: keys.map(() => merged.dates), y: keys.map(k => merged[k]) }, [0, 1, 2, 3])
+    } catch (err) {
+      console.warn('[Backtest] Zoom-Daten nicht geladen:', err.message)
+    }
+  }, 300)
+}
+
+function renderChart(data) {
+  if (!ensureLwcChart()) {
+    console.error('lwc-chart Container nicht gefunden')
+    return
+  }
+
+  lwIndicatorSeries.forEach(s => lwChart.removeSeries(s))
+  lwIndicatorSeries = []
+
+  chartOverview = data
+  lwCandleSeries.setData(toCandles(data))
   lwChart.timeScale().fitContent()
 
   setTimeout(() => {
@@ -593,11 +682,7 @@ function renderChart(data) {
       priceLineVisible: false,
       lastValueVisible: false,
     })
-    const lineData = data.dates
-      .map((d, idx) => ({ time: toUnixTime(d), value: values[idx] }))
-      .filter(p => p.value !== null)
-
-    series.setData(lineData)
+    series.setData(toLine(data.dates, values))
     lwIndicatorSeries.push(series)
     legendItems.push({ name: col.toUpperCase(), color })
   })
@@ -683,6 +768,25 @@ function renderEquity(data) {
       line: { color: 'rgba(122,162,247,0.25)', width: 1 },
       showlegend: false, hoverinfo: 'x+y+name'
     },
+    ...(data.projection.bands?.p25 && data.projection.bands?.p75 ? [
+      {
+        name: 'Projection P75',
+        type: 'scatter',
+        x: [lastDate, ...data.projection.dates],
+        y: [lastEquity, ...Array.from(data.projection.bands.p75, capProj)],
+        line: { color: 'rgba(122,162,247,0.3)', width: 1 },
+        showlegend: false, hoverinfo: 'x+y+name'
+      },
+      {
+        name: 'Projection P25',
+        type: 'scatter',
+        x: [lastDate, ...data.projection.dates],
+        y: [lastEquity, ...Array.from(data.projection.bands.p25, capProj)],
+        fill: 'tonexty', fillcolor: 'rgba(122,162,247,0.15)',
+        line: { color: 'rgba(122,162,247,0.3)', width: 1 },
+        showlegend: false, hoverinfo: 'x+y+name'
+      },
+    ] : []),
     {
       name: 'Erwartete Equity',
       type: 'scatter',
@@ -750,6 +854,7 @@ function renderEquity(data) {
         updates['xaxis.range[0]'] = new Date(curMin).toISOString()
         updates['xaxis.range[1]'] = new Date(curMax).toISOString()
       }
+      loadEquityWindow(plotEl, curMin, curMax)
     }
 
     if (hasY) {
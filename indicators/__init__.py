@@ -1,20 +1,63 @@
 import importlib
+import inspect
+import sys
+import types
 from pathlib import Path
-from functools import wraps
 
-def _wrap(fn):
-    @wraps(fn)
-    def wrapper(*args, **kwargs):
+# Wird vom Backend gesetzt (backend.core.indicator_engine), sonst direkter Aufruf
+_compute = None
+
+# Funktion -> (gültige Parameter, **kwargs?), einmal pro Funktionsobjekt ermittelt
+_signatures = {}
+
+
+def _signature(fn):
+    sig = _signatures.get(fn)
+    if sig is None:
+        params = inspect.signature(fn).parameters.values()
+        sig = _signatures[fn] = (frozenset(p.name for p in params),
+                                 any(p.kind == inspect.Parameter.VAR_KEYWORD for p in params))
+    return sig
+
+
+def _wrap(name, module):
+    # Funktion bei jedem Aufruf aus dem Modul holen: nach einem Reload
+    # (backend.core.plugins) gilt sofort die neue Version
+    def wrapper(df, *args, **kwargs):
+        fn = getattr(module, name)
+        valid, var_kw = _signature(fn)
         # unbekannte kwargs rausfiltern bevor sie die Funktion erreichen
-        import inspect
-        valid = inspect.signature(fn).parameters
-        clean = {k: v for k, v in kwargs.items() if k in valid}
-        return fn(*args, **clean)
+        clean = kwargs if var_kw else {k: v for k, v in kwargs.items() if k in valid}
+        if _compute is not None:
+            return _compute(name, fn, df, *args, **clean)
+        return fn(df, *args, **clean)
+
+    wrapper.__name__ = wrapper.__qualname__ = name
+    wrapper.__doc__  = getattr(module, name).__doc__
     return wrapper
 
-for file in Path(__file__).parent.glob("*.py"):
-    if file.stem == "__init__":
-        continue
-    module = importlib.import_module(f".{file.stem}", package=__name__)
-    if hasattr(module, file.stem):
-        globals()[file.stem] = _wrap(getattr(module, file.stem))
+
+class _Package(types.ModuleType):
+    """
+    Plugins werden erst beim Zugriff importiert (`from indicators import sma`).
+    Das Import-System hängt Untermodule als Attribut ans Paket; statt des
+    Moduls landet dort der Wrapper um die gleichnamige Funktion.
+    """
+
+    def __setattr__(self, name, value):
+        if isinstance(value, types.ModuleType) and value.__name__ == f"{__name__}.{name}" \
+                and callable(getattr(value, name, None)):
+            value = _wrap(name, value)
+        super().__setattr__(name, value)
+
+    def __getattr__(self, name):
+        if name.startswith("_") or not (Path(__file__).parent / f"{name}.py").exists():
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+        importlib.import_module(f".{name}", package=__name__)
+        try:
+            return self.__dict__[name]
+        except KeyError:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+
+sys.modules[__name__].__class__ = _Package
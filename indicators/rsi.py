@@ -1,6 +1,44 @@
+from collections import deque
+
+INPUTS  = ["{col}"]
+OUTPUTS = ["rsi"]
+
 def rsi(df, period=14, col="close"):
     delta = df[col].diff()
     gain  = delta.clip(lower=0).rolling(period).mean()
     loss  = (-delta.clip(upper=0)).rolling(period).mean()
     df["rsi"] = 100 - (100 / (1 + gain / loss))
     return df
+
+
+class RsiStream:
+    """Live-Modus: gleitende Summen von Gewinnen/Verlusten (wie `rsi`), O(1) pro Bar."""
+
+    def __init__(self, period=14, col="close"):
+        self.period = period
+        self.col    = col
+        self.prev   = None
+        self.deltas = deque()
+        self.gain   = 0.0
+        self.loss   = 0.0
+
+    def update(self, bar):
+        value = bar[self.col]
+        if self.prev is not None:
+            delta = value - self.prev
+            self.deltas.append(delta)
+            self.gain += max(delta, 0.0)
+            self.loss += max(-delta, 0.0)
+            if len(self.deltas) > self.period:
+                old = self.deltas.popleft()
+                self.gain -= max(old, 0.0)
+                self.loss -= max(-old, 0.0)
+        self.prev = value
+
+        if len(self.deltas) < self.period:
+            return {"rsi": None}
+        if self.loss <= 0.0:
+            return {"rsi": 100.0 if self.gain > 0.0 else None}
+        return {"rsi": 100 - 100 / (1 + self.gain / self.loss)}
+
+STREAM = RsiStream
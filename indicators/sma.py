@@ -1,3 +1,29 @@
+from collections import deque
+
+INPUTS  = ["{col}"]
+OUTPUTS = ["sma_{period}"]
+
 def sma(df, period=20, col="close"):
     df[f"sma_{period}"] = df[col].rolling(period).mean()
     return df
+
+
+class SmaStream:
+    """Live-Modus: laufende Summe über die letzten `period` Werte, O(1) pro Bar."""
+
+    def __init__(self, period=20, col="close"):
+        self.period = period
+        self.col    = col
+        self.window = deque()
+        self.total  = 0.0
+        self.name   = f"sma_{period}"
+
+    def update(self, bar):
+        value = bar[self.col]
+        self.window.append(value)
+        self.total += value
+        if len(self.window) > self.period:
+            self.total -= self.window.popleft()
+        return {self.name: self.total / self.period if len(self.window) == self.period else None}
+
+STREAM = SmaStream
@@ -1,25 +1,53 @@
 import importlib
-from pathlib import Path
-from functools import wraps
 import inspect
+import sys
+import types
+from pathlib import Path
+
+# Funktion -> (gültige Parameter, **kwargs?), einmal pro Funktionsobjekt ermittelt
+_signatures = {}
+
+
+def _signature(fn):
+    sig = _signatures.get(fn)
+    if sig is None:
+        params = inspect.signature(fn).parameters.values()
+        sig = _signatures[fn] = (frozenset(p.name for p in params),
+                                 any(p.kind == inspect.Parameter.VAR_KEYWORD for p in params))
+    return sig
+
 
-def _wrap(fn):
-    @wraps(fn)
+def _wrap(name, module):
+    # Funktion bei jedem Aufruf aus dem Modul holen (Hot-Reload, backend.core.plugins)
     def wrapper(*args, **kwargs):
-        params = inspect.signature(fn).parameters
-        has_var_keyword = any(
-            p.kind == inspect.Parameter.VAR_KEYWORD
-            for p in params.values()
-        )
-        if has_var_keyword:
+        fn = getattr(module, name)
+        valid, var_kw = _signature(fn)
+        if var_kw:
             return fn(*args, **kwargs)
-        clean = {k: v for k, v in kwargs.items() if k in params}
-        return fn(*args, **clean)
+        return fn(*args, **{k: v for k, v in kwargs.items() if k in valid})
+
+    wrapper.__name__ = wrapper.__qualname__ = name
+    wrapper.__doc__  = getattr(module, name).__doc__
     return wrapper
 
-for file in Path(__file__).parent.glob("*.py"):
-    if file.stem == "__init__":
-        continue
-    module = importlib.import_module(f".{file.stem}", package=__name__)
-    if hasattr(module, file.stem):
-        globals()[file.stem] = _wrap(getattr(module, file.stem))
+
+class _Package(types.ModuleType):
+    """Lazy wie indicators/: Import beim Zugriff, Paket-Attribut = Wrapper um die Funktion."""
+
+    def __setattr__(self, name, value):
+        if isinstance(value, types.ModuleType) and value.__name__ == f"{__name__}.{name}" \
+                and callable(getattr(value, name, None)):
+            value = _wrap(name, value)
+        super().__setattr__(name, value)
+
+    def __getattr__(self, name):
+        if name.startswith("_") or not (Path(__file__).parent / f"{name}.py").exists():
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+        importlib.import_module(f".{name}", package=__name__)
+        try:
+            return self.__dict__[name]
+        except KeyError:
+            raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+
+sys.modules[__name__].__class__ = _Package
@@ -1,4 +1,5 @@
 from indicators import sma
+from indicators.sma import SmaStream
 
 def sma_cross(df, fast=20, slow=50):
     df = sma(df, fast)
@@ -8,3 +9,19 @@ def sma_cross(df, fast=20, slow=50):
     df.loc[df[f"sma_{fast}"] > df[f"sma_{slow}"], "signal"] = 1
     df.loc[df[f"sma_{fast}"] < df[f"sma_{slow}"], "signal"] = -1
     return df
+
+
+class SmaCrossStream:
+    """Live-Modus: zwei inkrementelle SMAs, Signal wie `sma_cross`."""
+
+    def __init__(self, fast=20, slow=50):
+        self.fast = SmaStream(fast)
+        self.slow = SmaStream(slow)
+
+    def update(self, bar):
+        out = {**self.fast.update(bar), **self.slow.update(bar)}
+        f, s = out[self.fast.name], out[self.slow.name]
+        out["signal"] = 0 if f is None or s is None or f == s else (1 if f > s else -1)
+        return out
+
+STREAM = SmaCrossStream
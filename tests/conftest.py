@@ -0,0 +1,8 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Plugins (indicators/, strategies/) werden relativ zum Projekt-Root geladen
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
@@ -0,0 +1,62 @@
+import json
+import time
+
+from backend.core import assets as assets_mod
+from backend.core import clients
+from backend.core.assets import AssetCatalog
+from backend.core.fake_alpaca import FakeAlpaca
+
+
+def _wait(catalog: AssetCatalog, timeout: float = 5.0):
+    deadline = time.time() + timeout
+    while catalog.stats()["refreshing"] and time.time() < deadline:
+        time.sleep(0.01)
+
+
+def test_cold_start_snapshot_and_background_diff(monkeypatch, tmp_path):
+    path = tmp_path / "assets.json"
+    with FakeAlpaca(n_symbols=20) as fake:
+        monkeypatch.setattr(clients, "ALPACA_TRADING_URL", fake.url)
+
+        first = AssetCatalog(path)
+        equities = first.equities("key", "secret")
+        assert len(equities) == 20 and {"type", "sector", "market_cap", "is_popular"} <= set(equities[0])
+        assert {"BTC/USD", "BTC/EUR"} <= {s["symbol"] for s in first.assets()}   # Spot + synthetische Pairs
+        assert fake.requests == 2 and path.exists()
+
+        # Neustart: Snapshot sofort, ohne Alpaca-Call
+        second = AssetCatalog(path)
+        assert second.equity_symbols("key", "secret") == first.equity_symbols()
+        assert fake.requests == 2 and second.stats()["snapshot_loads"] == 1
+
+        # Snapshot veraltet -> Hintergrund-Abgleich mit Diff
+        snap = json.loads(path.read_text())
+        snap["ts"] -= 2 * second.ttl
+        snap["assets"] = snap["assets"][1:]
+        snap["assets"][0]["name"] = "Renamed"
+        path.write_text(json.dumps(snap))
+
+        third = AssetCatalog(path)
+        assert len(third.equities("key", "secret")) == 19          # sofort, alter Stand
+        _wait(third)
+        stats = third.stats()
+        assert stats["background_refreshes"] == 1 and stats["added"] == 1 and stats["changed"] == 1
+        assert len(third.equities()) == 20 and stats["age_seconds"] < 5
+
+
+def test_failed_refresh_backs_off(monkeypatch, tmp_path):
+    catalog = AssetCatalog(tmp_path / "assets.json", ttl=0)
+    catalog._set({"AAA": {"symbol": "AAA", "name": "A", "exchange": "NYSE", "tradable": True,
+                          "asset_class": "us_equity"}}, ts=1.0)
+    calls = []
+
+    def fail(*args):
+        calls.append(1)
+        raise RuntimeError("offline")
+
+    monkeypatch.setattr(catalog, "_fetch", fail)
+    assert catalog.equity_symbols("key", "secret") == ["AAA"]
+    _wait(catalog)
+    catalog.equity_symbols("key", "secret")
+    _wait(catalog)
+    assert len(calls) == 1 and catalog._retry_at > time.time() + assets_mod.ASSET_RETRY_AFTER - 5
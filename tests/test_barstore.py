@@ -0,0 +1,97 @@
+import threading
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from backend.core.barstore import BarStore, _gaps, _merge_ranges, _to_ns
+
+
+def _daily(start: datetime, end: datetime) -> pd.DataFrame:
+    index = pd.date_range(pd.Timestamp(start).ceil("D"), end, freq="D", tz="UTC", name="timestamp")
+    close = np.arange(len(index), dtype="float64") + 100.0
+    return pd.DataFrame({"open": close, "close": close}, index=index)
+
+
+class Recorder:
+    def __init__(self):
+        self.calls = []
+        self.lock  = threading.Lock()
+
+    def fetch(self, start, end):
+        with self.lock:
+            self.calls.append((start, end))
+        return _daily(start, end)
+
+    def fetch_many(self, symbols, start, end):
+        with self.lock:
+            self.calls.append((tuple(symbols), start, end))
+        return {sym: _daily(start, end) for sym in symbols}
+
+
+def test_gaps_and_merge():
+    assert _gaps(0, 100, []) == [(0, 100)]
+    assert _gaps(0, 100, [(20, 40), (60, 80)]) == [(0, 20), (40, 60), (80, 100)]
+    assert _gaps(30, 70, [(0, 50), (50, 100)]) == []
+    assert _gaps(0, 100, [(-10, 10), (90, 200)]) == [(10, 90)]
+    assert _merge_ranges([(50, 60), (0, 10), (5, 20), (20, 30)]) == [(0, 30), (50, 60)]
+
+
+def test_overlapping_requests_fetch_only_gaps(tmp_path):
+    store = BarStore(tmp_path)
+    rec   = Recorder()
+    d     = lambda m, day=1: datetime(2023, m, day)
+    utc   = lambda m: d(m).replace(tzinfo=timezone.utc)
+
+    a = store.get("AAA", "1d", "sip", "all", d(1), d(3), rec.fetch)
+    b = store.get("AAA", "1d", "sip", "all", d(2), d(5), rec.fetch)
+    c = store.get("AAA", "1d", "sip", "all", d(1), d(5), rec.fetch)
+    store.get("AAA", "1d", "sip", "all", d(1, 15), d(4), rec.fetch)
+
+    assert rec.calls == [(utc(1), utc(3)), (utc(3), utc(5))]
+    assert store.missing("AAA", "1d", "sip", "all", d(1), d(5)) == []
+    assert len(a) == 60 and len(c) == 121
+    assert c.index.is_monotonic_increasing and not c.index.has_duplicates
+    assert c.loc[b.index[0]:].index.equals(b.index)
+    assert [p.name for p in store._path("AAA", "1d", "sip", "all").iterdir() if p.is_dir()] == ["v2"]
+
+
+def test_unsettled_tail_is_not_persisted(tmp_path):
+    store = BarStore(tmp_path)
+    rec   = Recorder()
+    end   = datetime.now(timezone.utc)
+    start = end - timedelta(days=10)
+
+    first  = store.get("AAA", "1d", "sip", "all", start, end, rec.fetch)
+    meta   = store._meta(store._path("AAA", "1d", "sip", "all"))
+    second = store.get("AAA", "1d", "sip", "all", start, end, rec.fetch)
+
+    assert len(rec.calls) == 2                       # Tail wird jedes Mal neu geholt
+    assert rec.calls[1][0] > start                   # ... aber nur der Tail
+    assert first.index.equals(second.index)
+    assert meta["ranges"][0][1] < _to_ns(end)
+    stored = store._read(store._path("AAA", "1d", "sip", "all"), meta)
+    assert stored.index.max() < first.index.max()
+
+
+def test_get_many_groups_and_locks(tmp_path):
+    store = BarStore(tmp_path)
+    rec   = Recorder()
+    store.get("AAA", "1d", "sip", "all", datetime(2023, 1, 1), datetime(2023, 2, 1), rec.fetch)
+    rec.calls.clear()
+
+    def load():
+        return store.get_many(["AAA", "BBB", "CCC"], "1d", "sip", "all",
+                              datetime(2023, 1, 1), datetime(2023, 3, 1), rec.fetch_many)
+
+    threads = [threading.Thread(target=load) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(c[0] for c in rec.calls) == [("AAA",), ("BBB", "CCC")]
+    result = load()
+    assert len(rec.calls) == 2
+    assert set(result) == {"AAA", "BBB", "CCC"}
+    assert all(len(df) == 60 for df in result.values())
@@ -0,0 +1,73 @@
+import json
+from datetime import datetime, timezone
+
+import pandas as pd
+from alpaca.data.requests import StockBarsRequest
+from alpaca.data.timeframe import TimeFrame
+
+from backend.core import clients
+from backend.core.bars import load_bars
+from backend.core.fake_alpaca import FakeDataClient, bars_frame, generate_bars
+from benchmarks import harness
+from benchmarks.synthetic import PROFILES, offline, ohlcv, universe
+
+
+def test_synthetic_bars_are_deterministic_and_sized():
+    for interval, n in (("1d", 300), ("1h", 500), ("1m", 2_000)):
+        df = ohlcv("SPY", interval, n)
+        assert len(df) == n and df.index.is_monotonic_increasing
+        assert (df["high"] >= df[["open", "close"]].max(axis=1)).all()
+        assert (df["low"] <= df[["open", "close"]].min(axis=1)).all()
+        pd.testing.assert_frame_equal(df, ohlcv("SPY", interval, n))
+    assert list(universe(3, "1d", 10)) == ["AAA", "AAB", "AAC"]
+
+
+def test_frame_matches_fake_server_json():
+    start, end = datetime(2024, 3, 1, tzinfo=timezone.utc), datetime(2024, 3, 8, tzinfo=timezone.utc)
+    df   = bars_frame("QQQ", "1Hour", start, end)
+    bars = generate_bars("QQQ", "1Hour", start, end)
+    assert len(df) == len(bars) > 0
+    assert df["close"].tolist() == [b["c"] for b in bars]
+    assert df.index[0] == pd.Timestamp(bars[0]["t"])
+
+
+def test_fake_client_is_injected_into_load_bars():
+    with offline() as env:
+        assert clients.make_stock_client("k", "s") is env["client"]
+        df = load_bars("SPY", "1d", "2024-01-01", "2024-03-01", "k", "s")
+        assert len(df) > 30 and env["client"].requests == 1
+        load_bars("SPY", "1d", "2024-01-01", "2024-03-01", "k", "s")     # jetzt aus dem Bar-Store
+        assert env["client"].requests == 1
+    assert clients._data_client is None
+
+    multi = FakeDataClient().get_stock_bars(StockBarsRequest(
+        symbol_or_symbols=["AAA", "AAB"], timeframe=TimeFrame.Day,
+        start=datetime(2024, 1, 1), end=datetime(2024, 1, 31)))
+    assert multi.df.index.names == ["symbol", "timestamp"]
+    assert set(multi.df.index.get_level_values("symbol")) == {"AAA", "AAB"}
+
+
+def test_harness_measures_and_compares(tmp_path):
+    bench = harness.Benchmark(min_rounds=3, max_time=0.0, warmup=1)
+    calls = []
+    assert bench.pedantic(lambda x: calls.append(x) or x * 2, setup=lambda: ((21,), {})) == 42
+    assert len(calls) == 4 and bench.stats()["rounds"] == 3
+
+    path = tmp_path / "baselines.json"
+    harness.save_baseline({"a": {"median": 1.0, "min": 0.9}}, "quick", path)
+    harness.save_baseline({"b": {"median": 2.0, "min": 1.9}}, "quick", path)
+    baseline = harness.load_baseline(path)["quick"]
+    assert set(baseline["results"]) == {"a", "b"}                        # Teil-Läufe mischen sich ein
+    ratios = harness.compare({"a": {"median": 1.5}, "b": {"median": 2.0}}, baseline)
+    assert ratios["a"] == {"ratio": 1.5, "regression": True}
+    assert ratios["b"] == {"ratio": 1.0, "regression": False}
+
+
+def test_quick_suite_runs_offline():
+    names = [name for name, _, _ in harness.collect()]
+    assert any(n.startswith("core.indicator[") for n in names)
+    assert any(n.startswith("backtest.endpoint_cold") for n in names)
+
+    results = harness.run("core.to_list", PROFILES["quick"], max_time=0.0)
+    results.update(harness.run("backtest.endpoint_warm[1d]", PROFILES["quick"], max_time=0.0))
+    assert results and all("median" in r for r in results.values()), json.dumps(results)
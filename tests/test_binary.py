@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.api import backtest as backtest_api
+from backend.core.binary import MEDIA_TYPE, decode_frame, encode_frame
+from backend.main import app
+
+
+def _frame(n: int = 500) -> pd.DataFrame:
+    rng   = np.random.default_rng(3)
+    close = 100.0 * np.cumprod(1.0 + rng.normal(0.0003, 0.01, n))
+    index = pd.date_range("2024-01-02 14:30", periods=n, freq="min", tz="UTC", name="timestamp")
+    return pd.DataFrame({"open": close, "high": close * 1.001, "low": close * 0.999,
+                         "close": close, "volume": 1e4}, index=index)
+
+
+def test_roundtrip_keeps_nan_and_time():
+    index  = pd.date_range("2024-01-01", periods=5, freq="D", tz="UTC")
+    values = np.array([1.5, np.nan, 3.0, np.inf, -2.0])
+    out = decode_frame(encode_frame({"a": {"t": index, "v": values, "f": values.astype("float32")},
+                                     "n": 3, "s": "x", "l": [1, 2]}))
+    assert out["n"] == 3 and out["s"] == "x" and out["l"] == [1, 2]
+    assert out["a"]["t"].equals(index)
+    np.testing.assert_array_equal(out["a"]["v"], values)
+    assert out["a"]["f"].dtype == np.float32
+
+
+def test_backtest_binary_matches_json(monkeypatch):
+    monkeypatch.setattr(backtest_api, "load_bars", lambda *args, **kwargs: _frame())
+    client = TestClient(app)
+    body   = {"strategy": "sma_cross", "interval": "1m"}
+
+    as_json = client.post("/api/backtest", json=body).json()
+    res     = client.post("/api/backtest", json=body, headers={"Accept": MEDIA_TYPE})
+    assert res.headers["content-type"] == MEDIA_TYPE
+    assert len(res.content) < len(client.post("/api/backtest", json=body).content) / 2
+
+    frame = decode_frame(res.content)
+    assert frame["performance"] == as_json["performance"]
+    proj = frame["equity"]["projection"]
+    assert proj["dates"].strftime("%Y-%m-%d").tolist() == as_json["equity"]["projection"]["dates"]
+    assert proj["mid"].tolist() == as_json["equity"]["projection"]["mid"]
+    assert frame["chart"]["dates"].strftime("%Y-%m-%d %H:%M").tolist() == as_json["chart"]["dates"]
+    for key in ("equity", "bh_equity", "equity_high", "equity_low"):
+        expected = np.array([np.nan if v is None else v for v in as_json["equity"][key]])
+        np.testing.assert_allclose(frame["equity"][key], expected, rtol=1e-6)
+    np.testing.assert_allclose(frame["chart"]["close"], as_json["chart"]["close"], rtol=1e-6)
+    assert set(frame["chart"]["indicators"]) == set(as_json["chart"]["indicators"])
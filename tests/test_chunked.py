@@ -0,0 +1,66 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from backend.core.backtest import result_frame, summarize, with_equity
+from backend.core.chunked import RunningStats, chunk_days, lookback, run_chunked
+from backend.core.engine import apply_indicators
+from backend.core.fake_alpaca import bars_frame
+from backend.main import app
+from benchmarks.synthetic import offline
+
+PARAMS  = {"fast": 20, "slow": 50}
+SUMMARY = (2000, 500, 1, [5, 50, 95], [10, 20], 1)
+
+
+def _bars() -> pd.DataFrame:
+    return bars_frame("SPY", "1Min", datetime(2024, 1, 1, tzinfo=timezone.utc),
+                      datetime(2024, 2, 15, tzinfo=timezone.utc), False)
+
+
+def test_chunks_match_in_memory_run():
+    df  = _bars()
+    ref = with_equity(apply_indicators(df.copy(), ["rsi"]), "sma_cross", PARAMS, 10000)
+    expected, expected_frame = summarize(ref, 10000, *SUMMARY), result_frame(ref)
+
+    # Fenster beliebiger Länge, Trades laufen über die Grenzen
+    chunks = [df.iloc[i:i + 997] for i in range(0, len(df), 997)]
+    frame, summary = run_chunked(chunks, "sma_cross", PARAMS, ["rsi"], 10000, SUMMARY)
+
+    assert summary["performance"] == expected["performance"]
+    for key, values in expected["ledger"].items():
+        np.testing.assert_array_equal(summary["ledger"][key], values)
+    for col in ("equity", "bh_equity", "equity_high", "equity_low", "rsi"):
+        np.testing.assert_array_equal(frame[col].to_numpy(), expected_frame[col].to_numpy())
+    # rollende Summen beginnen je Fenster neu: nur letzte Stellen dürfen abweichen
+    pd.testing.assert_frame_equal(frame, expected_frame, check_exact=False, rtol=1e-12)
+    np.testing.assert_array_equal(summary["projection"]["mid"], expected["projection"]["mid"])
+
+
+def test_running_stats_and_lookback():
+    values = np.random.default_rng(1).normal(0, 1, 1000)
+    values[::50] = np.nan
+    stats = RunningStats()
+    for part in np.array_split(values, 7):
+        stats.update(part)
+    assert np.isclose(stats.mean, np.nanmean(values)) and np.isclose(stats.std, np.nanstd(values, ddof=1))
+
+    assert lookback("sma_cross", {"fast": 5, "slow": 80}, ["rsi"]) == 161
+    assert chunk_days("1m", "2020-01-01", "2025-01-01") > 0
+    assert chunk_days("1d", "2000-01-01", "2025-01-01") == 0
+    assert chunk_days("1h", "2024-01-01", "2024-02-01", requested=7) == 7
+
+
+def test_endpoint_chunked_matches_in_memory():
+    body = {"symbol": "SPY", "interval": "5m", "start": "2024-03-01", "end": "2024-03-29",
+            "strategy": "sma_cross", "alpaca_key": "k", "alpaca_secret": "s", "max_points": 0}
+    with offline():
+        client = TestClient(app)
+        whole  = client.post("/api/backtest", json=body).json()
+        parts  = client.post("/api/backtest", json={**body, "chunk_days": 5}).json()
+    assert parts["performance"] == whole["performance"]
+    assert parts["total_bars"] == whole["total_bars"]
+    assert parts["equity"]["equity"] == whole["equity"]["equity"]
+    assert parts["trades"] == whole["trades"]
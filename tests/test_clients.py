@@ -0,0 +1,72 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.core import clients
+from backend.core.clients import ClientRegistry
+from backend.core.fake_alpaca import FakeAlpaca
+from backend.main import app
+
+
+class _Client:
+    closed = False
+
+    def __init__(self):
+        outer = self
+
+        class Session:
+            def close(self):
+                outer.closed = True
+        self._session = Session()
+
+
+def test_reuse_per_credential_and_idle_eviction(monkeypatch):
+    reg = ClientRegistry(idle_ttl=10, max_clients=2)
+    now = [0.0]
+    monkeypatch.setattr(clients.time, "monotonic", lambda: now[0])
+
+    a = reg.get("stock", "k", "s", None, _Client)
+    assert reg.get("stock", "k", "s", None, _Client) is a
+    b = reg.get("stock", "k2", "s", None, _Client)
+    assert b is not a and reg.get("trading", "k", "s", None, _Client) is not a
+    assert reg.stats()["clients"] == 2 and a.closed           # max_clients: ältester geschlossen
+
+    now[0] = 20.0
+    c = reg.get("stock", "k", "s", None, _Client)
+    assert b.closed and reg.stats()["clients"] == 1 and not c.closed
+    assert reg.stats()["hits"] == 1 and reg.stats()["evictions"] == 3
+
+
+def test_validation_cached_with_ttl(monkeypatch):
+    reg = ClientRegistry(health_ttl=60)
+    now = [0.0]
+    monkeypatch.setattr(clients.time, "monotonic", lambda: now[0])
+    calls = []
+
+    def check():
+        calls.append(1)
+        return {"alpaca_valid": True}
+
+    assert reg.validated("k", "s", check) == reg.validated("k", "s", check)
+    assert len(calls) == 1
+    now[0] = 61.0
+    reg.validated("k", "s", check)
+    assert len(calls) == 2
+
+    with pytest.raises(RuntimeError):                           # Fehler werden nicht gecacht
+        reg.validated("bad", "s", lambda: (_ for _ in ()).throw(RuntimeError("401")))
+    assert reg.validated("bad", "s", check) == {"alpaca_valid": True}
+
+
+def test_health_reuses_warm_connection(monkeypatch):
+    clients.registry.clear()
+    monkeypatch.setattr(clients.registry, "health_ttl", 0)
+    with FakeAlpaca(n_symbols=5) as fake:
+        monkeypatch.setattr(clients, "ALPACA_TRADING_URL", fake.url)
+        client = TestClient(app)
+        for _ in range(3):
+            res = client.post("/api/health", json={"alpaca_key": "key", "alpaca_secret": "secret"}).json()
+            assert res["alpaca_valid"] and res["account_status"] == "ACTIVE"
+        assert fake.requests == 3 and fake.connections == 1
+        stats = clients.registry.stats()
+        assert stats["by_kind"]["trading"] >= 1 and stats["pool_connections"] == 1
+    clients.registry.clear()
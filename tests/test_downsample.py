@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from backend.api import backtest as backtest_api
+from backend.core.downsample import lttb_indices, ohlc_buckets
+from backend.main import app
+
+
+def _frame(n: int) -> pd.DataFrame:
+    rng   = np.random.default_rng(5)
+    close = 100.0 * np.cumprod(1.0 + rng.normal(0.0, 0.002, n))
+    index = pd.date_range("2024-01-02 14:30", periods=n, freq="min", tz="UTC", name="timestamp")
+    return pd.DataFrame({"open": close, "high": close * 1.002, "low": close * 0.998,
+                         "close": close, "volume": 1e4}, index=index)
+
+
+def test_lttb_keeps_endpoints_and_spikes():
+    y = np.sin(np.linspace(0, 20, 10_000))
+    y[4321] = 50.0
+    idx = lttb_indices(y, 500)
+    assert len(idx) == 500
+    assert idx[0] == 0 and idx[-1] == len(y) - 1
+    assert np.all(np.diff(idx) > 0)
+    assert 4321 in idx
+
+
+def test_ohlc_buckets_aggregate():
+    df = _frame(1000)
+    buckets, ends = ohlc_buckets(df, 100)
+    assert len(buckets) == 100
+    assert buckets["high"].iloc[0] == df["high"].iloc[:10].max()
+    assert buckets["low"].iloc[-1] == df["low"].iloc[-10:].min()
+    assert buckets["open"].iloc[3] == df["open"].iloc[30]
+    assert buckets["close"].iloc[3] == df["close"].iloc[39] and ends[3] == 39
+
+
+def test_backtest_budget_and_window(monkeypatch):
+    monkeypatch.setattr(backtest_api, "load_bars", lambda *args, **kwargs: _frame(20_000))
+    client = TestClient(app)
+
+    res = client.post("/api/backtest", json={"strategy": "sma_cross", "max_points": 500}).json()
+    assert res["downsampled"] and res["total_bars"] == 20_000
+    assert len(res["chart"]["dates"]) == 500 and len(res["equity"]["dates"]) == 500
+    assert len(res["equity"]["projection"]["dates"]) <= 500
+    assert all(len(v) == 500 for v in res["chart"]["indicators"].values())
+
+    start, end = res["chart"]["dates"][100], res["chart"]["dates"][110]
+    win = client.get("/api/backtest/window",
+                     params={"result_id": res["result_id"], "start": start, "end": end, "max_points": 500}).json()
+    assert not win["downsampled"]
+    assert win["chart"]["dates"][0] == start and win["chart"]["dates"][-1] == end
+    assert win["total_bars"] == len(win["equity"]["equity"]) > 400
+
+    full = client.post("/api/backtest", json={"strategy": "sma_cross", "max_points": 0}).json()
+    assert len(full["chart"]["dates"]) == 20_000 and not full["downsampled"]
+
+    missing = client.get("/api/backtest/window", params={"result_id": "nope"})
+    assert missing.status_code == 404
@@ -0,0 +1,74 @@
+import asyncio
+import time
+from datetime import datetime
+
+from alpaca.data.historical import StockHistoricalDataClient
+from alpaca.data.requests import StockBarsRequest
+from alpaca.data.timeframe import TimeFrame
+
+from backend.core import gateway as gw
+from backend.core.fake_alpaca import FakeAlpaca
+
+
+def _bars_request(symbols):
+    return StockBarsRequest(symbol_or_symbols=symbols, timeframe=TimeFrame.Day,
+                            start=datetime(2024, 1, 1), end=datetime(2024, 6, 30))
+
+
+def test_retries_429_with_backoff(monkeypatch):
+    monkeypatch.setattr(gw, "BACKOFF_BASE", 0.01)
+    gateway = gw.DataGateway(rpm=60_000, concurrency=2)
+
+    with FakeAlpaca(n_symbols=10, rate_limit_every=3) as fake:
+        client = gateway.attach(StockHistoricalDataClient("key", "secret", url_override=fake.url))
+        assert 429 not in client._retry_codes
+        frames = [client.get_stock_bars(_bars_request(sym)).df for sym in fake.symbols[:6]]
+
+    stats = gateway.stats()
+    assert all(len(df) > 100 for df in frames)
+    assert stats["rate_limited"] > 0
+    assert stats["retries"] == stats["rate_limited"]
+    assert stats["errors"] == 0
+    assert stats["requests"] == fake.requests
+
+
+def test_token_bucket_throttles():
+    gateway = gw.DataGateway(rpm=600, concurrency=1)
+    gateway.bucket = gw.TokenBucket(600, capacity=1)     # 10 Requests/s, kein Burst
+
+    with FakeAlpaca(n_symbols=5) as fake:
+        client = gateway.attach(StockHistoricalDataClient("key", "secret", url_override=fake.url))
+        started = time.perf_counter()
+        for sym in fake.symbols:
+            client.get_stock_bars(_bars_request(sym))
+        elapsed = time.perf_counter() - started
+
+    assert elapsed >= 0.35
+    assert gateway.stats()["throttled_seconds"] > 0
+
+
+def test_map_async_reports_start_and_cancels_on_close():
+    gateway = gw.DataGateway(rpm=60_000, concurrency=1)
+    ran = []
+
+    def work(item):
+        ran.append(item)
+        time.sleep(0.02)
+        return item * 2
+
+    async def consume():
+        events = []
+        stream = gateway.map_async(work, list(range(10)))
+        async for event in stream:
+            events.append(event)
+            if event[0] == "done":
+                break
+        await stream.aclose()
+        return events
+
+    events = asyncio.run(consume())
+    assert events[0][:2] == ("start", 0)
+    assert events[-1] == ("done", 0, 0, 0)
+
+    time.sleep(0.1)
+    assert len(ran) < 10
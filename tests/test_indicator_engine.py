@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+import indicators
+from backend.core.engine import run_strategy
+from backend.core.indicator_engine import IndicatorEngine
+from indicators.rsi import rsi as raw_rsi
+from indicators.sma import sma as raw_sma
+
+
+def _frame(n: int = 300, seed: int = 0) -> pd.DataFrame:
+    close = 100.0 + np.cumsum(np.random.default_rng(seed).normal(0, 1, n))
+    index = pd.date_range("2024-01-01", periods=n, freq="D", tz="UTC", name="timestamp")
+    return pd.DataFrame({"open": close, "high": close, "low": close, "close": close}, index=index)
+
+
+def test_memoized_results_match_and_hit_across_requests():
+    eng = IndicatorEngine()
+    a = eng.compute("sma", raw_sma, _frame(), 20)
+    b = eng.compute("sma", raw_sma, _frame(), period=20)          # neuer Request, gleiche Daten
+    c = eng.compute("sma", raw_sma, _frame(seed=1), 20)           # andere Daten
+
+    expected = _frame()["close"].rolling(20).mean()
+    np.testing.assert_array_equal(a["sma_20"], expected)
+    np.testing.assert_array_equal(b["sma_20"], expected)
+    assert not np.allclose(c["sma_20"].dropna(), expected.dropna())
+    assert eng.stats()["hits"] == 1 and eng.stats()["misses"] == 2
+
+
+def test_dedupes_within_run_and_evicts_by_size():
+    eng = IndicatorEngine(max_bytes=3 * 300 * 8)
+    df = _frame()
+    df = eng.compute("sma", raw_sma, df, 20)
+    df = eng.compute("sma", raw_sma, df, 20, unknown=1)
+    assert eng.stats()["deduped"] == 1
+
+    for period in (5, 10, 15, 30):
+        eng.compute("rsi", raw_rsi, _frame(), period)
+    stats = eng.stats()
+    assert stats["entries"] == 3 and stats["bytes"] <= stats["max_bytes"]
+    assert stats["evictions"] == 2
+
+
+def test_strategy_reuses_active_indicator():
+    df = _frame()
+    out = run_strategy(df, "sma_cross", ["sma"], {"fast": 20, "slow": 50})
+    assert {"sma_20", "sma_50", "signal"} <= set(out.columns)
+    assert indicators._compute is not None
+    assert "_indicator_nodes" in out.attrs and ("sma", (("col", "close"), ("period", 20))) in out.attrs["_indicator_nodes"]
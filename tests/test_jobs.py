@@ -0,0 +1,110 @@
+import json
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.api import backtest as backtest_api
+from backend.core.jobs import JobQueue, QueueFull
+from backend.main import app
+from tests.test_sweep import _frame
+
+
+def _wait(job, timeout=10.0):
+    deadline = time.time() + timeout
+    while job.finished is None and time.time() < deadline:
+        time.sleep(0.01)
+    return job
+
+
+def test_job_matches_sync_backtest(monkeypatch):
+    monkeypatch.setattr(backtest_api, "load_bars", lambda *args, **kwargs: _frame())
+    client = TestClient(app)
+    body = {"strategy": "sma_cross", "active_indicators": ["rsi"], "mc_paths": 200}
+
+    job = client.post("/api/backtest/jobs", json=body)
+    assert job.status_code == 202 and job.json()["state"] in ("queued", "running", "done")
+    job_id = job.json()["job_id"]
+
+    stream = client.get(f"/api/backtest/jobs/{job_id}/stream")
+    events = [json.loads(line[6:]) for line in stream.text.splitlines() if line.startswith("data: ")]
+    stages = [e["stage"] for e in events]
+    assert stages[0] == "queued" and stages[-1] == "done"
+    assert [s for s in ("fetch", "indicators", "strategy", "metrics") if s in stages] == \
+           ["fetch", "indicators", "strategy", "metrics"]
+    assert events[-1]["progress"] == 100
+
+    result = client.get(f"/api/backtest/jobs/{job_id}/result").json()
+    sync   = client.post("/api/backtest", json=body).json()
+    result.pop("result_id"), sync.pop("result_id")
+    assert result == sync
+
+
+def test_job_stages_in_process_pool(monkeypatch):
+    monkeypatch.setattr(backtest_api, "load_bars", lambda *args, **kwargs: _frame())
+    monkeypatch.setattr(backtest_api, "JOB_PARALLEL_BARS", 1)
+    client = TestClient(app)
+    body = {"strategy": "sma_cross", "mc_paths": 100}
+
+    job_id = client.post("/api/backtest/jobs", json=body).json()["job_id"]
+    _wait(backtest_api.job_queue.get(job_id), timeout=60)
+    result = client.get(f"/api/backtest/jobs/{job_id}/result").json()
+    assert result["performance"] == client.post("/api/backtest", json=body).json()["performance"]
+
+
+def test_job_errors_and_unknown_ids(monkeypatch):
+    def fail(*args, **kwargs):
+        raise ValueError("keine Daten")
+
+    monkeypatch.setattr(backtest_api, "load_bars", fail)
+    client = TestClient(app)
+    assert client.post("/api/backtest/jobs", json={"strategy": "nope"}).status_code == 400
+
+    job_id = client.post("/api/backtest/jobs", json={"strategy": "sma_cross"}).json()["job_id"]
+    _wait(backtest_api.job_queue.get(job_id))
+    assert client.get(f"/api/backtest/jobs/{job_id}").json()["state"] == "error"
+    res = client.get(f"/api/backtest/jobs/{job_id}/result")
+    assert res.status_code == 500 and "keine Daten" in res.json()["detail"]
+    assert client.get("/api/backtest/jobs/unbekannt").status_code == 404
+
+
+def test_cancel_queued_and_running_jobs():
+    queue   = JobQueue(workers=1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow(job):
+        job.stage_run("fetch", 10, "wartet", lambda: (started.set(), release.wait(5)))
+        return job.stage_run("metrics", 50, "rechnet", lambda: "fertig")
+
+    running = queue.submit("test", slow)
+    queued  = queue.submit("test", slow)
+    assert started.wait(5)
+
+    assert queue.cancel(queued.id).state == "cancelled"       # nie gestartet
+    queue.cancel(running.id)
+    assert running.state == "running"                           # Abbruch erst an der Stufengrenze
+    release.set()
+    assert _wait(running).state == "cancelled" and running.result is None
+    assert [e["stage"] for e in running.events][-1] == "cancelled"
+    assert "metrics" not in [e["stage"] for e in running.events]
+    assert queue.stats()["cancelled"] == 2
+
+
+def test_results_expire_after_ttl():
+    queue = JobQueue(workers=1, ttl=0.05)
+    job   = _wait(queue.submit("test", lambda job: 42))
+    assert job.state == "done" and queue.get(job.id).result == 42
+    time.sleep(0.1)
+    assert queue.get(job.id) is None and queue.stats()["expired"] == 1
+
+
+def test_queue_limit():
+    release = threading.Event()
+    queue   = JobQueue(workers=1, max_pending=2)
+    queue.submit("test", lambda job: release.wait(5))
+    queue.submit("test", lambda job: release.wait(5))
+    with pytest.raises(QueueFull):
+        queue.submit("test", lambda job: None)
+    release.set()
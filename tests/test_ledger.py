@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from backend.api import backtest as backtest_api
+from backend.core.ledger import trade_ledger, trade_metrics
+from backend.main import app
+from tests.test_sweep import _frame
+
+
+def test_ledger_from_position_runs():
+    close    = np.array([10, 11, 12, 11, 10, 10, 12, 13, 12], dtype="float64")
+    position = np.array([0, 1, 1, 0, 0, 1, 1, 0, 1], dtype="float64")
+    df = pd.DataFrame({"close": close, "position": position})
+    strat_ret = position * np.r_[np.nan, close[1:] / close[:-1] - 1]
+    df["equity"] = 1000 * np.cumprod(1 + np.nan_to_num(strat_ret))
+
+    ledger = trade_ledger(df)
+    assert ledger["entry"].tolist() == [1, 5, 8] and ledger["exit"].tolist() == [2, 6, 8]
+    assert ledger["entry_price"].tolist() == [10, 10, 13]
+    assert ledger["exit_price"].tolist() == [12, 12, 12]
+    assert ledger["bars"].tolist() == [2, 2, 1] and ledger["open"].tolist() == [False, False, True]
+    np.testing.assert_allclose(ledger["pnl"], [0.2, 0.2, 12 / 13 - 1])
+    np.testing.assert_allclose(ledger["pnl_abs"], [200, 240, -1440 * (1 - 12 / 13)])
+
+    metrics = trade_metrics(ledger)
+    assert metrics["total_trades"] == 3
+    np.testing.assert_allclose(metrics["win_rate"], 200 / 3)
+    assert metrics["profit_factor"] == round(440 / (1440 / 13), 2)
+
+
+def test_backtest_reports_trades(monkeypatch):
+    monkeypatch.setattr(backtest_api, "load_bars", lambda *args, **kwargs: _frame())
+    res = TestClient(app).post("/api/backtest", json={"strategy": "sma_cross", "mc_paths": 100}).json()
+    trades, perf = res["trades"], res["performance"]
+    assert perf["total_trades"] == len(trades["entry"]) > 0
+    assert all(b >= 1 for b in trades["bars"])
+    compounded = np.prod(1 + np.array(trades["pnl"]) / 100) * perf["capital"]
+    np.testing.assert_allclose(compounded, perf["end_capital"], rtol=1e-4)
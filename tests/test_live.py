@@ -0,0 +1,53 @@
+import json
+
+import numpy as np
+import pandas as pd
+from fastapi.testclient import TestClient
+
+from backend.core import clients
+from backend.core.barstore import bar_store
+from backend.core.engine import run_strategy
+from backend.core.fake_alpaca import FakeAlpaca
+from backend.core.live import LiveSession, bar_dicts
+from backend.main import app
+
+
+def _frame(n: int = 400, seed: int = 3) -> pd.DataFrame:
+    close = 100.0 + np.cumsum(np.random.default_rng(seed).normal(0, 1, n))
+    index = pd.date_range("2024-01-01", periods=n, freq="D", tz="UTC", name="timestamp")
+    return pd.DataFrame({"open": close, "high": close + 1, "low": close - 1,
+                         "close": close, "volume": 1000.0}, index=index)
+
+
+def test_incremental_matches_batch():
+    df = _frame()
+    batch = run_strategy(df.copy(), "sma_cross", ["rsi"], {"fast": 10, "slow": 30})
+    batch["equity"] = 10000 * (1 + batch["strat_ret"].fillna(0)).cumprod()
+
+    session = LiveSession("sma_cross", {"fast": 10, "slow": 30}, ["rsi"], 10000)
+    updates = [session.push(bar) for bar in bar_dicts(df)]
+
+    def live(key):
+        return np.array([np.nan if u["indicators"][key] is None else u["indicators"][key] for u in updates])
+
+    np.testing.assert_allclose(live("sma_10"), batch["sma_10"], equal_nan=True)
+    np.testing.assert_allclose(live("sma_30"), batch["sma_30"], equal_nan=True)
+    np.testing.assert_allclose(live("rsi"), batch["rsi"], equal_nan=True)
+    assert [u["signal"] for u in updates] == batch["signal"].tolist()
+    assert [u["position"] for u in updates] == batch["position"].tolist()
+    np.testing.assert_allclose([u["equity"] for u in updates], batch["equity"], atol=0.01)
+
+
+def test_replay_stream(monkeypatch, tmp_path):
+    with FakeAlpaca(n_symbols=5) as server:
+        monkeypatch.setattr(clients, "ALPACA_DATA_URL", server.url)
+        monkeypatch.setattr(bar_store, "root", tmp_path)
+        res = TestClient(app).get("/api/live/replay", params={
+            "symbol": "SPY", "start": "2024-01-01", "end": "2024-03-01", "strategy": "sma_cross",
+            "fast": 3, "slow": 5, "indicators": "rsi", "warmup": 10,
+            "alpaca_key": "key", "alpaca_secret": "secret"})
+    events = [json.loads(line[6:]) for line in res.text.splitlines() if line.startswith("data: ")]
+    init, bars, done = events[0], events[1:-1], events[-1]
+    assert init["stage"] == "init" and init["warmup"] == 10 and init["last"]["indicators"]["sma_5"] is not None
+    assert len(bars) == init["total"] - 10 and done["bars"] == init["total"]
+    assert all(b["stage"] == "bar" and b["signal"] in (-1, 0, 1) for b in bars)
@@ -0,0 +1,61 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.api import market
+from backend.core import clients
+from backend.core.assets import AssetCatalog
+from backend.core.barstore import bar_store
+from backend.core.fake_alpaca import FakeAlpaca
+from backend.main import app
+
+
+@pytest.fixture
+def fake(monkeypatch, tmp_path):
+    with FakeAlpaca(n_symbols=60) as server:
+        monkeypatch.setattr(clients, "ALPACA_DATA_URL", server.url)
+        monkeypatch.setattr(clients, "ALPACA_TRADING_URL", server.url)
+        monkeypatch.setattr(bar_store, "root", tmp_path)
+        monkeypatch.setattr(market, "asset_catalog", AssetCatalog(tmp_path / "assets.json"))
+        monkeypatch.setitem(market._bars_cache, "panel", None)
+        monkeypatch.setitem(market._bars_cache, "ts", 0.0)
+        yield server
+
+
+def _stream(client):
+    res = client.get("/api/market/heatmap/stream", params={"alpaca_key": "key", "alpaca_secret": "secret"})
+    return [json.loads(line[6:]) for line in res.text.splitlines() if line.startswith("data: ")]
+
+
+def test_stream_full_then_incremental(fake):
+    client = TestClient(app)
+
+    first = _stream(client)
+    done  = first[-1]
+    assert done["stage"] == "done" and done["count"] == 60
+    assert any(e["stage"] == "batch_start" for e in first)
+    requests_full = fake.requests
+
+    market._bars_cache["ts"] = 0.0           # TTL abgelaufen
+    second = _stream(client)
+    init   = next(e for e in second if e["stage"] == "loading-init")
+    assert init["incremental"] is True
+    assert second[-1]["symbols"] == done["symbols"]
+    assert fake.requests - requests_full <= 2   # nur der Tail, ein Request pro Startzeitpunkt
+
+
+def test_panel_over_budget_is_not_cached(fake, monkeypatch):
+    client = TestClient(app)
+    monkeypatch.setattr(market, "UNIVERSE_CACHE_BYTES", 1024)
+    monkeypatch.setitem(market._bars_cache, "over_budget", 0)
+
+    done = _stream(client)[-1]
+    assert done["stage"] == "done" and done["count"] == 60
+    stats = client.get("/api/health/universe").json()
+    assert stats["bytes"] == 0 and stats["over_budget"] == 1
+
+    monkeypatch.setattr(market, "UNIVERSE_CACHE_BYTES", 64 * 2 ** 20)
+    _stream(client)
+    stats = client.get("/api/health/universe").json()
+    assert stats["symbols"] == 60 and 0 < stats["bytes"] <= stats["budget_bytes"]
@@ -0,0 +1,90 @@
+import time
+
+from fastapi.testclient import TestClient
+
+from backend.api import backtest as backtest_api
+from backend.core import metrics
+from backend.core.metrics import Counter, Histogram, Registry, server_timing, span
+from backend.main import app
+from tests.test_sweep import _frame
+
+
+def test_prometheus_text_format():
+    reg  = Registry()
+    hist = reg.histogram("t_seconds", "Test", ("stage",), buckets=(0.1, 1.0))
+    hist.observe(0.05, stage="a")
+    hist.observe(0.5, stage="a")
+    cnt = reg.counter("t_total", "Test", ("kind",))
+    cnt.inc(3, kind='x"y')
+    reg.collector(lambda: [("t_ratio", "gauge", "Test", [({"cache": "c"}, 0.5)])])
+
+    text = reg.render()
+    assert '# TYPE t_seconds histogram' in text
+    assert 't_seconds_bucket{stage="a",le="0.1"} 1' in text
+    assert 't_seconds_bucket{stage="a",le="1.0"} 2' in text
+    assert 't_seconds_bucket{stage="a",le="+Inf"} 2' in text
+    assert 't_seconds_count{stage="a"} 2' in text
+    assert 't_total{kind="x\\"y"} 3' in text
+    assert 't_ratio{cache="c"} 0.5' in text
+    assert isinstance(cnt, Counter) and isinstance(hist, Histogram)
+
+
+def test_server_timing_merges_repeated_stages():
+    header = server_timing([("fetch", 0.010), ("calc", 0.002), ("fetch", 0.005)], 0.020)
+    assert header == "fetch;dur=15.0, calc;dur=2.0, app;dur=20.0"
+
+
+def test_span_outside_request_only_feeds_histogram():
+    before = metrics.STAGE_SECONDS.count(stage="test_only")
+    with span("test_only"):
+        pass
+    assert metrics.STAGE_SECONDS.count(stage="test_only") == before + 1
+
+
+def test_backtest_reports_stage_timings_and_metrics(monkeypatch):
+    monkeypatch.setattr(backtest_api, "load_bars", lambda *args, **kwargs: _frame())
+    client = TestClient(app)
+    before = metrics.REQUEST_SECONDS.count(method="POST", route="/api/backtest", status="200")
+    json_bytes = metrics.RESPONSE_BYTES.value(format="json")
+
+    resp = client.post("/api/backtest", json={"strategy": "sma_cross", "mc_paths": 50})
+    assert resp.status_code == 200
+    stages = [part.split(";")[0] for part in resp.headers["server-timing"].split(", ")]
+    assert stages == ["fetch", "indicators", "strategy", "metrics", "serialize", "app"]
+
+    assert metrics.REQUEST_SECONDS.count(method="POST", route="/api/backtest", status="200") == before + 1
+    assert metrics.RESPONSE_BYTES.value(format="json") - json_bytes == len(resp.content)
+
+    text = client.get("/api/metrics")
+    assert text.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'quantos_stage_seconds_count{stage="serialize"}' in text.text
+    assert 'quantos_cache_hit_ratio{cache="indicators"}' in text.text
+    assert 'quantos_flight_in_flight{flight="heatmap"} 0' in text.text
+
+
+def test_profiler_for_single_request(monkeypatch):
+    def slow_bars(*args, **kwargs):
+        time.sleep(0.05)
+        return _frame()
+
+    monkeypatch.setattr(backtest_api, "load_bars", slow_bars)
+    client = TestClient(app)
+    body   = {"strategy": "sma_cross", "mc_paths": 50}
+
+    assert "x-quantos-profile-id" not in client.post("/api/backtest", json=body).headers
+    resp = client.post("/api/backtest", json=body, headers={"X-QuantOS-Profile": "1"})
+    profile_id = resp.headers["x-quantos-profile-id"]
+
+    profile = client.get(f"/api/metrics/profiles/{profile_id}").json()
+    assert profile["path"] == "/api/backtest" and profile["samples"] > 0
+    assert any("slow_bars" in stack for stack in profile["stacks"])
+    assert client.get("/api/metrics/profiles/unknown").status_code == 404
+
+
+def test_route_label_uses_path_template():
+    client = TestClient(app)
+    client.get("/api/backtest/jobs/doesnotexist")
+    client.get("/api/nope")
+    labels = {dict(k)["route"] for k in metrics.REQUEST_SECONDS._values}
+    assert "/api/backtest/jobs/{job_id}" in labels and "unmatched" in labels
+    assert not any("doesnotexist" in label for label in labels)
@@ -0,0 +1,46 @@
+import time
+
+import numpy as np
+from fastapi.testclient import TestClient
+
+from backend.api import backtest as backtest_api
+from backend.core import montecarlo
+from backend.core.montecarlo import monte_carlo
+from backend.main import app
+from tests.test_sweep import _frame
+
+
+def test_bands_are_ordered_and_match_unchunked(monkeypatch):
+    returns = np.random.default_rng(1).normal(0.001, 0.01, 500)
+    full = monte_carlo(returns, 300, paths=2000, block=5, seed=3)
+
+    bands = np.vstack([full["bands"][p] for p in (5, 25, 50, 75, 95)])
+    assert np.all(np.diff(bands, axis=0) >= 0)
+    probs = list(full["drawdown_prob"].values())
+    assert probs == sorted(probs, reverse=True) and 0 <= probs[-1] <= probs[0] <= 1
+
+    # Kleine Blöcke im Speicher ändern die Verteilung nicht wesentlich
+    monkeypatch.setattr(montecarlo, "MC_CHUNK_VALUES", 2000 * 20)
+    chunked = monte_carlo(returns, 300, paths=2000, block=5, seed=3)
+    np.testing.assert_allclose(chunked["bands"][50][-1], full["bands"][50][-1], rtol=0.03)
+
+
+def test_constant_returns_and_speed():
+    out = monte_carlo(np.full(100, 0.01), 10, paths=100, seed=0)
+    np.testing.assert_allclose(out["bands"][5], 1.01 ** np.arange(1, 11))
+    assert out["drawdown_prob"][10] == 0.0
+
+    start = time.perf_counter()
+    monte_carlo(np.random.default_rng(0).normal(0, 0.01, 2000), 1000, paths=10_000)
+    assert time.perf_counter() - start < 2.0
+
+
+def test_backtest_projection(monkeypatch):
+    monkeypatch.setattr(backtest_api, "load_bars", lambda *args, **kwargs: _frame())
+    client = TestClient(app)
+    body = {"strategy": "sma_cross", "mc_paths": 2000, "mc_percentiles": [10, 50, 90]}
+    proj = client.post("/api/backtest", json=body).json()["equity"]["projection"]
+    assert set(proj["bands"]) == {"p10", "p50", "p90"}
+    assert proj["upper"] == proj["bands"]["p90"] and proj["mid"] == proj["bands"]["p50"]
+    assert set(proj["drawdown_prob"]) == {"10", "20", "30"}
+    assert client.post("/api/backtest", json={**body, "mc_paths": 0}).status_code == 400
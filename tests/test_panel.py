@@ -0,0 +1,66 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from backend.core.panel import BarPanel
+
+
+def _frame(days, opens, closes):
+    index = pd.DatetimeIndex([pd.Timestamp(d, tz="UTC") for d in days], name="timestamp")
+    return pd.DataFrame({"open": opens, "close": closes}, index=index)
+
+
+def test_changes_use_first_bar_after_cutoff():
+    frames = {
+        "AAA": _frame(["2024-01-01", "2024-01-03", "2024-01-05"], [10.0, 20.0, 30.0], [11.0, 21.0, 40.0]),
+        "BBB": _frame(["2024-01-02", "2024-01-05"], [50.0, 0.0], [55.0, 60.0]),
+        "CCC": pd.DataFrame(),
+    }
+    panel = BarPanel.from_frames(frames)
+    out = panel.changes({"a": datetime(2024, 1, 2), "b": datetime(2024, 1, 5), "c": datetime(2024, 2, 1)})
+
+    assert set(out) == {"AAA", "BBB"}
+    assert out["AAA"] == {"price": 40.0, "a": 100.0, "b": round((40 - 30) / 30 * 100, 2), "c": None}
+    assert out["BBB"]["a"] == 20.0
+    assert out["BBB"]["b"] is None          # Open 0 -> keine Veränderung
+    assert np.array_equal(panel.next_bar[0], [0, 2, 2, 3])
+
+
+def test_update_merges_in_place():
+    frames = {
+        "AAA": _frame(["2024-01-01", "2024-01-02"], [10.0, 11.0], [10.5, 11.5]),
+        "BBB": _frame(["2024-01-01", "2024-01-02"], [20.0, 21.0], [20.5, 21.5]),
+    }
+    panel = BarPanel.from_frames(frames)
+    cutoffs = {"a": datetime(2024, 1, 2)}
+
+    # Letzter Bar revidiert + neuer Tag nur für AAA, neues Symbol CCC
+    rows = panel.update({
+        "AAA": _frame(["2024-01-02", "2024-01-03"], [11.0, 12.0], [11.8, 13.0]),
+        "CCC": _frame(["2024-01-03"], [5.0], [6.0]),
+    }, keep_from=datetime(2024, 1, 2))
+
+    full = BarPanel.from_frames({
+        "AAA": _frame(["2024-01-02", "2024-01-03"], [11.0, 12.0], [11.8, 13.0]),
+        "BBB": _frame(["2024-01-02"], [21.0], [21.5]),
+        "CCC": _frame(["2024-01-03"], [5.0], [6.0]),
+    })
+    assert rows.tolist() == [0, 2]
+    assert panel.symbols == ["AAA", "BBB", "CCC"]
+    assert panel.last_timestamps()["AAA"] == pd.Timestamp("2024-01-03", tz="UTC").value
+    assert panel.changes(cutoffs) == full.changes(cutoffs)
+    assert panel.changes(cutoffs, rows) == {k: v for k, v in full.changes(cutoffs).items() if k != "BBB"}
+
+
+def test_compact_storage_and_footprint():
+    days   = pd.date_range("2024-01-01", periods=250, freq="D", tz="UTC")
+    frames = {f"S{i}": pd.DataFrame({"open": np.linspace(10, 20, 250), "close": np.linspace(11, 21, 250),
+                                     "volume": 1e6, "vwap": 1.0}, index=days) for i in range(100)}
+    panel = BarPanel.from_frames(frames)
+    assert panel.open.dtype == np.float32 and panel.next_bar.dtype == np.int16
+    assert panel.nbytes < 100 * 250 * 12                     # ~10 Byte pro Zelle + Achsen
+    assert panel.stats()["symbols"] == 100 and panel.stats()["days"] == 250
+
+    out = panel.changes({"a": datetime(2024, 1, 1)})["S0"]
+    assert out == {"price": 21.0, "a": round((21 - 10) / 10 * 100, 2)}
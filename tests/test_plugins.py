@@ -0,0 +1,84 @@
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from backend.core.engine import strategies
+from backend.core.plugins import PluginRegistry
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def package(tmp_path, monkeypatch):
+    """Temporäres Plugin-Paket mit dem Lazy-`__init__` aus indicators/."""
+    pkg = tmp_path / "tmp_plugins"
+    pkg.mkdir()
+    shutil.copy(ROOT / "indicators" / "__init__.py", pkg / "__init__.py")
+    (pkg / "double.py").write_text("def double(df, factor=2, col='close'):\n"
+                                   "    '''Spalte skalieren.'''\n"
+                                   "    df['out'] = df[col] * factor\n"
+                                   "    return df\n")
+    (pkg / "helpers.py").write_text("X = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield pkg
+    for name in [m for m in sys.modules if m == "tmp_plugins" or m.startswith("tmp_plugins.")]:
+        del sys.modules[name]
+
+
+def _rewrite(path: Path, text: str):
+    path.write_text(text)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_discovers_without_import_and_filters_kwargs(package):
+    reg = PluginRegistry("tmp_plugins", reload_interval=0)
+    assert list(reg) == ["double"] and "helpers" not in reg
+    assert "tmp_plugins.double" not in sys.modules
+    assert reg.describe()["double"] == {"params": {"factor": 2, "col": "close"},
+                                        "doc": "Spalte skalieren.", "loaded": False}
+
+    df = pd.DataFrame({"close": [1.0, 2.0]})
+    out = reg.call("double", df, factor=3, unknown="ignoriert")
+    assert out["out"].tolist() == [3.0, 6.0]
+    assert reg.stats()["imports"] == 1 and reg.stats()["loaded"] == 1
+    with pytest.raises(KeyError):
+        reg["missing"]
+
+
+def test_hot_reload_on_mtime_change(package):
+    reg = PluginRegistry("tmp_plugins", reload_interval=1e-9)
+    reloaded = []
+    reg.on_reload(reloaded.append)
+    df = pd.DataFrame({"close": [1.0, 2.0]})
+    assert reg.call("double", df)["out"].tolist() == [2.0, 4.0]
+
+    import tmp_plugins
+    from tmp_plugins import double as wrapper            # Paket-Wrapper sieht den Reload ebenfalls
+
+    _rewrite(package / "double.py", "def double(df, factor=10, col='close'):\n"
+                                    "    df['out'] = df[col] * factor\n"
+                                    "    return df\n")
+    assert reg.call("double", df)["out"].tolist() == [10.0, 20.0]
+    assert reloaded == ["double"] and reg.stats()["reloads"] == 1
+    assert wrapper(df)["out"].tolist() == [10.0, 20.0]
+    assert tmp_plugins.double is wrapper
+
+    # Syntaxfehler: alte Version bleibt aktiv
+    _rewrite(package / "double.py", "def double(df:\n")
+    assert reg.call("double", df)["out"].tolist() == [10.0, 20.0]
+
+    (package / "triple.py").write_text("def triple(df):\n    return df\n")
+    (package / "double.py").unlink()
+    assert list(reg) == ["triple"]
+
+
+def test_strategies_registry_is_shared():
+    assert "sma_cross" in strategies
+    assert strategies.describe()["sma_cross"]["params"] == {"fast": 20, "slow": 50}
+    plugin = strategies.plugin("sma_cross")
+    assert plugin.filter({"fast": 5, "slow": 10, "extra": 1}) == {"fast": 5, "slow": 10}
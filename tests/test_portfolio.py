@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.api import backtest as backtest_api
+from backend.api import portfolio as portfolio_api
+from backend.main import app
+
+
+def _frame(seed: int, n: int = 300) -> pd.DataFrame:
+    rng   = np.random.default_rng(seed)
+    close = 100.0 * np.cumprod(1.0 + rng.normal(0.0005, 0.01, n))
+    index = pd.date_range("2023-01-02", periods=n, freq="B", tz="UTC", name="timestamp")
+    return pd.DataFrame({"open": close, "high": close * 1.01, "low": close * 0.99,
+                         "close": close, "volume": 1e6}, index=index)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    def load_many(symbols, *args, **kwargs):
+        return {s: _frame(i) for i, s in enumerate(symbols) if s != "MISSING"}
+
+    monkeypatch.setattr(portfolio_api, "load_bars_many", load_many)
+    monkeypatch.setattr(backtest_api, "load_bars", lambda *args, **kwargs: _frame(0))
+    return TestClient(app)
+
+
+def test_portfolio_weights_and_attribution(client):
+    res = client.post("/api/backtest/portfolio",
+                      json={"symbols": ["SPY", "QQQ", "MISSING"], "weights": [3, 1, 4]})
+    assert res.status_code == 200, res.text
+    body = res.json()
+    assert body["missing"] == ["MISSING"]
+    assert [a["weight"] for a in body["attribution"]] == [0.75, 0.25]
+    total = sum(a["contribution"] for a in body["attribution"])
+    assert total == pytest.approx(body["performance"]["total_return"], abs=0.05)
+
+
+@pytest.mark.parametrize("payload", [
+    {"symbols": ["SPY", "SPY"]},
+    {"symbols": ["SPY", "QQQ"], "weights": [1, -1]},
+    {"symbols": ["SPY", "MISSING"], "weights": [0, 1]},
+])
+def test_portfolio_rejects_bad_input(client, payload):
+    res = client.post("/api/backtest/portfolio", json=payload)
+    assert res.status_code == 400, res.text
+
+
+def test_single_backtest_uses_engine(client):
+    single = client.post("/api/backtest", json={"strategy": "sma_cross"}).json()
+    port   = client.post("/api/backtest/portfolio",
+                         json={"symbols": ["SPY"], "strategy": "sma_cross"}).json()
+    assert single["performance"]["total_return"] == port["performance"]["total_return"]
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+from backend.core.bars import load_bars
+from backend.core.resample import ResampleCache, bases, resample, resample_cache
+from benchmarks.synthetic import offline
+
+
+def _minutes(start: str, periods: int) -> pd.DataFrame:
+    index = pd.date_range(start, periods=periods, freq="1min", tz="UTC")
+    rng   = np.random.default_rng(7)
+    close = 100 + rng.normal(0, 0.1, periods).cumsum()
+    return pd.DataFrame({
+        "open": close + 0.01, "high": close + 0.05, "low": close - 0.05, "close": close,
+        "volume": rng.integers(1, 1000, periods).astype(float),
+        "trade_count": rng.integers(1, 50, periods).astype(float),
+        "vwap": close,
+    }, index=index)
+
+
+def test_bases_are_exact_divisors():
+    assert bases("15m") == ["1m", "5m"]
+    assert bases("1h") == ["1m", "5m", "15m", "30m"]
+    assert bases("1m") == [] and bases("1d") == []
+
+
+def test_matches_groupby_on_utc_grid():
+    df  = _minutes("2024-03-02 00:00", 24 * 60)                    # Samstag, Crypto
+    out = resample(df, "15m", session=False)
+    ref = df.resample("15min").agg({"open": "first", "high": "max", "low": "min", "close": "last",
+                                    "volume": "sum", "trade_count": "sum"})
+    pd.testing.assert_frame_equal(out[ref.columns], ref, check_freq=False)
+    turnover = (df["vwap"] * df["volume"]).resample("15min").sum()
+    np.testing.assert_allclose(out["vwap"], turnover / ref["volume"])
+
+
+def test_equity_buckets_respect_sessions():
+    df  = _minutes("2024-03-04 09:00", 16 * 60)                   # 04:00–20:00 New York
+    out = resample(df, "1h")
+    local = out.index.tz_convert("America/New_York").strftime("%H:%M").tolist()
+    assert local[:7] == ["04:00", "05:00", "06:00", "07:00", "08:00", "09:00", "09:30"]
+    assert "15:30" in local and local[local.index("15:30") + 1] == "16:00"
+    assert out.loc[out.index[local.index("09:00")], "volume"] == df["volume"].iloc[300:330].sum()
+    assert out["volume"].sum() == df["volume"].sum()
+
+
+def test_cache_is_bounded_and_returns_copies():
+    df    = _minutes("2024-03-04 14:30", 60)
+    size  = int(df.memory_usage(index=True).sum())
+    cache = ResampleCache(max_bytes=size * 2)
+    for key in "abc":
+        cache.put((key,), df)
+    assert cache.get(("a",)) is None and cache.stats()["evictions"] == 1
+    copy = cache.get(("c",))
+    copy["close"] = 0
+    assert (cache.get(("c",))["close"] != 0).all()
+
+
+def test_switching_timeframes_is_local():
+    resample_cache.clear()
+    with offline() as env:
+        m5 = load_bars("SPY", "5m", "2024-03-04", "2024-03-09", "k", "s")
+        requests = env["client"].requests
+        m15 = load_bars("SPY", "15m", "2024-03-04", "2024-03-09", "k", "s")
+        h1  = load_bars("SPY", "1h", "2024-03-04", "2024-03-09", "k", "s")
+        assert env["client"].requests == requests                    # aus den 1m-Bars abgeleitet
+        assert m15["volume"].sum() == m5["volume"].sum() == h1["volume"].sum()
+        assert len(m15) * 3 == len(m5)
+        load_bars("SPY", "15m", "2024-03-04", "2024-03-09", "k", "s")
+        assert resample_cache.stats()["hits"] >= 1
+    resample_cache.clear()
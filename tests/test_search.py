@@ -0,0 +1,55 @@
+from fastapi.testclient import TestClient
+
+from backend.api import symbols as symbols_api
+from backend.core.assets import AssetCatalog
+from backend.core.search import SymbolIndex, index_for
+from backend.main import app
+from data.symbols import build_symbols
+
+
+def _raw(symbol, name, asset_class="us_equity", exchange="NASDAQ"):
+    return {"symbol": symbol, "name": name, "exchange": exchange, "tradable": True, "asset_class": asset_class}
+
+
+RAW = [
+    _raw("AAPL", "Apple Inc."), _raw("APP", "AppLovin Corp"), _raw("APLE", "Apple Hospitality REIT"),
+    _raw("MSFT", "Microsoft Corporation"), _raw("SPY", "SPDR S&P 500 ETF Trust", exchange="ARCA"),
+    _raw("A", "Agilent Technologies"), _raw("BTC/USD", "Bitcoin", "crypto", "CRYPTO"),
+]
+
+
+def test_ranking_prefix_tokens_and_facets():
+    index = SymbolIndex(build_symbols(RAW))
+
+    res = index.search("ap")
+    assert [r["symbol"] for r in res["results"]] == ["APP", "APLE", "AAPL"]    # Ticker-Präfix vor Name
+
+    assert index.search("aapl")["results"][0]["symbol"] == "AAPL"                 # exakt vor allem
+    assert index.search("A")["results"][0]["symbol"] == "A"
+    assert [r["symbol"] for r in index.search("apple hosp")["results"]] == ["APLE"]
+    assert index.search("btcusd")["results"][0]["symbol"] == "BTC/USD"
+
+    etfs = index.search("", {"type": "Index ETF"})
+    assert [r["symbol"] for r in etfs["results"]] == ["SPY"]
+    crypto = index.search("", {"asset_class": "crypto"}, facets=True)
+    assert crypto["total"] == crypto["facets"]["asset_class"]["crypto"] and "us_equity" not in crypto["facets"]["asset_class"]
+
+    page = index.search("", offset=2, limit=2)
+    assert page["total"] == len(index.items) and [r["symbol"] for r in page["results"]] == \
+        [s["symbol"] for s in index.items[2:4]]
+    assert set(page["results"][0]) == {"symbol", "name", "exchange", "type", "sector", "market_cap"}
+
+
+def test_endpoint_reuses_index(monkeypatch, tmp_path):
+    catalog = AssetCatalog(tmp_path / "assets.json")
+    catalog._set({r["symbol"]: r for r in RAW}, ts=1e18)
+    monkeypatch.setattr(symbols_api, "asset_catalog", catalog)
+    client = TestClient(app)
+
+    res = client.get("/api/symbols/search", params={"q": "micro", "limit": 5}).json()
+    assert res["total"] == 1 and res["results"][0]["symbol"] == "MSFT"
+    assert index_for(catalog.assets()) is index_for(catalog.assets())
+    assert client.get("/api/symbols/search", params={"limit": 1000}).status_code == 422
+
+    monkeypatch.setattr(symbols_api, "asset_catalog", AssetCatalog(tmp_path / "none.json"))
+    assert client.get("/api/symbols/search", params={"q": "a"}).status_code == 401
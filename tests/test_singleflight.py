@@ -0,0 +1,115 @@
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.api import market
+from backend.core.singleflight import SingleFlight, StreamFlights
+from backend.main import app
+from tests.test_market import fake  # noqa: F401  (Fixture)
+
+
+def test_single_flight_shares_one_call():
+    flight  = SingleFlight()
+    calls   = []
+    release = threading.Event()
+
+    def load():
+        calls.append(1)
+        release.wait(5)
+        return pd.DataFrame({"close": [1.0, 2.0]})
+
+    with ThreadPoolExecutor(4) as pool:
+        futures = [pool.submit(flight.do, "SPY", load, pd.DataFrame.copy) for _ in range(4)]
+        while flight.stats()["shared"] < 3:
+            time.sleep(0.01)
+        release.set()
+        frames = [f.result() for f in futures]
+
+    assert len(calls) == 1 and flight.stats() == {"calls": 1, "shared": 3, "in_flight": 0}
+    assert len({id(df) for df in frames}) == 4            # Wartende bekommen Kopien
+    assert all(df["close"].tolist() == [1.0, 2.0] for df in frames)
+
+
+def test_single_flight_shares_errors_and_forgets_key():
+    flight = SingleFlight()
+    with pytest.raises(ValueError):
+        flight.do("k", lambda: (_ for _ in ()).throw(ValueError("kaputt")))
+    assert flight.do("k", lambda: 7) == 7
+
+
+def test_stream_subscribers_share_one_producer():
+    flights = StreamFlights()
+    starts  = []
+
+    async def producer():
+        starts.append(1)
+        for i in range(5):
+            await asyncio.sleep(0.01)
+            yield i
+
+    async def collect(delay):
+        await asyncio.sleep(delay)
+        return [e async for e in flights.subscribe("heatmap", producer)]
+
+    async def main():
+        return await asyncio.gather(collect(0), collect(0.025), collect(0.03))
+
+    results = asyncio.run(main())
+    assert starts == [1]
+    assert all(r == [0, 1, 2, 3, 4] for r in results)      # späte Abonnenten bekommen die Historie
+    assert flights.stats()["in_flight"] == 0 and flights.stats()["shared"] == 2
+
+
+def test_stream_producer_cancelled_with_last_subscriber():
+    flights = StreamFlights()
+    state   = {"events": 0, "cancelled": False}
+
+    async def producer():
+        try:
+            while True:
+                await asyncio.sleep(0.01)
+                state["events"] += 1
+                yield state["events"]
+        except asyncio.CancelledError:
+            state["cancelled"] = True
+            raise
+
+    async def main():
+        a = flights.subscribe("k", producer)
+        b = flights.subscribe("k", producer)
+        await a.__anext__(), await b.__anext__()
+        await a.aclose()
+        await asyncio.sleep(0.03)
+        assert not state["cancelled"]                      # b hört noch zu
+        await b.aclose()
+        await asyncio.sleep(0.03)
+
+    asyncio.run(main())
+    assert state["cancelled"] and flights.stats()["cancelled"] == 1 and flights.stats()["in_flight"] == 0
+
+
+def test_concurrent_heatmap_streams_load_once(fake):
+    fake.latency = 0.05
+    params = {"alpaca_key": "key", "alpaca_secret": "secret"}
+    before = market.heatmap_flights.stats()
+
+    with TestClient(app) as client:
+        def stream():
+            res = client.get("/api/market/heatmap/stream", params=params)
+            return [json.loads(line[6:]) for line in res.text.splitlines() if line.startswith("data: ")]
+
+        with ThreadPoolExecutor(3) as pool:
+            runs = list(pool.map(lambda _: stream(), range(3)))
+
+    after = market.heatmap_flights.stats()
+    assert after["flights"] - before["flights"] == 1 and after["shared"] - before["shared"] == 2
+    assert after["in_flight"] == 0
+    assert all(run[-1]["stage"] == "done" for run in runs)
+    assert runs[0] == runs[1] == runs[2]                     # alle bekommen jedes Event
+    assert any(e["stage"] == "batch_done" for e in runs[0])
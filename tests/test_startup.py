@@ -0,0 +1,49 @@
+import json
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.api import health
+from backend.core import startup
+from benchmarks.bench_startup import importtime, probe
+
+
+def test_health_answers_without_heavy_imports():
+    result = json.loads(probe("lazy").stdout.strip().splitlines()[-1])
+    assert result["status"] == 200 and result["heavy_loaded"] == []
+
+
+def test_routers_load_on_first_request_and_warmup_runs():
+    app    = FastAPI()
+    loader = startup.RouterLoader(app, [("modules", "/api", "modules")])
+    warmup = startup.Warmup(delay=30)
+    ran    = []
+    warmup.hook(lambda: ran.append(loader.loaded))
+    app.add_middleware(startup.LazyRouters, loader=loader, warmup=warmup)
+    app.include_router(health.router, prefix="/api")
+    app.state.startup = lambda: startup.stats(loader, warmup)
+
+    client = TestClient(app)
+    warmup.start()
+    assert client.get("/api/health").json() == {"status": "ok"}
+    assert not loader.loaded                                     # Health lädt keine Router
+
+    deadline = time.time() + 5
+    while warmup.state != "done" and time.time() < deadline:     # erster Request löst das Warm-up aus
+        time.sleep(0.01)
+    assert ran == [False]
+
+    modules = client.get("/api/modules")
+    assert modules.status_code == 200 and "sma_cross" in modules.json()["strategies"]
+    assert loader.loaded and "/api/modules" in app.openapi()["paths"]
+    stats = client.get("/api/health/startup").json()
+    assert stats["routers_loaded"] and stats["warmup"] == "done"
+
+
+def test_importtime_parser():
+    stderr = ("import time: self [us] | cumulative | imported package\n"
+              "import time:       100 |        100 |   fastapi\n"
+              "import time:      2000 |       2500 | backend.main\n")
+    total, top = importtime(stderr)
+    assert total == 2.5 and top[0] == ("backend.main", 2.0)
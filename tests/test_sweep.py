@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.api import sweep as sweep_api
+from backend.core import sweep as core_sweep
+from backend.core.sweep import run_sweep
+from backend.main import app
+
+
+def _frame(n: int = 400) -> pd.DataFrame:
+    rng   = np.random.default_rng(7)
+    close = 100.0 * np.cumprod(1.0 + rng.normal(0.0005, 0.01, n))
+    index = pd.date_range("2023-01-02", periods=n, freq="B", tz="UTC", name="timestamp")
+    return pd.DataFrame({"open": close, "high": close * 1.01, "low": close * 0.99,
+                         "close": close, "volume": 1e6}, index=index)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(sweep_api, "load_bars", lambda *args, **kwargs: _frame())
+    return TestClient(app)
+
+
+def test_vectorized_matches_plugin_and_param_order():
+    df   = _frame()
+    grid = {"fast": [5, 10, 15], "slow": [20, 40]}
+    fast = run_sweep(df, "sma_cross", grid)
+    swapped = run_sweep(df, "sma_cross", {"slow": grid["slow"], "fast": grid["fast"]})
+
+    assert fast["sharpe"].shape == (3, 2)
+    assert swapped["sharpe"].shape == (2, 3)
+    np.testing.assert_allclose(swapped["sharpe"], fast["sharpe"].T)
+
+    plugin = core_sweep._plugin_chunk("sma_cross", df, ["fast", "slow"], [(10, 40)])
+    np.testing.assert_allclose(plugin["total_return"][0], fast["total_return"][1, 1])
+
+
+def test_sweep_endpoint(client):
+    res = client.post("/api/backtest/sweep", json={})
+    assert res.status_code == 200, res.text
+    body = res.json()
+    assert body["cells"] == 100
+    assert set(body["best"]["params"]) == {"fast", "slow"}
+    assert all(v is None or isinstance(v, float) for v in body["best"]["metrics"].values())
+    assert len(body["metrics"]["sharpe"]) == 10
+
+
+@pytest.mark.parametrize("params", [
+    {"fast": {"start": 5, "stop": 50, "step": 0}},
+    {"fast": {"start": 50, "stop": 5, "step": 5}},
+    {"fast": {"start": 5, "stop": 6, "step": 0.5}, "slow": {"start": 20, "stop": 40, "step": 20}},
+    {"fast": {"start": 1, "stop": 1000, "step": 1}, "slow": {"start": 1, "stop": 1000, "step": 1}},
+])
+def test_sweep_rejects_bad_ranges(client, params):
+    res = client.post("/api/backtest/sweep", json={"params": params})
+    assert res.status_code == 400, res.text
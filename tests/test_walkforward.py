@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.api import sweep as sweep_api
+from backend.core import walkforward
+from backend.core.engine import run_strategy
+from backend.core.walkforward import make_folds, run_walkforward
+from backend.main import app
+from tests.test_sweep import _frame
+
+GRID = {"fast": [5, 10, 15], "slow": [20, 40]}
+
+
+def test_folds_rolling_and_anchored():
+    rolling = make_folds(400, 4, 3.0)
+    assert [f[2:] for f in rolling] == [(172, 229), (229, 286), (286, 343), (343, 400)]
+    assert all(hi - lo == 172 for lo, hi, _, _ in rolling)
+    assert all(f[0] == 0 for f in make_folds(400, 4, 3.0, anchored=True))
+    with pytest.raises(ValueError):
+        make_folds(10, 8, 3.0)
+
+
+def test_out_of_sample_is_stitched_from_fold_winners(monkeypatch):
+    df = _frame()
+    wf = run_walkforward(df, "sma_cross", GRID, folds=3, train_ratio=2.0)
+    splits = make_folds(len(df), 3, 2.0)
+
+    expected = []
+    for (lo, _, test_lo, test_hi), fold in zip(splits, wf["folds"]):
+        out = run_strategy(df.iloc[lo:test_hi].copy(), "sma_cross", [], fold["params"])
+        expected.append(out["strat_ret"].to_numpy()[-(test_hi - test_lo):])
+    np.testing.assert_allclose(wf["strat_ret"], np.concatenate(expected))
+    assert len(wf["equity"]) == len(wf["index"]) == len(df) - splits[0][2]
+
+    # Gleiches Ergebnis über den Prozesspool
+    monkeypatch.setattr(walkforward, "PARALLEL_THRESHOLD", 0)
+    pooled = run_walkforward(df, "sma_cross", GRID, folds=3, train_ratio=2.0)
+    np.testing.assert_allclose(pooled["strat_ret"], wf["strat_ret"])
+    assert [f["params"] for f in pooled["folds"]] == [f["params"] for f in wf["folds"]]
+
+
+def test_endpoint(monkeypatch):
+    monkeypatch.setattr(sweep_api, "load_bars", lambda *args, **kwargs: _frame())
+    client = TestClient(app)
+    body = {"params": {"fast": {"start": 5, "stop": 15, "step": 5}, "slow": {"start": 20, "stop": 40, "step": 20}},
+            "folds": 4, "anchored": True}
+    res = client.post("/api/backtest/walkforward", json=body)
+    assert res.status_code == 200
+    data = res.json()
+    assert len(data["folds"]) == 4 and data["cells"] == 6
+    assert data["folds"][0]["train"][0] == data["folds"][3]["train"][0]
+    assert client.post("/api/backtest/walkforward", json={**body, "objective": "foo"}).status_code == 400
+    assert client.post("/api/backtest/walkforward", json={**body, "folds": 200}).status_code == 400